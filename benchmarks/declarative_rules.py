@@ -0,0 +1,104 @@
+"""
+声明式规则基准测试：比较匹配表（一次遍历、按标签分派）与每个规则各自遍历文档的开销随规则数量的变化
+
+用法:
+    python benchmarks/declarative_rules.py [--elements 20000] [--repeat 3]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from wcag_validator.core.index import DocumentIndex
+from wcag_validator.rules.declarative import MatcherTable, define_rule
+
+# 文档中使用的标签，规则依次分派到这些标签上
+TAGS = [
+    'div', 'span', 'p', 'a', 'img', 'input', 'button', 'li', 'ul', 'section',
+    'article', 'aside', 'nav', 'header', 'footer', 'label', 'select', 'option', 'textarea', 'table',
+    'tr', 'td', 'th', 'em', 'strong', 'b', 'i', 'small', 'code', 'pre',
+    'h1', 'h2', 'h3', 'h4', 'figure', 'figcaption', 'dl', 'dt', 'dd', 'blockquote',
+]
+
+
+def build_document(element_count, seed=0):
+    """生成包含element_count个元素的测试文档"""
+    rng = random.Random(seed)
+    parts = ['<html lang="zh-CN"><body>']
+    for i in range(element_count):
+        tag = rng.choice(TAGS)
+        attrs = f' data-k{rng.randrange(100)}="v"' if rng.random() < 0.3 else ''
+        parts.append(f'<{tag} id="e{i}"{attrs}>x</{tag}>')
+    parts.append('</body></html>')
+    return BeautifulSoup("".join(parts), 'html.parser')
+
+
+def build_rules(count):
+    """生成count个声明式规则，分别检查不同标签上的不同属性"""
+    return [
+        define_rule({
+            "id": f"bench-{i}",
+            "level": "A",
+            "selector": {"tag": TAGS[i % len(TAGS)], "attrs": {f"data-k{i % 100}": True}},
+            "message": "{tag}带有data属性",
+        }, register=False)
+        for i in range(count)
+    ]
+
+
+def run_table(document, rules):
+    """匹配表：索引只构建一次，所有规则在一次遍历中执行"""
+    document.__dict__.pop('_wcag_index', None)
+    index = DocumentIndex.for_document(document)
+    results = MatcherTable(rules).run(document, index)
+    return sum(len(matches) for matches in results.values())
+
+
+def run_naive(document, rules):
+    """逐规则执行：每个规则各自遍历整个文档查找候选元素"""
+    total = 0
+    for rule in rules:
+        for element in document.find_all(True):
+            if element.name in rule.tags and rule.match(element, None) is not None:
+                total += 1
+    return total
+
+
+def measure(func, document, rules, repeat):
+    """返回多次运行中的最短耗时（秒）和匹配数"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        matches = func(document, rules)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description='声明式规则匹配表基准测试')
+    parser.add_argument('--elements', type=int, default=20000, help='文档中的元素数量')
+    parser.add_argument('--repeat', type=int, default=3, help='每项测试重复次数（取最短耗时）')
+    parser.add_argument('--rules', default='1,5,10,25,50,100', help='逗号分隔的规则数量')
+    args = parser.parse_args()
+    
+    document = build_document(args.elements)
+    counts = [int(count) for count in args.rules.split(',')]
+    
+    print(f"元素数量: {args.elements}")
+    print(f"{'规则数':>6}  {'匹配表(ms)':>10}  {'逐规则(ms)':>10}  {'匹配数':>6}")
+    for count in counts:
+        rules = build_rules(count)
+        table_time, table_matches = measure(run_table, document, rules, args.repeat)
+        naive_time, naive_matches = measure(run_naive, document, rules, args.repeat)
+        assert table_matches == naive_matches
+        print(f"{count:>6}  {table_time * 1000:>10.1f}  {naive_time * 1000:>10.1f}  {table_matches:>6}")
+
+
+if __name__ == '__main__':
+    main()
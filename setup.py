@@ -12,6 +12,12 @@ setup(
         "requests>=2.25.0",
         "html5lib>=1.1"
     ],
+    extras_require={
+        "parquet": ["pyarrow>=8.0.0"],
+        "fast-json": ["orjson>=3.6.0"],
+        "yaml": ["PyYAML>=5.1"],
+        "fast-color": ["numpy>=1.17"],
+    },
     entry_points={
         "console_scripts": [
             "wcag-validator=wcag_validator.cli:main",
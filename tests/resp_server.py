@@ -0,0 +1,245 @@
+"""
+测试用的最小Redis协议（RESP2）服务，只实现RedisQueue和RespClient用到的命令，数据保存在内存中
+"""
+import socketserver
+import threading
+import time
+
+
+class Error(str):
+    """错误回复"""
+
+
+class Status(str):
+    """简单字符串回复（如OK）"""
+
+
+OK = Status("OK")
+
+
+class Store:
+    """
+    内存数据库
+    
+    值为str（字符串）、list（列表）或dict（哈希）。过期时间在访问键时检查，过期的键
+    视为不存在。所有命令在同一把锁下执行，与Redis的单线程语义一致。
+    """
+    
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+        self.lock = threading.Lock()
+    
+    def execute(self, args):
+        """
+        执行一条命令
+        
+        参数:
+            args: 命令名和参数组成的字符串列表
+        
+        返回:
+            回复值（None、int、str、Status、Error或列表）
+        """
+        name, args = args[0].upper(), args[1:]
+        handler = getattr(self, f"cmd_{name.lower()}", None)
+        if handler is None:
+            return Error(f"ERR unknown command '{name}'")
+        with self.lock:
+            try:
+                return handler(*args)
+            except (TypeError, ValueError) as exc:
+                return Error(f"ERR {exc}")
+    
+    def _get(self, key, kind=None):
+        """返回未过期的值；kind不为None且键不存在时创建空值"""
+        expires = self.expires.get(key)
+        if expires is not None and expires <= time.time():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        if key not in self.data and kind is not None:
+            self.data[key] = kind()
+        return self.data.get(key)
+    
+    # 连接和键
+    
+    def cmd_ping(self):
+        return Status("PONG")
+    
+    def cmd_select(self, db):
+        return OK
+    
+    def cmd_auth(self, password):
+        return OK
+    
+    def cmd_del(self, *keys):
+        removed = 0
+        for key in keys:
+            if self._get(key) is not None:
+                del self.data[key]
+                self.expires.pop(key, None)
+                removed += 1
+        return removed
+    
+    def cmd_exists(self, *keys):
+        return sum(1 for key in keys if self._get(key) is not None)
+    
+    def cmd_pexpire(self, key, milliseconds):
+        if self._get(key) is None:
+            return 0
+        self.expires[key] = time.time() + int(milliseconds) / 1000
+        return 1
+    
+    # 字符串
+    
+    def cmd_get(self, key):
+        return self._get(key)
+    
+    def cmd_set(self, key, value, *options):
+        options = [option.upper() for option in options]
+        if "NX" in options and self._get(key) is not None:
+            return None
+        self.data[key] = value
+        self.expires.pop(key, None)
+        if "PX" in options:
+            self.expires[key] = time.time() + int(options[options.index("PX") + 1]) / 1000
+        return OK
+    
+    # 列表
+    
+    def cmd_lpush(self, key, *values):
+        items = self._get(key, list)
+        for value in values:
+            items.insert(0, value)
+        return len(items)
+    
+    def cmd_rpush(self, key, *values):
+        items = self._get(key, list)
+        items.extend(values)
+        return len(items)
+    
+    def cmd_rpoplpush(self, source, destination):
+        items = self._get(source)
+        if not items:
+            return None
+        value = items.pop()
+        self._get(destination, list).insert(0, value)
+        return value
+    
+    def cmd_llen(self, key):
+        return len(self._get(key) or [])
+    
+    def cmd_lrange(self, key, start, stop):
+        items = self._get(key) or []
+        stop = int(stop)
+        return items[int(start):None if stop == -1 else stop + 1]
+    
+    def cmd_lrem(self, key, count, value):
+        items = self._get(key) or []
+        count, removed, kept = int(count), 0, []
+        for item in items:
+            if item == value and (count == 0 or removed < abs(count)):
+                removed += 1
+            else:
+                kept.append(item)
+        items[:] = kept
+        return removed
+    
+    # 哈希
+    
+    def cmd_hset(self, key, *pairs):
+        fields = self._get(key, dict)
+        added = 0
+        for field, value in zip(pairs[::2], pairs[1::2]):
+            added += field not in fields
+            fields[field] = value
+        return added
+    
+    def cmd_hsetnx(self, key, field, value):
+        fields = self._get(key, dict)
+        if field in fields:
+            return 0
+        fields[field] = value
+        return 1
+    
+    def cmd_hget(self, key, field):
+        return (self._get(key) or {}).get(field)
+    
+    def cmd_hmget(self, key, *fields):
+        values = self._get(key) or {}
+        return [values.get(field) for field in fields]
+    
+    def cmd_hdel(self, key, *fields):
+        values = self._get(key) or {}
+        return sum(1 for field in fields if values.pop(field, None) is not None)
+    
+    def cmd_hlen(self, key):
+        return len(self._get(key) or {})
+    
+    def cmd_hexists(self, key, field):
+        return int(field in (self._get(key) or {}))
+    
+    def cmd_hincrby(self, key, field, increment):
+        fields = self._get(key, dict)
+        value = int(fields.get(field, 0)) + int(increment)
+        fields[field] = str(value)
+        return value
+    
+    def cmd_hgetall(self, key):
+        return [item for pair in (self._get(key) or {}).items() for item in pair]
+
+
+def encode(reply):
+    """将回复值编码为RESP2"""
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, Error):
+        return b"-" + reply.encode('utf-8') + b"\r\n"
+    if isinstance(reply, Status):
+        return b"+" + reply.encode('utf-8') + b"\r\n"
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, list):
+        return b"*%d\r\n" % len(reply) + b"".join(encode(item) for item in reply)
+    data = reply.encode('utf-8')
+    return b"$%d\r\n" % len(data) + data + b"\r\n"
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """读取RESP数组形式的命令并写回回复，一个连接上的命令依次执行（支持流水线）"""
+    
+    def handle(self):
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            args = []
+            for _ in range(int(line[1:-2])):
+                length = int(self.rfile.readline()[1:-2])
+                args.append(self.rfile.read(length + 2)[:-2].decode('utf-8'))
+            self.wfile.write(encode(self.server.store.execute(args)))
+
+
+class RespServer(socketserver.ThreadingTCPServer):
+    """
+    在后台线程中运行的RESP服务，监听127.0.0.1上的临时端口
+    
+    用法:
+        with RespServer() as server:
+            queue = open_queue(server.url)
+    """
+    
+    daemon_threads = True
+    allow_reuse_address = True
+    
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.store = Store()
+        self.port = self.server_address[1]
+        self.url = f"redis://127.0.0.1:{self.port}"
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+    
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self._thread.join()
+        super().__exit__(*exc_info)
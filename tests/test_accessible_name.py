@@ -0,0 +1,64 @@
+"""
+无障碍名称服务与表单标签规则测试
+"""
+import pytest
+from bs4 import BeautifulSoup
+
+from wcag_validator import WCAGValidator
+from wcag_validator.core.index import DocumentIndex
+
+
+def names_of(html, selector):
+    """返回(无障碍名称, 是否只来自title)"""
+    document = BeautifulSoup(html, 'html.parser')
+    index = DocumentIndex.for_document(document)
+    element = document.select_one(selector)
+    return index.names.name(element), index.names.title_only(element)
+
+
+def form_label_issues(body):
+    report = WCAGValidator('AA', rule_ids=['form-label']).validate_html(f"<html><body>{body}</body></html>")
+    return report.get_issues_by_rule('form-label')
+
+
+@pytest.mark.parametrize("html, name", [
+    ('<label for="q">搜索</label><input id="q">', "搜索"),
+    ('<label>搜索 <input id="q"></label>', "搜索"),
+    ('<span id="l">站内 搜索</span><input id="q" aria-labelledby="l" aria-label="忽略" title="忽略">', "站内 搜索"),
+    ('<input id="q" aria-label="搜索" title="提示">', "搜索"),
+    ('<label for="q">搜索</label><input id="q" title="提示">', "搜索"),
+])
+def test_name_from_label_sources(html, name):
+    """aria-labelledby、aria-label和label优先于title"""
+    assert names_of(html, "#q") == (name, False)
+
+
+def test_name_from_title_only():
+    """只有title时title提供名称，并被标记为只来自title"""
+    assert names_of('<input id="q" title="搜索">', "#q") == ("搜索", True)
+    assert names_of('<input id="q" title="  ">', "#q") == ("", False)
+
+
+@pytest.mark.parametrize("body", [
+    '<label for="q">搜索</label><input id="q">',
+    '<label>搜索 <input type="checkbox"></label>',
+    '<input id="q" aria-label="搜索">',
+    '<label for="q">搜索</label><input id="q" title="输入关键字">',
+])
+def test_labelled_controls_pass(body):
+    assert form_label_issues(body) == []
+
+
+def test_title_only_control_reported_at_reduced_impact():
+    """只通过title获得名称的控件报告为影响程度较低的问题"""
+    issue, = form_label_issues('<input id="q" title="搜索">')
+    assert issue.code == "form-label.title-only"
+    assert issue.params == {"title": "搜索"}
+    assert issue.impact == "中"
+    assert "搜索" in issue.description
+
+
+def test_unnamed_control_reported():
+    issue, = form_label_issues('<input id="q">')
+    assert issue.code == "form-label.no-label"
+    assert issue.impact == "高"
@@ -0,0 +1,41 @@
+"""
+站点聚合器测试
+"""
+from wcag_validator.core.aggregate import SiteAggregator
+
+
+# (页面URL, [(规则ID, 元素签名, 问题描述), ...])，page1.html出现两次
+PAGES = [
+    ("page1.html", [("img-alt", "img", "缺少alt"), ("img-alt", "img", "缺少alt"), ("link-text", "a", "链接文本")]),
+    ("page2.html", []),
+    ("page3.html", [("img-alt", "img", "缺少alt"), ("lang", "html", "缺少lang")]),
+    ("fix.html", [("img-alt", "img", "缺少alt")]),
+    ("page1.html", [("img-alt", "img", "缺少alt"), ("link-text", "a", "链接文本")]),
+]
+
+
+def _aggregate(max_groups_in_memory, max_samples=5):
+    aggregator = SiteAggregator(max_samples=max_samples, max_groups_in_memory=max_groups_in_memory)
+    try:
+        for url, issues in PAGES:
+            for rule_id, signature, message in issues:
+                aggregator.add_issue(url, rule_id, signature, message, rule_name=rule_id,
+                                     wcag_criterion="1.1.1", level="A")
+            aggregator.end_page(has_issues=bool(issues))
+        return aggregator.to_dict()
+    finally:
+        aggregator.close()
+
+
+def test_sample_urls_are_not_repeated():
+    """同一页面再次出现时不重复记录示例URL"""
+    groups = {group["rule_id"]: group for group in _aggregate(100000)["groups"]}
+    assert groups["img-alt"]["sample_urls"] == ["page1.html", "page3.html", "fix.html"]
+    assert groups["img-alt"]["count"] == 5
+    assert groups["img-alt"]["pages"] == 4
+
+
+def test_spilling_does_not_change_result():
+    """每个页面后都溢出到磁盘时，结果与全部保留在内存中相同"""
+    assert _aggregate(1) == _aggregate(100000)
+    assert _aggregate(1, max_samples=2) == _aggregate(100000, max_samples=2)
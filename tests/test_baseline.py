@@ -0,0 +1,99 @@
+"""
+基线测试：上一次运行的报告作为基线时，只报告新增问题；检出目录的位置不影响匹配
+"""
+import pytest
+
+from wcag_validator import WCAGValidator, write_report
+from wcag_validator.core.baseline import Baseline, page_key
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head><title>测试</title></head>
+<body>
+<img src="logo.png">
+<a href="/more">点击这里</a>
+<input type="text" name="q">
+</body>
+</html>
+"""
+
+
+def checkout(directory, html=PAGE):
+    """在directory中写入页面，模拟一次检出"""
+    directory.mkdir()
+    path = directory / "page.html"
+    path.write_text(html, encoding="utf-8")
+    return path
+
+
+def write_baseline(tmp_path, format="json"):
+    """在检出目录a中验证页面，按命令行的方式以相对路径记录，写出基线报告"""
+    root = tmp_path / "a"
+    page = checkout(root)
+    report = WCAGValidator('AA').validate_file(str(page))
+    report.url = page_key(report.url, str(root))
+    path = root / f"base.{format}"
+    with open(path, "w", encoding="utf-8") as f:
+        write_report(report, f, format=format)
+    return path, report
+
+
+def validate_against(baseline_path, directory, html=PAGE):
+    """在另一个检出目录中验证同一页面（可能已修改）"""
+    page = checkout(directory, html)
+    baseline = Baseline(str(baseline_path), root=str(directory))
+    report = WCAGValidator('AA', baseline=baseline).validate_file(str(page))
+    return baseline, report
+
+
+def test_page_key(tmp_path):
+    root = str(tmp_path)
+    assert page_key((tmp_path / "site" / "page.html").as_uri(), root) == "site/page.html"
+    assert page_key(str(tmp_path / "page.html"), root) == "page.html"
+    assert page_key("./site/../page.html", root) == "page.html"
+    assert page_key("https://example.com/a?b=1", root) == "https://example.com/a?b=1"
+    assert page_key(None, root) == ""
+
+
+@pytest.mark.parametrize("format", ["json", "jsonl", "sarif"])
+def test_round_trip_in_another_checkout(tmp_path, format):
+    """同一页面在不同目录中验证时，基线中的问题全部匹配"""
+    baseline_path, original = write_baseline(tmp_path, format)
+    baseline, report = validate_against(baseline_path, tmp_path / "b")
+    assert len(original.issues) > 0
+    assert len(baseline) == len(original.issues)
+    assert report.issues == []
+    assert report.baseline_suppressed == len(original.issues)
+    assert list(baseline.iter_fixed()) == []
+
+
+def test_new_issue_is_reported(tmp_path):
+    baseline_path, original = write_baseline(tmp_path)
+    html = PAGE.replace('<img src="logo.png">', '<img src="logo.png"><img src="banner.png">')
+    baseline, report = validate_against(baseline_path, tmp_path / "b", html)
+    assert [(issue.rule.id, issue.element["src"]) for issue in report.issues] == [("img-alt", "banner.png")]
+    assert report.baseline_suppressed == len(original.issues)
+    assert list(baseline.iter_fixed()) == []
+
+
+def test_fixed_issue_is_listed(tmp_path):
+    baseline_path, original = write_baseline(tmp_path)
+    html = PAGE.replace('<img src="logo.png">', '<img src="logo.png" alt="公司标志">')
+    baseline, report = validate_against(baseline_path, tmp_path / "b", html)
+    assert report.issues == []
+    fixed = list(baseline.iter_fixed())
+    assert [(record["rule_id"], record["url"]) for record in fixed] == [("img-alt", "page.html")]
+    assert report.baseline_suppressed == len(original.issues) - 1
+
+
+def test_other_pages_are_not_matched(tmp_path):
+    """基线中的问题只匹配同一页面"""
+    baseline_path, _ = write_baseline(tmp_path)
+    directory = tmp_path / "b"
+    directory.mkdir()
+    other = directory / "other.html"
+    other.write_text(PAGE, encoding="utf-8")
+    baseline = Baseline(str(baseline_path), root=str(directory))
+    report = WCAGValidator('AA', baseline=baseline).validate_file(str(other))
+    assert report.baseline_suppressed == 0
+    assert report.issues
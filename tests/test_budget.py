@@ -0,0 +1,141 @@
+"""
+执行预算测试：单规则和单文档的元素数与耗时预算，超出预算的规则被中止并标记为部分完成
+"""
+import time
+
+import pytest
+
+from wcag_validator import WCAGValidator
+from wcag_validator.core.budget import Budget, BudgetExceeded, BudgetMeter
+from wcag_validator.rules.base import Rule
+
+BODY = '<img src="a.png">' * 30 + '<a href="/">首页</a>' * 5
+
+
+def validate(budget, body=BODY, **options):
+    html = f'<html lang="zh"><head><title>测试</title></head><body>{body}</body></html>'
+    return WCAGValidator('AA', budget=budget, **options).validate_html(html)
+
+
+def reasons(report):
+    return {entry["rule_id"]: entry["reason"] for entry in report.partial_rules}
+
+
+def test_rule_elements_budget():
+    """规则访问的元素超出预算时中止，保留已发现的问题，其余规则继续执行"""
+    report = validate({"rule_elements": 10})
+    assert reasons(report)["img-alt"] == "超出规则元素预算 (10个元素)"
+    assert len(report.get_issues_by_rule("img-alt")) == 10
+    assert report.get_issues_by_rule("page-language") == []
+    assert "page-language" not in reasons(report)
+    
+    unlimited = validate(None)
+    assert unlimited.partial_rules == []
+    assert len(unlimited.get_issues_by_rule("img-alt")) == 30
+
+
+def test_document_elements_budget():
+    """文档预算用尽后当前规则被中止，剩余规则不再执行"""
+    report = validate({"document_elements": 40}, profile=True)
+    partial = reasons(report)
+    assert "img-alt" not in partial
+    assert len(report.get_issues_by_rule("img-alt")) == 30
+    assert partial
+    assert set(partial.values()) == {"超出文档元素预算 (40个元素)"}
+    # 只有第一个规则完整执行，第二个规则中途被中止，其余规则没有执行
+    executed = [entry["rule_id"] for entry in report.profile.rules]
+    assert executed[0] == "img-alt" and len(executed) == 2
+    assert set(partial) > set(executed[1:])
+
+
+def test_document_time_budget():
+    report = validate({"document_time": 1e-9})
+    partial = reasons(report)
+    assert "img-alt" in partial and "link-purpose" in partial
+    assert set(partial.values()) == {"超出文档时间预算 (1e-09秒)"}
+    assert report.issues == []
+
+
+def deep_links(depth, count=20):
+    """每个链接包含depth层嵌套的span，名称计算遍历的元素多、规则访问的元素少"""
+    link = '<a href="/more">' + '<span>' * depth + '更多' + '</span>' * depth + '</a>'
+    return link * count
+
+
+def test_rule_time_budget_stops_deep_name_computation():
+    """只遍历少量链接、但每个链接的名称计算遍历大量元素的规则同样受时间预算限制"""
+    body = deep_links(2000)
+    report = validate({"rule_time": 0.001}, body=body, rule_ids=["link-purpose"])
+    assert reasons(report) == {"link-purpose": "超出规则时间预算 (0.001秒)"}
+    assert len(report.get_issues_by_rule("link-purpose")) < 20
+    
+    unlimited = validate(None, body=body, rule_ids=["link-purpose"])
+    assert len(unlimited.get_issues_by_rule("link-purpose")) == 20
+
+
+def test_name_computation_counts_towards_element_budget():
+    report = validate({"rule_elements": 500}, body=deep_links(200, count=5), rule_ids=["link-purpose"])
+    assert reasons(report) == {"link-purpose": "超出规则元素预算 (500个元素)"}
+    assert len(report.get_issues_by_rule("link-purpose")) == 2
+
+
+class SlowRule(Rule):
+    """不访问索引中的元素、但耗时较长的规则"""
+    
+    def __init__(self):
+        super().__init__()
+        self.id = "test-slow"
+        self.name = "慢规则"
+        self.wcag_criterion = "1.1.1"
+        self.level = "A"
+    
+    def iter_issues(self, document):
+        time.sleep(0.02)
+        return
+        yield
+
+
+def test_rule_over_time_budget_when_finished_is_partial():
+    html = '<html lang="zh"><head><title>测试</title></head><body></body></html>'
+    report = WCAGValidator('AA', rules=[SlowRule()], budget={"rule_time": 0.005}).validate_html(html)
+    assert reasons(report) == {"test-slow": "超出规则时间预算 (0.005秒)"}
+    assert report.passed_rules == []
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+def test_meter_checks_time_on_every_tick():
+    clock = FakeClock()
+    meter = BudgetMeter(Budget(rule_time=1.0), clock=clock)
+    meter.start_rule(SlowRule())
+    meter.tick()
+    clock.now = 1.5
+    with pytest.raises(BudgetExceeded) as info:
+        meter.tick()
+    assert (info.value.scope, info.value.resource) == ("rule", "time")
+
+
+def test_meter_excludes_enrichment_time():
+    clock = FakeClock()
+    meter = BudgetMeter(Budget(rule_time=1.0, document_time=10.0), clock=clock)
+    meter.start_rule(SlowRule())
+    clock.now = 1.5
+    meter.exclude(1.0)
+    meter.tick()
+    clock.now = 10.5
+    with pytest.raises(BudgetExceeded) as info:
+        meter.tick()
+    assert (info.value.scope, info.value.resource) == ("document", "time")
+
+
+def test_invalid_budget():
+    with pytest.raises(ValueError):
+        Budget(rule_time=0)
+    assert not Budget()
+    assert Budget(rule_elements=5).to_dict() == {"rule_elements": 5}
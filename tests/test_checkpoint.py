@@ -0,0 +1,164 @@
+"""
+检查点测试：中断时写了一半的行、配置不一致、文件修改后重新验证，以及结果记录先于检查点行写入
+"""
+import json
+
+import pytest
+
+from wcag_validator import WCAGValidator
+from wcag_validator.core.checkpoint import PARTIALS_SUFFIX, Checkpoint
+
+CONFIG = {"level": "AA", "locale": None}
+
+PAGE = '<html><head><title>{0}</title></head><body><img src="{0}.png"></body></html>'
+
+
+@pytest.fixture
+def pages(tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"page{i}.html"
+        path.write_text(PAGE.format(i), encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def record(checkpoint, source):
+    validator = WCAGValidator('AA')
+    report = validator.validate_file(source)
+    checkpoint.record(source, report, validator.parser.source_code)
+    return report
+
+
+def restored_urls(checkpoint, sources):
+    return [report.url if report else None for report in map(checkpoint.restore, sources)]
+
+
+def test_resume_restores_recorded_sources(tmp_path, pages):
+    path = str(tmp_path / "run.ckpt")
+    checkpoint = Checkpoint(path, CONFIG)
+    expected = [record(checkpoint, source) for source in pages[:2]]
+    checkpoint.close()
+    
+    checkpoint = Checkpoint(path, CONFIG, resume=True)
+    assert len(checkpoint) == 2
+    for source, report in zip(pages, expected):
+        restored = checkpoint.restore(source)
+        assert restored.url == report.url
+        assert [issue.fingerprint for issue in restored.issues] == [issue.fingerprint for issue in report.issues]
+    assert checkpoint.restore(pages[2]) is None
+    assert checkpoint.restored == 2
+    checkpoint.close()
+    
+    # 不恢复时清空已有的检查点
+    Checkpoint(path, CONFIG).close()
+    checkpoint = Checkpoint(path, CONFIG, resume=True)
+    assert len(checkpoint) == 0
+    checkpoint.close()
+
+
+def test_half_written_line_is_truncated(tmp_path, pages):
+    path = tmp_path / "run.ckpt"
+    checkpoint = Checkpoint(str(path), CONFIG)
+    record(checkpoint, pages[0])
+    checkpoint.close()
+    complete = path.read_bytes()
+    with open(path, "ab") as f:
+        f.write(b'{"source": "' + pages[1].encode("utf-8") + b'", "sha1": "0a1b')
+    
+    checkpoint = Checkpoint(str(path), CONFIG, resume=True)
+    assert path.read_bytes() == complete
+    assert len(checkpoint) == 1
+    record(checkpoint, pages[1])
+    checkpoint.close()
+    
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line).get("source") for line in lines] == [None, pages[0], pages[1]]
+    checkpoint = Checkpoint(str(path), CONFIG, resume=True)
+    assert restored_urls(checkpoint, pages[:2]) == [WCAGValidator('AA').validate_file(p).url for p in pages[:2]]
+    checkpoint.close()
+
+
+@pytest.mark.parametrize("header", [
+    {"version": 1, "config": dict(CONFIG, level="AAA")},
+    {"version": 1, "config": dict(CONFIG, rules=["img-alt"])},
+    {"version": 99, "config": CONFIG},
+])
+def test_mismatched_checkpoint_raises(tmp_path, header):
+    path = tmp_path / "run.ckpt"
+    path.write_text(json.dumps(header) + "\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        Checkpoint(str(path), CONFIG, resume=True)
+
+
+def test_empty_checkpoint_raises(tmp_path):
+    path = tmp_path / "run.ckpt"
+    path.write_bytes(b'{"version": 1, "con')
+    with pytest.raises(ValueError):
+        Checkpoint(str(path), CONFIG, resume=True)
+
+
+def test_modified_file_is_revalidated(tmp_path, pages):
+    path = str(tmp_path / "run.ckpt")
+    checkpoint = Checkpoint(path, CONFIG)
+    for source in pages:
+        record(checkpoint, source)
+    checkpoint.close()
+    
+    with open(pages[1], "a", encoding="utf-8") as f:
+        f.write("<!-- 修改 -->")
+    checkpoint = Checkpoint(path, CONFIG, resume=True)
+    assert checkpoint.restore(pages[0]) is not None
+    assert checkpoint.restore(pages[1]) is None
+    assert checkpoint.restore(pages[2]) is not None
+    
+    # 重新验证后记录新的哈希，之后的恢复使用新的结果
+    record(checkpoint, pages[1])
+    checkpoint.close()
+    checkpoint = Checkpoint(path, CONFIG, resume=True)
+    assert checkpoint.restore(pages[1]) is not None
+    checkpoint.close()
+
+
+class _Interrupted(Exception):
+    pass
+
+
+class _CrashingFile:
+    """写入时抛出异常的文件，模拟进程在写检查点行之前中断"""
+    
+    def __init__(self, file):
+        self.file = file
+    
+    def write(self, data):
+        raise _Interrupted()
+    
+    def close(self):
+        self.file.close()
+
+
+def test_partials_written_before_checkpoint_line(tmp_path, pages):
+    """写入结果记录之后、写入检查点行之前中断时，来源在恢复时重新验证"""
+    path = tmp_path / "run.ckpt"
+    partials = tmp_path / ("run.ckpt" + PARTIALS_SUFFIX)
+    checkpoint = Checkpoint(str(path), CONFIG)
+    record(checkpoint, pages[0])
+    checkpoint._file = _CrashingFile(checkpoint._file)
+    with pytest.raises(_Interrupted):
+        record(checkpoint, pages[1])
+    checkpoint.close()
+    
+    assert partials.read_bytes().count(b"\n") == 2
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 2
+    
+    checkpoint = Checkpoint(str(path), CONFIG, resume=True)
+    assert checkpoint.restore(pages[0]) is not None
+    assert checkpoint.restore(pages[1]) is None
+    report = record(checkpoint, pages[1])
+    checkpoint.close()
+    
+    # 重新验证的结果追加在孤立的结果记录之后
+    checkpoint = Checkpoint(str(path), CONFIG, resume=True)
+    assert checkpoint.restore(pages[1]).url == report.url
+    assert partials.read_bytes().count(b"\n") == 3
+    checkpoint.close()
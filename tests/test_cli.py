@@ -0,0 +1,181 @@
+"""
+命令行测试：报告写到标准输出时，标准输出只包含报告本身；中断的批量运行用--resume恢复后输出不变
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head><title>测试</title></head>
+<body>
+<img src="logo.png">
+<a href="/more">点击这里</a>
+<input type="text" name="q">
+</body>
+</html>
+"""
+
+
+def run_cli(*args, cwd=None):
+    """运行命令行工具，返回(退出码, 标准输出, 标准错误)"""
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    result = subprocess.run(
+        [sys.executable, "-m", "wcag_validator.cli"] + list(args),
+        cwd=cwd, env=env, capture_output=True, text=True, encoding="utf-8"
+    )
+    return result.returncode, result.stdout, result.stderr
+
+
+def write_pages(directory, count):
+    paths = []
+    for i in range(count):
+        path = os.path.join(str(directory), f"page{i}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(PAGE)
+        paths.append(path)
+    return paths
+
+
+def test_sarif_to_stdout_is_valid_json(tmp_path):
+    """单个来源的SARIF报告写到标准输出时是合法的JSON，进度信息写到标准错误"""
+    page, = write_pages(tmp_path, 1)
+    code, stdout, stderr = run_cli(page, "--format", "sarif")
+    assert code == 0, stderr
+    sarif = json.loads(stdout)
+    assert sarif["runs"][0]["results"]
+    assert "正在验证文件" in stderr
+
+
+def test_batch_sarif_to_stdout_is_valid_json(tmp_path):
+    """多个来源的SARIF报告写到标准输出时是合法的JSON"""
+    pages = write_pages(tmp_path, 3)
+    code, stdout, stderr = run_cli(*pages, "--format", "sarif")
+    assert code == 0, stderr
+    assert len(json.loads(stdout)["runs"][0]["results"]) >= 3
+
+
+# 逐行解析JSON Lines的读取器，任一行不是JSON对象时以非零状态退出
+JSONL_READER = (
+    "import json, sys\n"
+    "records = [json.loads(line) for line in sys.stdin if line.strip()]\n"
+    "assert records and all(isinstance(record, dict) for record in records)\n"
+    "print(len(records))\n"
+)
+
+
+def test_jsonl_stdout_pipes_into_json_lines_reader(tmp_path):
+    """--format jsonl写到标准输出时可以直接通过管道交给JSON Lines读取器"""
+    pages = write_pages(tmp_path, 3)
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    producer = subprocess.Popen(
+        [sys.executable, "-m", "wcag_validator.cli"] + pages + ["--format", "jsonl"],
+        env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    reader = subprocess.run(
+        [sys.executable, "-c", JSONL_READER],
+        stdin=producer.stdout, capture_output=True, text=True
+    )
+    producer.stdout.close()
+    stderr = producer.stderr.read().decode("utf-8")
+    producer.stderr.close()
+    assert producer.wait() == 0, stderr
+    assert reader.returncode == 0, reader.stderr
+    assert int(reader.stdout) >= 3
+    assert stderr.count("正在验证文件") == 3
+
+
+def test_single_source_jsonl_stdout_is_json_lines(tmp_path):
+    """单个来源的jsonl报告每一行都是JSON对象"""
+    page, = write_pages(tmp_path, 1)
+    code, stdout, stderr = run_cli(page, "--format", "jsonl")
+    assert code == 0, stderr
+    lines = stdout.splitlines()
+    assert lines
+    for line in lines:
+        assert isinstance(json.loads(line), dict)
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="需要命名管道")
+def test_killed_run_resumes_to_same_report(tmp_path):
+    """运行中被强制结束后用--resume继续，汇总报告与不中断的运行相同"""
+    pages = write_pages(tmp_path, 12)
+    for i, page in enumerate(pages):
+        with open(page, "w", encoding="utf-8") as f:
+            f.write(PAGE.replace("logo.png", f"logo{i}.png").replace("<input", f'<input id="q{i % 3}"'))
+    sources = tmp_path / "sources.txt"
+    sources.write_text("\n".join(pages) + "\n", encoding="utf-8")
+    common = ["--sources-file", str(sources), "--aggregate", "--format", "json"]
+    
+    code, _, stderr = run_cli(*common, "--output", str(tmp_path / "full.json"))
+    assert code == 0, stderr
+    
+    # 第7个来源换成命名管道，读取时阻塞，在前6个来源记录到检查点后结束进程
+    blocked = pages[6]
+    os.rename(blocked, blocked + ".bak")
+    os.mkfifo(blocked)
+    checkpoint = tmp_path / "run.ckpt"
+    args = common + ["--output", str(tmp_path / "resumed.json"), "--checkpoint", str(checkpoint)]
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    process = subprocess.Popen([sys.executable, "-m", "wcag_validator.cli"] + args, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.time() + 60
+        while not checkpoint.exists() or len(checkpoint.read_bytes().splitlines()) < 7:
+            assert process.poll() is None and time.time() < deadline
+            time.sleep(0.05)
+    finally:
+        process.kill()
+        process.wait()
+    os.remove(blocked)
+    os.rename(blocked + ".bak", blocked)
+    assert not (tmp_path / "resumed.json").exists()
+    
+    code, _, stderr = run_cli(*args, "--resume")
+    assert code == 0, stderr
+    assert "恢复 6 个来源，共记录 12 个已完成的来源" in stderr
+    assert (tmp_path / "resumed.json").read_bytes() == (tmp_path / "full.json").read_bytes()
+
+
+def test_baseline_from_another_checkout(tmp_path):
+    """在另一个目录中生成的基线同样适用：本地文件按相对路径匹配"""
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+        write_pages(tmp_path / name, 1)
+    code, _, stderr = run_cli("page0.html", "--format", "json", "--output", "base.json", cwd=str(tmp_path / "a"))
+    assert code == 0, stderr
+    assert json.loads((tmp_path / "a" / "base.json").read_text(encoding="utf-8"))["url"] == "page0.html"
+    
+    code, _, stderr = run_cli("page0.html", "--baseline", "../a/base.json", "--format", "json",
+                              "--output", "out.json", cwd=str(tmp_path / "b"))
+    assert code == 0, stderr
+    assert "基线对比: 新增 0 个问题" in stderr
+    assert json.loads((tmp_path / "b" / "out.json").read_text(encoding="utf-8"))["issues"] == []
+    
+    code, _, stderr = run_cli(str(tmp_path / "b" / "page0.html"), "--baseline", "a/base.json",
+                              "--baseline-root", "b", "--format", "json", "--output", "out.json", cwd=str(tmp_path))
+    assert code == 0, stderr
+    assert "基线对比: 新增 0 个问题" in stderr
+
+
+def test_locale_option(tmp_path):
+    """--locale决定报告中问题描述的语言"""
+    from wcag_validator import WCAGValidator
+    
+    page, = write_pages(tmp_path, 1)
+    descriptions = {}
+    for locale in ("zh-CN", "en"):
+        code, stdout, stderr = run_cli(page, "--format", "jsonl", "--locale", locale)
+        assert code == 0, stderr
+        issues = [json.loads(line) for line in stdout.splitlines()]
+        descriptions[locale] = [issue.get("description") for issue in issues if issue.get("code")]
+    for locale, actual in descriptions.items():
+        report = WCAGValidator('AA', locale=locale).validate_file(page)
+        assert actual == [issue.description for issue in report.issues if issue.code]
+    assert descriptions["en"] and descriptions["en"] != descriptions["zh-CN"]
@@ -0,0 +1,140 @@
+"""
+继承上下文测试：自顶向下计算的上下文（aria-hidden容器、fieldset、label、form和地标）
+以及焦点顺序中被禁用的fieldset与逐个祖先向上查找的结果一致
+"""
+import os
+import random
+
+import pytest
+from bs4 import BeautifulSoup
+
+from wcag_validator.core.context import IMPLICIT_LANDMARKS, LANDMARK_ROLES
+from wcag_validator.core.focus import DISABLEABLE_TAGS, INERT_TAGS, _natively_focusable, parse_tabindex
+from wcag_validator.core.index import DocumentIndex
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CONTAINERS = ['div', 'span', 'section', 'fieldset', 'label', 'form', 'header', 'footer', 'nav', 'main', 'aside']
+CONTROLS = ['<input>', '<input disabled>', '<button>保存</button>', '<button disabled>保存</button>',
+            '<a href="/">首页</a>', '<select><option>一</option></select>', '<span tabindex="0">x</span>']
+ROLES = ['banner', 'contentinfo', 'navigation', 'region', 'search', 'presentation', ' Main ']
+
+
+def random_markup(generator, depth=0):
+    """生成随机嵌套的容器和表单控件"""
+    parts = []
+    for _ in range(generator.randint(1, 3)):
+        if depth >= 5 or generator.random() < 0.3:
+            parts.append(generator.choice(CONTROLS))
+            continue
+        name = generator.choice(CONTAINERS)
+        attrs = ''
+        if generator.random() < 0.2:
+            attrs += ' aria-hidden="%s"' % generator.choice(['true', 'false'])
+        if generator.random() < 0.2:
+            attrs += ' role="%s"' % generator.choice(ROLES)
+        if name == 'fieldset' and generator.random() < 0.5:
+            attrs += ' disabled'
+        if generator.random() < 0.05:
+            attrs += ' hidden'
+        parts.append(f'<{name}{attrs}>{random_markup(generator, depth + 1)}</{name}>')
+    return ''.join(parts)
+
+
+def ancestors(element):
+    """从最近的祖先开始向上列出所有祖先元素"""
+    return [parent for parent in element.parents if parent.name != '[document]']
+
+
+def nearest(element, predicate):
+    return next((parent for parent in ancestors(element) if predicate(parent)), None)
+
+
+def landmark_role(element):
+    """元素自身的地标角色，header和footer属于其他地标时不是地标"""
+    role = element.get('role')
+    role = role.strip().lower() if isinstance(role, str) else None
+    if role in LANDMARK_ROLES:
+        return role
+    role = IMPLICIT_LANDMARKS.get(element.name)
+    if role in ('banner', 'contentinfo') and nearest(element, landmark_role) is not None:
+        return None
+    return role
+
+
+def naive_context(element):
+    landmark = nearest(element, landmark_role)
+    return {
+        'hidden_root': nearest(element, lambda parent: parent.get('aria-hidden') == 'true'),
+        'fieldset': nearest(element, lambda parent: parent.name == 'fieldset'),
+        'label': nearest(element, lambda parent: parent.name == 'label'),
+        'form': nearest(element, lambda parent: parent.name == 'form'),
+        'landmark': landmark,
+        'landmark_role': landmark_role(landmark) if landmark is not None else None,
+    }
+
+
+def naive_focusable(element):
+    """逐个祖先判断元素是否不渲染或位于被禁用的fieldset内"""
+    chain = [element] + ancestors(element)
+    if any(item.name in INERT_TAGS or item.has_attr('hidden') or item.has_attr('inert') for item in chain):
+        return False
+    if element.name in DISABLEABLE_TAGS and (
+            element.has_attr('disabled')
+            or nearest(element, lambda parent: parent.name == 'fieldset' and parent.has_attr('disabled'))):
+        return False
+    return parse_tabindex(element.get('tabindex')) is not None or _natively_focusable(element)
+
+
+def check_document(html):
+    document = BeautifulSoup(html, 'html.parser')
+    index = DocumentIndex.for_document(document)
+    assert index.elements
+    for element in index.elements:
+        context = index.context(element)
+        actual = {slot: getattr(context, slot) for slot in context.__slots__}
+        expected = naive_context(element)
+        # 比较元素对象本身而不是相等的标记
+        assert {key: id(value) for key, value in actual.items() if key != 'landmark_role'} == \
+            {key: id(value) for key, value in expected.items() if key != 'landmark_role'}, str(element)[:200]
+        assert actual['landmark_role'] == expected['landmark_role']
+        assert context.hidden == (expected['hidden_root'] is not None)
+        assert index.focus.is_focusable(element) == naive_focusable(element), str(element)[:200]
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_random_documents(seed):
+    generator = random.Random(seed)
+    check_document(f'<html lang="zh"><body>{random_markup(generator)}</body></html>')
+
+
+@pytest.mark.parametrize("body", [
+    # 嵌套的aria-hidden容器取最近的一个
+    '<div aria-hidden="true"><p aria-hidden="true"><span>x</span></p></div>',
+    # aria-hidden="false"不会取消外层容器的隐藏
+    '<div aria-hidden="true"><div aria-hidden="false"><a href="/">首页</a></div></div>',
+    # 被禁用的fieldset中的控件不可聚焦，链接不受影响
+    '<fieldset disabled><legend>选项</legend><label>名称 <input></label><a href="/">帮助</a></fieldset>',
+    '<fieldset disabled><fieldset><button>保存</button></fieldset></fieldset>',
+    # 属于其他地标的header和footer不是地标
+    '<main><header><nav><a href="/">首页</a></nav></header><footer><p>版权</p></footer></main>',
+    '<header><p>横幅</p></header><div role="search"><footer role="contentinfo"><p>x</p></footer></div>',
+])
+def test_handcrafted_documents(body):
+    check_document(f'<html lang="zh"><body>{body}</body></html>')
+
+
+def test_sample_document():
+    with open(os.path.join(ROOT, "test_sample.html"), encoding="utf-8") as f:
+        check_document(f.read())
+
+
+def test_shared_contexts():
+    """没有引入新上下文的元素与兄弟元素共享同一个上下文对象"""
+    document = BeautifulSoup('<form><p>a</p><p>b<span>c</span></p></form>', 'html.parser')
+    index = DocumentIndex.for_document(document)
+    first, second = index.elements_by_tag('p')
+    span, = index.elements_by_tag('span')
+    assert index.context(first) is index.context(second) is index.context(span)
+    assert index.context(first).form is document.form
+    assert index.context(document.form).form is None
@@ -0,0 +1,142 @@
+"""
+对比度测试：4.5:1和7:1的边界、大号和加粗文本的阈值、半透明颜色的合成、无法确定背景或不显示的文本，
+以及NumPy与纯Python批量计算结果一致
+"""
+import random
+
+import pytest
+
+from wcag_validator import WCAGValidator
+from wcag_validator.utils import color
+from wcag_validator.utils.color import WHITE, contrast_ratio, contrast_ratios, pack, parse_color
+
+
+def failures(body, level='AAA', style=""):
+    """返回验证结果中对比度问题的(规则ID, 文本, 前景色, 背景色, 要求的对比度)列表"""
+    html = f'<html lang="zh"><head><title>测试</title><style>{style}</style></head><body>{body}</body></html>'
+    report = WCAGValidator(level, rule_ids=["color-contrast", "color-contrast-enhanced"]).validate_html(html)
+    return [
+        (issue.rule.id, issue.element.get_text(), issue.params["foreground"], issue.params["background"],
+         issue.params["required"])
+        for issue in report.issues
+    ]
+
+
+def test_ratio_boundaries_on_white():
+    assert contrast_ratio(parse_color("#767676"), WHITE) == pytest.approx(4.54, abs=0.01)
+    assert contrast_ratio(parse_color("#777777"), WHITE) < 4.5
+    assert contrast_ratio(parse_color("#595959"), WHITE) > 7
+    assert contrast_ratio(parse_color("#5a5a5a"), WHITE) < 7
+    assert contrast_ratio(parse_color("black"), WHITE) == pytest.approx(21)
+    assert contrast_ratio(WHITE, WHITE) == 1
+
+
+@pytest.mark.parametrize("foreground, expected", [
+    ("#767676", [("color-contrast-enhanced", "#767676", 7.0)]),
+    ("#777777", [("color-contrast", "#777777", 4.5), ("color-contrast-enhanced", "#777777", 7.0)]),
+    ("#595959", []),
+    ("#5a5a5a", [("color-contrast-enhanced", "#5a5a5a", 7.0)]),
+])
+def test_normal_text_thresholds(foreground, expected):
+    found = failures(f'<p style="color: {foreground}">文本</p>')
+    assert [(rule_id, fg, required) for rule_id, _, fg, _, required in found] == expected
+
+
+@pytest.mark.parametrize("style, large", [
+    ("font-size: 24px", True),
+    ("font-size: 18pt", True),
+    ("font-size: 23px", False),
+    ("font-size: 19px; font-weight: bold", True),
+    ("font-size: 19px; font-weight: 700", True),
+    ("font-size: 18px; font-weight: bold", False),
+    ("font-size: 19px; font-weight: 600", False),
+])
+def test_large_text_thresholds(style, large):
+    """大号文本：至少24px，或至少18.66px且加粗；#949494在白底上为3.03:1，#767676为4.54:1"""
+    found = failures(f'<p style="color: #949494; {style}">文本</p>', level='AA')
+    assert [required for *_, required in found] == ([] if large else [4.5])
+    
+    found = failures(f'<p style="color: #767676; {style}">文本</p>')
+    assert [required for *_, required in found] == ([] if large else [7.0])
+
+
+def test_large_text_inherits_font_size():
+    found = failures('<div style="font-size: 24px"><p style="color: #959595">文本</p></div>', level='AA')
+    assert [(fg, required) for _, _, fg, _, required in found] == [("#959595", 3.0)]
+
+
+def test_translucent_foreground_is_blended():
+    """半透明的前景色合成到背景上：50%黑色在白底上为#808080"""
+    found = failures('<p style="color: rgba(0, 0, 0, 0.5)">文本</p>', level='AA')
+    assert [(fg, bg) for _, _, fg, bg, _ in found] == [("#808080", "#ffffff")]
+
+
+def test_translucent_backgrounds_are_composited():
+    """半透明背景逐层合成到祖先的背景上"""
+    body = ('<div style="background-color: #000000">'
+            '<div style="background: rgba(255, 255, 255, 0.5)"><p style="color: #ffffff">文本</p></div>'
+            '</div>')
+    found = failures(body, level='AA')
+    assert [(fg, bg) for _, _, fg, bg, _ in found] == [("#ffffff", "#808080")]
+
+
+@pytest.mark.parametrize("body", [
+    '<p style="color: #eeeeee; background-image: url(photo.jpg)">文本</p>',
+    '<p style="color: #eeeeee; background: #fff url(photo.jpg) no-repeat">文本</p>',
+    '<div style="background: linear-gradient(#000, #333)"><p style="color: #eeeeee">文本</p></div>',
+    '<div style="display: none"><p style="color: #eeeeee">文本</p></div>',
+    '<p style="color: #eeeeee; visibility: hidden">文本</p>',
+    '<button style="color: #eeeeee" disabled>文本</button>',
+])
+def test_undeterminable_or_hidden_text_is_skipped(body):
+    assert failures(body) == []
+
+
+def test_background_image_class_is_skipped():
+    style = ".hero { background-image: url(hero.png) } p { color: #eeeeee }"
+    body = '<div class="hero"><p>图片上的文本</p></div><p>白底上的文本</p>'
+    assert [text for _, text, *_ in failures(body, level='AA', style=style)] == ["白底上的文本"]
+
+
+def test_opaque_background_over_image_is_checked():
+    """背景图片之上有不透明背景色的元素重新确定了背景"""
+    body = ('<div style="background-image: url(photo.jpg)">'
+            '<p style="background-color: #ffffff; color: #eeeeee">文本</p></div>')
+    assert [bg for _, _, _, bg, _ in failures(body, level='AA')] == ["#ffffff"]
+
+
+def random_colors(count, seed=0):
+    generator = random.Random(seed)
+    # 包含大量重复的颜色，与真实页面一致
+    palette = [generator.randrange(1 << 24) for _ in range(50)] + [0x000000, 0xffffff, 0x767676]
+    return [generator.choice(palette) for _ in range(count)], [generator.choice(palette) for _ in range(count)]
+
+
+def test_numpy_and_pure_python_ratios_agree(monkeypatch):
+    pytest.importorskip("numpy")
+    foregrounds, backgrounds = random_colors(2000)
+    vectorized = contrast_ratios(foregrounds, backgrounds)
+    monkeypatch.setattr(color, "np", None)
+    pure = contrast_ratios(foregrounds, backgrounds)
+    assert vectorized == pytest.approx(pure, rel=1e-12)
+    assert all(isinstance(ratio, float) for ratio in vectorized)
+    assert contrast_ratios([], []) == []
+
+
+def test_numpy_and_pure_python_reports_agree(monkeypatch):
+    pytest.importorskip("numpy")
+    foregrounds, backgrounds = random_colors(200, seed=1)
+    body = "".join(
+        f'<div style="background-color: #{bg:06x}"><p style="color: #{fg:06x}">文本{i}</p></div>'
+        for i, (fg, bg) in enumerate(zip(foregrounds, backgrounds))
+    )
+    vectorized = failures(body)
+    monkeypatch.setattr(color, "np", None)
+    pure = failures(body)
+    assert vectorized and vectorized == pure
+
+
+def test_pack_round_trip():
+    assert pack(parse_color("#767676")) == 0x767676
+    assert pack((1.4, 254.6, 0, 1.0)) == 0x01ff00
+    assert contrast_ratios([pack(parse_color("#767676"))], [pack(WHITE)]) == [pytest.approx(4.54, abs=0.01)]
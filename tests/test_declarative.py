@@ -0,0 +1,51 @@
+"""
+声明式规则测试：多值属性（class、rel）按空格连接后参与谓词、捕获和模板
+"""
+from bs4 import BeautifulSoup
+
+from wcag_validator import WCAGValidator
+from wcag_validator.rules.base import RuleRegistry
+from wcag_validator.rules.declarative import define_rule
+
+SPEC = {
+    "id": "test-button-class",
+    "name": "按钮类链接需要role",
+    "wcag_criterion": "4.1.2",
+    "level": "A",
+    "selector": {
+        "tag": "a",
+        "attrs": {
+            "class": {"matches": r"\bbtn\b", "ignore_case": True},
+            "rel": {"in": ["noopener noreferrer"]},
+            "role": False,
+        },
+    },
+    "let": {"kind": {"lookup": ["class"], "table": {"主要": ["primary"], "次要": ["secondary"]}}},
+    "message": "{kind}按钮链接缺少role",
+    "examples": [{"code": '<a class="{attrs[class]}" role="button" {attributes}>{inner}</a>', "omit": ["class"]}],
+}
+
+
+def validate(body):
+    registry = RuleRegistry(plugins=False)
+    define_rule(SPEC, registry=registry)
+    validator = WCAGValidator('AA', rule_ids=[SPEC["id"]], registry=registry)
+    return validator.validate_html(f"<html><body>{body}</body></html>").get_issues_by_rule(SPEC["id"])
+
+
+def test_multi_valued_attributes_match():
+    """class和rel解析为列表时谓词、捕获和模板使用以空格连接的值"""
+    document = BeautifulSoup('<a class="BTN Primary" rel="noopener noreferrer">购买</a>', 'html.parser')
+    assert isinstance(document.a["class"], list)
+    
+    issue, = validate('<a class="BTN Primary" rel="noopener noreferrer">购买</a>')
+    assert issue.description == "主要按钮链接缺少role"
+    assert issue.code_examples[0]["code"] == (
+        '<a class="BTN Primary" role="button" rel="noopener noreferrer">购买</a>'
+    )
+
+
+def test_multi_valued_attributes_do_not_match():
+    assert validate('<a class="button primary" rel="noopener noreferrer">购买</a>') == []
+    assert validate('<a class="btn" rel="noopener">购买</a>') == []
+    assert validate('<a class="btn" rel="noopener noreferrer" role="button">购买</a>') == []
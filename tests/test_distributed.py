@@ -0,0 +1,141 @@
+"""
+分布式队列测试：SQLite和Redis协议后端的租约、确认、过期重试和入队顺序，Redis后端使用内存中的RESP服务
+"""
+import time
+
+import pytest
+
+from resp_server import RespServer
+from wcag_validator.distributed.backends import LEASE_EXPIRED, open_queue
+from wcag_validator.distributed.worker import Coordinator, Worker
+
+# 测试使用的短租约（秒）
+TTL = 0.05
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def queue(request, tmp_path):
+    if request.param == "sqlite":
+        queue = open_queue(str(tmp_path / "queue.db"))
+        yield queue
+        queue.close()
+    else:
+        with RespServer() as server:
+            queue = open_queue(server.url)
+            yield queue
+            queue.close()
+
+
+def expire():
+    time.sleep(TTL * 3)
+
+
+def test_lease_and_ack(queue):
+    assert queue.enqueue([("u1", ["a.html", "b.html"])]) == 1
+    assert queue.enqueue([("u1", ["a.html", "b.html"])]) == 0
+    
+    lease, = queue.lease("w1")
+    assert (lease.unit_id, lease.sources, lease.attempts) == ("u1", ["a.html", "b.html"], 1)
+    assert queue.counts() == {"pending": 0, "leased": 1, "done": 0, "failed": 0}
+    assert queue.renew(lease)
+    
+    assert queue.ack(lease, [{"source": "a.html"}, {"source": "b.html"}])
+    assert queue.counts() == {"pending": 0, "leased": 0, "done": 1, "failed": 0}
+    assert list(queue.results(["u1"])) == [("u1", [{"source": "a.html"}, {"source": "b.html"}])]
+    assert queue.lease("w1") == []
+
+
+def test_lease_order_is_fifo(queue):
+    queue.enqueue([(f"u{i}", [f"{i}.html"]) for i in range(5)])
+    assert [lease.unit_id for lease in queue.lease("w1", count=3)] == ["u0", "u1", "u2"]
+    assert [lease.unit_id for lease in queue.lease("w1", count=3)] == ["u3", "u4"]
+
+
+def test_failed_unit_is_requeued(queue):
+    queue.enqueue([("u1", ["1.html"]), ("u2", ["2.html"])])
+    first, = queue.lease("w1")
+    assert first.unit_id == "u1"
+    assert queue.fail(first, "RuntimeError: x")
+    
+    retry = {lease.unit_id: lease.attempts for lease in queue.lease("w1", count=3)}
+    assert retry == {"u1": 2, "u2": 1}
+
+
+def test_expired_lease_is_retried(queue):
+    """过期的租约重新排队，原工作进程迟到的确认不覆盖新租约写入的结果"""
+    queue.enqueue([("u1", ["a.html"])])
+    stale, = queue.lease("w1", ttl=TTL)
+    expire()
+    
+    assert queue.reap() == 1
+    assert queue.counts()["pending"] == 1
+    assert not queue.renew(stale)
+    
+    retry, = queue.lease("w2")
+    assert retry.unit_id == "u1"
+    assert retry.attempts == 2
+    assert retry.token != stale.token
+    
+    assert queue.ack(retry, [{"source": "a.html", "worker": "w2"}])
+    assert not queue.ack(stale, [{"source": "a.html", "worker": "w1"}])
+    assert list(queue.results(["u1"])) == [("u1", [{"source": "a.html", "worker": "w2"}])]
+    assert queue.counts() == {"pending": 0, "leased": 0, "done": 1, "failed": 0}
+
+
+def test_expired_lease_reaped_by_lease(queue):
+    """没有待处理单元时，lease先回收过期的租约"""
+    queue.enqueue([("u1", ["a.html"])])
+    queue.lease("w1", ttl=TTL)
+    assert queue.lease("w2") == []
+    expire()
+    
+    lease, = queue.lease("w2")
+    assert (lease.unit_id, lease.attempts) == ("u1", 2)
+
+
+def test_expired_lease_without_attempts_left_fails(queue):
+    queue.enqueue([("u1", ["a.html"])])
+    queue.lease("w1", ttl=TTL, max_attempts=1)
+    expire()
+    
+    assert queue.reap(max_attempts=1) == 0
+    assert queue.failures() == {"u1": LEASE_EXPIRED}
+    assert queue.counts() == {"pending": 0, "leased": 0, "done": 0, "failed": 1}
+    
+    # 重新提交时失败的单元重新排队
+    assert queue.enqueue([("u1", ["a.html"])]) == 1
+    lease, = queue.lease("w1")
+    assert lease.attempts == 1
+
+
+def test_resubmit_with_different_max_attempts(queue):
+    """重试次数不参与单元ID的计算，修改后重新提交不会产生新的单元"""
+    sources = ["a.html", "b.html", "c.html"]
+    config = {"level": "AA", "max_attempts": 3}
+    first = Coordinator(queue, shard_size=2)
+    assert first.submit(sources, config) == 2
+    
+    second = Coordinator(queue, shard_size=2)
+    assert second.submit(sources, dict(config, max_attempts=5)) == 0
+    assert second.unit_ids == first.unit_ids
+    assert queue.get_config()["max_attempts"] == 5
+    
+    assert Coordinator(queue, shard_size=2).submit(sources, dict(config, level="AAA")) == 2
+
+
+def test_worker_processes_units_in_order(queue, tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"page{i}.html"
+        path.write_text(f'<html lang="zh"><head><title>{i}</title></head><body><img src="{i}.png"></body></html>',
+                        encoding="utf-8")
+        paths.append(path)
+    
+    coordinator = Coordinator(queue, shard_size=1)
+    coordinator.submit([str(path) for path in paths], {"level": "AA", "rules": ["img-alt"]})
+    assert Worker(queue, poll_interval=0).run() == 3
+    
+    reports = list(coordinator.iter_reports())
+    assert [report.url for report in reports] == [path.as_uri() for path in paths]
+    assert all(len(report.issues) == 1 for report in reports)
+    assert coordinator.errors == []
@@ -0,0 +1,128 @@
+"""
+列式导出测试：紧凑CSV及其字典编码表.dict.csv读回后与报告中的问题一致，Parquet导出与CSV内容相同
+"""
+import csv
+import os
+
+import pytest
+
+from wcag_validator import WCAGValidator
+from wcag_validator.core.export import COLUMNS, DICTIONARY_COLUMNS, ColumnarExporter, read_columnar_csv
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head><title>测试</title></head>
+<body>
+<img src="logo.png">
+<img src="banner.png">
+<a href="/more">点击这里</a>
+<input type="text" name="q">
+</body>
+</html>
+"""
+
+
+def reports():
+    sample = WCAGValidator('AAA').validate_file(os.path.join(ROOT, "test_sample.html"))
+    return [sample] + [WCAGValidator('AA').validate_html(PAGE, f"page{i}.html") for i in range(3)]
+
+
+def expected_rows(reports):
+    return [
+        {
+            "url": report.url or "",
+            "rule_id": issue.rule.id,
+            "wcag_criterion": issue.rule.wcag_criterion,
+            "level": issue.rule.level,
+            "impact": issue.impact,
+            "line": issue.line,
+            "column": issue.column,
+            "path": issue.path,
+            "description": issue.description,
+        }
+        for report in reports for issue in report.issues
+    ]
+
+
+def export(path, reports, **options):
+    exporter = ColumnarExporter(str(path), **options)
+    for report in reports:
+        exporter.add_report(report)
+    exporter.close()
+    return exporter
+
+
+@pytest.mark.parametrize("row_group_size", [1, 7, 10000])
+def test_csv_round_trip(tmp_path, row_group_size):
+    validated = reports()
+    path = tmp_path / "issues.csv"
+    exporter = export(path, validated, row_group_size=row_group_size)
+    expected = expected_rows(validated)
+    assert exporter.rows == len(expected) > 0
+    assert list(read_columnar_csv(str(path))) == expected
+
+
+def test_dictionary_file(tmp_path):
+    validated = reports()
+    path = tmp_path / "issues.csv"
+    export(path, validated, row_group_size=5)
+    expected = expected_rows(validated)
+    
+    with open(str(path) + ".dict.csv", encoding="utf-8", newline="") as f:
+        entries = list(csv.reader(f))
+    assert entries[0] == ["column", "code", "value"]
+    # 每个列中的每个取值只编码一次，编码从0开始连续分配
+    for name in DICTIONARY_COLUMNS:
+        values = [value for column, _, value in entries[1:] if column == name]
+        codes = [int(code) for column, code, _ in entries[1:] if column == name]
+        assert values == list(dict.fromkeys(row[name] for row in expected))
+        assert codes == list(range(len(values)))
+    
+    # 主文件中字典编码的列只包含整数编码
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == COLUMNS
+    assert all(row[name].isdigit() for row in rows for name in DICTIONARY_COLUMNS)
+
+
+def test_missing_values(tmp_path):
+    path = tmp_path / "rows.csv"
+    exporter = ColumnarExporter(str(path))
+    exporter.add_row(url="a.html", rule_id="img-alt", line=3)
+    exporter.add_row(url="a.html")
+    exporter.close()
+    rows = list(read_columnar_csv(str(path)))
+    assert [(row["url"], row["rule_id"], row["line"], row["column"]) for row in rows] == [
+        ("a.html", "img-alt", 3, None), ("a.html", None, None, None)
+    ]
+
+
+def test_parquet_matches_csv(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    validated = reports()
+    export(tmp_path / "issues.parquet", validated, row_group_size=7)
+    table = pq.read_table(str(tmp_path / "issues.parquet"))
+    assert table.column_names == COLUMNS
+    assert pq.ParquetFile(str(tmp_path / "issues.parquet")).num_row_groups > 1
+    assert table.to_pylist() == expected_rows(validated)
+
+
+def test_invalid_format(tmp_path):
+    with pytest.raises(ValueError):
+        ColumnarExporter(str(tmp_path / "issues.txt"), format="xlsx")
+
+
+def test_cli_export(tmp_path):
+    from test_cli import run_cli, write_pages
+    
+    pages = write_pages(tmp_path, 3)
+    path = tmp_path / "out.csv"
+    code, _, stderr = run_cli(*pages, "--export", str(path))
+    assert code == 0, stderr
+    expected = expected_rows([WCAGValidator('AA').validate_file(page) for page in pages])
+    rows = list(read_columnar_csv(str(path)))
+    assert [(row["rule_id"], row["line"], row["path"]) for row in rows] == \
+        [(row["rule_id"], row["line"], row["path"]) for row in expected]
+    assert len({row["url"] for row in rows}) == 3
@@ -0,0 +1,111 @@
+"""
+门禁测试：按级别或问题数判定失败，结论确定后停止验证，之后的规则不再执行
+"""
+import pytest
+
+from wcag_validator import WCAGValidator
+from wcag_validator.core.validator import FailThreshold, Issue
+from wcag_validator.rules.base import Rule
+
+PAGE = '<html lang="zh"><head><title>测试</title></head><body><p>内容</p></body></html>'
+
+
+class CountingRule(Rule):
+    """产生固定数量问题的规则，记录是否被执行以及产生了多少个问题"""
+    
+    def __init__(self, rule_id, level, count):
+        super().__init__()
+        self.id = rule_id
+        self.name = rule_id
+        self.wcag_criterion = "1.1.1"
+        self.level = level
+        self.count = count
+        self.runs = 0
+        self.emitted = 0
+    
+    def iter_issues(self, document):
+        self.runs += 1
+        body = document.find("body")
+        for i in range(self.count):
+            self.emitted += 1
+            yield Issue(rule=self, element=body, description=f"{self.id}问题{i}")
+
+
+def validate(rules, fail_on):
+    return WCAGValidator('AAA', rules=rules, fail_on=fail_on).validate_html(PAGE)
+
+
+def runs(rules):
+    return {rule.id: rule.runs for rule in rules}
+
+
+def test_level_gate_runs_relevant_rules_first():
+    """A级门禁：A级规则先于AA级规则执行，第一个A级问题出现后停止"""
+    rules = [CountingRule("aa-1", "AA", 2), CountingRule("a-1", "A", 3), CountingRule("a-2", "A", 2)]
+    report = validate(rules, "A")
+    assert report.gate_failed is True
+    assert report.short_circuited is True
+    assert [issue.rule.id for issue in report.issues] == ["a-1"]
+    assert rules[1].emitted == 1
+    assert runs(rules) == {"aa-1": 0, "a-1": 1, "a-2": 0}
+
+
+def test_level_gate_passes_with_higher_level_issues():
+    """AA级问题不影响A级门禁，所有规则都执行"""
+    rules = [CountingRule("a-1", "A", 0), CountingRule("aa-1", "AA", 2), CountingRule("aaa-1", "AAA", 1)]
+    report = validate(rules, "A")
+    assert report.gate_failed is False
+    assert report.short_circuited is False
+    assert len(report.issues) == 3
+    assert runs(rules) == {"a-1": 1, "aa-1": 1, "aaa-1": 1}
+
+
+def test_aa_gate():
+    rules = [CountingRule("aaa-1", "AAA", 2), CountingRule("a-1", "A", 0), CountingRule("aa-1", "AA", 2)]
+    report = validate(rules, "AA")
+    assert (report.gate_failed, report.short_circuited) == (True, True)
+    assert [issue.rule.id for issue in report.issues] == ["aa-1"]
+    assert runs(rules) == {"aaa-1": 0, "a-1": 1, "aa-1": 1}
+    assert [rule.id for rule in report.passed_rules] == ["a-1"]
+
+
+@pytest.mark.parametrize("max_issues", [0, 1, 3, 4])
+def test_count_gate_keeps_n_plus_one_issues(max_issues):
+    """count=N门禁：第N+1个问题出现时停止，报告中恰好有N+1个问题"""
+    rules = [CountingRule("r1", "AA", 2), CountingRule("r2", "A", 3), CountingRule("r3", "AAA", 5)]
+    report = validate(rules, f"count={max_issues}")
+    assert (report.gate_failed, report.short_circuited) == (True, True)
+    assert len(report.issues) == max_issues + 1
+    assert sum(rule.emitted for rule in rules) == max_issues + 1
+    
+    # 结论确定后的规则没有执行
+    last = report.issues[-1].rule
+    position = rules.index(last)
+    assert all(rule.runs == 1 for rule in rules[:position + 1])
+    assert all(rule.runs == 0 for rule in rules[position + 1:])
+
+
+def test_count_gate_not_exceeded():
+    rules = [CountingRule("r1", "AA", 2), CountingRule("r2", "A", 3)]
+    report = validate(rules, "count=5")
+    assert (report.gate_failed, report.short_circuited) == (False, False)
+    assert len(report.issues) == 5
+    assert runs(rules) == {"r1": 1, "r2": 1}
+
+
+def test_without_gate():
+    rules = [CountingRule("r1", "AA", 2), CountingRule("r2", "A", 3)]
+    report = validate(rules, None)
+    assert (report.gate_failed, report.short_circuited) == (None, False)
+    assert len(report.issues) == 5
+
+
+@pytest.mark.parametrize("spec, text", [("aa", "AA"), (" count=3 ", "count=3")])
+def test_parse_threshold(spec, text):
+    assert str(FailThreshold.parse(spec)) == text
+
+
+@pytest.mark.parametrize("spec", ["B", "count=x", "count=-1"])
+def test_invalid_threshold(spec):
+    with pytest.raises(ValueError):
+        FailThreshold.parse(spec)
@@ -0,0 +1,103 @@
+"""
+自动修复测试：编辑拼接和文件写回必须逐字节保留未修改的内容
+"""
+import pytest
+
+from wcag_validator import WCAGValidator
+from wcag_validator.fixes import AutoFixer, Edit, apply_edits, set_attributes
+
+
+def test_apply_edits_skips_overlapping_edit():
+    """与先前编辑重叠的编辑被跳过，源代码的其余部分不变"""
+    first, second = Edit(1, 3, "X"), Edit(2, 4, "Y")
+    text, applied, skipped = apply_edits("abcdef", [second, first])
+    assert text == "aXdef"
+    assert applied == [first]
+    assert skipped == [second]
+
+
+def test_apply_edits_adjacent_edits():
+    """首尾相接的编辑都被应用"""
+    text, applied, skipped = apply_edits("abcdef", [Edit(3, 5, "Y"), Edit(1, 3, "X")])
+    assert text == "aXYf"
+    assert len(applied) == 2
+    assert skipped == []
+
+
+def test_apply_edits_inserts_keep_order():
+    """同一位置的插入按给出的顺序保留，插入在同一位置的替换之前"""
+    edits = [Edit(2, 2, "1"), Edit(2, 4, "R"), Edit(2, 2, "2"), Edit(6, 6, "!")]
+    text, _, skipped = apply_edits("abcdef", edits)
+    assert text == "ab12Ref!"
+    assert skipped == []
+
+
+@pytest.mark.parametrize("tag, expected", [
+    ('<IMG SRC="a.png">', '<IMG SRC="a.png" alt="" role="presentation">'),
+    ('<img src="a.png" data-x="a>b" />', '<img src="a.png" data-x="a>b" alt="" role="presentation" />'),
+    ("<img src='a.png' ALT=' '>", "<img src='a.png' ALT='' role=\"presentation\">"),
+    ('<img alt src=a.png>', '<img alt="" src=a.png role="presentation">'),
+    ('<img\n  src="a.png"\n  alt=x>', '<img\n  src="a.png"\n  alt="" role="presentation">'),
+])
+def test_set_attributes(tag, expected):
+    """已有属性原位替换（保留引号风格和大小写），新属性插入到标签末尾"""
+    source = f"<p>前</p>{tag}<p>后</p>"
+    edits = set_attributes(source, source.index(tag), {"alt": "", "role": "presentation"})
+    text, _, skipped = apply_edits(source, edits)
+    assert text == f"<p>前</p>{expected}<p>后</p>"
+    assert skipped == []
+
+
+def test_set_attributes_not_a_start_tag():
+    assert set_attributes("<!-- <img> -->", 0, {"alt": ""}) == []
+
+
+def fix_bytes(tmp_path, data, lang="en"):
+    """将data写入文件，修复后返回文件的字节内容和FixResult"""
+    path = tmp_path / "page.html"
+    path.write_bytes(data)
+    _, result = AutoFixer(lang=lang).fix_file(WCAGValidator('AA'), str(path))
+    return path.read_bytes(), result
+
+
+def test_fix_file_preserves_crlf(tmp_path):
+    """CRLF换行、大写标签和属性值中的>原样保留"""
+    data = (
+        b'<!DOCTYPE html>\r\n<HTML>\r\n<head><title>t</title></head>\r\n<body>\r\n'
+        b'<IMG SRC="a.png" data-x="a>b">\r\n<img src="b.png"\r\n     alt="">\r\n</body>\r\n</HTML>\r\n'
+    )
+    expected = (
+        b'<!DOCTYPE html>\r\n<HTML lang="en">\r\n<head><title>t</title></head>\r\n<body>\r\n'
+        b'<IMG SRC="a.png" data-x="a>b" alt="" role="presentation">\r\n'
+        b'<img src="b.png"\r\n     alt="" role="presentation">\r\n</body>\r\n</HTML>\r\n'
+    )
+    text, result = fix_bytes(tmp_path, data)
+    assert text == expected
+    assert result.fixed_issues == 3
+    assert result.skipped == []
+
+
+def test_fix_file_non_ascii(tmp_path):
+    """同一行中元素之前的多字节字符（包括BMP以外的字符）不影响编辑位置"""
+    data = (
+        '<html><body>\n'
+        '<p>中文段落 😀 émoji</p><img src="图片.png"><p>之后</p>\n'
+        '<label>电子邮件</label><input type="email" name="邮箱">\n'
+        '</body></html>\n'
+    ).encode('utf-8')
+    expected = (
+        '<html lang="zh-CN"><body>\n'
+        '<p>中文段落 😀 émoji</p><img src="图片.png" alt="" role="presentation"><p>之后</p>\n'
+        '<label for="邮箱">电子邮件</label><input type="email" name="邮箱" id="邮箱">\n'
+        '</body></html>\n'
+    ).encode('utf-8')
+    text, result = fix_bytes(tmp_path, data, lang="zh-CN")
+    assert text == expected
+    assert result.skipped == []
+
+
+def test_fix_file_without_issues_is_untouched(tmp_path):
+    data = b'<html lang="en">\r\n<body><img src="a.png" alt="Logo"></body>\r\n</html>'
+    text, result = fix_bytes(tmp_path, data)
+    assert text == data
+    assert not result.changed
@@ -0,0 +1,53 @@
+"""
+键盘规则测试：focusable-hidden不重复aria-usage已报告的缺陷，示例保留元素内容
+"""
+import pytest
+
+from wcag_validator import WCAGValidator
+
+
+def issues(body, rules=('aria-usage', 'focusable-hidden')):
+    report = WCAGValidator('AA', rule_ids=list(rules)).validate_html(f'<html lang="zh"><body>{body}</body></html>')
+    return [(issue.code, issue.element.name) for issue in report.issues]
+
+
+@pytest.mark.parametrize("body, expected", [
+    # 包含交互控件的容器只由aria-usage报告
+    ('<div aria-hidden="true"><button>保存</button><div tabindex="0">更多</div></div>',
+     [("aria-usage.hidden-interactive", "div")]),
+    ('<div aria-hidden="true"><div aria-hidden="true"><a href="/">首页</a></div><span tabindex="0">x</span></div>',
+     [("aria-usage.hidden-interactive", "div"), ("aria-usage.hidden-interactive", "div")]),
+    ('<a href="/" aria-hidden="true"><input></a>',
+     [("aria-usage.hidden-interactive", "a")]),
+    # aria-usage不报告的情况由focusable-hidden报告
+    ('<a href="/" aria-hidden="true">首页</a>',
+     [("focusable-hidden.aria-hidden", "a")]),
+    ('<div aria-hidden="true"><span tabindex="0">图标</span></div>',
+     [("focusable-hidden.aria-hidden", "span")]),
+    # 不在Tab顺序中的元素不报告
+    ('<div aria-hidden="true"><span tabindex="-1">图标</span></div>', []),
+])
+def test_hidden_focusable_reported_once(body, expected):
+    assert issues(body) == expected
+
+
+def examples(body, rule_id):
+    report = WCAGValidator('AA', rule_ids=[rule_id]).validate_html(f'<html lang="zh"><body>{body}</body></html>')
+    issue, = report.get_issues_by_rule(rule_id)
+    return [example["code"] for example in issue.code_examples]
+
+
+@pytest.mark.parametrize("body, rule_id, expected", [
+    ('<div aria-hidden="true"><span tabindex="0" class="icon"><b>图标</b></span></div>', "focusable-hidden",
+     ['<span class="icon" tabindex="-1"><b>图标</b></span>']),
+    ('<button aria-hidden="true">保存</button>', "focusable-hidden",
+     ['<button aria-hidden="true" tabindex="-1">保存</button>']),
+    ('<a href="/" tabindex="2">首页</a>', "focus-order",
+     ['<a href="/" tabindex="0">首页</a>']),
+    ('<div onclick="go()">打开</div>', "keyboard-click",
+     ['<button type="button" onclick="go()">打开</button>', '<div onclick="go()" role="button" tabindex="0">打开</div>']),
+    ('<span onclick="go()" tabindex="0">打开</span>', "keyboard-click",
+     ['<span onclick="go()" role="button" tabindex="0">打开</span>']),
+])
+def test_examples_keep_element_content(body, rule_id, expected):
+    assert examples(body, rule_id) == expected
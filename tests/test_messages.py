@@ -0,0 +1,124 @@
+"""
+消息目录测试：代码示例模板的strip、set和each选项，使用它们的规则示例，以及语言属于验证器和报告
+"""
+from bs4 import BeautifulSoup
+
+from wcag_validator import WCAGValidator, generate_report
+from wcag_validator.core.messages import MessageCatalogue
+from wcag_validator.distributed.worker import validator_from_config
+
+
+def element(html):
+    return BeautifulSoup(html, 'html.parser').find(True)
+
+
+def test_strip_removes_attribute_from_descendants():
+    catalogue = MessageCatalogue()
+    catalogue.define("t.strip", {"message": "m", "examples": [{"code": "{html}", "strip": ["aria-hidden"]}]})
+    el = element('<div aria-hidden="true" class="a b"><a aria-hidden="true" href="/">x</a></div>')
+    example, = catalogue.code_examples("t.strip", element=el)
+    assert example["code"] == '<div class="a b"><a href="/">x</a></div>'
+    # 原始元素不变
+    assert el["aria-hidden"] == "true" and el.a["aria-hidden"] == "true"
+
+
+def test_set_replaces_or_adds_attribute():
+    catalogue = MessageCatalogue()
+    catalogue.define("t.set", {"message": "m", "examples": [{"code": "{html}", "set": {"tabindex": "-1"}}]})
+    example, = catalogue.code_examples("t.set", element=element('<button tabindex="2">保存</button>'))
+    assert example["code"] == '<button tabindex="-1">保存</button>'
+    example, = catalogue.code_examples("t.set", element=element('<a href="/">链接</a>'))
+    assert example["code"] == '<a href="/" tabindex="-1">链接</a>'
+
+
+def test_each_uses_first_template_with_all_fields():
+    catalogue = MessageCatalogue()
+    catalogue.define("t.each", {"message": "m", "examples": [{
+        "code": "<ul>{each}</ul>",
+        "each": {"param": "items", "code": ['<li id="{id}">{text}</li>', "<li>{text}</li>"], "join": ""},
+    }]})
+    params = {"items": [{"id": "a", "text": "一"}, {"id": "", "text": "二"}]}
+    example, = catalogue.code_examples("t.each", params)
+    assert example["code"] == '<ul><li id="a">一</li><li>二</li></ul>'
+    example, = catalogue.code_examples("t.each", {"items": []})
+    assert example["code"] == "<ul></ul>"
+
+
+def issue_for(body, rule_id, locale=None):
+    validator = WCAGValidator('AA', rule_ids=[rule_id], locale=locale)
+    report = validator.validate_html(f'<html lang="zh"><body>{body}</body></html>')
+    issue, = report.get_issues_by_rule(rule_id)
+    return issue
+
+
+def test_checkbox_group_example_lists_every_member():
+    """分组示例为每个控件生成label，没有id的控件用包含它的label，不会出现for=\"\""""
+    issue = issue_for('<input name="c[]" type="checkbox"/><input name="c[]" type="checkbox" id="c2"/>', "form-fieldset")
+    assert issue.code == "form-fieldset.checkbox-group"
+    assert issue.code_examples[0]["code"] == (
+        '<fieldset>\n'
+        '  <legend>c选项</legend>\n'
+        '  <label><input name="c[]" type="checkbox"/> 选项文本</label>\n'
+        '  <input id="c2" name="c[]" type="checkbox"/> <label for="c2">选项文本</label>\n'
+        '</fieldset>'
+    )
+    assert 'for=""' not in issue.code_examples[0]["code"]
+
+
+def test_radio_group_example_in_english():
+    issue = issue_for('<input type="radio" name="r" id="r1"><input type="radio" name="r" id="r2">', "form-fieldset", "en")
+    assert issue.code_examples[0]["code"] == (
+        '<fieldset>\n'
+        '  <legend>r options</legend>\n'
+        '  <input id="r1" name="r" type="radio"/> <label for="r1">Option text</label>\n'
+        '  <input id="r2" name="r" type="radio"/> <label for="r2">Option text</label>\n'
+        '</fieldset>'
+    )
+
+
+def test_hidden_interactive_example_removes_nested_aria_hidden():
+    issue = issue_for('<div aria-hidden="true"><a href="/" aria-hidden="true">首页</a></div>', "aria-usage")
+    assert issue.code == "aria-usage.hidden-interactive"
+    assert issue.code_examples[0]["code"] == '<div><a href="/">首页</a></div>'
+
+
+PAGE = '<html><body><img src="logo.png"><input type="radio" name="r"><input type="radio" name="r"></body></html>'
+
+
+def rendered(report):
+    return [(issue.description, issue.fix_suggestions, issue.code_examples) for issue in report.issues]
+
+
+def test_reports_in_different_locales_do_not_interfere():
+    """不同语言的报告交替生成和输出，各自的描述、建议和示例保持自己的语言"""
+    chinese = WCAGValidator('AA', locale="zh-CN").validate_html(PAGE, "zh.html")
+    english = WCAGValidator('AA', locale="en").validate_html(PAGE, "en.html")
+    assert (chinese.locale, english.locale) == ("zh-CN", "en")
+    expected_chinese, expected_english = rendered(chinese), rendered(english)
+    assert [issue.code for issue in chinese.issues] == [issue.code for issue in english.issues]
+    assert expected_chinese != expected_english
+    
+    # 之后创建的验证器和生成的报告不改变已有报告的语言
+    WCAGValidator('AA', locale="en").validate_html(PAGE)
+    assert rendered(chinese) == expected_chinese
+    assert generate_report(chinese, "json") != generate_report(english, "json")
+    assert expected_chinese[0][0] in generate_report(chinese, "markdown")
+    assert expected_english[0][0] in generate_report(english, "markdown")
+    assert rendered(WCAGValidator('AA').validate_html(PAGE)) == expected_chinese
+
+
+def test_locale_fallback():
+    catalogue = MessageCatalogue()
+    catalogue.define("t.only-zh", {"message": "只有中文", "fix": ["修复"]})
+    catalogue.define("t.only-zh", {"message": "English"}, "en")
+    assert catalogue.render("t.only-zh") == "只有中文"
+    assert catalogue.render("t.only-zh", locale="en-US") == "English"
+    # 没有该语言的消息时回退到默认语言
+    assert catalogue.render("t.only-zh", locale="fr") == "只有中文"
+
+
+def test_worker_uses_config_locale():
+    english = validator_from_config({"level": "AA", "locale": "en"})
+    default = validator_from_config({"level": "AA", "locale": None})
+    assert (english.locale, default.locale) == ("en", "zh-CN")
+    assert rendered(english.validate_html(PAGE)) == rendered(WCAGValidator('AA', locale="en").validate_html(PAGE))
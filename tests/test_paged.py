@@ -0,0 +1,119 @@
+"""
+分页HTML报告测试：数据块数量由--chunk-size决定，清单记录每个数据块的问题数、级别和规则，数据块是可解析的JSONP
+"""
+import json
+import math
+import os
+import re
+
+import pytest
+
+from wcag_validator import WCAGValidator
+from wcag_validator.core.paged import DATA_DIR, PagedHTMLWriter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_JSONP_RE = re.compile(r'^wcagReport\.(manifest|chunk)\((?:(\d+), )?(.*)\);\n$', re.S)
+
+
+def read_jsonp(path):
+    """解析JSONP数据文件，返回(回调名, 数据块序号, 数据)"""
+    with open(path, encoding="utf-8") as f:
+        match = _JSONP_RE.match(f.read())
+    assert match, path
+    index = int(match.group(2)) if match.group(2) is not None else None
+    return match.group(1), index, json.loads(match.group(3))
+
+
+def reports():
+    sample = WCAGValidator('AAA').validate_file(os.path.join(ROOT, "test_sample.html"))
+    return [sample, WCAGValidator('AA').validate_html('<html><body><img src="a.png"></body></html>', "a.html")]
+
+
+def write(directory, reports, chunk_size):
+    writer = PagedHTMLWriter(str(directory), chunk_size=chunk_size)
+    for report in reports:
+        writer.add_report(report)
+    writer.close()
+    return writer
+
+
+def read_report(directory):
+    """读取清单和全部数据块，返回(清单, 按顺序拼接的问题行)"""
+    name, _, manifest = read_jsonp(os.path.join(directory, DATA_DIR, "manifest.js"))
+    assert name == "manifest"
+    rows = []
+    for i, info in enumerate(manifest["chunks"]):
+        name, index, data = read_jsonp(os.path.join(directory, DATA_DIR, f"chunk-{i:06d}.js"))
+        assert (name, index) == ("chunk", i)
+        assert len(data) == info["count"]
+        assert info["rules"] == sorted({row[1] for row in data})
+        assert info["levels"] == sorted({manifest["rules"][row[1]][2] for row in data})
+        rows.extend(data)
+    return manifest, rows
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 10, 100000])
+def test_chunks_and_manifest(tmp_path, chunk_size):
+    validated = reports()
+    issues = [(report.url, issue) for report in validated for issue in report.issues]
+    write(tmp_path, validated, chunk_size)
+    manifest, rows = read_report(tmp_path)
+    
+    assert manifest["chunk_size"] == chunk_size
+    assert manifest["total"] == len(issues)
+    assert len(manifest["chunks"]) == math.ceil(len(issues) / chunk_size)
+    assert [info["count"] for info in manifest["chunks"][:-1]] == [chunk_size] * (len(manifest["chunks"]) - 1)
+    assert sorted(os.listdir(tmp_path / DATA_DIR)) == \
+        [f"chunk-{i:06d}.js" for i in range(len(manifest["chunks"]))] + ["manifest.js"]
+    
+    assert rows == [
+        [url, issue.rule.id, issue.description, issue.impact, issue.location, issue.element_html,
+         issue.fix_suggestions]
+        for url, issue in issues
+    ]
+    assert manifest["rules"] == {
+        issue.rule.id: [issue.rule.name, issue.rule.wcag_criterion, issue.rule.level] for _, issue in issues
+    }
+
+
+def test_shell_contains_only_summary(tmp_path):
+    validated = reports()
+    writer = write(tmp_path, validated, 5)
+    with open(writer.index_path, encoding="utf-8") as f:
+        shell = f.read()
+    total = sum(len(report.issues) for report in validated)
+    assert f"<strong>{total}</strong>总问题数" in shell
+    assert "<strong>2</strong>页面数" in shell
+    assert "$" + "total_issues" not in shell
+    assert validated[0].issues[0].element_html not in shell
+    
+    # 外壳页面的大小与问题数量无关
+    empty = PagedHTMLWriter(str(tmp_path / "empty"))
+    empty.close()
+    manifest, rows = read_report(tmp_path / "empty")
+    assert (manifest["total"], manifest["chunks"], rows) == (0, [], [])
+    assert abs(os.path.getsize(empty.index_path) - os.path.getsize(writer.index_path)) < 20
+
+
+def test_invalid_chunk_size(tmp_path):
+    with pytest.raises(ValueError):
+        PagedHTMLWriter(str(tmp_path), chunk_size=0)
+
+
+def test_cli_chunk_size(tmp_path):
+    from test_cli import run_cli, write_pages
+    
+    pages = write_pages(tmp_path, 3)
+    output = tmp_path / "report"
+    code, _, stderr = run_cli(*pages, "--format", "html-paged", "--output", str(output), "--chunk-size", "4")
+    assert code == 0, stderr
+    manifest, rows = read_report(output)
+    total = sum(len(WCAGValidator('AA').validate_file(page).issues) for page in pages)
+    assert manifest["total"] == len(rows) == total
+    assert len(manifest["chunks"]) == math.ceil(total / 4)
+    assert os.path.exists(output / "index.html")
+    
+    code, _, stderr = run_cli(*pages, "--format", "html-paged", "--output", str(output), "--chunk-size", "0")
+    assert code != 0
+    assert "--chunk-size" in stderr
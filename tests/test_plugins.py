@@ -0,0 +1,158 @@
+"""
+规则包插件测试：规则包按所选级别、标准和规则ID延迟导入，不加载规则包的注册表与默认注册表隔离，
+损坏的入口点被跳过
+"""
+import logging
+import sys
+
+import pytest
+
+from wcag_validator import WCAGValidator
+from wcag_validator.rules import plugins
+from wcag_validator.rules.base import RuleRegistry
+from wcag_validator.rules.plugins import RulePack
+
+RULE_MODULE = '''
+from wcag_validator.rules.base import Rule, RuleRegistry
+
+
+@RuleRegistry.register
+class {cls}(Rule):
+    def __init__(self):
+        super().__init__()
+        self.id = "{rule_id}"
+        self.name = "{rule_id}"
+        self.wcag_criterion = "{criterion}"
+        self.level = "{level}"
+    
+    def iter_issues(self, document):
+        from wcag_validator.core.validator import Issue
+        
+        for element in document.find_all("blink"):
+            yield Issue(rule=self, element=element, description="不要使用blink元素")
+'''
+
+PAGE = '<html lang="zh"><head><title>测试</title></head><body><blink>新</blink></body></html>'
+
+
+class FakeEntryPoint:
+    def __init__(self, name, target):
+        self.name = name
+        self.target = target
+    
+    def load(self):
+        if isinstance(self.target, Exception):
+            raise self.target
+        return self.target
+
+
+@pytest.fixture
+def packs(tmp_path, monkeypatch):
+    """
+    安装两个规则包：acme（AA级，标准2.4.6）和deep（AAA级，标准1.4.6），以及一个损坏的入口点
+    
+    默认注册表替换为继承内置规则的新注册表，测试结束后恢复
+    """
+    modules = {}
+    for name, cls, level, criterion in [("acme", "AcmeRule", "AA", "2.4.6"), ("deep", "DeepRule", "AAA", "1.4.6")]:
+        module = f"wcag_test_{name}_rules"
+        (tmp_path / f"{module}.py").write_text(
+            RULE_MODULE.format(cls=cls, rule_id=f"{name}-x", criterion=criterion, level=level), encoding="utf-8")
+        modules[name] = RulePack(name, modules=[module], levels=[level], criteria=[criterion],
+                                 rule_ids=[f"{name}-x"])
+    monkeypatch.syspath_prepend(str(tmp_path))
+    entry_points = [
+        FakeEntryPoint("acme", modules["acme"]),
+        FakeEntryPoint("broken", ImportError("No module named 'broken_wcag'")),
+        FakeEntryPoint("deep", modules["deep"]),
+    ]
+    monkeypatch.setattr(plugins, "_iter_entry_points", lambda: entry_points)
+    monkeypatch.setattr(plugins, "_packs", None)
+    monkeypatch.setattr(RuleRegistry, "_default", RuleRegistry())
+    yield modules
+    for module in ("wcag_test_acme_rules", "wcag_test_deep_rules"):
+        sys.modules.pop(module, None)
+
+
+def loaded(packs):
+    return {name for name, pack in packs.items() if pack._loaded}
+
+
+def rule_ids(rules):
+    return {rule.id for rule in rules}
+
+
+def test_broken_entry_point_is_skipped(packs, caplog):
+    with caplog.at_level(logging.WARNING, logger=plugins.__name__):
+        discovered = plugins.discover_packs()
+    assert [pack.name for pack in discovered] == ["acme", "deep"]
+    assert "broken" in caplog.text
+    assert RuleRegistry().select('AA', rule_ids=["img-alt"])
+
+
+def test_broken_rule_module_is_skipped(packs, caplog):
+    packs["acme"].modules = ["wcag_test_missing_rules"]
+    with caplog.at_level(logging.WARNING, logger=plugins.__name__):
+        rules = RuleRegistry().select('AA')
+    assert "acme-x" not in rule_ids(rules)
+    assert "acme" in caplog.text
+
+
+def test_packs_load_by_level(packs):
+    registry = RuleRegistry()
+    registry.select('A')
+    assert loaded(packs) == set()
+    
+    assert "acme-x" in rule_ids(registry.select('AA'))
+    assert loaded(packs) == {"acme"}
+    
+    assert {"acme-x", "deep-x"} <= rule_ids(registry.select('AAA'))
+    assert loaded(packs) == {"acme", "deep"}
+
+
+def test_packs_load_by_criteria(packs):
+    registry = RuleRegistry()
+    assert rule_ids(registry.select('AAA', criteria=["1.1.1"])) >= {"img-alt"}
+    assert loaded(packs) == set()
+    
+    assert rule_ids(registry.select('AAA', criteria=["1.4.6"])) >= {"deep-x"}
+    assert loaded(packs) == {"deep"}
+
+
+def test_packs_load_by_rule_id(packs):
+    registry = RuleRegistry()
+    assert rule_ids(registry.select('AAA', rule_ids=["acme-x"])) == {"acme-x"}
+    assert loaded(packs) == {"acme"}
+    
+    assert registry.get_rule("deep-x").level == "AAA"
+    assert loaded(packs) == {"acme", "deep"}
+
+
+def test_validator_reports_pack_rule(packs):
+    report = WCAGValidator('AA').validate_html(PAGE)
+    assert [issue.rule.id for issue in report.get_issues_by_rule("acme-x")] == ["acme-x"]
+    assert loaded(packs) == {"acme"}
+
+
+def test_registry_without_plugins_is_isolated(packs):
+    """默认注册表已加载的规则包不出现在plugins=False的注册表中"""
+    WCAGValidator('AAA').validate_html(PAGE)
+    assert {"acme-x", "deep-x"} <= rule_ids(RuleRegistry.default().select('AAA'))
+    
+    isolated = RuleRegistry(plugins=False)
+    assert not {"acme-x", "deep-x"} & rule_ids(isolated.select('AAA'))
+    assert isolated.get_rule("acme-x") is None
+    assert "img-alt" in rule_ids(isolated.select('A'))
+    
+    report = WCAGValidator('AAA', registry=isolated).validate_html(PAGE)
+    assert report.get_issues_by_rule("acme-x") == []
+    
+    # 加载规则包的子注册表继承默认注册表已加载的规则包，不重复导入
+    assert {"acme-x", "deep-x"} <= rule_ids(RuleRegistry().select('AAA'))
+
+
+def test_child_registry_packs_do_not_leak(packs):
+    """子注册表加载的规则包不进入默认注册表"""
+    child = RuleRegistry()
+    assert "acme-x" in rule_ids(child.select('AA'))
+    assert "acme-x" not in rule_ids(RuleRegistry.default()._all_rules().values())
@@ -0,0 +1,174 @@
+"""
+性能分析测试：每个规则的元素数和问题数与报告一致，批量汇总的分位数与精确值的误差不超过分桶精度
+"""
+import math
+import os
+import random
+
+import pytest
+
+from wcag_validator import WCAGValidator
+from wcag_validator.core.index import DocumentIndex
+from wcag_validator.core.profiler import PERCENTILES, LatencyHistogram, ProfileAggregator, ValidationProfile
+from wcag_validator.core.validator import Issue
+from wcag_validator.rules.base import Rule
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ImageRule(Rule):
+    """遍历前limit张图片，每张没有alt的图片产生一个问题"""
+    
+    def __init__(self, limit=None):
+        super().__init__()
+        self.id = "test-images"
+        self.name = "图片"
+        self.wcag_criterion = "1.1.1"
+        self.level = "A"
+        self.limit = limit
+    
+    def iter_issues(self, document):
+        images = DocumentIndex.for_document(document).elements_by_tag("img")
+        for i, image in enumerate(images):
+            if self.limit is not None and i >= self.limit:
+                break
+            if not image.has_attr("alt"):
+                yield Issue(rule=self, element=image, description="缺少alt")
+
+
+def page(images, with_alt=0):
+    body = '<img src="a.png">' * images + '<img src="b.png" alt="">' * with_alt
+    return f'<html lang="zh"><head><title>t</title></head><body>{body}</body></html>'
+
+
+def profile_entries(report):
+    return {entry["rule_id"]: entry for entry in report.profile.rules}
+
+
+@pytest.mark.parametrize("limit, elements, issues", [(None, 7, 4), (2, 3, 2), (5, 6, 4)])
+def test_rule_elements_and_issues(limit, elements, issues):
+    """遍历在第limit个元素处停止时，已取出的元素都计入访问数"""
+    report = WCAGValidator('AA', rules=[ImageRule(limit)], profile=True).validate_html(page(4, 3))
+    entry, = report.profile.rules
+    assert (entry["rule_id"], entry["elements"], entry["issues"]) == ("test-images", elements, issues)
+    assert entry["issues"] == len(report.issues)
+    assert entry["time"] >= 0
+
+
+def test_profile_matches_sample_report():
+    validator = WCAGValidator('AAA', profile=True)
+    report = validator.validate_file(os.path.join(ROOT, "test_sample.html"))
+    entries = profile_entries(report)
+    assert len(entries) == len(report.profile.rules)
+    
+    for rule_id, entry in entries.items():
+        assert entry["issues"] == len(report.get_issues_by_rule(rule_id)), rule_id
+        assert entry["elements"] >= 0
+    # 有问题的规则都被执行过；没有执行的规则是因触发条件不存在而跳过的
+    assert {issue.rule.id for issue in report.issues} <= set(entries)
+    assert set(entries) | {rule.id for rule in report.passed_rules} == {rule.id for rule in validator.rules}
+    
+    assert set(report.profile.phases) >= {"parse", "index", "declarative", "rules", "enrich"}
+    assert report.profile.total_time == pytest.approx(sum(report.profile.phases.values()))
+    assert report.profile.to_dict()["rules"][0]["rule_id"] == report.profile.rules[0]["rule_id"]
+    assert "规则耗时" in report.profile.format_table()
+
+
+def test_profile_does_not_change_results():
+    path = os.path.join(ROOT, "test_sample.html")
+    plain = WCAGValidator('AAA').validate_file(path)
+    profiled = WCAGValidator('AAA', profile=True).validate_file(path)
+    assert plain.profile is None
+    assert [issue.fingerprint for issue in profiled.issues] == [issue.fingerprint for issue in plain.issues]
+
+
+def nearest_rank(samples, p):
+    ordered = sorted(samples)
+    return ordered[max(1, math.ceil(len(ordered) * p / 100)) - 1]
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_histogram_percentiles(seed):
+    generator = random.Random(seed)
+    samples = [generator.lognormvariate(-6, 1.5) for _ in range(5000)]
+    histogram = LatencyHistogram()
+    for sample in samples:
+        histogram.add(sample)
+    assert histogram.count == len(samples)
+    assert histogram.max == max(samples)
+    assert histogram.total == pytest.approx(sum(samples))
+    for p in (1, 25) + PERCENTILES + (100,):
+        exact = nearest_rank(samples, p)
+        # 取所在桶的上界：不低于精确值，且相对误差不超过相邻桶的比例
+        assert exact <= histogram.percentile(p) <= exact * LatencyHistogram.BASE, p
+
+
+def test_histogram_edge_cases():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(50) == 0.0
+    histogram.add(0.0)
+    histogram.add(2e-7)
+    assert histogram.percentile(100) == histogram.max == 2e-7
+    histogram.add(0.25)
+    assert histogram.percentile(100) == 0.25
+
+
+def make_profile(times):
+    profile = ValidationProfile()
+    profile.add_phase("parse", times["parse"])
+    for rule_id, (seconds, elements, issues) in times["rules"].items():
+        rule = Rule()
+        rule.id = rule_id
+        profile.add_rule(rule, seconds, elements, issues)
+    return profile
+
+
+def test_aggregator_statistics():
+    generator = random.Random(3)
+    aggregator = ProfileAggregator()
+    samples = {"parse": [], "a": [], "b": []}
+    totals = {"a": [0, 0], "b": [0, 0]}
+    for i in range(200):
+        times = {"parse": generator.uniform(0.001, 0.05), "rules": {}}
+        samples["parse"].append(times["parse"])
+        # 规则b只在部分页面上执行
+        for rule_id in ("a", "b") if i % 4 == 0 else ("a",):
+            seconds = generator.expovariate(1000)
+            elements, issues = generator.randrange(100), generator.randrange(5)
+            times["rules"][rule_id] = (seconds, elements, issues)
+            samples[rule_id].append(seconds)
+            totals[rule_id][0] += elements
+            totals[rule_id][1] += issues
+        aggregator.add_profile(make_profile(times))
+    
+    result = aggregator.to_dict()
+    assert result["pages"] == 200
+    assert {rule_id: (stats["runs"], stats["elements"], stats["issues"])
+            for rule_id, stats in result["rules"].items()} == {
+        "a": (200, *totals["a"]), "b": (50, *totals["b"])
+    }
+    summaries = dict(result["rules"], parse=result["phases"]["parse"])
+    for name, values in samples.items():
+        summary = summaries[name]
+        assert summary["max"] == round(max(values) * 1000, 3)
+        assert summary["total"] == pytest.approx(sum(values) * 1000, abs=1e-3)
+        for p in PERCENTILES:
+            exact = nearest_rank(values, p) * 1000
+            assert exact - 1e-3 <= summary[f"p{p}"] <= exact * LatencyHistogram.BASE + 1e-3, (name, p)
+    
+    table = aggregator.format_table()
+    assert table.startswith("性能分析: 200 个页面")
+    # 规则按总耗时排序
+    assert table.index("  a ") < table.index("  b ")
+
+
+def test_aggregator_over_validations():
+    aggregator = ProfileAggregator()
+    validator = WCAGValidator('AA', profile=True)
+    reports = [validator.validate_html(page(n, 1)) for n in range(1, 4)]
+    for report in reports:
+        aggregator.add_profile(report.profile)
+    stats = aggregator.to_dict()["rules"]["img-alt"]
+    assert stats["runs"] == 3
+    assert stats["issues"] == sum(len(report.get_issues_by_rule("img-alt")) for report in reports)
+    assert stats["elements"] == sum(profile_entries(report)["img-alt"]["elements"] for report in reports)
@@ -0,0 +1,143 @@
+"""
+报告查询测试：按维度索引的query、count和facet_counts与逐个过滤问题的结果一致，失败规则不重复
+"""
+import itertools
+import os
+import random
+
+import pytest
+
+from wcag_validator import WCAGValidator
+from wcag_validator.core.validator import Issue, ValidationReport
+from wcag_validator.rules.base import Rule
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPACTS = ["高", "中", "低"]
+
+
+class StubRule(Rule):
+    def __init__(self, rule_id, criterion, level):
+        super().__init__()
+        self.id = rule_id
+        self.name = rule_id
+        self.wcag_criterion = criterion
+        self.level = level
+
+
+RULES = [
+    StubRule("r1", "1.1.1", "A"),
+    StubRule("r2", "1.1.1", "A"),
+    StubRule("r3", "1.4.3", "AA"),
+    StubRule("r4", "2.4.6", "AA"),
+    StubRule("r5", "1.4.6", "AAA"),
+]
+
+
+def random_report(count=300, seed=0):
+    generator = random.Random(seed)
+    report = ValidationReport("page.html")
+    for i in range(count):
+        issue = Issue(rule=generator.choice(RULES), description=f"问题{i}")
+        report.add_issue(issue.set_impact(generator.choice(IMPACTS)))
+    return report
+
+
+def linear(report, **facets):
+    """逐个过滤问题的参考实现"""
+    def matches(issue):
+        for facet, value in facets.items():
+            values = set(value) if isinstance(value, (list, tuple, set, frozenset)) else {value}
+            if ValidationReport.FACETS[facet](issue) not in values:
+                return False
+        return True
+    return [issue for issue in report.issues if matches(issue)]
+
+
+def sample_report():
+    return WCAGValidator('AAA').validate_file(os.path.join(ROOT, "test_sample.html"))
+
+
+# 每个维度的取值，包含不存在的取值和多个取值的组合
+VALUES = {
+    "rule_id": ["r1", "r3", "missing", ["r1", "r5"], ("r2", "r4", "missing")],
+    "wcag_criterion": ["1.1.1", "2.4.6", ["1.4.3", "1.4.6"]],
+    "level": ["A", "AA", "AAA", {"A", "AAA"}],
+    "impact": ["高", "低", ["中", "低"]],
+}
+
+
+def combinations():
+    facets = sorted(VALUES)
+    for size in range(1, len(facets) + 1):
+        for chosen in itertools.combinations(facets, size):
+            for values in itertools.product(*(VALUES[facet] for facet in chosen)):
+                yield dict(zip(chosen, values))
+
+
+def test_query_and_count_match_linear_filter():
+    report = random_report()
+    checked = 0
+    for facets in combinations():
+        expected = linear(report, **facets)
+        assert report.query(**facets) == expected, facets
+        assert report.count(**facets) == len(expected), facets
+        checked += bool(expected)
+    assert checked > 50
+    assert report.query() == report.issues
+    assert report.count() == len(report.issues)
+
+
+@pytest.mark.parametrize("facet", sorted(ValidationReport.FACETS))
+def test_facet_counts_match_linear_filter(facet):
+    report = random_report()
+    key = ValidationReport.FACETS[facet]
+    for filters in [{}] + [f for f in combinations() if facet not in f]:
+        expected = {}
+        for issue in linear(report, **filters):
+            expected[key(issue)] = expected.get(key(issue), 0) + 1
+        assert report.facet_counts(facet, **filters) == expected, filters
+
+
+def test_sample_report_indexes():
+    report = sample_report()
+    assert report.issues
+    for facet, key in ValidationReport.FACETS.items():
+        for value in {key(issue) for issue in report.issues}:
+            assert report.query(**{facet: value}) == linear(report, **{facet: value})
+    assert report.get_issues_by_level("A") == linear(report, level="A")
+    assert report.get_issues_by_criterion("1.1.1") == linear(report, wcag_criterion="1.1.1")
+    assert sum(report.facet_counts("level").values()) == report.summary["total_issues"]
+    assert report.facet_counts("level").get("A", 0) == report.summary["level_A_issues"]
+
+
+def test_failed_rules_are_deduplicated():
+    report = random_report()
+    expected = []
+    for issue in report.issues:
+        if issue.rule not in expected:
+            expected.append(issue.rule)
+    assert report.failed_rules == expected
+    assert report.summary["failed_rules"] == len(RULES)
+    assert all(report.has_failed(rule) for rule in RULES)
+    
+    report = sample_report()
+    rules = [issue.rule for issue in report.issues]
+    assert len(report.failed_rules) == len(set(rules)) == report.summary["failed_rules"]
+    assert not set(report.failed_rules) & set(report.passed_rules)
+
+
+def test_passed_rules_are_deduplicated():
+    report = ValidationReport()
+    report.add_passed_rule(RULES[0])
+    report.add_passed_rule(RULES[0])
+    assert report.passed_rules == [RULES[0]]
+    assert report.summary["passed_rules"] == 1
+
+
+def test_unknown_facet():
+    report = random_report(10)
+    with pytest.raises(ValueError):
+        report.query(selector="img")
+    with pytest.raises(ValueError):
+        report.facet_counts("selector")
@@ -0,0 +1,157 @@
+"""
+执行计划测试：按规则ID、跳过的规则和WCAG标准筛选规则，触发条件不存在的规则被跳过，
+注册表变化时缓存的执行计划失效
+"""
+import os
+
+import pytest
+from bs4 import BeautifulSoup
+
+from wcag_validator import WCAGValidator
+from wcag_validator.core.index import DocumentIndex
+from wcag_validator.core.rule_engine import ExecutionPlan
+from wcag_validator.rules.base import Rule, RuleRegistry
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+with open(os.path.join(ROOT, "test_sample.html"), encoding="utf-8") as f:
+    SAMPLE = f.read()
+
+
+def ids(plan):
+    return [rule.id for rule in plan.rules]
+
+
+def test_rule_ids_selection():
+    plan = ExecutionPlan.compile('AAA', rule_ids=["page-title", "img-alt"])
+    all_ids = ids(ExecutionPlan.compile('AAA'))
+    # 保持注册顺序
+    assert ids(plan) == [rule_id for rule_id in all_ids if rule_id in ("page-title", "img-alt")]
+    # 规则ID只在所选级别内生效
+    assert ids(ExecutionPlan.compile('A', rule_ids=["color-contrast"])) == []
+
+
+def test_skip_rules():
+    full = ids(ExecutionPlan.compile('AA'))
+    plan = ExecutionPlan.compile('AA', skip_rules=["img-alt", "color-contrast"])
+    assert ids(plan) == [rule_id for rule_id in full if rule_id not in ("img-alt", "color-contrast")]
+
+
+def test_criteria_selection():
+    plan = ExecutionPlan.compile('AAA', criteria=["1.4.3", "1.4.6"])
+    assert ids(plan) == ["color-contrast", "color-contrast-enhanced"]
+    assert ids(ExecutionPlan.compile('AA', criteria=["1.4.3", "1.4.6"])) == ["color-contrast"]
+    assert {rule.wcag_criterion for rule in ExecutionPlan.compile('AAA', criteria=["1.1.1"]).rules} == {"1.1.1"}
+
+
+def test_level_selection():
+    levels = {"A": {"A"}, "AA": {"A", "AA"}, "AAA": {"A", "AA", "AAA"}}
+    for level, allowed in levels.items():
+        plan = ExecutionPlan.compile(level)
+        assert plan.rules and {rule.level for rule in plan.rules} <= allowed
+
+
+@pytest.mark.parametrize("options", [{"rule_ids": ["no-such-rule"]}, {"skip_rules": ["no-such-rule"]}])
+def test_unknown_rule_id(options):
+    with pytest.raises(ValueError):
+        ExecutionPlan.compile('AA', **options)
+
+
+def test_plans_are_cached_per_configuration():
+    plan = ExecutionPlan.compile('aa', rule_ids=["img-alt", "page-title"])
+    assert ExecutionPlan.compile('AA', rule_ids=["page-title", "img-alt"]) is plan
+    assert ExecutionPlan.compile('AAA', rule_ids=["page-title", "img-alt"]) is not plan
+    assert WCAGValidator('AA', rule_ids=("img-alt", "page-title")).plan is plan
+
+
+class ProbeRule(Rule):
+    """记录执行次数的规则"""
+    
+    def __init__(self, rule_id="test-probe", tags=None, attrs=None):
+        super().__init__()
+        self.id = rule_id
+        self.name = rule_id
+        self.wcag_criterion = "4.1.2"
+        self.level = "A"
+        self.required_tags = tags
+        self.required_attrs = attrs
+        self.runs = 0
+    
+    def iter_issues(self, document):
+        self.runs += 1
+        return iter(())
+
+
+def index_of(body):
+    document = BeautifulSoup(f"<html><head><title>t</title></head><body>{body}</body></html>", "html.parser")
+    return DocumentIndex.for_document(document)
+
+
+@pytest.mark.parametrize("body, expected", [
+    ("<p>文本</p>", ["always"]),
+    ("<video></video>", ["always", "tag", "either"]),
+    ('<p onclick="go()">文本</p>', ["always", "attr", "either"]),
+    ('<video onclick="go()"></video>', ["always", "tag", "attr", "either"]),
+])
+def test_rules_without_triggers_are_skipped(body, expected):
+    rules = [
+        ProbeRule("always"),
+        ProbeRule("tag", tags={"video"}),
+        ProbeRule("attr", attrs={"onclick"}),
+        ProbeRule("either", tags={"video"}, attrs={"onclick"}),
+    ]
+    plan = ExecutionPlan(rules)
+    selected, skipped = plan.select(index_of(body))
+    assert [rule.id for rule in selected] == expected
+    assert [rule.id for rule in skipped] == [rule.id for rule in rules if rule.id not in expected]
+    
+    # 跳过的规则视为通过，不会被执行
+    html = f"<html><head><title>t</title></head><body>{body}</body></html>"
+    report = WCAGValidator('AA', rules=rules).validate_html(html)
+    assert {rule.id for rule in rules if rule.runs} == set(expected)
+    assert {rule.id for rule in report.passed_rules} == {rule.id for rule in rules}
+
+
+def untriggered(plan):
+    """不按触发条件跳过规则的执行计划"""
+    plan = ExecutionPlan(plan.rules)
+    plan.triggers = [(rule, None, None) for rule, _, _ in plan.triggers]
+    return plan
+
+
+@pytest.mark.parametrize("html", [
+    "<html><head><title>t</title></head><body><p>文本</p></body></html>",
+    '<html lang="zh"><body><img src="a.png"><a href="/">点击这里</a><input type="text"></body></html>',
+    SAMPLE,
+])
+def test_skipping_does_not_change_results(html):
+    """触发条件不存在的规则不可能发现问题，跳过它们不改变验证结果"""
+    validator = WCAGValidator('AAA')
+    expected = [(issue.rule.id, issue.description, issue.path) for issue in validator.validate_html(html).issues]
+    validator.plan = untriggered(validator.plan)
+    actual = [(issue.rule.id, issue.description, issue.path) for issue in validator.validate_html(html).issues]
+    assert actual == expected
+
+
+def test_plan_cache_invalidated_by_registry_version(monkeypatch):
+    monkeypatch.setattr(RuleRegistry, "_default", RuleRegistry())
+    registry = RuleRegistry()
+    plan = ExecutionPlan.compile('AA', registry=registry)
+    version = registry.version
+    assert ExecutionPlan.compile('AA', registry=registry) is plan
+    
+    # 在注册表上注册规则后重新编译
+    registry.register(type("LocalRule", (ProbeRule,), {}))
+    assert registry.version > version
+    local = ExecutionPlan.compile('AA', registry=registry)
+    assert local is not plan
+    assert ids(local) == ids(plan) + ["test-probe"]
+    
+    # 在继承的默认注册表上注册规则同样使执行计划失效
+    class GlobalRule(ProbeRule):
+        def __init__(self):
+            super().__init__("test-global")
+    
+    RuleRegistry.register(GlobalRule)
+    assert "test-global" in ids(ExecutionPlan.compile('AA', registry=registry))
+    assert "test-global" not in ids(ExecutionPlan.compile('AA', registry=RuleRegistry(inherit=False)))
@@ -0,0 +1,92 @@
+"""
+预编译选择器测试：基于文档索引求值的结果与soup.select返回的元素及顺序相同
+"""
+import os
+import random
+
+import pytest
+from bs4 import BeautifulSoup
+
+from wcag_validator.core.index import DocumentIndex
+from wcag_validator.core.selectors import CompiledSelector, compile_selector
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SELECTORS = [
+    'img', 'IMG', '*', 'div p', 'div > p', 'h1 + p', 'h2 ~ p', 'ul li a',
+    '.note', 'p.note', '.note.warn', '#main', 'div#main', '#main a',
+    '[alt]', '[alt=""]', 'img:not([alt])', '[role="button"]', '[type!="text"]', 'input[type="text" i]',
+    '[href^="http"]', '[href$=".pdf"]', '[class~="warn"]', '[lang|="zh"]', '[data-x*="b"]',
+    'img, a', 'a, .note, #main', 'h1, h2, h3', '[alt], [title]', 'input, [tabindex]',
+    'p:first-child', 'li:nth-child(2n+1)', 'li:last-of-type', ':not(div)', 'div:has(> img)',
+    'a:not([href])', 'label input', 'form > fieldset input', ':is(h1, h2) + p', 'table th[scope]',
+]
+
+TAGS = ['div', 'p', 'span', 'ul', 'li', 'a', 'img', 'h1', 'h2', 'h3', 'input', 'label', 'form', 'fieldset',
+        'table', 'th']
+ATTRS = [
+    'class="note"', 'class="note warn"', 'class="warn"', 'id="main"', 'alt=""', 'alt="图片"',
+    'role="button"', 'type="text"', 'type="TEXT"', 'type="checkbox"', 'href="http://a.example/"',
+    'href="/doc.pdf"', 'title="说明"', 'lang="zh-CN"', 'data-x="abc"', 'tabindex="0"', 'scope="col"',
+]
+
+
+def random_markup(generator, depth=0):
+    """生成随机嵌套的元素，属性从固定的取值中选择以便选择器有机会命中"""
+    parts = []
+    for _ in range(generator.randint(1, 4)):
+        name = generator.choice(TAGS)
+        attrs = ''.join(' ' + attr for attr in generator.sample(ATTRS, generator.randint(0, 2)))
+        if name in ('img', 'input'):
+            parts.append(f'<{name}{attrs}>')
+        elif depth >= 4 or generator.random() < 0.3:
+            parts.append(f'<{name}{attrs}>文本</{name}>')
+        else:
+            parts.append(f'<{name}{attrs}>{random_markup(generator, depth + 1)}</{name}>')
+    return ''.join(parts)
+
+
+def check_document(html):
+    document = BeautifulSoup(html, 'html.parser')
+    index = DocumentIndex.for_document(document)
+    matched = 0
+    for css in SELECTORS:
+        expected = [id(element) for element in document.select(css)]
+        assert [id(element) for element in compile_selector(css).select(index)] == expected, css
+        assert [id(element) for element in index.select(css)] == expected, css
+        matched += len(expected)
+    return matched
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_documents(seed):
+    generator = random.Random(seed)
+    assert check_document(f'<html lang="zh"><body>{random_markup(generator)}</body></html>') > 0
+
+
+def test_sample_document():
+    with open(os.path.join(ROOT, "test_sample.html"), encoding="utf-8") as f:
+        assert check_document(f.read()) > 0
+
+
+@pytest.mark.parametrize("css, tags, keys", [
+    ('img', {'img'}, [('tag', 'img')]),
+    ('img, a', {'img', 'a'}, [('tag', 'img'), ('tag', 'a')]),
+    ('div > .note', None, [('attr', 'class')]),
+    ('#main, [alt]', None, [('attr', 'id'), ('attr', 'alt')]),
+    ('[type!="text"]', None, [None]),
+    (':not(div)', None, [None]),
+])
+def test_candidate_keys(css, tags, keys):
+    selector = compile_selector(css)
+    assert (selector.tags, selector.keys) == (tags, keys)
+
+
+def test_compiled_selectors_are_cached():
+    selector = compile_selector('ul > li')
+    assert isinstance(selector, CompiledSelector)
+    assert compile_selector('ul > li') is selector
+    assert compile_selector(selector) is selector
+    document = BeautifulSoup('<ul><li>一</li></ul><ol><li>二</li></ol>', 'html.parser')
+    item = document.find('li')
+    assert selector.match(item) and not selector.match(document.find_all('li')[1])
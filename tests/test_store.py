@@ -0,0 +1,140 @@
+"""
+结果存储测试：写入运行后重新打开数据库，查询历史、新增和已修复的问题以及趋势
+"""
+from collections import Counter
+
+import pytest
+
+from wcag_validator import WCAGValidator
+from wcag_validator.core.store import ResultStore, issue_key
+
+PAGE = """<!DOCTYPE html>
+<html lang="zh">
+<head><title>测试</title></head>
+<body>
+<img src="logo.png">
+<a href="/more">点击这里</a>
+<input type="text" name="q">
+</body>
+</html>
+"""
+
+# 第二次运行时：a页面修复了图片的替代文本，b页面新增了一张没有替代文本的图片，原有元素的行号都后移了一行
+FIXED = PAGE.replace('<img src="logo.png">', '<img src="logo.png" alt="公司标志">')
+ADDED = PAGE.replace('<img src="logo.png">', '<p>横幅</p>\n<img src="logo.png"><img src="banner.png">')
+
+
+def validate(html, url):
+    return WCAGValidator('AA').validate_html(html, url)
+
+
+def write_run(store, pages, label):
+    run_id = store.begin_run('AA', label=label)
+    reports = [validate(html, url) for url, html in pages]
+    for report in reports:
+        store.add_report(run_id, report)
+    store.finish_run(run_id)
+    return run_id, reports
+
+
+@pytest.fixture
+def history(tmp_path):
+    """写入两次运行后关闭数据库，返回(路径, 第一次运行, 第二次运行)"""
+    path = str(tmp_path / "results.db")
+    store = ResultStore(path, batch_size=2)
+    first = write_run(store, [("a.html", PAGE), ("b.html", PAGE)], "v1")
+    second = write_run(store, [("a.html", FIXED), ("b.html", ADDED)], "v2")
+    store.close()
+    return path, first, second
+
+
+def stored_issues(store, run_id):
+    return store.conn.execute(
+        'SELECT url, rule_id, level, issue_key, description, line, "column", path FROM issues '
+        'WHERE run_id = ? ORDER BY id', (run_id,)
+    ).fetchall()
+
+
+def test_issues_round_trip(history):
+    path, (first_id, reports), _ = history
+    store = ResultStore(path)
+    expected = [
+        (report.url, issue.rule.id, issue.rule.level, issue_key(report.url, issue), issue.description,
+         issue.line, issue.column, issue.path)
+        for report in reports for issue in report.issues
+    ]
+    assert stored_issues(store, first_id) == expected
+    rules = dict(store.conn.execute("SELECT id, wcag_criterion FROM rules"))
+    assert rules == {issue.rule.id: issue.rule.wcag_criterion for report in reports for issue in report.issues}
+    store.close()
+
+
+def test_list_runs(history):
+    path, (first_id, first), (second_id, second) = history
+    store = ResultStore(path)
+    runs = store.list_runs()
+    assert [(run["id"], run["label"], run["wcag_level"], run["pages"]) for run in runs] == [
+        (second_id, "v2", "AA", 2), (first_id, "v1", "AA", 2)
+    ]
+    assert [run["issues"] for run in runs] == [sum(len(r.issues) for r in second), sum(len(r.issues) for r in first)]
+    assert all(run["finished_at"] for run in runs)
+    assert store.latest_run_id() == second_id
+    assert len(store.list_runs(limit=1)) == 1
+    store.close()
+
+
+def test_new_and_fixed_issues(history):
+    path, (first_id, _), (second_id, _) = history
+    store = ResultStore(path)
+    # 行号变化不影响问题的识别：b页面中原有的问题仍被视为同一问题
+    new = store.new_issues_since(first_id)
+    assert [(issue["url"], issue["rule_id"]) for issue in new] == [("b.html", "img-alt")]
+    assert "banner.png" in store.conn.execute(
+        "SELECT element_html FROM issues WHERE issue_key = ?", (new[0]["issue_key"],)).fetchone()[0]
+    fixed = store.fixed_issues_since(first_id)
+    assert [(issue["url"], issue["rule_id"]) for issue in fixed] == [("a.html", "img-alt")]
+    assert store.new_issues_since(first_id, run_id=second_id) == new
+    
+    # 已修复的问题即反向比较时新增的问题
+    assert store.new_issues_since(second_id, run_id=first_id) == fixed
+    assert store.new_issues_since(first_id, limit=0) == []
+    store.close()
+
+
+def test_top_failing_rules(history):
+    path, _, (second_id, reports) = history
+    store = ResultStore(path)
+    counts = Counter(issue.rule.id for report in reports for issue in report.issues)
+    pages = Counter(rule_id for report in reports for rule_id in {issue.rule.id for issue in report.issues})
+    top = store.top_failing_rules()
+    assert {rule["rule_id"]: (rule["issues"], rule["pages"]) for rule in top} == {
+        rule_id: (count, pages[rule_id]) for rule_id, count in counts.items()
+    }
+    assert [rule["issues"] for rule in top] == sorted(counts.values(), reverse=True)
+    assert len(store.top_failing_rules(second_id, limit=1)) == 1
+    store.close()
+
+
+def test_issue_trend(history):
+    path, (first_id, first), (second_id, second) = history
+    store = ResultStore(path)
+    totals = [(run_id, total) for run_id, _, total in store.issue_trend()]
+    assert totals == [(first_id, sum(len(r.issues) for r in first)), (second_id, sum(len(r.issues) for r in second))]
+    images = [count for _, _, count in store.issue_trend(rule_id="img-alt")]
+    assert images == [2, 2]
+    assert [count for _, _, count in store.issue_trend(rule_id="no-such-rule")] == [0, 0]
+    assert [run_id for run_id, _, _ in store.issue_trend(limit=1)] == [second_id]
+    store.close()
+
+
+def test_pending_rows_are_written_on_close(tmp_path):
+    path = str(tmp_path / "results.db")
+    store = ResultStore(path, batch_size=1000)
+    run_id = store.begin_run('AA')
+    report = validate(PAGE, "a.html")
+    store.add_report(run_id, report)
+    store.close()
+    
+    store = ResultStore(path)
+    assert len(stored_issues(store, run_id)) == len(report.issues)
+    store.close()
@@ -0,0 +1,154 @@
+"""
+样式引擎测试：层叠顺序（特异性、!important、style属性、简写清除子属性）、inherit和initial、
+打印样式的排除、@import，以及样式表缓存在文档间的复用
+"""
+import pytest
+from bs4 import BeautifulSoup
+
+from wcag_validator import WCAGValidator
+from wcag_validator.core import styles
+from wcag_validator.core.index import DocumentIndex
+from wcag_validator.core.styles import StyleEngine, StylesheetCache
+
+
+def make_engine(html, base_url=None, cache=None):
+    document = BeautifulSoup(html, 'html.parser')
+    return StyleEngine(document, DocumentIndex.for_document(document), base_url=base_url,
+                       cache=cache if cache is not None else StylesheetCache())
+
+
+def styles_of(css, body, selector="#t", **options):
+    """返回selector匹配元素的(层叠声明, 计算样式)"""
+    engine = make_engine(f'<html><head><style>{css}</style></head><body>{body}</body></html>', **options)
+    element = engine.document.select_one(selector)
+    return engine.declarations(element), engine.computed(element)
+
+
+@pytest.mark.parametrize("css, body, expected", [
+    # 特异性：id > class > 标签，与出现顺序无关
+    ("#t { color: red } .c { color: blue } p { color: green }", '<p id="t" class="c">x</p>', "red"),
+    ("p.c { color: red } .c { color: blue }", '<p id="t" class="c">x</p>', "red"),
+    # 特异性相同时后出现的规则优先
+    (".a { color: red } .b { color: blue }", '<p id="t" class="b a">x</p>', "blue"),
+    # style属性优先于样式表中的普通声明
+    ("#t { color: red }", '<p id="t" style="color: blue">x</p>', "blue"),
+    # !important优先于style属性中的普通声明和特异性更高的规则
+    ("p { color: red !important } #t { color: blue }", '<p id="t" style="color: green">x</p>', "red"),
+    # style属性中的!important优先于样式表中的!important
+    ("#t { color: red !important }", '<p id="t" style="color: green !important">x</p>', "green"),
+    # 交互状态下的伪类和伪元素不作用于元素本身
+    ("#t:hover { color: red } #t::before { color: blue }", '<p id="t">x</p>', None),
+])
+def test_cascade_order(css, body, expected):
+    declared, computed = styles_of(css, body)
+    assert declared.get("color") == expected
+    assert computed.get("color") == expected
+
+
+def test_shorthand_clears_earlier_longhands():
+    declared, _ = styles_of("p { background-color: red } #t { background: url(photo.jpg) }", '<p id="t">x</p>')
+    assert declared == {"background": "url(photo.jpg)"}
+    
+    # 后出现的子属性不被先前的简写清除
+    declared, _ = styles_of("p { background: blue } #t { background-color: red }", '<p id="t">x</p>')
+    assert declared == {"background": "blue", "background-color": "red"}
+
+
+def test_font_shorthand_sets_size_and_weight():
+    _, computed = styles_of("#t { font: bold 24px/1.5 serif }", '<p id="t">x</p>')
+    assert computed.font_size == 24
+    assert computed.get("font-weight") == "bold"
+
+
+def test_inheritance():
+    css = "div { color: red; background-color: yellow; font-size: 20px }"
+    _, computed = styles_of(css, '<div><p><span id="t">x</span></p></div>')
+    assert computed.get("color") == "red"
+    assert computed.font_size == 20
+    assert "background-color" not in computed
+    
+    _, computed = styles_of(css + " p { font-size: 1.5em }", '<div><p id="t">x</p></div>')
+    assert computed.font_size == 30
+
+
+def test_inherit_and_initial():
+    css = "div { color: red; background-color: yellow; font-size: 32px }"
+    _, computed = styles_of(css, '<div><p id="t" style="background-color: inherit">x</p></div>')
+    assert computed.get("background-color") == "yellow"
+    
+    _, computed = styles_of(css, '<div><p id="t" style="color: initial; font-size: initial">x</p></div>')
+    assert "color" not in computed
+    assert computed.font_size == 16
+    
+    # 子元素继承的是重置后的值
+    _, computed = styles_of(css, '<div><p style="color: initial"><span id="t">x</span></p></div>')
+    assert "color" not in computed
+
+
+def test_user_agent_styles():
+    _, computed = styles_of("", '<h1 id="t">x</h1>')
+    assert computed.font_size == 32
+    assert computed.get("font-weight") == "bold"
+    declared, _ = styles_of("", '<p id="t" hidden>x</p>')
+    assert declared.get("display") == "none"
+
+
+def test_print_media_is_excluded():
+    css = ("@media print { #t { color: red } } "
+           "@media screen and (min-width: 0) { #t { font-weight: bold } } "
+           "@supports (display: grid) { #t { font-style: italic } }")
+    declared, _ = styles_of(css, '<p id="t">x</p>')
+    assert declared == {"font-weight": "bold", "font-style": "italic"}
+    
+    engine = make_engine('<style media="print">#t { color: red }</style><p id="t">x</p>')
+    assert engine.declarations(engine.document.select_one("#t")) == {}
+
+
+@pytest.fixture
+def site(tmp_path):
+    """样式表site.css通过@import引用base.css，打印样式表只在打印时引用"""
+    (tmp_path / "base.css").write_text("#t { color: red; font-weight: bold }", encoding="utf-8")
+    (tmp_path / "print.css").write_text("#t { font-style: italic }", encoding="utf-8")
+    (tmp_path / "site.css").write_text(
+        '@import url("base.css");\n@import "print.css" print;\n#t { color: blue }', encoding="utf-8")
+    (tmp_path / "other.css").write_text("#t { text-decoration: underline }", encoding="utf-8")
+    return tmp_path
+
+
+PAGE = """<html><head>
+<link rel="stylesheet" href="site.css">
+<link rel="stylesheet" href="other.css" media="print">
+<link rel="stylesheet" href="https://example.com/remote.css">
+</head><body><p id="t">x</p></body></html>"""
+
+
+def test_linked_stylesheets_and_import(site):
+    engine = make_engine(PAGE, base_url=(site / "page.html").as_uri())
+    # 被引用的样式表在引用它的样式表之前生效
+    assert engine.declarations(engine.document.select_one("#t")) == {"color": "blue", "font-weight": "bold"}
+    assert len(engine.stylesheets) == 3
+
+
+def test_stylesheet_cache_across_documents(site):
+    cache = StylesheetCache()
+    for _ in range(2):
+        engine = make_engine(PAGE, base_url=(site / "page.html").as_uri(), cache=cache)
+        assert engine.declarations(engine.document.select_one("#t"))["color"] == "blue"
+    # 浏览器默认样式、site.css和base.css各解析一次
+    assert (cache.misses, cache.hits) == (3, 3)
+    
+    # 文件修改后重新读取
+    (site / "site.css").write_text('@import url("base.css");\n#t { color: green }', encoding="utf-8")
+    engine = make_engine(PAGE, base_url=(site / "page.html").as_uri(), cache=cache)
+    assert engine.declarations(engine.document.select_one("#t"))["color"] == "green"
+    assert (cache.misses, cache.hits) == (4, 5)
+
+
+def test_validator_shares_cache_between_pages(site, monkeypatch):
+    cache = StylesheetCache()
+    monkeypatch.setattr(styles, "stylesheet_cache", cache)
+    for name in ("a.html", "b.html"):
+        path = site / name
+        path.write_text(PAGE, encoding="utf-8")
+        WCAGValidator('AA', rule_ids=["color-contrast"]).validate_file(str(path))
+    assert (cache.misses, cache.hits) == (3, 3)
@@ -0,0 +1,118 @@
+"""
+流式报告写入测试：HTML、Markdown和控制台写入器在任意缓冲区大小下与generate_report的输出相同，
+逐个写入问题时只有摘要的位置不同
+"""
+import io
+import os
+from datetime import datetime
+
+import pytest
+
+from wcag_validator import WCAGValidator, generate_report, write_report
+from wcag_validator.core import writers
+from wcag_validator.core.report import ReportGenerator
+from wcag_validator.core.writers import ConsoleReportWriter, HTMLReportWriter, MarkdownReportWriter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WRITERS = {'html': HTMLReportWriter, 'markdown': MarkdownReportWriter, 'console': ConsoleReportWriter}
+STREAMS = {'html': 'write_html', 'markdown': 'write_markdown', 'console': 'write_console'}
+
+
+class FixedDatetime(datetime):
+    """固定生成时间，使两次生成的报告可以逐字比较"""
+    
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2024, 5, 1, 12, 30, 0)
+
+
+@pytest.fixture(autouse=True)
+def fixed_time(monkeypatch):
+    monkeypatch.setattr(writers, "datetime", FixedDatetime)
+
+
+class RecordingFile:
+    """记录每次write调用的文件对象"""
+    
+    def __init__(self):
+        self.writes = []
+    
+    def write(self, text):
+        self.writes.append(text)
+    
+    def getvalue(self):
+        return "".join(self.writes)
+
+
+@pytest.fixture(scope="module")
+def sample_report():
+    return WCAGValidator('AAA').validate_file(os.path.join(ROOT, "test_sample.html"))
+
+
+@pytest.mark.parametrize("format", sorted(WRITERS))
+def test_write_report_matches_generate_report(sample_report, format):
+    expected = generate_report(sample_report, format)
+    assert sample_report.issues[0].description in expected
+    
+    buffer = io.StringIO()
+    write_report(sample_report, buffer, format)
+    assert buffer.getvalue() == expected
+
+
+@pytest.mark.parametrize("format", sorted(WRITERS))
+@pytest.mark.parametrize("buffer_size", [1, 100, 4096])
+def test_buffer_size_does_not_change_output(sample_report, format, buffer_size):
+    expected = generate_report(sample_report, format)
+    fp = RecordingFile()
+    getattr(ReportGenerator(sample_report), STREAMS[format])(fp, buffer_size=buffer_size)
+    assert fp.getvalue() == expected
+    # 缓冲区写满即刷新，除最后一块外每块至少为缓冲区大小，且不会一次写入整个报告
+    assert all(len(text) >= buffer_size for text in fp.writes[:-1])
+    assert len(fp.writes) > 1
+
+
+def summary_text(format, summary):
+    """单独写入的摘要部分"""
+    buffer = io.StringIO()
+    writer = WRITERS[format](buffer)
+    writer._write_summary(summary)
+    writer.out.flush()
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("format", sorted(WRITERS))
+def test_incremental_writes_move_only_the_summary(sample_report, format):
+    """begin -> write_issue... -> finish与一次写入完整报告的区别只在于摘要在问题之后输出"""
+    buffer = io.StringIO()
+    writer = WRITERS[format](buffer, buffer_size=64)
+    writer.begin(sample_report.url)
+    for issue in sample_report.issues:
+        writer.write_issue(issue)
+    writer.finish(sample_report.summary)
+    assert writer.issue_count == len(sample_report.issues)
+    
+    summary = "\n" + summary_text(format, sample_report.summary)
+    full = generate_report(sample_report, format)
+    streamed = buffer.getvalue()
+    assert full.count(summary) == streamed.count(summary) == 1
+    assert streamed.index(summary) > full.index(summary)
+    assert streamed.replace(summary, "") == full.replace(summary, "")
+
+
+@pytest.mark.parametrize("format", sorted(WRITERS))
+def test_report_without_issues(format):
+    report = WCAGValidator('AA', rule_ids=["page-title"]).validate_html(
+        "<html lang='zh'><head><title>产品目录 - 示例商店</title></head><body><p>x</p></body></html>", "a.html")
+    assert not report.issues
+    buffer = io.StringIO()
+    write_report(report, buffer, format)
+    assert buffer.getvalue() == generate_report(report, format)
+    
+    # 逐个写入时同样输出"没有问题"的部分
+    streamed = io.StringIO()
+    writer = WRITERS[format](streamed)
+    writer.begin(report.url)
+    writer.finish(report.summary)
+    summary = "\n" + summary_text(format, report.summary)
+    assert streamed.getvalue().replace(summary, "") == buffer.getvalue().replace(summary, "")
@@ -1,10 +1,12 @@
 """
 WCAG验证器主模块，提供对外接口
 """
-from .core.validator import WCAGValidator
+__version__ = "0.1.0"
+
+from .core.validator import WCAGValidator, FailThreshold
 from .core.report import ReportGenerator
 
-def validate_html(html_content, wcag_level='AA', url=None):
+def validate_html(html_content, wcag_level='AA', url=None, fail_on=None):
     """
     验证HTML内容
     
@@ -12,39 +14,42 @@ def validate_html(html_content, wcag_level='AA', url=None):
         html_content: HTML字符串
         wcag_level: 验证级别 ('A', 'AA', 'AAA')
         url: 可选的URL，用于报告中
+        fail_on: 可选的门禁阈值 ('A', 'AA', 'AAA', 'count=N')，结论确定后即停止验证
         
     返回:
         ValidationReport对象
     """
-    validator = WCAGValidator(wcag_level=wcag_level)
+    validator = WCAGValidator(wcag_level=wcag_level, fail_on=fail_on)
     return validator.validate_html(html_content, url)
 
-def validate_file(file_path, wcag_level='AA'):
+def validate_file(file_path, wcag_level='AA', fail_on=None):
     """
     验证HTML文件
     
     参数:
         file_path: HTML文件路径
         wcag_level: 验证级别 ('A', 'AA', 'AAA')
+        fail_on: 可选的门禁阈值 ('A', 'AA', 'AAA', 'count=N')，结论确定后即停止验证
         
     返回:
         ValidationReport对象
     """
-    validator = WCAGValidator(wcag_level=wcag_level)
+    validator = WCAGValidator(wcag_level=wcag_level, fail_on=fail_on)
     return validator.validate_file(file_path)
 
-def validate_url(url, wcag_level='AA'):
+def validate_url(url, wcag_level='AA', fail_on=None):
     """
     验证URL指向的网页
     
     参数:
         url: 网页URL
         wcag_level: 验证级别 ('A', 'AA', 'AAA')
+        fail_on: 可选的门禁阈值 ('A', 'AA', 'AAA', 'count=N')，结论确定后即停止验证
         
     返回:
         ValidationReport对象
     """
-    validator = WCAGValidator(wcag_level=wcag_level)
+    validator = WCAGValidator(wcag_level=wcag_level, fail_on=fail_on)
     return validator.validate_url(url)
 
 def generate_report(report, format='html'):
@@ -70,3 +75,30 @@ def generate_report(report, format='html'):
         return generator.to_console()
     else:
         raise ValueError(f"不支持的报告格式: {format}")
+
+def write_report(report, fp, format='html'):
+    """
+    将报告流式写入文件对象，适合大型报告
+    
+    参数:
+        report: ValidationReport对象
+        fp: 支持write方法的文本文件对象
+        format: 报告格式 ('html', 'markdown', 'json', 'jsonl', 'console', 'sarif')
+    """
+    generator = ReportGenerator(report)
+    
+    if format.lower() == 'html':
+        generator.write_html(fp)
+    elif format.lower() == 'markdown':
+        generator.write_markdown(fp)
+    elif format.lower() == 'json':
+        fp.write(generator.to_json())
+    elif format.lower() == 'jsonl':
+        generator.write_json(fp, lines=True)
+    elif format.lower() == 'console':
+        generator.write_console(fp)
+    elif format.lower() == 'sarif':
+        from .core.sarif import SarifWriter
+        SarifWriter(fp).write_report(report)
+    else:
+        raise ValueError(f"不支持的报告格式: {format}")
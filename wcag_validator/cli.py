@@ -5,44 +5,511 @@ WCAG验证器命令行接口
 import argparse
 import sys
 import os
+import time
 
-from wcag_validator import validate_file, validate_url, validate_html, generate_report
+from wcag_validator import WCAGValidator, FailThreshold, write_report
+from wcag_validator.core.aggregate import SiteAggregator
+from wcag_validator.core.baseline import Baseline, page_key
+from wcag_validator.core.budget import Budget
+from wcag_validator.core.checkpoint import Checkpoint
+from wcag_validator.core.export import ColumnarExporter
+from wcag_validator.core.messages import LOCALES
+from wcag_validator.core.paged import PagedHTMLWriter, DEFAULT_CHUNK_SIZE
+from wcag_validator.core.profiler import ProfileAggregator, cprofile_to
+from wcag_validator.core.sarif import SarifWriter
+from wcag_validator.core.serializer import JSONReportWriter
+from wcag_validator.core.store import ResultStore
+from wcag_validator.distributed import (
+    DEFAULT_LEASE_TTL, DEFAULT_MAX_ATTEMPTS, DEFAULT_SHARD_SIZE, Coordinator, Worker, open_queue, start_workers
+)
+from wcag_validator.fixes import AutoFixer
+from wcag_validator.rules import RuleRegistry
+from wcag_validator.fixes.engine import write_text
+
+def _split_list(value):
+    """解析逗号分隔的参数值"""
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+def _iter_sources(args):
+    """依次产生命令行和来源列表文件中的所有来源"""
+    for source in args.sources:
+        yield source
+    
+    if args.sources_file:
+        with open(args.sources_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    yield line
+
+def _iter_reports(args, validator, fixer=None, checkpoint=None):
+    """
+    依次验证所有来源，产生报告（URL为空时使用来源）
+    
+    指定了检查点时，已完成的来源直接从检查点恢复报告，新验证的来源写入检查点。
+    """
+    for source in _iter_sources(args):
+        if checkpoint is not None:
+            report = checkpoint.restore(source)
+            if report is not None:
+                yield report
+                continue
+        report = _validate_source(validator, source, fixer, args.baseline_root)
+        if report.url is None:
+            report.url = source
+        if checkpoint is not None:
+            checkpoint.record(source, report, validator.parser.source_code)
+        yield report
+
+def _validate_source(validator, source, fixer=None, root=None):
+    """
+    验证单个来源（文件、URL或HTML字符串），指定了fixer时修复本地文件
+    
+    本地文件在报告中记录为相对于root的路径，报告用作基线时与检出目录的位置无关。
+    """
+    # 判断输入是文件、URL还是HTML字符串
+    if source.startswith(('http://', 'https://')):
+        print(f"正在验证URL: {source}", file=sys.stderr)
+        report = validator.validate_url(source)
+        if fixer is not None:
+            print(f"警告: 只能修复本地文件，跳过 {source}", file=sys.stderr)
+    elif os.path.isfile(source):
+        print(f"正在验证文件: {source}", file=sys.stderr)
+        report = validator.validate_file(source)
+        report.url = page_key(report.url, root)
+        if fixer is not None:
+            _fix_file(fixer, validator, source, report)
+    else:
+        print("正在验证HTML字符串", file=sys.stderr)
+        with open(source, 'r', encoding='utf-8') as f:
+            html_content = f.read()
+        report = validator.validate_html(html_content)
+    
+    for entry in report.partial_rules:
+        print(f"警告: {source} 的规则 {entry['rule_id']} 未完成: {entry['reason']}", file=sys.stderr)
+    return report
+
+def _fix_file(fixer, validator, path, report):
+    """将刚验证完的文件中可自动修复的问题写回文件"""
+    parser = validator.parser
+    result = fixer.fix(report, parser.source_code, parser.document, parser.line_positions)
+    if result.changed:
+        write_text(path, result.text)
+        print(f"已修复 {result.fixed_issues} 个问题: {path}", file=sys.stderr)
+    if result.skipped:
+        print(f"警告: {path} 中有 {len(result.skipped)} 处修复与其他修复冲突，未应用", file=sys.stderr)
 
 def main():
     """主函数"""
     parser = argparse.ArgumentParser(description='WCAG 2.2 验证工具')
-    parser.add_argument('source', help='HTML文件路径或URL')
+    parser.add_argument('sources', nargs='*', metavar='source', help='HTML文件路径或URL，可指定多个')
+    parser.add_argument('--sources-file', metavar='FILE',
+                        help='来源列表文件，每行一个文件路径或URL')
+    parser.add_argument('--aggregate', action='store_true',
+                        help='将所有页面的结果分组汇总为一份站点摘要报告')
+    parser.add_argument('--max-samples', type=int, default=5,
+                        help='站点摘要中每个问题分组保留的示例URL数量 (默认: 5)')
+    parser.add_argument('--export', metavar='PATH',
+                        help='将所有问题按行组导出为列式文件（.parquet需要pyarrow，其他扩展名为紧凑CSV）')
+    parser.add_argument('--export-format', choices=['parquet', 'csv'],
+                        help='导出格式 (默认: 根据--export的扩展名判断)')
+    parser.add_argument('--store', metavar='DB',
+                        help='将本次运行的结果写入SQLite数据库，用于历史和趋势查询')
+    parser.add_argument('--store-label', metavar='LABEL',
+                        help='写入数据库的运行标签（如提交号）')
     parser.add_argument('--level', choices=['A', 'AA', 'AAA'], default='AA',
                         help='WCAG合规级别 (默认: AA)')
-    parser.add_argument('--format', choices=['json', 'html', 'markdown', 'console'],
-                        default='console', help='输出格式 (默认: console)')
-    parser.add_argument('--output', help='输出文件路径')
+    parser.add_argument('--format', choices=['json', 'jsonl', 'html', 'html-paged', 'markdown', 'console', 'sarif'],
+                        default='console',
+                        help='输出格式 (默认: console；jsonl每行一个问题；html-paged输出分页HTML报告目录；'
+                             'jsonl、sarif和html-paged可配合多个来源输出到同一份报告)')
+    parser.add_argument('--output', help='输出文件路径（html-paged格式为输出目录）')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f'html-paged格式每个数据块的问题数 (默认: {DEFAULT_CHUNK_SIZE})')
+    parser.add_argument('--fail-on', metavar='A|AA|AAA|count=N', type=FailThreshold.parse,
+                        help='门禁模式：出现该级别问题或问题数超过N时以非零状态退出，结论确定后立即停止验证')
+    parser.add_argument('--baseline', metavar='FILE',
+                        help='上一次运行输出的json、jsonl或sarif报告，只报告相对它新增和已修复的问题')
+    parser.add_argument('--baseline-root', metavar='DIR',
+                        help='本地文件的根目录（默认: 当前目录），报告中记录相对于它的路径，基线按此路径匹配')
+    parser.add_argument('--rules', type=_split_list, metavar='ID[,ID...]',
+                        help='只执行指定ID的规则（逗号分隔）')
+    parser.add_argument('--skip-rules', type=_split_list, metavar='ID[,ID...]',
+                        help='跳过指定ID的规则（逗号分隔）')
+    parser.add_argument('--criteria', type=_split_list, metavar='X.Y.Z[,X.Y.Z...]',
+                        help='只执行指定WCAG标准的规则（逗号分隔，如1.1.1,1.3.1）')
+    parser.add_argument('--rule-time-budget', type=float, metavar='SECONDS',
+                        help='单个规则的最长耗时，超出时中止该规则并标记为部分完成，其余规则继续执行')
+    parser.add_argument('--rule-element-budget', type=int, metavar='N',
+                        help='单个规则最多访问的元素数，超出时中止该规则并标记为部分完成')
+    parser.add_argument('--document-time-budget', type=float, metavar='SECONDS',
+                        help='单个页面所有规则的最长总耗时，超出时剩余规则标记为部分完成')
+    parser.add_argument('--document-element-budget', type=int, metavar='N',
+                        help='单个页面所有规则最多访问的元素总数，超出时剩余规则标记为部分完成')
+    parser.add_argument('--profile', action='store_true',
+                        help='记录每个规则的耗时、访问的元素数和问题数以及各阶段耗时，输出到标准错误（多个来源时输出分位数）')
+    parser.add_argument('--profile-dump', metavar='FILE',
+                        help='在cProfile下运行并将统计数据写入FILE（可用python -m pstats FILE查看）')
+    parser.add_argument('--fix', action='store_true',
+                        help='自动修复本地文件中可机械修复的问题（图像标记为装饰性、添加lang、关联相邻的label），直接写回文件')
+    parser.add_argument('--fix-lang', default='zh-CN', metavar='LANG',
+                        help='--fix为缺少语言的页面添加的语言代码（默认zh-CN）')
+    parser.add_argument('--no-plugins', action='store_true',
+                        help='不加载通过入口点安装的第三方规则包')
+    parser.add_argument('--locale', choices=LOCALES, default='zh-CN',
+                        help='问题描述、修复建议和代码示例的语言（默认zh-CN；基线指纹与语言无关）')
+    parser.add_argument('--checkpoint', metavar='FILE',
+                        help='批量运行时将已完成的来源、内容哈希和结果追加写入检查点文件（结果存放在FILE.partials）')
+    parser.add_argument('--resume', action='store_true',
+                        help='从--checkpoint恢复：跳过已完成的来源（本地文件内容改变时重新验证），汇总结果从检查点重建')
+    parser.add_argument('--queue', metavar='URL',
+                        help='分布式工作队列：SQLite文件路径或redis://主机:端口/库?name=队列名；'
+                             '指定来源时作为协调器分片提交并汇总结果')
+    parser.add_argument('--worker', action='store_true',
+                        help='作为工作进程运行：从--queue租用工作单元并验证，直到队列处理完毕')
+    parser.add_argument('--workers', type=int, default=0, metavar='N',
+                        help='在本机启动的工作进程数（默认0，协调器只等待其他机器上的工作进程）')
+    parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE, metavar='N',
+                        help=f'每个工作单元的来源数 (默认: {DEFAULT_SHARD_SIZE})')
+    parser.add_argument('--lease-ttl', type=float, default=DEFAULT_LEASE_TTL, metavar='SECONDS',
+                        help=f'工作单元的租约时长，过期未确认的单元重新排队 (默认: {DEFAULT_LEASE_TTL})')
+    parser.add_argument('--max-attempts', type=int, default=DEFAULT_MAX_ATTEMPTS, metavar='N',
+                        help=f'工作单元的最大尝试次数 (默认: {DEFAULT_MAX_ATTEMPTS})')
     
     args = parser.parse_args()
     
-    # 判断输入是文件、URL还是HTML字符串
-    if args.source.startswith(('http://', 'https://')):
-        print(f"正在验证URL: {args.source}")
-        report = validate_url(args.source, wcag_level=args.level)
-    elif os.path.isfile(args.source):
-        print(f"正在验证文件: {args.source}")
-        report = validate_file(args.source, wcag_level=args.level)
-    else:
-        print("正在验证HTML字符串")
-        with open(args.source, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-        report = validate_html(html_content, wcag_level=args.level)
+    if args.workers < 0 or args.shard_size < 1 or args.max_attempts < 1 or args.lease_ttl <= 0:
+        parser.error("--workers不能为负数，--shard-size、--max-attempts和--lease-ttl必须为正数")
+    if args.worker:
+        if not args.queue:
+            parser.error("--worker需要使用--queue指定工作队列")
+        _run_worker(args)
+        return
+    if args.queue and (args.baseline or args.fix):
+        parser.error("分布式队列不支持--baseline和--fix")
+    if args.resume and not args.checkpoint:
+        parser.error("--resume需要使用--checkpoint指定检查点文件")
+    if args.checkpoint and args.queue:
+        parser.error("分布式队列已记录完成的工作单元，不支持--checkpoint")
+    if args.resume and args.baseline:
+        parser.error("--resume不支持--baseline（恢复的报告不参与基线对比）")
+    
+    try:
+        baseline = Baseline(args.baseline, root=args.baseline_root) if args.baseline else None
+    except (OSError, ValueError) as e:
+        parser.error(f"无法读取基线文件: {e}")
+    
+    try:
+        budget = Budget(
+            rule_time=args.rule_time_budget,
+            rule_elements=args.rule_element_budget,
+            document_time=args.document_time_budget,
+            document_elements=args.document_element_budget
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    
+    try:
+        validator = WCAGValidator(
+            wcag_level=args.level,
+            fail_on=args.fail_on,
+            rule_ids=args.rules,
+            skip_rules=args.skip_rules,
+            criteria=args.criteria,
+            baseline=baseline,
+            profile=args.profile,
+            budget=budget,
+            registry=RuleRegistry(plugins=False) if args.no_plugins else None,
+            locale=args.locale
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    
+    if not args.sources and not args.sources_file:
+        parser.error("请指定至少一个来源")
+    
+    streaming = args.format in ('sarif', 'jsonl', 'html-paged')
+    if args.aggregate and streaming:
+        parser.error(f"站点摘要报告不支持{args.format}格式")
+    if args.format == 'html-paged' and not args.output:
+        parser.error("html-paged格式需要使用--output指定输出目录")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size必须为正数")
+    
+    multiple = bool(args.sources_file) or len(args.sources) > 1 or bool(args.queue)
+    batch = args.aggregate or args.export or (multiple and (args.store or streaming))
+    if multiple and not batch:
+        parser.error("多个来源需要配合--aggregate、--export、--store或--format sarif/jsonl/html-paged使用")
+    if args.checkpoint and not batch:
+        parser.error("--checkpoint只用于批量运行（--aggregate、--export、--store或--format sarif/jsonl/html-paged）")
+    
+    fixer = AutoFixer(lang=args.fix_lang) if args.fix else None
     
-    # 生成报告
-    output = generate_report(report, format=args.format)
+    with cprofile_to(args.profile_dump):
+        if args.queue:
+            exit_code = _run_distributed(args, validator)
+        elif batch:
+            exit_code = _run_batch(args, validator, fixer)
+        else:
+            exit_code = _run_single(args, validator, fixer)
     
-    # 输出报告
-    if args.output:
+    if args.profile_dump:
+        print(f"cProfile统计数据已保存到: {args.profile_dump}", file=sys.stderr)
+    if exit_code:
+        sys.exit(exit_code)
+
+def _run_single(args, validator, fixer=None):
+    """验证单个来源并输出报告，返回退出码"""
+    baseline = validator.baseline
+    report = _validate_source(validator, args.sources[0], fixer, args.baseline_root)
+    
+    if args.store:
+        store = ResultStore(args.store)
+        try:
+            run_id = store.begin_run(wcag_level=args.level, label=args.store_label)
+            store.add_report(run_id, report)
+            store.finish_run(run_id)
+        finally:
+            store.close()
+    
+    # 生成并流式输出报告
+    render_started = time.perf_counter()
+    if args.format == 'html-paged':
+        writer = PagedHTMLWriter(args.output, chunk_size=args.chunk_size)
+        writer.add_report(report)
+        writer.close()
+        print(f"报告已保存到: {writer.index_path}", file=sys.stderr)
+    elif args.output:
         with open(args.output, 'w', encoding='utf-8') as f:
-            f.write(output)
-        print(f"报告已保存到: {args.output}")
+            write_report(report, f, format=args.format)
+        print(f"报告已保存到: {args.output}", file=sys.stderr)
     else:
-        print(output)
+        write_report(report, sys.stdout, format=args.format)
+        if args.format != 'jsonl':
+            # JSON Lines的每条记录已以换行结束，多余的空行会被严格的读取器拒绝
+            sys.stdout.write("\n")
+    
+    if report.profile is not None:
+        report.profile.add_phase("render", time.perf_counter() - render_started)
+        print(report.profile.format_table(), file=sys.stderr)
+    
+    if baseline:
+        _print_baseline_diff(baseline, report.summary["total_issues"])
+    
+    # 门禁结论
+    if report.gate_failed is not None:
+        if report.gate_failed:
+            print(f"门禁失败 (--fail-on {args.fail_on})", file=sys.stderr)
+            return 1
+        print(f"门禁通过 (--fail-on {args.fail_on})", file=sys.stderr)
+    return 0
+
+def _run_batch(args, validator, fixer=None, reports=None):
+    """
+    逐页验证多个来源，结果汇总为站点摘要报告和/或导出为列式文件，返回退出码
+    
+    每个页面的报告处理完即释放，内存占用不随页面数增长。使用sarif、jsonl或
+    html-paged格式时，所有页面的问题依次写入同一份报告。指定reports时不再验证，
+    直接处理给出的报告（如分布式工作进程的结果）。指定--checkpoint时记录已完成的
+    来源，--resume时已完成的来源从检查点恢复，所有输出与完整运行相同。
+    """
+    aggregator = SiteAggregator(max_samples=args.max_samples) if args.aggregate else None
+    profiles = ProfileAggregator() if validator.profile else None
+    exporter = ColumnarExporter(args.export, format=args.export_format) if args.export else None
+    store = ResultStore(args.store) if args.store else None
+    stream_file = None
+    stream = None
+    checkpoint = None
+    gate_failures = 0
+    new_issues = 0
+    
+    try:
+        if store:
+            run_id = store.begin_run(wcag_level=args.level, label=args.store_label)
+        
+        if args.format == 'html-paged' and not aggregator:
+            stream = PagedHTMLWriter(args.output, chunk_size=args.chunk_size)
+        elif args.format in ('sarif', 'jsonl') and not aggregator:
+            stream_file = open(args.output, 'w', encoding='utf-8') if args.output else None
+            if args.format == 'sarif':
+                stream = SarifWriter(stream_file or sys.stdout, rules=validator.rules)
+                stream.begin()
+            else:
+                stream = JSONReportWriter(stream_file or sys.stdout, lines=True)
+        
+        if reports is None:
+            if args.checkpoint:
+                try:
+                    checkpoint = Checkpoint(args.checkpoint, config=_job_config(args), resume=args.resume)
+                except ValueError as e:
+                    print(f"错误: {e}", file=sys.stderr)
+                    return 2
+            reports = _iter_reports(args, validator, fixer, checkpoint)
+        for report in reports:
+            render_started = time.perf_counter()
+            if aggregator:
+                aggregator.add_report(report)
+            if exporter:
+                exporter.add_report(report)
+            if store:
+                store.add_report(run_id, report)
+            if stream:
+                stream.add_report(report)
+            if profiles and report.profile is not None:
+                report.profile.add_phase("render", time.perf_counter() - render_started)
+                profiles.add_profile(report.profile)
+            new_issues += report.summary["total_issues"]
+            if report.gate_failed:
+                gate_failures += 1
+        
+        if stream:
+            if args.format == 'html-paged':
+                stream.close()
+                print(f"报告已保存到: {stream.index_path}", file=sys.stderr)
+            elif args.format == 'sarif':
+                stream.finish()
+                if not stream_file:
+                    sys.stdout.write("\n")
+            else:
+                stream.flush()
+            if stream_file:
+                print(f"报告已保存到: {args.output}", file=sys.stderr)
+        
+        if exporter:
+            exporter.close()
+            print(f"已导出 {exporter.rows} 个问题到: {args.export}", file=sys.stderr)
+        
+        if store:
+            store.finish_run(run_id)
+            print(f"结果已写入数据库: {args.store} (运行ID {run_id})", file=sys.stderr)
+        
+        if aggregator:
+            if args.output:
+                with open(args.output, 'w', encoding='utf-8') as f:
+                    aggregator.write(f, format=args.format)
+                print(f"报告已保存到: {args.output}", file=sys.stderr)
+            else:
+                aggregator.write(sys.stdout, format=args.format)
+                sys.stdout.write("\n")
+    finally:
+        if checkpoint:
+            checkpoint.close()
+        if stream_file:
+            stream_file.close()
+        if aggregator:
+            aggregator.close()
+        if store:
+            store.close()
+    
+    if profiles:
+        print(profiles.format_table(), file=sys.stderr)
+    
+    if checkpoint:
+        print(f"检查点: 从 {args.checkpoint} 恢复 {checkpoint.restored} 个来源，"
+              f"共记录 {len(checkpoint)} 个已完成的来源", file=sys.stderr)
+    
+    if validator.baseline:
+        _print_baseline_diff(validator.baseline, new_issues)
+    
+    # 门禁结论：任一页面失败即失败
+    if args.fail_on is not None:
+        if gate_failures:
+            print(f"门禁失败 (--fail-on {args.fail_on}): {gate_failures} 个页面", file=sys.stderr)
+            return 1
+        print(f"门禁通过 (--fail-on {args.fail_on})", file=sys.stderr)
+    return 0
+
+def _job_config(args):
+    """
+    任务配置：分布式工作进程据此创建与协调器相同的验证器（包括输出语言），
+    检查点据此判断能否恢复
+    """
+    return {
+        "level": args.level,
+        "locale": args.locale,
+        "rules": args.rules,
+        "skip_rules": args.skip_rules,
+        "criteria": args.criteria,
+        "fail_on": str(args.fail_on) if args.fail_on else None,
+        "budget": {
+            "rule_time": args.rule_time_budget,
+            "rule_elements": args.rule_element_budget,
+            "document_time": args.document_time_budget,
+            "document_elements": args.document_element_budget
+        },
+        "no_plugins": args.no_plugins
+    }
+
+def _run_worker(args):
+    """作为工作进程处理队列中的工作单元，验证配置（包括语言）从队列读取"""
+    if args.workers > 1:
+        processes = start_workers(args.queue, args.workers, lease_ttl=args.lease_ttl)
+        for process in processes:
+            process.join()
+        print(f"{args.workers} 个工作进程已退出", file=sys.stderr)
+        return
+    
+    queue = open_queue(args.queue)
+    try:
+        worker = Worker(queue, lease_ttl=args.lease_ttl)
+        try:
+            worker.run()
+        except ValueError as e:
+            print(f"错误: {e}", file=sys.stderr)
+            sys.exit(2)
+        print(f"工作进程 {worker.worker_id} 已完成 {worker.processed} 个工作单元，失败 {worker.failed} 次",
+              file=sys.stderr)
+    finally:
+        queue.close()
+
+def _run_distributed(args, validator):
+    """
+    作为协调器将来源分片提交到工作队列，等待工作进程处理完毕后汇总结果，返回退出码
+    
+    已完成的工作单元不会重新入队，中断后用相同来源重新运行只处理剩余单元。
+    """
+    queue = open_queue(args.queue)
+    try:
+        coordinator = Coordinator(queue, shard_size=args.shard_size)
+        queued = coordinator.submit(_iter_sources(args), dict(_job_config(args), max_attempts=args.max_attempts))
+        print(f"已提交 {len(coordinator.unit_ids)} 个工作单元（新入队 {queued} 个）: {args.queue}", file=sys.stderr)
+        
+        processes = start_workers(args.queue, args.workers, lease_ttl=args.lease_ttl) if args.workers else []
+        if not processes:
+            print(f"等待工作进程: wcag-validator --worker --queue {args.queue}", file=sys.stderr)
+        coordinator.wait(processes, max_attempts=args.max_attempts, progress=_progress_printer())
+        for process in processes:
+            process.join()
+        
+        exit_code = _run_batch(args, validator, reports=coordinator.iter_reports())
+        
+        for source, error in coordinator.errors:
+            print(f"警告: 无法验证 {source}: {error}", file=sys.stderr)
+        for unit_id, error in queue.failures().items():
+            print(f"警告: 工作单元 {unit_id} 失败: {error}", file=sys.stderr)
+    finally:
+        queue.close()
+    return exit_code
+
+def _progress_printer():
+    """返回输出队列进度的回调，只在进度变化时输出"""
+    last = {}
+    
+    def progress(counts):
+        if counts != last:
+            last.update(counts)
+            print(f"队列进度: 完成 {counts['done']}，处理中 {counts['leased']}，"
+                  f"等待 {counts['pending']}，失败 {counts['failed']}", file=sys.stderr)
+    return progress
+
+def _print_baseline_diff(baseline, new_issues):
+    """输出与基线对比的结果：新增问题数、已知问题数和已修复问题列表"""
+    fixed = list(baseline.iter_fixed())
+    print(f"基线对比: 新增 {new_issues} 个问题，已知 {baseline.suppressed} 个问题，已修复 {len(fixed)} 个问题",
+          file=sys.stderr)
+    for record in fixed:
+        print(f"  已修复: [{record.get('rule_id')}] {record.get('url') or ''} {record.get('description') or ''}",
+              file=sys.stderr)
 
 if __name__ == "__main__":
     main()
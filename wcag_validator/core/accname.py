@@ -0,0 +1,299 @@
+"""
+无障碍名称计算模块，按照accname算法计算元素的无障碍名称，并在文档生命周期内缓存结果
+"""
+from bs4.element import CData, NavigableString, Tag
+
+from ..utils.html_utils import normalize_space
+
+# 参与文本内容计算的字符串类型（与BeautifulSoup的get_text()一致，不含注释和脚本）
+TEXT_TYPES = (NavigableString, CData)
+
+# 可以从内容获取名称的元素和角色
+NAME_FROM_CONTENT_TAGS = {
+    'a', 'button', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'label', 'legend', 'option',
+    'summary', 'td', 'th', 'caption', 'figcaption', 'dt', 'li'
+}
+NAME_FROM_CONTENT_ROLES = {
+    'button', 'cell', 'checkbox', 'columnheader', 'gridcell', 'heading', 'link', 'menuitem',
+    'menuitemcheckbox', 'menuitemradio', 'option', 'radio', 'row', 'rowheader', 'switch',
+    'tab', 'tooltip', 'treeitem'
+}
+
+# 名称来自关联label的表单控件
+LABELABLE_TAGS = {'input', 'select', 'textarea', 'meter', 'output', 'progress'}
+
+# 名称来自value属性的按钮类input
+BUTTON_INPUT_TYPES = {'submit', 'reset', 'button'}
+
+# 可能有原生名称的元素
+NATIVE_NAME_TAGS = LABELABLE_TAGS | {'img', 'area', 'svg', 'fieldset', 'figure', 'table'}
+
+# 影响名称计算的属性
+NAMING_ATTRS = {'aria-labelledby', 'aria-label', 'aria-hidden', 'hidden', 'title', 'role'}
+
+# 计算名称时忽略其内容的元素
+SKIPPED_TAGS = {'script', 'style', 'template', 'noscript'}
+
+
+class AccessibleNameService:
+    """
+    无障碍名称服务
+    
+    按accname算法依次尝试aria-labelledby、aria-label、原生标签（label、alt、
+    title子元素、legend等）、元素内容和title属性。文本内容和名称按节点缓存，
+    同一文档的多个规则共享计算结果，嵌套内容只遍历一次。遍历的元素计入索引上的
+    计数器（见DocumentIndex.meter），归属于当前规则，受执行预算限制。
+    """
+    
+    def __init__(self, index):
+        """
+        初始化名称服务
+        
+        参数:
+            index: 文档的DocumentIndex对象
+        """
+        self.index = index
+        self._text = {}  # 元素id -> 文本内容
+        self._names = {}  # 元素id -> 无障碍名称
+        self._content_names = {}  # 元素id -> 作为其他元素内容时贡献的文本
+    
+    def text_content(self, element):
+        """
+        获取元素的文本内容，等价于element.get_text()
+        
+        子元素的文本同样被缓存，因此嵌套内容不会被重复遍历。
+        
+        参数:
+            element: 元素
+        
+        返回:
+            文本字符串
+        """
+        text = self._text.get(id(element))
+        if text is not None:
+            return text
+        
+        # 后序遍历：先计算所有未缓存的子元素，再拼接
+        meter = self.index.meter
+        stack = [(element, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in self._text:
+                continue
+            if not expanded:
+                if meter is not None:
+                    meter.tick()
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.contents
+                             if isinstance(child, Tag) and id(child) not in self._text)
+                continue
+            
+            parts = []
+            for child in node.contents:
+                if isinstance(child, Tag):
+                    parts.append(self._text[id(child)])
+                elif type(child) in TEXT_TYPES:
+                    parts.append(child)
+            self._text[id(node)] = "".join(parts)
+        
+        return self._text[id(element)]
+    
+    def name(self, element):
+        """
+        计算元素的无障碍名称
+        
+        参数:
+            element: 元素
+        
+        返回:
+            规范化空白后的名称，没有名称时返回空字符串
+        """
+        key = id(element)
+        name = self._names.get(key)
+        if name is None:
+            name = normalize_space(self._compute(element, referenced=False, in_content=False))
+            self._names[key] = name
+        return name
+    
+    def title_only(self, element):
+        """
+        判断元素的无障碍名称是否只来自title属性
+        
+        title只在悬停时显示，触屏和键盘用户通常看不到，作为唯一的标签是较弱的做法。
+        
+        参数:
+            element: 元素
+        
+        返回:
+            有名称且去掉title后没有名称时返回True
+        """
+        if not self.name(element):
+            return False
+        title = element.get('title')
+        if not title or not title.strip():
+            return False
+        return not normalize_space(self._compute(element, referenced=False, in_content=False, use_title=False))
+    
+    def labels(self, control):
+        """
+        获取与表单控件关联的label元素（for属性指向控件的label和包含控件的label）
+        
+        参数:
+            control: 表单控件
+        
+        返回:
+            label元素列表
+        """
+        labels = []
+        control_id = control.get('id')
+        if control_id:
+            labels.extend(self.index.labels_for(control_id))
+        enclosing = self.index.context(control).label
+        if enclosing is not None and all(enclosing is not label for label in labels):
+            labels.append(enclosing)
+        return labels
+    
+    def _compute(self, element, referenced, in_content, visited=None, use_title=True):
+        """accname算法的主体，返回未规范化的文本"""
+        if element.name in SKIPPED_TAGS:
+            return ""
+        
+        # 隐藏的元素没有名称，除非是被aria-labelledby直接引用的
+        if not referenced and (element.get('aria-hidden') == 'true' or element.has_attr('hidden')):
+            return ""
+        
+        # aria-labelledby（在aria-labelledby的引用链中不再继续展开）
+        labelledby = element.get('aria-labelledby')
+        if labelledby and visited is None:
+            parts = []
+            for ref_id in labelledby.split():
+                target = self.index.element_by_id(ref_id)
+                if target is not None:
+                    parts.append(self._compute(target, referenced=True, in_content=False, visited={id(element)}))
+            text = " ".join(part for part in parts if part.strip())
+            if text.strip():
+                return text
+        
+        # aria-label
+        label = element.get('aria-label')
+        if label and label.strip():
+            return label
+        
+        role = element.get('role')
+        role = role.strip().lower() if isinstance(role, str) else ''
+        if role in ('presentation', 'none') and not in_content:
+            return ""
+        
+        # 原生标签
+        native = self._native_name(element, visited)
+        if native is not None and native.strip():
+            return native
+        
+        # 从内容获取名称
+        if in_content or referenced or element.name in NAME_FROM_CONTENT_TAGS or role in NAME_FROM_CONTENT_ROLES:
+            text = self._name_from_content(element, visited)
+            if text.strip():
+                return text
+        
+        # title属性
+        title = element.get('title') if use_title else None
+        if title and title.strip():
+            return title
+        
+        return native or ""
+    
+    def _native_name(self, element, visited):
+        """根据HTML原生语义获取名称，不适用时返回None"""
+        name = element.name
+        if name == 'img' or name == 'area':
+            return element.get('alt')
+        
+        if name == 'input':
+            input_type = (element.get('type') or 'text').lower()
+            if input_type == 'image':
+                return element.get('alt')
+            if input_type in BUTTON_INPUT_TYPES:
+                return element.get('value')
+            if input_type == 'hidden':
+                return ""
+        
+        if name in LABELABLE_TAGS:
+            visited = (visited or set()) | {id(element)}
+            parts = [self._name_from_content(label, visited) for label in self.labels(element)]
+            return " ".join(part for part in parts if part.strip())
+        
+        if name == 'svg':
+            for child in element.find_all('title', recursive=False):
+                return self.text_content(child)
+            return None
+        
+        child_tag = {'fieldset': 'legend', 'figure': 'figcaption', 'table': 'caption'}.get(name)
+        if child_tag:
+            for child in element.find_all(child_tag, recursive=False):
+                return self._name_from_content(child, visited)
+        
+        return None
+    
+    def _name_from_content(self, element, visited):
+        """拼接子节点的文本，子元素按accname算法计算其贡献"""
+        cache = self._content_names if visited is None else {}
+        text = cache.get(id(element))
+        if text is not None:
+            return text
+        
+        # 后序遍历直接贡献内容的子元素（见_is_plain），深层嵌套不会耗尽递归深度
+        meter = self.index.meter
+        stack = [(element, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if not expanded:
+                if meter is not None:
+                    meter.tick()
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.contents
+                             if self._is_plain(child, visited) and id(child) not in cache)
+                continue
+            
+            parts = []
+            for child in node.contents:
+                if isinstance(child, Tag):
+                    if visited is not None and id(child) in visited:
+                        continue  # 计算控件名称时跳过控件本身
+                    if self._is_plain(child, visited):
+                        parts.append(cache[id(child)])
+                    else:
+                        parts.append(self._content_contribution(child, visited))
+                elif type(child) in TEXT_TYPES:
+                    parts.append(child)
+            cache[id(node)] = "".join(parts)
+        
+        return cache[id(element)]
+    
+    @staticmethod
+    def _is_plain(node, visited):
+        """没有ARIA属性、也没有原生名称的元素，作为内容时直接贡献其子节点的文本"""
+        return (isinstance(node, Tag) and node.name not in SKIPPED_TAGS and node.name not in NATIVE_NAME_TAGS
+                and NAMING_ATTRS.isdisjoint(node.attrs) and (visited is None or id(node) not in visited))
+    
+    def _content_contribution(self, element, visited):
+        """子元素作为内容时贡献的文本"""
+        name = element.name
+        if name in SKIPPED_TAGS:
+            return ""
+        
+        # 内嵌的表单控件贡献其当前值
+        if name == 'input' and (element.get('type') or 'text').lower() not in ('image', 'hidden'):
+            return element.get('value') or ""
+        if name == 'textarea':
+            return self.text_content(element)
+        if name == 'select':
+            for option in element.find_all('option'):
+                if option.has_attr('selected'):
+                    return self.text_content(option)
+            return ""
+        
+        # 没有ARIA属性、也没有原生名称的元素直接贡献其内容
+        if self._is_plain(element, visited):
+            return self._name_from_content(element, visited)
+        
+        return self._compute(element, referenced=False, in_content=True, visited=visited)
@@ -0,0 +1,420 @@
+"""
+站点级聚合模块，流式汇总多个页面的验证结果，生成一份站点摘要报告
+"""
+import html
+import json
+import os
+import sqlite3
+import tempfile
+from datetime import datetime
+
+from .serializer import dumps
+from .writers import BufferedTextWriter, DEFAULT_BUFFER_SIZE
+
+class SiteAggregator:
+    """
+    站点聚合器
+    
+    按(规则ID, 规范化元素签名, 问题描述)对问题分组，每组只保留计数和有限数量的
+    示例URL。内存中的分组数超过上限时，会在页面之间溢出到临时SQLite文件，
+    因此内存占用与页面数和问题总数无关。
+    """
+    
+    def __init__(self, max_samples=5, max_groups_in_memory=50000, spill_dir=None):
+        """
+        初始化聚合器
+        
+        参数:
+            max_samples: 每个分组保留的示例URL数量
+            max_groups_in_memory: 内存中保留的分组数上限，超过后溢出到磁盘
+            spill_dir: 溢出文件所在目录，默认为系统临时目录
+        """
+        self.max_samples = max_samples
+        self.max_groups_in_memory = max_groups_in_memory
+        self.spill_dir = spill_dir
+        
+        # (rule_id, signature, message) -> [问题数, 页面数, 最近的页面序号, 示例URL列表]
+        self.groups = {}
+        self.rules = {}  # rule_id -> {"name", "wcag_criterion", "level", "issues"}
+        self.summary = {
+            "pages": 0,
+            "pages_with_issues": 0,
+            "total_issues": 0,
+            "level_A_issues": 0,
+            "level_AA_issues": 0,
+            "level_AAA_issues": 0
+        }
+        
+        self._spill_path = None
+        self._spill_conn = None
+    
+    def add_report(self, report):
+        """
+        添加一个页面的验证报告
+        
+        参数:
+            report: ValidationReport对象
+        """
+        url = report.url or ""
+        for issue in report.issues:
+            rule = issue.rule
+            self.add_issue(
+                url, rule.id, issue.signature, issue.description,
+                rule_name=rule.name, wcag_criterion=rule.wcag_criterion, level=rule.level
+            )
+        self.end_page(has_issues=bool(report.issues))
+    
+    def add_issue(self, url, rule_id, signature, message,
+                  rule_name=None, wcag_criterion=None, level=None):
+        """
+        添加单个问题记录，同一页面的问题需在调用end_page之前全部添加
+        
+        参数:
+            url: 页面URL
+            rule_id: 规则ID
+            signature: 规范化元素签名
+            message: 问题描述
+            rule_name: 规则名称
+            wcag_criterion: WCAG标准编号
+            level: WCAG级别
+        """
+        rule_info = self.rules.get(rule_id)
+        if rule_info is None:
+            rule_info = self.rules[rule_id] = {
+                "name": rule_name,
+                "wcag_criterion": wcag_criterion,
+                "level": level,
+                "issues": 0
+            }
+        rule_info["issues"] += 1
+        
+        self.summary["total_issues"] += 1
+        level_key = f"level_{rule_info['level']}_issues"
+        if level_key in self.summary:
+            self.summary[level_key] += 1
+        
+        key = (rule_id, signature, message)
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = [0, 0, None, []]
+        
+        group[0] += 1
+        page = self.summary["pages"]
+        if group[2] != page:
+            # 同一页面的问题在end_page之前添加，页面序号变化即为新页面（同一URL再次出现也计入）
+            group[1] += 1
+            group[2] = page
+            # 与溢出合并（_merge_samples）相同：已在示例中的URL不重复记录
+            if len(group[3]) < self.max_samples and url not in group[3]:
+                group[3].append(url)
+    
+    def end_page(self, has_issues=True):
+        """标记一个页面处理完毕，必要时将分组溢出到磁盘"""
+        self.summary["pages"] += 1
+        if has_issues:
+            self.summary["pages_with_issues"] += 1
+        
+        if len(self.groups) > self.max_groups_in_memory:
+            self._spill()
+    
+    @property
+    def group_count(self):
+        """不同问题分组的数量"""
+        if self._spill_conn is None:
+            return len(self.groups)
+        
+        self._spill()
+        return self._spill_conn.execute("SELECT COUNT(*) FROM groups").fetchone()[0]
+    
+    def iter_groups(self):
+        """
+        按问题数从多到少遍历分组
+        
+        返回:
+            分组字典迭代器
+        """
+        if self._spill_conn is None:
+            items = sorted(self.groups.items(), key=lambda item: -item[1][0])
+            rows = (
+                (rule_id, signature, message, count, pages, samples)
+                for (rule_id, signature, message), (count, pages, _, samples) in items
+            )
+        else:
+            self._spill()
+            rows = (
+                (rule_id, signature, message, count, pages, json.loads(samples))
+                for rule_id, signature, message, count, pages, samples in self._spill_conn.execute(
+                    "SELECT rule_id, signature, message, count, pages, samples "
+                    "FROM groups ORDER BY count DESC"
+                )
+            )
+        
+        for rule_id, signature, message, count, pages, samples in rows:
+            rule_info = self.rules.get(rule_id, {})
+            yield {
+                "rule_id": rule_id,
+                "rule_name": rule_info.get("name"),
+                "wcag_criterion": rule_info.get("wcag_criterion"),
+                "level": rule_info.get("level"),
+                "signature": signature,
+                "message": message,
+                "count": count,
+                "pages": pages,
+                "sample_urls": samples
+            }
+    
+    def get_rule_summary(self):
+        """按问题数从多到少返回每个规则的统计"""
+        return [
+            dict(rule_id=rule_id, **info)
+            for rule_id, info in sorted(self.rules.items(), key=lambda item: -item[1]["issues"])
+        ]
+    
+    def to_dict(self, max_groups=None):
+        """
+        转换为字典
+        
+        参数:
+            max_groups: 最多包含的分组数，None表示全部
+        
+        返回:
+            站点摘要字典
+        """
+        groups = []
+        for group in self.iter_groups():
+            if max_groups is not None and len(groups) >= max_groups:
+                break
+            groups.append(group)
+        
+        return {
+            "summary": dict(self.summary, groups=self.group_count),
+            "rules": self.get_rule_summary(),
+            "groups": groups
+        }
+    
+    def write(self, fp, format='markdown', max_groups=None, buffer_size=DEFAULT_BUFFER_SIZE):
+        """
+        将站点摘要报告流式写入文件对象
+        
+        参数:
+            fp: 支持write方法的文本文件对象
+            format: 报告格式 ('json', 'markdown', 'console', 'html')
+            max_groups: 最多输出的分组数，None表示全部
+            buffer_size: 写入缓冲区大小（字符数）
+        """
+        writers = {
+            'json': self._write_json,
+            'markdown': self._write_markdown,
+            'console': self._write_console,
+            'html': self._write_html,
+        }
+        if format not in writers:
+            raise ValueError(f"不支持的报告格式: {format}")
+        
+        out = BufferedTextWriter(fp, buffer_size)
+        groups = self.iter_groups()
+        if max_groups is not None:
+            groups = (group for _, group in zip(range(max_groups), groups))
+        
+        writers[format](out, groups)
+        out.flush()
+    
+    def close(self):
+        """删除溢出文件"""
+        if self._spill_conn is not None:
+            self._spill_conn.close()
+            self._spill_conn = None
+        if self._spill_path and os.path.exists(self._spill_path):
+            os.remove(self._spill_path)
+        self._spill_path = None
+    
+    def _spill(self):
+        """将内存中的分组合并到溢出文件"""
+        if self._spill_conn is None:
+            fd, self._spill_path = tempfile.mkstemp(prefix='wcag-aggregate-', suffix='.sqlite',
+                                                    dir=self.spill_dir)
+            os.close(fd)
+            self._spill_conn = sqlite3.connect(self._spill_path)
+            self._spill_conn.create_function("merge_samples", 2, self._merge_samples)
+            self._spill_conn.execute(
+                "CREATE TABLE groups ("
+                "rule_id TEXT, signature TEXT, message TEXT, "
+                "count INTEGER, pages INTEGER, samples TEXT, "
+                "PRIMARY KEY (rule_id, signature, message))"
+            )
+        
+        if not self.groups:
+            return
+        
+        with self._spill_conn:
+            self._spill_conn.executemany(
+                "INSERT INTO groups VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (rule_id, signature, message) DO UPDATE SET "
+                "count = count + excluded.count, "
+                "pages = pages + excluded.pages, "
+                "samples = merge_samples(samples, excluded.samples)",
+                (
+                    (rule_id, signature, message, count, pages, json.dumps(samples))
+                    for (rule_id, signature, message), (count, pages, _, samples) in self.groups.items()
+                )
+            )
+        self.groups = {}
+    
+    def _merge_samples(self, existing, new):
+        """合并两个示例URL列表（JSON），保持上限"""
+        samples = json.loads(existing)
+        for url in json.loads(new):
+            if len(samples) >= self.max_samples:
+                break
+            if url not in samples:
+                samples.append(url)
+        return json.dumps(samples)
+    
+    def _write_json(self, out, groups):
+        out.write('{"summary": ')
+        out.write(dumps(dict(self.summary, groups=self.group_count)))
+        out.write(', "rules": ')
+        out.write(dumps(self.get_rule_summary()))
+        out.write(', "groups": [')
+        for i, group in enumerate(groups):
+            if i:
+                out.write(', ')
+            out.write(dumps(group))
+        out.write(']}')
+    
+    def _write_markdown(self, out, groups):
+        summary = self.summary
+        lines = [
+            "# WCAG 2.2 站点验证摘要",
+            "",
+            f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            "",
+            "## 摘要",
+            "",
+            f"- **页面数:** {summary['pages']}",
+            f"- **有问题的页面数:** {summary['pages_with_issues']}",
+            f"- **总问题数:** {summary['total_issues']}",
+            f"- **A级问题:** {summary['level_A_issues']}",
+            f"- **AA级问题:** {summary['level_AA_issues']}",
+            f"- **AAA级问题:** {summary['level_AAA_issues']}",
+            f"- **问题分组数:** {self.group_count}",
+            "",
+            "## 按规则统计",
+            "",
+            "| 规则 | WCAG标准 | 级别 | 问题数 |",
+            "| --- | --- | --- | --- |"
+        ]
+        for rule in self.get_rule_summary():
+            lines.append(f"| {rule['name']} (`{rule['rule_id']}`) | {rule['wcag_criterion']} | {rule['level']} | {rule['issues']} |")
+        lines.extend(["", "## 问题分组", ""])
+        out.write("\n".join(lines))
+        
+        for i, group in enumerate(groups, 1):
+            lines = [
+                "",
+                f"### {i}. {group['rule_name']} ({group['count']} 个问题, {group['pages']} 个页面)",
+                "",
+                f"**WCAG标准:** {group['wcag_criterion']} (级别 {group['level']})",
+                "",
+                f"**问题描述:** {group['message']}",
+                ""
+            ]
+            if group['signature']:
+                lines.append(f"**元素:** `{group['signature']}`")
+                lines.append("")
+            lines.append("**示例页面:**")
+            lines.append("")
+            for url in group['sample_urls']:
+                lines.append(f"- {url}")
+            out.write("\n".join(lines))
+            out.write("\n")
+        
+        out.write("\n*由 WCAG 2.2 验证器生成*")
+    
+    def _write_console(self, out, groups):
+        summary = self.summary
+        lines = [
+            "=" * 80,
+            "WCAG 2.2 站点验证摘要",
+            "=" * 80,
+            "",
+            f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            "",
+            "摘要:",
+            f"- 页面数: {summary['pages']}",
+            f"- 有问题的页面数: {summary['pages_with_issues']}",
+            f"- 总问题数: {summary['total_issues']}",
+            f"- A级问题: {summary['level_A_issues']}",
+            f"- AA级问题: {summary['level_AA_issues']}",
+            f"- AAA级问题: {summary['level_AAA_issues']}",
+            f"- 问题分组数: {self.group_count}",
+            "",
+            "按规则统计:"
+        ]
+        for rule in self.get_rule_summary():
+            lines.append(f"- {rule['rule_id']} ({rule['wcag_criterion']}, 级别 {rule['level']}): {rule['issues']}")
+        lines.extend(["", "问题分组:", "-" * 80])
+        out.write("\n".join(lines))
+        
+        for i, group in enumerate(groups, 1):
+            lines = [
+                "",
+                f"{i}. {group['rule_name']} - {group['count']} 个问题, {group['pages']} 个页面",
+                f"   WCAG标准: {group['wcag_criterion']} (级别 {group['level']})",
+                f"   问题描述: {group['message']}"
+            ]
+            if group['signature']:
+                lines.append(f"   元素: {group['signature']}")
+            lines.append("   示例页面:")
+            for url in group['sample_urls']:
+                lines.append(f"   - {url}")
+            out.write("\n".join(lines))
+            out.write("\n")
+        
+        out.write("\n由 WCAG 2.2 验证器生成")
+    
+    def _write_html(self, out, groups):
+        summary = self.summary
+        lines = [
+            "<!DOCTYPE html>",
+            "<html lang='zh-CN'>",
+            "<head>",
+            "    <meta charset='utf-8'>",
+            "    <title>WCAG 2.2 站点验证摘要</title>",
+            "    <style>",
+            "        body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 20px; color: #343a40; }",
+            "        table { border-collapse: collapse; width: 100%; margin-bottom: 20px; }",
+            "        th, td { border: 1px solid #ddd; padding: 8px; text-align: left; vertical-align: top; }",
+            "        th { background-color: #2c3e50; color: white; }",
+            "        code { font-family: monospace; word-break: break-all; }",
+            "    </style>",
+            "</head>",
+            "<body>",
+            "    <h1>WCAG 2.2 站点验证摘要</h1>",
+            f"    <p>生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>",
+            "    <h2>摘要</h2>",
+            "    <ul>",
+            f"        <li>页面数: {summary['pages']}</li>",
+            f"        <li>有问题的页面数: {summary['pages_with_issues']}</li>",
+            f"        <li>总问题数: {summary['total_issues']}</li>",
+            f"        <li>A级问题: {summary['level_A_issues']}</li>",
+            f"        <li>AA级问题: {summary['level_AA_issues']}</li>",
+            f"        <li>AAA级问题: {summary['level_AAA_issues']}</li>",
+            f"        <li>问题分组数: {self.group_count}</li>",
+            "    </ul>",
+            "    <h2>问题分组</h2>",
+            "    <table>",
+            "        <tr><th>#</th><th>规则</th><th>WCAG标准</th><th>问题描述</th><th>元素</th><th>问题数</th><th>页面数</th><th>示例页面</th></tr>"
+        ]
+        out.write("\n".join(lines))
+        
+        for i, group in enumerate(groups, 1):
+            samples = "<br>".join(html.escape(url) for url in group['sample_urls'])
+            out.write(
+                f"\n        <tr><td>{i}</td><td>{html.escape(group['rule_name'] or group['rule_id'])}</td>"
+                f"<td>{group['wcag_criterion']} ({group['level']})</td><td>{html.escape(group['message'])}</td>"
+                f"<td><code>{html.escape(group['signature'])}</code></td><td>{group['count']}</td>"
+                f"<td>{group['pages']}</td><td>{samples}</td></tr>"
+            )
+        
+        out.write("\n    </table>\n</body>\n</html>")
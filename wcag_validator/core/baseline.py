@@ -0,0 +1,203 @@
+"""
+基线对比模块，根据稳定的问题指纹区分新增问题和已修复问题
+"""
+import hashlib
+import json
+import os
+
+from ..utils.html_utils import element_signature, normalized_path
+
+# SARIF结果中保存指纹的partialFingerprints键
+SARIF_FINGERPRINT_KEY = "wcagFingerprint/v1"
+
+
+def issue_fingerprint(issue):
+    """
+    计算问题的稳定指纹
+    
+    指纹由规则ID、元素的规范化DOM路径、元素签名（标签和关键属性）以及问题代码和
+    参数组成（没有代码的问题使用问题描述），不依赖行号、列号和兄弟节点序号，也不
+    依赖输出语言，因此页面其他部分的改动或切换语言都不会改变指纹。
+    
+    参数:
+        issue: Issue对象
+    
+    返回:
+        十六进制字符串
+    """
+    if issue.code:
+        message = issue.code + json.dumps(issue.params, sort_keys=True, ensure_ascii=False, default=str)
+    else:
+        message = issue.description
+    raw = "\x1f".join([
+        issue.rule.id,
+        normalized_path(issue.element),
+        element_signature(issue.element),
+        message
+    ])
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def page_key(url, root=None):
+    """
+    页面在基线中的标识
+    
+    本地文件（file:// URL或文件路径）使用相对于root的POSIX风格路径，工作目录的
+    位置改变（如CI每次运行使用不同的检出目录）不影响匹配；相对路径被视为已经相对
+    于root。其他URL保持不变。
+    
+    参数:
+        url: 页面URL或文件路径
+        root: 本地文件的根目录，默认为当前工作目录
+    
+    返回:
+        字符串，没有URL时为空字符串
+    """
+    if not url:
+        return ""
+    if url.startswith('file://'):
+        path = url[len('file://'):]
+    elif '://' in url:
+        return url
+    else:
+        path = url
+    if os.path.isabs(path):
+        path = os.path.relpath(path, root or os.getcwd())
+    return os.path.normpath(path).replace(os.sep, '/')
+
+
+def _baseline_key(page, fingerprint):
+    """将页面标识和指纹合并为定长的哈希键，减少大基线的内存占用"""
+    return hashlib.blake2b(f"{page}\x1f{fingerprint}".encode('utf-8'), digest_size=16).digest()
+
+
+class Baseline:
+    """
+    问题基线
+    
+    加载上一次运行输出的JSON、JSON Lines或SARIF报告，将其中每个问题的
+    (页面, 指纹)放入哈希表。验证时每个问题只需一次哈希查找即可判断是否为已知问题，
+    两次运行的对比是线性的哈希连接。同一元素上指纹相同的多个问题按出现次数匹配。
+    本地文件按相对于root的路径匹配（见page_key）。
+    """
+    
+    def __init__(self, path, root=None):
+        """
+        加载基线文件
+        
+        参数:
+            path: 上一次运行输出的报告文件路径
+            root: 本地文件的根目录，默认为当前工作目录
+        """
+        self.path = path
+        self.root = root
+        self._pages = {}  # URL -> 页面标识，同一页面的问题只计算一次
+        self.known_issues = 0
+        self.suppressed = 0
+        self._remaining = {}
+        self._urls = set()
+        
+        for url, fingerprint, _ in self._iter_records():
+            key = _baseline_key(self._page(url), fingerprint)
+            self._remaining[key] = self._remaining.get(key, 0) + 1
+            self.known_issues += 1
+    
+    def __len__(self):
+        return self.known_issues
+    
+    def begin_page(self, url):
+        """
+        记录本次运行验证过的页面，只有这些页面的基线问题才可能被判定为已修复
+        
+        参数:
+            url: 页面URL
+        """
+        self._urls.add(self._page(url))
+    
+    def match(self, url, issue):
+        """
+        判断问题是否已存在于基线中，匹配成功时消耗一次计数
+        
+        参数:
+            url: 页面URL
+            issue: 已计算指纹的Issue对象
+        
+        返回:
+            布尔值
+        """
+        key = _baseline_key(self._page(url), issue.fingerprint)
+        count = self._remaining.get(key)
+        if not count:
+            return False
+        
+        self._remaining[key] = count - 1
+        self.suppressed += 1
+        return True
+    
+    def iter_fixed(self):
+        """
+        依次产生基线中存在、但本次运行未再出现的问题
+        
+        只考虑本次运行验证过的页面。基线文件会被再读一遍，内存中不保存问题详情。
+        
+        返回:
+            问题字典迭代器，包含url、fingerprint以及原记录中的规则和描述
+        """
+        remaining = dict(self._remaining)
+        for url, fingerprint, record in self._iter_records():
+            page = self._page(url)
+            if page not in self._urls:
+                continue
+            
+            key = _baseline_key(page, fingerprint)
+            if remaining.get(key):
+                remaining[key] -= 1
+                yield dict(record, url=url, fingerprint=fingerprint)
+    
+    def _page(self, url):
+        page = self._pages.get(url)
+        if page is None:
+            page = self._pages[url] = page_key(url, self.root)
+        return page
+    
+    def _iter_records(self):
+        """依次产生基线文件中的(url, 指纹, 问题记录)"""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            first_line = f.readline()
+            if not first_line.strip():
+                return
+            try:
+                first = json.loads(first_line)
+            except ValueError:
+                first = None
+            
+            if isinstance(first, dict) and 'fingerprint' in first:
+                # JSON Lines：每行一个问题
+                f.seek(0)
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        yield record.get('url'), record['fingerprint'], record
+                return
+            
+            f.seek(0)
+            data = json.load(f)
+        
+        if 'runs' in data:
+            # SARIF
+            for run in data['runs']:
+                for result in run.get('results', []):
+                    fingerprint = result.get('partialFingerprints', {}).get(SARIF_FINGERPRINT_KEY)
+                    if not fingerprint:
+                        continue
+                    locations = result.get('locations') or [{}]
+                    url = locations[0].get('physicalLocation', {}).get('artifactLocation', {}).get('uri')
+                    record = {"rule_id": result.get('ruleId'),
+                              "description": result.get('message', {}).get('text')}
+                    yield url or None, fingerprint, record
+        else:
+            # JSON报告
+            url = data.get('url')
+            for record in data.get('issues', []):
+                if record.get('fingerprint'):
+                    yield url, record['fingerprint'], record
@@ -0,0 +1,170 @@
+"""
+执行预算模块，限制单个规则和单个文档的耗时与访问的元素数
+"""
+import time
+
+from .profiler import ElementMeter
+
+
+class BudgetExceeded(Exception):
+    """规则或文档超出执行预算"""
+    
+    def __init__(self, scope, resource, limit):
+        """
+        参数:
+            scope: 'rule'或'document'
+            resource: 'time'或'elements'
+            limit: 超出的预算值
+        """
+        self.scope = scope
+        self.resource = resource
+        self.limit = limit
+        super().__init__(self.reason)
+    
+    @property
+    def reason(self):
+        """超出预算的原因描述"""
+        scope = "规则" if self.scope == 'rule' else "文档"
+        if self.resource == 'time':
+            return f"超出{scope}时间预算 ({self.limit}秒)"
+        return f"超出{scope}元素预算 ({self.limit}个元素)"
+
+
+class Budget:
+    """
+    执行预算
+    
+    规则超出单规则预算时被中止并标记为部分完成，其余规则继续执行；文档超出
+    总预算时当前规则被中止，其余规则不再执行，同样标记为部分完成。
+    """
+    
+    def __init__(self, rule_time=None, rule_elements=None, document_time=None, document_elements=None):
+        """
+        参数:
+            rule_time: 单个规则的最长耗时（秒）
+            rule_elements: 单个规则最多访问的元素数
+            document_time: 单个文档所有规则的最长总耗时（秒）
+            document_elements: 单个文档所有规则最多访问的元素总数
+        """
+        for name, value in (('rule_time', rule_time), ('rule_elements', rule_elements),
+                            ('document_time', document_time), ('document_elements', document_elements)):
+            if value is not None and value <= 0:
+                raise ValueError(f"预算{name}必须为正数")
+        
+        self.rule_time = rule_time
+        self.rule_elements = rule_elements
+        self.document_time = document_time
+        self.document_elements = document_elements
+    
+    def __bool__(self):
+        return any(value is not None for value in
+                   (self.rule_time, self.rule_elements, self.document_time, self.document_elements))
+    
+    def to_dict(self):
+        """转换为字典，只包含设置了的预算"""
+        return {
+            name: value for name, value in (
+                ('rule_time', self.rule_time), ('rule_elements', self.rule_elements),
+                ('document_time', self.document_time), ('document_elements', self.document_elements)
+            ) if value is not None
+        }
+
+
+class BudgetMeter(ElementMeter):
+    """
+    带预算检查的元素访问计数器
+    
+    规则遍历索引返回的元素列表时（以及名称服务遍历元素内容时）逐个计数，元素数超出
+    预算时立即中止；设置了时间预算时每访问一个元素都检查耗时，只访问少量元素但每个
+    元素工作量很大的规则同样会被中止。验证器在规则产生问题和规则结束时也会检查。
+    预算异常从规则的迭代中抛出，因此无需修改规则本身。
+    """
+    
+    def __init__(self, budget, clock=time.perf_counter):
+        """
+        参数:
+            budget: Budget对象
+            clock: 计时函数
+        """
+        super().__init__()
+        self.budget = budget
+        self.clock = clock
+        self.document_visited = 0  # 之前的规则访问的元素总数
+        self.document_started = clock()
+        self._document_deadline = None if budget.document_time is None \
+            else self.document_started + budget.document_time
+        self._rule_deadline = None  # 当前规则的截止时间
+        self._rule_limit = None  # 当前规则的元素上限（两种预算中较小的）
+        self._rule_scope = None
+        self._timed = budget.rule_time is not None or budget.document_time is not None
+    
+    def start_rule(self, rule):
+        """开始为规则计数，计算本规则的元素上限和截止时间"""
+        self.document_visited += self.visited
+        super().start_rule(rule)
+        budget = self.budget
+        
+        limits = []
+        if budget.rule_elements is not None:
+            limits.append((budget.rule_elements, 'rule'))
+        if budget.document_elements is not None:
+            limits.append((budget.document_elements - self.document_visited, 'document'))
+        self._rule_limit, self._rule_scope = min(limits, key=lambda item: item[0]) if limits else (None, None)
+        
+        self._rule_deadline = None if budget.rule_time is None else self.clock() + budget.rule_time
+    
+    def exclude(self, seconds):
+        """
+        从当前规则的耗时中扣除不属于规则本身的时间（如问题的位置和HTML计算），
+        文档预算仍按实际经过的时间计算
+        
+        参数:
+            seconds: 扣除的秒数
+        """
+        if self._rule_deadline is not None:
+            self._rule_deadline += seconds
+    
+    def tick(self):
+        """访问一个元素"""
+        self.visited += 1
+        if self._rule_limit is not None and self.visited > self._rule_limit:
+            self._raise_elements()
+        if self._timed:
+            self.check_time()
+    
+    def add(self, count):
+        """访问多个元素"""
+        self.visited += count
+        if self._rule_limit is not None and self.visited > self._rule_limit:
+            self._raise_elements()
+        self.check_time()
+    
+    def check_time(self):
+        """超出时间预算时抛出BudgetExceeded"""
+        if self._rule_deadline is None and self._document_deadline is None:
+            return
+        now = self.clock()
+        if self._document_deadline is not None and now > self._document_deadline:
+            raise BudgetExceeded('document', 'time', self.budget.document_time)
+        if self._rule_deadline is not None and now > self._rule_deadline:
+            raise BudgetExceeded('rule', 'time', self.budget.rule_time)
+    
+    def document_exhausted(self):
+        """
+        文档预算是否已用尽（用于跳过剩余规则）
+        
+        返回:
+            已用尽时返回BudgetExceeded对象，否则返回None
+        """
+        budget = self.budget
+        if budget.document_elements is not None and \
+                self.document_visited + self.visited >= budget.document_elements:
+            return BudgetExceeded('document', 'elements', budget.document_elements)
+        if self._document_deadline is not None and self.clock() >= self._document_deadline:
+            return BudgetExceeded('document', 'time', budget.document_time)
+        return None
+    
+    def _raise_elements(self):
+        if self._rule_scope == 'rule':
+            raise BudgetExceeded('rule', 'elements', self.budget.rule_elements)
+        raise BudgetExceeded('document', 'elements', self.budget.document_elements)
@@ -0,0 +1,158 @@
+"""
+检查点模块，批量验证时以追加方式记录已完成的来源，中断后可以跳过已完成的来源继续运行
+"""
+import hashlib
+import json
+import os
+
+from .records import RecordReport, report_to_record
+from .serializer import dumps
+
+# 检查点格式版本
+CHECKPOINT_VERSION = 1
+
+# 结果记录文件相对于检查点文件的后缀
+PARTIALS_SUFFIX = ".partials"
+
+
+def content_hash(data):
+    """计算内容的SHA-1哈希（字符串按UTF-8编码）"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha1(data).hexdigest()
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """计算文件内容的SHA-1哈希（按原始字节）"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Checkpoint:
+    """
+    批量验证的检查点
+    
+    由两个只追加的文件组成：检查点文件（JSON Lines）第一行为任务配置，之后每个已完成
+    的来源一行，记录其内容哈希和结果记录的位置；结果记录文件（检查点路径加.partials）
+    依次存放每个来源的结果记录（见records.report_to_record）。每个来源先写入结果记录，
+    再写入检查点行，进程在任何时刻中断都不会留下指向不完整结果的检查点行；中断时写了
+    一半的最后一行在恢复时被丢弃。
+    
+    恢复时，已完成的来源直接从结果记录重建报告，不再验证；本地文件的内容哈希与检查点
+    不一致（文件已修改）时重新验证。
+    """
+    
+    def __init__(self, path, config=None, resume=False):
+        """
+        参数:
+            path: 检查点文件路径
+            config: 任务配置字典，恢复时必须与检查点中的配置相同
+            resume: 是否从已有的检查点恢复，为False时清空已有的检查点
+        
+        异常:
+            ValueError: 恢复时检查点的配置与本次运行不同，或检查点格式无效
+        """
+        self.path = path
+        self.partials_path = path + PARTIALS_SUFFIX
+        self.config = config
+        self.entries = {}  # 来源 -> (内容哈希, 结果记录偏移量, 结果记录长度)
+        self.restored = 0  # 本次运行从检查点恢复的来源数
+        self._rules = {}  # 恢复的报告共享的规则信息
+        self._reader = None  # 读取结果记录的文件对象
+        
+        if resume and os.path.exists(path):
+            self._load()
+            self._file = open(path, 'a', encoding='utf-8')
+        else:
+            self._file = open(path, 'w', encoding='utf-8')
+            self._file.write(dumps({"version": CHECKPOINT_VERSION, "config": config}))
+            self._file.write('\n')
+            self._file.flush()
+            if os.path.exists(self.partials_path):
+                os.remove(self.partials_path)
+        self._partials = open(self.partials_path, 'ab')
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def restore(self, source):
+        """
+        从检查点恢复来源的报告
+        
+        参数:
+            source: 来源（文件路径或URL）
+        
+        返回:
+            RecordReport对象，来源未完成或本地文件已修改时返回None
+        """
+        entry = self.entries.get(source)
+        if entry is None:
+            return None
+        digest, offset, length = entry
+        if os.path.isfile(source) and file_hash(source) != digest:
+            return None
+        
+        if self._reader is None:
+            self._reader = open(self.partials_path, 'rb')
+        self._reader.seek(offset)
+        data = self._reader.read(length)
+        if len(data) != length:
+            return None
+        self.restored += 1
+        return RecordReport(json.loads(data), self._rules)
+    
+    def record(self, source, report, content):
+        """
+        记录一个已完成的来源
+        
+        参数:
+            source: 来源
+            report: 验证得到的ValidationReport对象
+            content: 被验证的源代码，用于计算URL的内容哈希；本地文件按记录时磁盘上的内容
+                计算（--fix修复后的文件在恢复时不会重新验证）
+        """
+        data = dumps(report_to_record(report, source)).encode('utf-8')
+        self._partials.seek(0, os.SEEK_END)
+        offset = self._partials.tell()
+        self._partials.write(data)
+        self._partials.write(b'\n')
+        self._partials.flush()
+        
+        digest = file_hash(source) if os.path.isfile(source) else content_hash(content)
+        self._file.write(dumps({"source": source, "sha1": digest, "at": [offset, len(data)]}))
+        self._file.write('\n')
+        self._file.flush()
+        self.entries[source] = (digest, offset, len(data))
+    
+    def close(self):
+        """关闭检查点文件"""
+        self._file.close()
+        self._partials.close()
+        if self._reader is not None:
+            self._reader.close()
+    
+    def _load(self):
+        """读取检查点，丢弃中断时写了一半的最后一行"""
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        complete = data.rfind(b'\n') + 1
+        if complete < len(data):
+            with open(self.path, 'r+b') as f:
+                f.truncate(complete)
+        
+        lines = data[:complete].decode('utf-8').splitlines()
+        if not lines:
+            raise ValueError(f"无效的检查点文件: {self.path}")
+        header = json.loads(lines[0])
+        if header.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"不支持的检查点版本: {header.get('version')}")
+        if self.config is not None and header.get("config") != json.loads(dumps(self.config)):
+            raise ValueError("检查点的任务配置（级别、规则、语言等）与本次运行不同，不能恢复")
+        
+        for line in lines[1:]:
+            entry = json.loads(line)
+            offset, length = entry["at"]
+            self.entries[entry["source"]] = (entry["sha1"], offset, length)
@@ -0,0 +1,109 @@
+"""
+继承上下文模块，自顶向下一次遍历计算每个元素从祖先继承的上下文
+"""
+
+# 显式role对应的地标角色
+LANDMARK_ROLES = {'banner', 'complementary', 'contentinfo', 'form', 'main', 'navigation', 'region', 'search'}
+
+# 隐式地标角色的元素（header和footer只在不属于其他地标时才是地标）
+IMPLICIT_LANDMARKS = {
+    'main': 'main',
+    'nav': 'navigation',
+    'aside': 'complementary',
+    'header': 'banner',
+    'footer': 'contentinfo',
+}
+
+
+class ElementContext:
+    """
+    元素从祖先继承的上下文（不含元素自身）
+    
+    属性均为最近的相应祖先元素，不存在时为None。上下文对象不可变，没有引入新
+    上下文的元素与其兄弟和子元素共享同一个对象。
+    """
+    
+    __slots__ = ('hidden_root', 'fieldset', 'label', 'form', 'landmark', 'landmark_role')
+    
+    def __init__(self, hidden_root=None, fieldset=None, label=None, form=None,
+                 landmark=None, landmark_role=None):
+        self.hidden_root = hidden_root  # 最近的aria-hidden="true"祖先
+        self.fieldset = fieldset  # 最近的fieldset祖先
+        self.label = label  # 最近的label祖先
+        self.form = form  # 最近的form祖先
+        self.landmark = landmark  # 最近的地标祖先
+        self.landmark_role = landmark_role  # 该地标的角色
+    
+    @property
+    def hidden(self):
+        """元素是否位于aria-hidden="true"的容器内"""
+        return self.hidden_root is not None
+    
+    def derive(self, element):
+        """
+        计算element的子元素继承的上下文
+        
+        参数:
+            element: 父元素
+        
+        返回:
+            ElementContext对象，element没有引入新上下文时返回自身
+        """
+        name = element.name
+        changes = {}
+        
+        if element.get('aria-hidden') == 'true':
+            changes['hidden_root'] = element
+        if name == 'fieldset':
+            changes['fieldset'] = element
+        elif name == 'label':
+            changes['label'] = element
+        elif name == 'form':
+            changes['form'] = element
+        
+        role = element.get('role')
+        role = role.strip().lower() if isinstance(role, str) else None
+        if role not in LANDMARK_ROLES:
+            role = IMPLICIT_LANDMARKS.get(name)
+            if role in ('banner', 'contentinfo') and self.landmark is not None:
+                role = None
+        if role:
+            changes['landmark'] = element
+            changes['landmark_role'] = role
+        
+        if not changes:
+            return self
+        
+        values = {slot: getattr(self, slot) for slot in self.__slots__}
+        values.update(changes)
+        return ElementContext(**values)
+
+
+EMPTY_CONTEXT = ElementContext()
+
+
+def build_contexts(elements):
+    """
+    自顶向下计算所有元素的继承上下文
+    
+    元素按文档顺序排列时父元素总在子元素之前，因此每个元素的上下文只需由
+    父元素的上下文和父元素自身推导，整个过程是一次线性遍历。
+    
+    参数:
+        elements: 按文档顺序排列的元素列表
+    
+    返回:
+        元素id -> ElementContext的字典
+    """
+    contexts = {}
+    child_contexts = {}  # 父元素id -> 其子元素继承的上下文
+    for element in elements:
+        parent = element.parent
+        key = id(parent)
+        context = child_contexts.get(key)
+        if context is None:
+            parent_context = contexts.get(key, EMPTY_CONTEXT)
+            context = parent_context.derive(parent) if getattr(parent, 'name', None) != '[document]' else parent_context
+            child_contexts[key] = context
+        contexts[id(element)] = context
+    return contexts
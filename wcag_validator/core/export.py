@@ -0,0 +1,178 @@
+"""
+列式导出模块，将验证结果按行组流式写入Parquet或紧凑CSV，便于导入数据仓库
+"""
+import csv
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow是可选依赖
+    pa = None
+    pq = None
+
+# 导出的列，以及其中使用字典编码的列
+COLUMNS = ['url', 'rule_id', 'wcag_criterion', 'level', 'impact', 'line', 'column', 'path', 'description']
+DICTIONARY_COLUMNS = ['url', 'rule_id', 'wcag_criterion', 'level', 'impact', 'description']
+INTEGER_COLUMNS = ['line', 'column']
+
+
+class ColumnarExporter:
+    """
+    列式导出器
+    
+    问题按行缓冲，每满row_group_size行写出一个行组。规则ID、WCAG标准、级别、
+    URL等重复度高的列使用字典编码：Parquet格式使用Arrow字典类型；CSV格式写入
+    整数编码，编码表追加写入旁路文件<path>.dict.csv（列名, 编码, 值）。
+    """
+    
+    def __init__(self, path, format=None, row_group_size=10000):
+        """
+        初始化导出器
+        
+        参数:
+            path: 输出文件路径
+            format: 'parquet'或'csv'，为None时根据扩展名判断
+            row_group_size: 每个行组的行数
+        """
+        if format is None:
+            format = 'parquet' if path.endswith('.parquet') else 'csv'
+        if format not in ('parquet', 'csv'):
+            raise ValueError(f"不支持的导出格式: {format}")
+        if format == 'parquet' and pa is None:
+            raise ImportError("导出Parquet需要安装pyarrow: pip install pyarrow")
+        
+        self.path = path
+        self.format = format
+        self.row_group_size = row_group_size
+        self.rows = 0
+        self._columns = {name: [] for name in COLUMNS}
+        self._buffered = 0
+        
+        if format == 'parquet':
+            dictionary_type = pa.dictionary(pa.int32(), pa.string())
+            self._schema = pa.schema([
+                (name, dictionary_type if name in DICTIONARY_COLUMNS else
+                 pa.int32() if name in INTEGER_COLUMNS else pa.string())
+                for name in COLUMNS
+            ])
+            self._writer = pq.ParquetWriter(path, self._schema, compression='zstd')
+        else:
+            self._file = open(path, 'w', encoding='utf-8', newline='')
+            self._dict_file = open(self.dictionary_path, 'w', encoding='utf-8', newline='')
+            self._writer = csv.writer(self._file)
+            self._dict_writer = csv.writer(self._dict_file)
+            self._writer.writerow(COLUMNS)
+            self._dict_writer.writerow(['column', 'code', 'value'])
+            self._codes = {name: {} for name in DICTIONARY_COLUMNS}
+    
+    @property
+    def dictionary_path(self):
+        """CSV格式的字典编码表路径"""
+        return self.path + '.dict.csv'
+    
+    def add_report(self, report):
+        """
+        添加一个页面的全部问题
+        
+        参数:
+            report: ValidationReport对象
+        """
+        url = report.url or ""
+        for issue in report.issues:
+            self.add_row(
+                url=url,
+                rule_id=issue.rule.id,
+                wcag_criterion=issue.rule.wcag_criterion,
+                level=issue.rule.level,
+                impact=issue.impact,
+                line=issue.line,
+                column=issue.column,
+                path=issue.path,
+                description=issue.description
+            )
+    
+    def add_row(self, **values):
+        """添加一行，缺少的列写入空值"""
+        for name in COLUMNS:
+            self._columns[name].append(values.get(name))
+        self._buffered += 1
+        self.rows += 1
+        
+        if self._buffered >= self.row_group_size:
+            self.flush()
+    
+    def flush(self):
+        """将缓冲的行写出为一个行组"""
+        if not self._buffered:
+            return
+        
+        if self.format == 'parquet':
+            arrays = [
+                pa.array(self._columns[name], type=pa.string()).dictionary_encode()
+                if name in DICTIONARY_COLUMNS else
+                pa.array(self._columns[name], type=field.type)
+                for name, field in zip(COLUMNS, self._schema)
+            ]
+            self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+        else:
+            encoded = [
+                self._encode_column(name) if name in DICTIONARY_COLUMNS else self._columns[name]
+                for name in COLUMNS
+            ]
+            self._writer.writerows(zip(*encoded))
+            self._file.flush()
+            self._dict_file.flush()
+        
+        self._columns = {name: [] for name in COLUMNS}
+        self._buffered = 0
+    
+    def close(self):
+        """写出剩余的行并关闭文件"""
+        self.flush()
+        if self.format == 'parquet':
+            self._writer.close()
+        else:
+            self._file.close()
+            self._dict_file.close()
+    
+    def _encode_column(self, name):
+        """将一列值替换为整数编码，新出现的值追加到编码表"""
+        codes = self._codes[name]
+        encoded = []
+        for value in self._columns[name]:
+            if value is None:
+                encoded.append("")
+                continue
+            
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(codes)
+                self._dict_writer.writerow([name, code, value])
+            encoded.append(code)
+        
+        return encoded
+
+
+def read_columnar_csv(path):
+    """
+    读取紧凑CSV导出文件，逐行还原字典编码的值
+    
+    参数:
+        path: 导出文件路径
+    
+    返回:
+        行字典迭代器
+    """
+    dictionaries = {name: {} for name in DICTIONARY_COLUMNS}
+    with open(path + '.dict.csv', 'r', encoding='utf-8', newline='') as f:
+        for name, code, value in csv.reader(f):
+            if name in dictionaries:
+                dictionaries[name][code] = value
+    
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            for name in DICTIONARY_COLUMNS:
+                row[name] = dictionaries[name].get(row[name])
+            for name in INTEGER_COLUMNS:
+                row[name] = int(row[name]) if row[name] else None
+            yield row
@@ -0,0 +1,174 @@
+"""
+焦点顺序模块，一次遍历计算文档中可聚焦元素、顺序焦点导航（Tab）顺序和交互控件的嵌套关系
+"""
+import re
+
+# 可交互的ARIA控件角色
+WIDGET_ROLES = {
+    'button', 'checkbox', 'combobox', 'gridcell', 'link', 'listbox', 'menuitem',
+    'menuitemcheckbox', 'menuitemradio', 'option', 'radio', 'scrollbar', 'searchbox',
+    'slider', 'spinbutton', 'switch', 'tab', 'textbox', 'treeitem',
+}
+
+# 按规范可以包含其他控件的控件角色（组合控件及其单元格、树节点）
+COMPOSITE_ROLES = {'combobox', 'gridcell', 'listbox', 'treeitem'}
+
+# 可以被disabled属性禁用的表单控件
+DISABLEABLE_TAGS = {'button', 'input', 'select', 'textarea'}
+
+# 内容只作为后备内容或选项的交互元素，不视为嵌套其他控件的容器
+FALLBACK_TAGS = {'audio', 'video', 'iframe', 'embed', 'select', 'textarea'}
+
+# 不渲染内容的元素，其后代不可聚焦
+INERT_TAGS = {'template', 'noscript', 'script', 'style'}
+
+_TABINDEX_RE = re.compile(r'^\s*[+-]?\d+\s*$')
+
+
+def parse_tabindex(value):
+    """
+    解析tabindex属性值
+    
+    参数:
+        value: 属性值，不存在时为None
+    
+    返回:
+        整数，值无效或不存在时返回None（与浏览器一样忽略无效值）
+    """
+    if not isinstance(value, str) or not _TABINDEX_RE.match(value):
+        return None
+    return int(value)
+
+
+class FocusOrder:
+    """
+    文档的焦点顺序索引
+    
+    自顶向下一次遍历文档，记录每个元素是否可聚焦、是否在Tab顺序中，以及最近的交互
+    控件祖先；Tab顺序按HTML规范排序：正数tabindex按数值升序（相同数值按文档顺序）
+    排在前面，其后是tabindex为0或原生可聚焦的元素（按文档顺序）。所有键盘相关规则
+    共享同一份结果。
+    """
+    
+    def __init__(self, elements):
+        """
+        参数:
+            elements: 按文档顺序排列的所有元素
+        """
+        self.focusable = []  # 可聚焦的元素（含tabindex为负数的元素），按文档顺序
+        self.tab_order = []  # 顺序焦点导航顺序
+        self.positive = []  # tabindex为正数的元素，按Tab顺序
+        self.nested = []  # (交互控件, 嵌套在其中的第一个可聚焦或交互元素)，按文档顺序
+        self._tabindex = {}  # 元素id -> 有效的tabindex
+        self._focusable = set()  # 可聚焦元素的id
+        self._positions = None  # 元素id -> Tab顺序中的位置
+        
+        zero = []
+        nested = {}  # 交互控件的id -> (控件, 第一个嵌套的元素)
+        # 元素id -> (不渲染, 被禁用的fieldset内, 最近的交互控件祖先)，没有改变状态的元素共享父元素的元组
+        states = {}
+        root = (False, False, None)
+        
+        for element in elements:
+            state = states.get(id(element.parent), root)
+            inert, disabled, container = state
+            name = element.name
+            
+            if not inert and (name in INERT_TAGS or element.has_attr('hidden') or element.has_attr('inert')):
+                inert = True
+            own_disabled = disabled or (name in DISABLEABLE_TAGS and element.has_attr('disabled'))
+            
+            tabindex = parse_tabindex(element.get('tabindex'))
+            if tabindex is not None:
+                self._tabindex[id(element)] = tabindex
+            
+            focusable = False
+            if not inert and not (own_disabled and name in DISABLEABLE_TAGS):
+                focusable = tabindex is not None or _natively_focusable(element)
+            if focusable:
+                self.focusable.append(element)
+                self._focusable.add(id(element))
+                if tabindex is None or tabindex == 0:
+                    zero.append(element)
+                elif tabindex > 0:
+                    self.positive.append(element)
+            
+            interactive = is_interactive(element)
+            if container is not None and (interactive or focusable) and id(container) not in nested:
+                nested[id(container)] = (container, element)
+            
+            # 子元素继承的状态
+            if name == 'fieldset' and element.has_attr('disabled'):
+                disabled = True
+            if interactive and name not in FALLBACK_TAGS and element.get('role', '').strip().lower() not in COMPOSITE_ROLES:
+                container = element
+            if inert is not state[0] or disabled is not state[1] or container is not state[2]:
+                state = (inert, disabled, container)
+            states[id(element)] = state
+        
+        # sorted是稳定排序，相同tabindex的元素保持文档顺序
+        self.positive.sort(key=lambda element: self._tabindex[id(element)])
+        self.tab_order = self.positive + zero
+        self.nested = list(nested.values())
+    
+    def tabindex(self, element):
+        """元素的有效tabindex，没有或无效时返回None"""
+        return self._tabindex.get(id(element))
+    
+    def is_focusable(self, element):
+        """元素是否可聚焦（包括只能通过脚本聚焦的tabindex为负数的元素）"""
+        return id(element) in self._focusable
+    
+    def is_tabbable(self, element):
+        """元素是否在Tab顺序中"""
+        return self.position(element) is not None
+    
+    def position(self, element):
+        """
+        元素在Tab顺序中的位置
+        
+        参数:
+            element: 文档中的元素
+        
+        返回:
+            从0开始的位置，不在Tab顺序中时返回None
+        """
+        if self._positions is None:
+            self._positions = {id(item): i for i, item in enumerate(self.tab_order)}
+        return self._positions.get(id(element))
+
+
+def is_interactive(element):
+    """元素是否为交互控件（原生交互元素或带有控件角色）"""
+    name = element.name
+    if name in ('a', 'area'):
+        if element.has_attr('href'):
+            return True
+    elif name == 'input':
+        if element.get('type', '').strip().lower() != 'hidden':
+            return True
+    elif name in ('button', 'select', 'textarea', 'iframe', 'embed'):
+        return True
+    elif name in ('audio', 'video'):
+        if element.has_attr('controls'):
+            return True
+    role = element.get('role')
+    return isinstance(role, str) and role.strip().lower() in WIDGET_ROLES
+
+
+def _natively_focusable(element):
+    """元素是否原生可聚焦（不考虑tabindex、禁用和隐藏）"""
+    name = element.name
+    if name in ('a', 'area'):
+        return element.has_attr('href')
+    if name == 'input':
+        return element.get('type', '').strip().lower() != 'hidden'
+    if name in ('button', 'select', 'textarea', 'iframe', 'embed'):
+        return True
+    if name in ('audio', 'video'):
+        return element.has_attr('controls')
+    if name == 'summary':
+        parent = element.parent
+        return parent is not None and parent.name == 'details' and parent.find('summary', recursive=False) is element
+    editable = element.get('contenteditable')
+    return isinstance(editable, str) and editable.strip().lower() in ('', 'true', 'plaintext-only')
@@ -0,0 +1,208 @@
+"""
+文档索引模块，一次遍历DOM树，为规则引擎和规则提供共享的元素索引
+"""
+from .accname import AccessibleNameService
+from .context import EMPTY_CONTEXT, build_contexts
+from .focus import FocusOrder
+from .selectors import compile_selector
+
+# aria-hidden="true"的容器中不应包含的交互控件
+HIDDEN_INTERACTIVE_TAGS = ('a', 'button', 'input', 'select', 'textarea')
+
+class DocumentIndex:
+    """文档索引，按标签名和属性名记录元素（保持文档顺序）"""
+    
+    def __init__(self, document):
+        """
+        初始化文档索引
+        
+        参数:
+            document: BeautifulSoup文档对象
+        """
+        self.document = document
+        self.elements = []  # 所有元素，按文档顺序
+        self.by_tag = {}  # 标签名 -> 元素列表
+        self.by_attr = {}  # 属性名 -> 元素列表
+        self._contexts = None  # 元素id -> 继承上下文，首次使用时计算
+        self._labels_for = None  # for属性值 -> 对应的label列表
+        self._ids = None  # id -> 第一个使用该id的元素
+        self._names = None  # 无障碍名称服务
+        self._focus = None  # 焦点顺序索引
+        self._hidden_interactive = None  # 包含交互控件的aria-hidden="true"容器的id集合
+        self.meter = None  # 可选的ElementMeter，设置后按规则统计访问的元素数
+        
+        for element in document.find_all(True):
+            self.elements.append(element)
+            self.by_tag.setdefault(element.name, []).append(element)
+            for attr in element.attrs:
+                self.by_attr.setdefault(attr, []).append(element)
+    
+    @classmethod
+    def for_document(cls, document):
+        """
+        获取文档的索引，同一文档只构建一次
+        
+        参数:
+            document: BeautifulSoup文档对象
+        
+        返回:
+            DocumentIndex对象
+        """
+        # 直接读取__dict__，避免BeautifulSoup把未知属性当作子标签查找
+        index = document.__dict__.get('_wcag_index')
+        if index is None:
+            index = cls(document)
+            document._wcag_index = index
+        return index
+    
+    def has_tag(self, name):
+        """文档中是否存在指定标签"""
+        return name in self.by_tag
+    
+    def has_attr(self, name):
+        """文档中是否存在带有指定属性的元素"""
+        return name in self.by_attr
+    
+    def elements_by_tag(self, *names):
+        """
+        按标签名获取元素
+        
+        参数:
+            names: 一个或多个标签名
+        
+        返回:
+            元素列表（多个标签名时按文档顺序合并）
+        """
+        if len(names) == 1:
+            elements = self.by_tag.get(names[0], [])
+        else:
+            wanted = set(names)
+            elements = [element for element in self.elements if element.name in wanted]
+        return self.meter.wrap(elements) if self.meter is not None else elements
+    
+    def elements_with_attr(self, name):
+        """获取带有指定属性的元素列表"""
+        elements = self.by_attr.get(name, [])
+        return self.meter.wrap(elements) if self.meter is not None else elements
+    
+    def select(self, selector):
+        """
+        获取匹配CSS选择器的元素，只对索引中的候选元素执行匹配
+        
+        参数:
+            selector: CSS选择器字符串或CompiledSelector对象（已编译的选择器会被缓存）
+        
+        返回:
+            按文档顺序排列的元素列表
+        """
+        selector = compile_selector(selector)
+        if self.meter is not None:
+            # 选择器对每个候选元素执行一次匹配
+            self.meter.add(len(selector.candidates(self)))
+        return selector.select(self)
+    
+    def context(self, element):
+        """
+        获取元素从祖先继承的上下文（aria-hidden容器、fieldset、label、form和地标）
+        
+        所有元素的上下文在首次调用时一次性自顶向下计算，之后每次查询为O(1)。
+        
+        参数:
+            element: 文档中的元素
+        
+        返回:
+            ElementContext对象
+        """
+        if self._contexts is None:
+            if self.meter is not None:
+                # 上下文的计算遍历文档中的每个元素
+                self.meter.add(len(self.elements))
+            self._contexts = build_contexts(self.elements)
+        return self._contexts.get(id(element), EMPTY_CONTEXT)
+    
+    def label_for(self, control_id):
+        """
+        获取for属性指向control_id的第一个label元素
+        
+        参数:
+            control_id: 控件的id
+        
+        返回:
+            label元素，不存在时返回None
+        """
+        labels = self.labels_for(control_id)
+        return labels[0] if labels else None
+    
+    def labels_for(self, control_id):
+        """
+        获取for属性指向control_id的所有label元素
+        
+        参数:
+            control_id: 控件的id
+        
+        返回:
+            label元素列表（按文档顺序）
+        """
+        if self._labels_for is None:
+            self._labels_for = {}
+            for label in self.by_tag.get('label', []):
+                target = label.get('for')
+                if target is not None:
+                    self._labels_for.setdefault(target, []).append(label)
+        return self._labels_for.get(control_id, [])
+    
+    def element_by_id(self, element_id):
+        """
+        获取第一个使用指定id的元素
+        
+        参数:
+            element_id: id属性值
+        
+        返回:
+            元素，不存在时返回None
+        """
+        if self._ids is None:
+            self._ids = {}
+            for element in self.by_attr.get('id', []):
+                self._ids.setdefault(element['id'], element)
+        return self._ids.get(element_id)
+    
+    def hides_interactive(self, container):
+        """
+        判断aria-hidden="true"的容器中是否包含交互控件（a、button、input、select、textarea）
+        
+        首次调用时每个交互控件沿继承上下文向外标记包含它的容器，已标记的容器（及其外层
+        容器）不再重复处理。aria-usage和focusable-hidden规则共享结果，避免同一缺陷报告两次。
+        
+        参数:
+            container: aria-hidden="true"的元素
+        
+        返回:
+            是否包含交互控件
+        """
+        if self._hidden_interactive is None:
+            marked = set()
+            for control in self.elements_by_tag(*HIDDEN_INTERACTIVE_TAGS):
+                hidden_root = self.context(control).hidden_root
+                while hidden_root is not None and id(hidden_root) not in marked:
+                    marked.add(id(hidden_root))
+                    hidden_root = self.context(hidden_root).hidden_root
+            self._hidden_interactive = marked
+        return id(container) in self._hidden_interactive
+    
+    @property
+    def names(self):
+        """文档的无障碍名称服务，计算结果在文档生命周期内缓存"""
+        if self._names is None:
+            self._names = AccessibleNameService(self)
+        return self._names
+    
+    @property
+    def focus(self):
+        """文档的焦点顺序索引（FocusOrder），首次使用时一次遍历计算，所有键盘相关规则共享"""
+        if self._focus is None:
+            if self.meter is not None:
+                # 焦点顺序的计算遍历文档中的每个元素
+                self.meter.add(len(self.elements))
+            self._focus = FocusOrder(self.elements)
+        return self._focus
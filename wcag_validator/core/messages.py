@@ -0,0 +1,302 @@
+"""
+消息目录模块，问题只携带代码和参数，描述、修复建议和代码示例在输出时按语言从共享的目录中生成
+"""
+import copy
+import re
+import string
+import sys
+
+from ..utils.html_utils import attribute_value
+
+# 默认语言，规则定义中的文本使用该语言
+DEFAULT_LOCALE = "zh-CN"
+
+# 内置消息提供的语言
+LOCALES = ("zh-CN", "en")
+
+# 没有结束标签的元素
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+    'meta', 'param', 'source', 'track', 'wbr',
+}
+
+class Message:
+    """一条消息的模板：描述、修复建议、get_fix_suggestions的建议和代码示例"""
+    
+    __slots__ = ('code', 'locale', 'text', 'fix', 'suggestions', 'examples')
+    
+    def __init__(self, code, locale, text, fix=(), suggestions=None, examples=()):
+        """
+        参数:
+            code: 问题代码
+            locale: 语言代码
+            text: 问题描述模板
+            fix: 问题自带的修复建议模板
+            suggestions: 规则get_fix_suggestions返回的建议模板，默认同fix
+            examples: 代码示例字典列表，见Example
+        """
+        self.code = code
+        self.locale = locale
+        self.text = _intern(text)
+        self.fix = tuple(_intern(item) for item in fix)
+        self.suggestions = self.fix if suggestions is None else tuple(_intern(item) for item in suggestions)
+        self.examples = tuple(Example(example) for example in examples)
+        if not self.fix:
+            self.fix = self.suggestions
+
+
+class Example:
+    """
+    代码示例模板
+    
+    示例字典包含code、可选的description，以及以下可选项：
+    
+    - omit: {attributes}中排除的问题元素属性
+    - strip: 从问题元素及其所有后代中移除的属性，影响{html}、{inner}和{attributes}
+    - set: 在问题元素上设置的属性（属性名 -> 值），影响{html}和{attributes}
+    - each: {"param", "code", "join"}，对列表参数param中的每一项（参数字典）格式化code
+      并以join连接，结果作为{each}；code可以是模板列表，使用第一个所引用的项参数都不为空
+      的模板，例如控件有id时用<label for>，没有id时用包含控件的<label>
+    """
+    
+    __slots__ = ('code', 'description', 'omit', 'strip', 'set', 'each')
+    
+    def __init__(self, spec):
+        self.code = _intern(spec["code"])
+        self.description = _intern(spec.get("description", ""))
+        self.omit = tuple(spec.get("omit", ()))
+        self.strip = tuple(spec.get("strip", ()))
+        self.set = dict(spec.get("set", {}))
+        self.each = None
+        each = spec.get("each")
+        if each is not None:
+            templates = each["code"] if isinstance(each["code"], (list, tuple)) else [each["code"]]
+            self.each = (
+                each["param"],
+                tuple((_intern(template), _field_names(template)) for template in templates),
+                each.get("join", "\n")
+            )
+    
+    def render(self, params=None, element=None):
+        """
+        格式化示例
+        
+        返回:
+            {"code", "description"}字典
+        """
+        if element is not None and (self.strip or self.set):
+            element = _edited_copy(element, self.strip, self.set)
+        if self.each is not None:
+            name, templates, join = self.each
+            params = dict(params or ())
+            parts = []
+            for item in params.get(name) or ():
+                template = next(
+                    (template for template, fields in templates if all(item.get(field) for field in fields if field in item)),
+                    templates[-1][0]
+                )
+                parts.append(_format(template, dict(params, **item), element))
+            params["each"] = join.join(parts)
+        return {
+            "code": _format(self.code, params, element, self.omit),
+            "description": _format(self.description, params, element, self.omit)
+        }
+
+
+class MessageCatalogue:
+    """
+    消息目录
+    
+    每个问题代码在每种语言下对应一条Message，模板字符串经过驻留，所有问题共享同一份
+    文本；不含参数的模板直接返回共享的字符串，含参数的模板在输出时才格式化。
+    """
+    
+    def __init__(self, default_locale=DEFAULT_LOCALE):
+        """
+        参数:
+            default_locale: 请求的语言中没有某条消息时回退的语言
+        """
+        self.default_locale = default_locale
+        self._messages = {}  # 语言 -> {代码: Message}
+    
+    @property
+    def locales(self):
+        """目录中包含消息的语言"""
+        return sorted(self._messages)
+    
+    def __contains__(self, code):
+        return any(code in messages for messages in self._messages.values())
+    
+    def define(self, code, entry, locale=None):
+        """
+        定义一条消息，同一代码和语言的已有消息被替换
+        
+        参数:
+            code: 问题代码
+            entry: 包含message、fix、suggestions、examples的字典（与声明式规则的spec格式相同）
+            locale: 语言代码，默认为目录的默认语言
+        
+        返回:
+            Message对象
+        """
+        locale = locale or self.default_locale
+        message = Message(
+            code, locale, entry["message"],
+            fix=entry.get("fix", ()),
+            suggestions=entry.get("suggestions"),
+            examples=entry.get("examples", ())
+        )
+        self._messages.setdefault(locale, {})[code] = message
+        return message
+    
+    def update(self, messages):
+        """
+        批量定义消息
+        
+        参数:
+            messages: {语言: {代码: 消息字典}}
+        """
+        for locale, entries in messages.items():
+            for code, entry in entries.items():
+                self.define(code, entry, locale)
+    
+    def get(self, code, locale=None):
+        """
+        查找消息，依次尝试请求的语言、其主语言（如en-US的en）和默认语言
+        
+        参数:
+            code: 问题代码
+            locale: 语言代码，默认为目录的默认语言
+        
+        返回:
+            Message对象，代码不存在时返回None
+        """
+        locale = locale or self.default_locale
+        for candidate in (locale, locale.split('-')[0], self.default_locale):
+            message = self._messages.get(candidate, {}).get(code)
+            if message is not None:
+                return message
+        return None
+    
+    def render(self, code, params=None, element=None, locale=None):
+        """
+        生成问题描述
+        
+        参数:
+            code: 问题代码
+            params: 模板参数
+            element: 问题元素，模板可以引用其标签、属性和HTML
+            locale: 语言代码，默认为目录的默认语言
+        
+        返回:
+            描述字符串，代码不存在时返回代码本身
+        """
+        message = self.get(code, locale)
+        if message is None:
+            return code
+        return _format(message.text, params, element)
+    
+    def fix_suggestions(self, code, params=None, element=None, locale=None):
+        """生成问题的修复建议列表"""
+        message = self.get(code, locale)
+        if message is None:
+            return []
+        return [_format(item, params, element) for item in message.fix]
+    
+    def suggestions(self, code, params=None, element=None, locale=None):
+        """生成规则get_fix_suggestions返回的建议列表"""
+        message = self.get(code, locale)
+        if message is None:
+            return []
+        return [_format(item, params, element) for item in message.suggestions]
+    
+    def code_examples(self, code, params=None, element=None, locale=None):
+        """生成问题的代码示例列表（{"code", "description"}字典）"""
+        message = self.get(code, locale)
+        if message is None:
+            return []
+        return [example.render(params, element) for example in message.examples]
+
+
+# 所有规则共享的消息目录
+catalogue = MessageCatalogue()
+
+
+class TemplateValues(dict):
+    """
+    模板参数，缺少的参数替换为空字符串
+    
+    除问题参数外，模板还可以引用问题元素的{tag}、{attrs[名称]}、{attributes}（全部属性，
+    示例中可用omit排除）、{html}、{inner}（内部HTML）、{text}和{end_tag}（空元素为空），
+    这些值只在模板引用时才计算。
+    """
+    
+    def __init__(self, params, element=None, omit=()):
+        super().__init__(params or ())
+        self.element = element
+        self.omit = omit
+    
+    def __missing__(self, key):
+        element = self.element
+        if element is None:
+            return ""
+        if key == "tag":
+            value = element.name
+        elif key == "attrs":
+            value = _AttrValues(element)
+        elif key == "attributes":
+            value = " ".join(f'{k}="{attribute_value(element, k)}"' for k in element.attrs if k not in self.omit)
+        elif key == "html":
+            value = str(element)
+        elif key == "inner":
+            value = element.decode_contents()
+        elif key == "text":
+            value = element.get_text()
+        elif key == "end_tag":
+            value = "" if element.name in VOID_ELEMENTS else f"</{element.name}>"
+        else:
+            return ""
+        self[key] = value
+        return value
+
+
+class _AttrValues:
+    """模板中的{attrs[名称]}，属性不存在时为空字符串"""
+    
+    def __init__(self, element):
+        self.element = element
+    
+    def __getitem__(self, name):
+        return attribute_value(self.element, name, "")
+
+
+def _format(template, params, element, omit=()):
+    """格式化模板，不含参数的模板直接返回共享的字符串"""
+    if '{' not in template:
+        return template
+    return template.format_map(TemplateValues(params, element, omit))
+
+
+def _field_names(template):
+    """模板引用的参数名（{attrs[id]}等取attrs）"""
+    names = set()
+    for _, field, _, _ in string.Formatter().parse(template):
+        if field:
+            names.add(re.split(r'[.\[]', field, 1)[0])
+    return names
+
+
+def _edited_copy(element, strip, attributes):
+    """复制元素，从元素及其后代中移除strip中的属性，并在元素上设置attributes"""
+    element = copy.copy(element)
+    if strip:
+        for node in [element] + element.find_all(True):
+            for name in strip:
+                node.attrs.pop(name, None)
+    for name, value in attributes.items():
+        element[name] = value
+    return element
+
+
+def _intern(text):
+    return sys.intern(text) if isinstance(text, str) else text
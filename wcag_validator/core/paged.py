@@ -0,0 +1,390 @@
+"""
+分页HTML报告模块，生成一个体积固定的外壳页面和分块数据文件，适合问题数量巨大的报告
+"""
+import html
+import os
+from datetime import datetime
+
+from .serializer import dumps
+from .writers import BufferedTextWriter, DEFAULT_BUFFER_SIZE
+
+DEFAULT_CHUNK_SIZE = 1000  # 每个数据块的问题数
+
+DATA_DIR = 'data'
+
+# 外壳页面模板。数据文件以<script>方式加载（JSONP），因此直接用file://打开也能工作
+SHELL_TEMPLATE = """<!DOCTYPE html>
+<html lang='zh-CN'>
+<head>
+    <meta charset='utf-8'>
+    <meta name='viewport' content='width=device-width, initial-scale=1'>
+    <title>WCAG 2.2 验证报告</title>
+    <style>
+        body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 0; background: #f5f5f5; color: #343a40; }
+        .container { max-width: 1200px; margin: 0 auto; padding: 20px; }
+        header { background: #2c3e50; color: white; padding: 20px; border-radius: 5px; margin-bottom: 20px; }
+        h1, h2 { margin-top: 0; }
+        .summary-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(150px, 1fr)); gap: 10px; margin-bottom: 20px; }
+        .summary-item { padding: 10px; border-radius: 5px; text-align: center; color: white; background: #2c3e50; }
+        .summary-item.level-A { background: #e74c3c; }
+        .summary-item.level-AA { background: #f39c12; }
+        .summary-item.level-AAA { background: #3498db; }
+        .summary-item strong { display: block; font-size: 1.5em; }
+        .filters { display: flex; flex-wrap: wrap; gap: 10px; align-items: center; background: white; padding: 10px; border-radius: 5px; margin-bottom: 10px; }
+        .filters input[type=text] { flex: 1; min-width: 200px; }
+        .pager { display: flex; gap: 10px; align-items: center; margin-bottom: 10px; }
+        #viewport { height: 60vh; overflow-y: auto; position: relative; background: white; border-radius: 5px; }
+        #spacer { position: relative; }
+        .row { position: absolute; left: 0; right: 0; height: 32px; line-height: 32px; padding: 0 10px; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; border-bottom: 1px solid #eee; cursor: pointer; box-sizing: border-box; }
+        .row:hover, .row.selected { background: #eef5fb; }
+        .badge { display: inline-block; min-width: 40px; text-align: center; border-radius: 3px; color: white; font-size: 0.8em; line-height: 20px; margin-right: 8px; }
+        .badge.level-A { background: #e74c3c; }
+        .badge.level-AA { background: #f39c12; }
+        .badge.level-AAA { background: #3498db; }
+        .url { color: #888; margin-left: 8px; }
+        #detail { background: white; border-radius: 5px; padding: 15px; margin-top: 10px; }
+        #detail pre { background: #f8f9fa; padding: 10px; white-space: pre-wrap; word-break: break-all; }
+    </style>
+</head>
+<body>
+    <div class='container'>
+        <header>
+            <h1>WCAG 2.2 验证报告</h1>
+            <p>生成时间: $timestamp</p>
+        </header>
+        <div class='summary-grid'>
+            <div class='summary-item'><strong>$pages</strong>页面数</div>
+            <div class='summary-item'><strong>$total_issues</strong>总问题数</div>
+            <div class='summary-item level-A'><strong>$level_A_issues</strong>A级问题</div>
+            <div class='summary-item level-AA'><strong>$level_AA_issues</strong>AA级问题</div>
+            <div class='summary-item level-AAA'><strong>$level_AAA_issues</strong>AAA级问题</div>
+        </div>
+        <div class='filters'>
+            <label>级别 <select id='level'><option value=''>全部</option><option>A</option><option>AA</option><option>AAA</option></select></label>
+            <label>规则 <select id='rule'><option value=''>全部</option></select></label>
+            <input type='text' id='url' placeholder='按URL过滤（包含）' aria-label='按URL过滤'>
+            <label>每页 <select id='page-size'><option>100</option><option selected>1000</option><option>5000</option></select></label>
+        </div>
+        <div class='pager'>
+            <button id='prev'>上一页</button>
+            <span id='status' aria-live='polite'>正在加载…</span>
+            <button id='next'>下一页</button>
+        </div>
+        <div id='viewport'><div id='spacer'></div></div>
+        <div id='detail' hidden></div>
+    </div>
+    <script>
+    (function () {
+        var ROW_HEIGHT = 32, OVERSCAN = 10, MAX_CACHED_CHUNKS = 20, DATA = '$data_dir/';
+        var manifest = null, chunks = {}, cached = [], waiting = {};
+        var rows = [], page = 0, pageSize = 1000, scan = null, selected = -1;
+        var byId = function (id) { return document.getElementById(id); };
+        
+        window.wcagReport = {
+            manifest: function (data) { manifest = data; init(); },
+            chunk: function (index, data) {
+                // 只缓存最近加载的数据块，避免扫描大报告时占用过多内存
+                chunks[index] = data;
+                cached.push(index);
+                if (cached.length > MAX_CACHED_CHUNKS) { delete chunks[cached.shift()]; }
+                (waiting[index] || []).forEach(function (fn) { fn(data); });
+                delete waiting[index];
+            }
+        };
+        
+        function load(src) {
+            var script = document.createElement('script');
+            script.src = DATA + src;
+            document.body.appendChild(script);
+        }
+        
+        function loadChunk(index, fn) {
+            if (chunks[index]) { fn(chunks[index]); return; }
+            if (!waiting[index]) { waiting[index] = []; load('chunk-' + ('00000' + index).slice(-6) + '.js'); }
+            waiting[index].push(fn);
+        }
+        
+        function filters() {
+            return { level: byId('level').value, rule: byId('rule').value, url: byId('url').value.trim() };
+        }
+        
+        function matches(row, f) {
+            var rule = manifest.rules[row[1]];
+            return (!f.level || rule[2] === f.level) && (!f.rule || row[1] === f.rule) &&
+                (!f.url || row[0].indexOf(f.url) !== -1);
+        }
+        
+        function chunkMayMatch(info, f) {
+            return (!f.level || info.levels.indexOf(f.level) !== -1) && (!f.rule || info.rules.indexOf(f.rule) !== -1);
+        }
+        
+        // 无过滤条件时按全局序号直接定位数据块；有过滤条件时按顺序扫描，跳过不可能匹配的数据块
+        function showPage() {
+            var f = filters(), start = page * pageSize, end = start + pageSize;
+            if (!f.level && !f.rule && !f.url) {
+                scan = null;
+                var first = Math.floor(start / manifest.chunk_size);
+                var last = Math.min(Math.ceil(Math.min(end, manifest.total) / manifest.chunk_size), manifest.chunks.length);
+                var parts = [], pending = last - first;
+                if (pending <= 0) { render([], manifest.total); return; }
+                for (var i = first; i < last; i++) {
+                    loadChunk(i, (function (position) {
+                        return function (data) {
+                            parts[position] = data;
+                            if (--pending) { return; }
+                            var offset = start - first * manifest.chunk_size;
+                            render([].concat.apply([], parts).slice(offset, offset + pageSize), manifest.total);
+                        };
+                    })(i - first));
+                }
+                return;
+            }
+            var key = JSON.stringify(f);
+            if (!scan || scan.key !== key) { scan = { key: key, next: 0, found: [] }; }
+            var current = scan;
+            (function step() {
+                if (current !== scan) { return; }
+                while (current.found.length < end && current.next < manifest.chunks.length &&
+                        !chunkMayMatch(manifest.chunks[current.next], f)) { current.next++; }
+                if (current.found.length >= end || current.next >= manifest.chunks.length) {
+                    var done = current.next >= manifest.chunks.length;
+                    render(current.found.slice(start, end), done ? current.found.length : null);
+                    return;
+                }
+                var index = current.next++;
+                byId('status').textContent = '正在扫描数据块 ' + (index + 1) + '/' + manifest.chunks.length + '…';
+                loadChunk(index, function (data) {
+                    for (var i = 0; i < data.length; i++) { if (matches(data[i], f)) { current.found.push(data[i]); } }
+                    step();
+                });
+            })();
+        }
+        
+        function render(pageRows, total) {
+            rows = pageRows;
+            selected = -1;
+            byId('detail').hidden = true;
+            byId('spacer').style.height = (rows.length * ROW_HEIGHT) + 'px';
+            byId('viewport').scrollTop = 0;
+            var pages = total === null ? '?' : Math.max(1, Math.ceil(total / pageSize));
+            byId('status').textContent = '第 ' + (page + 1) + ' / ' + pages + ' 页，共 ' + (total === null ? '≥' + scan.found.length : total) + ' 个问题';
+            byId('prev').disabled = page === 0;
+            byId('next').disabled = total !== null && (page + 1) * pageSize >= total;
+            draw();
+        }
+        
+        // 虚拟滚动：只渲染可见范围内的行
+        function draw() {
+            var viewport = byId('viewport'), spacer = byId('spacer');
+            var first = Math.max(0, Math.floor(viewport.scrollTop / ROW_HEIGHT) - OVERSCAN);
+            var last = Math.min(rows.length, Math.ceil((viewport.scrollTop + viewport.clientHeight) / ROW_HEIGHT) + OVERSCAN);
+            var fragment = document.createDocumentFragment();
+            for (var i = first; i < last; i++) {
+                var row = rows[i], rule = manifest.rules[row[1]];
+                var div = document.createElement('div');
+                div.className = 'row' + (i === selected ? ' selected' : '');
+                div.style.top = (i * ROW_HEIGHT) + 'px';
+                div.dataset.index = i;
+                var badge = document.createElement('span');
+                badge.className = 'badge level-' + rule[2];
+                badge.textContent = rule[2];
+                var url = document.createElement('span');
+                url.className = 'url';
+                url.textContent = row[0];
+                div.appendChild(badge);
+                div.appendChild(document.createTextNode(rule[0] + ' (' + rule[1] + '): ' + row[2]));
+                div.appendChild(url);
+                fragment.appendChild(div);
+            }
+            spacer.textContent = '';
+            spacer.appendChild(fragment);
+        }
+        
+        function showDetail(index) {
+            var row = rows[index], rule = manifest.rules[row[1]], detail = byId('detail');
+            selected = index;
+            detail.textContent = '';
+            var add = function (tag, text) {
+                var node = document.createElement(tag);
+                node.textContent = text;
+                detail.appendChild(node);
+                return node;
+            };
+            add('h2', rule[0] + ' — WCAG ' + rule[1] + ' (级别 ' + rule[2] + ')');
+            add('p', row[2]);
+            add('p', 'URL: ' + row[0]);
+            if (row[4]) { add('p', row[4]); }
+            if (row[5]) { add('pre', row[5]); }
+            if (row[6] && row[6].length) {
+                add('h3', '修复建议:');
+                var list = add('ul', '');
+                row[6].forEach(function (text) {
+                    var item = document.createElement('li');
+                    item.textContent = text;
+                    list.appendChild(item);
+                });
+            }
+            detail.hidden = false;
+            draw();
+        }
+        
+        function init() {
+            Object.keys(manifest.rules).sort().forEach(function (id) {
+                var option = document.createElement('option');
+                option.value = id;
+                option.textContent = id + ' — ' + manifest.rules[id][0];
+                byId('rule').appendChild(option);
+            });
+            var refilter = function () { page = 0; showPage(); };
+            byId('level').onchange = refilter;
+            byId('rule').onchange = refilter;
+            byId('url').onchange = refilter;
+            byId('page-size').onchange = function () { pageSize = parseInt(this.value, 10); refilter(); };
+            byId('prev').onclick = function () { if (page > 0) { page--; showPage(); } };
+            byId('next').onclick = function () { page++; showPage(); };
+            byId('viewport').onscroll = draw;
+            byId('spacer').onclick = function (event) {
+                var row = event.target.closest('.row');
+                if (row) { showDetail(parseInt(row.dataset.index, 10)); }
+            };
+            showPage();
+        }
+        
+        load('manifest.js');
+    })();
+    </script>
+</body>
+</html>
+"""
+
+
+class PagedHTMLWriter:
+    """
+    分页HTML报告写入器
+    
+    输出目录中包含index.html外壳页面、data/manifest.js清单和
+    data/chunk-NNNNNN.js数据块。外壳页面只包含摘要数字，大小与问题数量无关；
+    问题每满chunk_size个写出一个数据块，内存中只保留当前数据块。清单记录每个
+    数据块出现过的级别和规则，浏览器据此跳过不可能匹配过滤条件的数据块。
+    """
+    
+    def __init__(self, directory, chunk_size=DEFAULT_CHUNK_SIZE, buffer_size=DEFAULT_BUFFER_SIZE):
+        """
+        初始化写入器
+        
+        参数:
+            directory: 输出目录，不存在时自动创建
+            chunk_size: 每个数据块的问题数
+            buffer_size: 写入缓冲区大小（字符数）
+        """
+        if chunk_size < 1:
+            raise ValueError(f"数据块大小必须为正数: {chunk_size}")
+        
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.buffer_size = buffer_size
+        self.summary = {
+            "pages": 0,
+            "total_issues": 0,
+            "level_A_issues": 0,
+            "level_AA_issues": 0,
+            "level_AAA_issues": 0
+        }
+        self._rules = {}
+        self._chunks = []
+        self._rows = []
+        self._levels = set()
+        self._rule_ids = set()
+        
+        os.makedirs(os.path.join(directory, DATA_DIR), exist_ok=True)
+    
+    @property
+    def index_path(self):
+        """外壳页面路径"""
+        return os.path.join(self.directory, 'index.html')
+    
+    def add_report(self, report):
+        """
+        添加一个页面的全部问题
+        
+        参数:
+            report: ValidationReport对象
+        """
+        self.summary["pages"] += 1
+        for issue in report.issues:
+            self.add_issue(issue, report.url)
+    
+    def add_issue(self, issue, url=None):
+        """
+        添加单个问题
+        
+        参数:
+            issue: Issue对象
+            url: 问题所在页面的URL
+        """
+        rule = issue.rule
+        if rule.id not in self._rules:
+            self._rules[rule.id] = [rule.name, rule.wcag_criterion, rule.level]
+        
+        self.summary["total_issues"] += 1
+        level_key = f"level_{rule.level}_issues"
+        if level_key in self.summary:
+            self.summary[level_key] += 1
+        
+        self._rows.append([
+            url or "", rule.id, issue.description, issue.impact,
+            issue.location, issue.element_html, issue.fix_suggestions
+        ])
+        self._levels.add(rule.level)
+        self._rule_ids.add(rule.id)
+        
+        if len(self._rows) >= self.chunk_size:
+            self._write_chunk()
+    
+    def close(self):
+        """写出剩余的数据块、清单和外壳页面"""
+        if self._rows:
+            self._write_chunk()
+        
+        manifest = {
+            "chunk_size": self.chunk_size,
+            "total": self.summary["total_issues"],
+            "rules": self._rules,
+            "chunks": self._chunks
+        }
+        self._write_file(os.path.join(DATA_DIR, 'manifest.js'),
+                         ["wcagReport.manifest(", dumps(manifest), ");\n"])
+        
+        shell = SHELL_TEMPLATE.replace('$timestamp', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        shell = shell.replace('$data_dir', DATA_DIR)
+        for key, value in self.summary.items():
+            shell = shell.replace(f'${key}', html.escape(str(value)))
+        self._write_file('index.html', [shell])
+    
+    def _write_chunk(self):
+        """将当前缓冲的问题写出为一个数据块"""
+        index = len(self._chunks)
+        parts = [f"wcagReport.chunk({index}, ["]
+        for i, row in enumerate(self._rows):
+            if i:
+                parts.append(",\n")
+            parts.append(dumps(row))
+        parts.append("]);\n")
+        self._write_file(os.path.join(DATA_DIR, f'chunk-{index:06d}.js'), parts)
+        
+        self._chunks.append({
+            "count": len(self._rows),
+            "levels": sorted(self._levels),
+            "rules": sorted(self._rule_ids)
+        })
+        self._rows = []
+        self._levels = set()
+        self._rule_ids = set()
+    
+    def _write_file(self, name, parts):
+        """将文本片段写入输出目录中的文件"""
+        with open(os.path.join(self.directory, name), 'w', encoding='utf-8') as f:
+            out = BufferedTextWriter(f, self.buffer_size)
+            for part in parts:
+                out.write(part)
+            out.flush()
@@ -15,6 +15,7 @@ class HTMLParser:
         self.url = None
         self.source_code = None
         self.line_positions = []
+        self._sibling_positions = {}  # 元素id -> 在同名兄弟元素中的序号
     
     def parse_html(self, html_content, url=None):
         """
@@ -29,6 +30,7 @@ class HTMLParser:
         """
         self.source_code = html_content
         self.url = url
+        self._sibling_positions = {}
         
         # 计算行位置，用于后续定位元素
         self._calculate_line_positions()
@@ -48,7 +50,8 @@ class HTMLParser:
         返回:
             BeautifulSoup对象
         """
-        with open(file_path, 'r', encoding='utf-8') as f:
+        # 不转换换行符，使元素的行列位置与文件内容一一对应（自动修复按位置写回文件）
+        with open(file_path, 'r', encoding='utf-8', newline='') as f:
             html_content = f.read()
         
         return self.parse_html(html_content, url=f"file://{os.path.abspath(file_path)}")
@@ -81,7 +84,12 @@ class HTMLParser:
         if not self.source_code or not element:
             return (0, 0)
         
-        # 获取元素在源代码中的位置
+        # html.parser会记录每个标签在源代码中的行号和列号（列号从0开始）
+        sourceline = getattr(element, 'sourceline', None)
+        if sourceline is not None:
+            return (sourceline, element.sourcepos + 1)
+        
+        # 其他解析器没有位置信息时，按元素的HTML在源代码中查找
         element_str = str(element)
         start_pos = self.source_code.find(element_str)
         
@@ -112,8 +120,7 @@ class HTMLParser:
         
         while current and current.name:
             # 计算同名兄弟元素中的索引
-            siblings = current.find_previous_siblings(current.name)
-            index = len(list(siblings)) + 1
+            index = self._sibling_position(current)
             
             if index > 1:
                 path_parts.append(f"{current.name}[{index}]")
@@ -124,6 +131,29 @@ class HTMLParser:
         
         return "/" + "/".join(reversed(path_parts))
     
+    def _sibling_position(self, element):
+        """
+        获取元素在同名兄弟元素中的序号（从1开始）
+        
+        首次查询某个父元素的子元素时一次性为所有子元素编号，避免在兄弟元素
+        很多的页面上对每个问题都向前遍历兄弟元素。
+        """
+        position = self._sibling_positions.get(id(element))
+        if position is not None:
+            return position
+        
+        parent = element.parent
+        if parent is None:
+            return 1
+        
+        counts = {}
+        for child in parent.children:
+            name = child.name
+            if name:
+                counts[name] = counts.get(name, 0) + 1
+                self._sibling_positions[id(child)] = counts[name]
+        return self._sibling_positions[id(element)]
+    
     def get_element_html(self, element, max_length=100):
         """
         获取元素的HTML代码
@@ -149,12 +179,13 @@ class HTMLParser:
         if not self.source_code:
             return
         
+        # 按换行符计算行首位置，与html.parser的行号计算方式一致（兼容\r\n）
         self.line_positions = [0]
-        pos = 0
+        pos = self.source_code.find('\n')
         
-        for line in self.source_code.splitlines():
-            pos += len(line) + 1  # +1 for newline character
-            self.line_positions.append(pos)
+        while pos != -1:
+            self.line_positions.append(pos + 1)
+            pos = self.source_code.find('\n', pos + 1)
     
     def _find_line_number(self, position):
         """二分查找确定位置对应的行号"""
@@ -0,0 +1,276 @@
+"""
+性能分析模块，记录每个规则的耗时、访问的元素数和产生的问题数，以及各阶段耗时
+"""
+import cProfile
+import math
+from contextlib import contextmanager
+
+# 页面处理阶段
+PHASES = ("parse", "index", "declarative", "rules", "enrich", "render")
+
+# 批量统计的分位数
+PERCENTILES = (50, 90, 99)
+
+
+class ElementMeter:
+    """
+    元素访问计数器
+    
+    设置到DocumentIndex上后，索引返回的元素列表在被遍历时逐个计数，
+    计数归属于当前正在执行的规则。
+    """
+    
+    def __init__(self):
+        self.visited = 0  # 当前规则访问的元素数
+    
+    def start_rule(self, rule):
+        """开始为规则计数"""
+        self.visited = 0
+    
+    def wrap(self, elements):
+        """
+        包装元素列表，遍历时计数
+        
+        参数:
+            elements: 元素列表
+        
+        返回:
+            行为与原列表相同的列表
+        """
+        return _MeteredList(elements, self)
+    
+    def tick(self):
+        """访问一个元素"""
+        self.visited += 1
+    
+    def add(self, count):
+        """访问多个元素"""
+        self.visited += count
+
+
+class _MeteredList(list):
+    """遍历时为每个元素计数的列表，长度、下标和真值判断与普通列表相同"""
+    
+    def __init__(self, elements, meter):
+        super().__init__(elements)
+        self._meter = meter
+    
+    def __iter__(self):
+        tick = self._meter.tick
+        for element in list.__iter__(self):
+            tick()
+            yield element
+
+
+class ValidationProfile:
+    """单个页面的性能分析结果"""
+    
+    def __init__(self):
+        self.phases = {}  # 阶段 -> 耗时（秒）
+        self.rules = []  # 每个规则的统计字典，按执行顺序
+    
+    def add_phase(self, name, seconds):
+        """累加阶段耗时"""
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+    
+    def add_rule(self, rule, seconds, elements, issues):
+        """
+        记录规则的执行情况
+        
+        参数:
+            rule: 规则实例
+            seconds: 规则自身的耗时（不含问题位置和路径计算）
+            elements: 访问的元素数
+            issues: 产生的问题数
+        """
+        self.rules.append({
+            "rule_id": rule.id,
+            "time": seconds,
+            "elements": elements,
+            "issues": issues,
+        })
+    
+    @property
+    def total_time(self):
+        """各阶段耗时之和"""
+        return sum(self.phases.values())
+    
+    def to_dict(self):
+        """转换为字典（耗时单位为毫秒）"""
+        return {
+            "phases": {name: round(seconds * 1000, 3) for name, seconds in self.phases.items()},
+            "rules": [
+                dict(entry, time=round(entry["time"] * 1000, 3))
+                for entry in self.rules
+            ],
+        }
+    
+    def format_table(self):
+        """
+        生成文本表格
+        
+        返回:
+            字符串
+        """
+        lines = ["阶段耗时 (ms):"]
+        for name in PHASES:
+            if name in self.phases:
+                lines.append(f"  {name:<12} {self.phases[name] * 1000:>10.2f}")
+        
+        lines.append("规则耗时 (按耗时排序):")
+        lines.append(f"  {'规则':<24} {'耗时(ms)':>10} {'元素':>8} {'问题':>6}")
+        for entry in sorted(self.rules, key=lambda entry: -entry["time"]):
+            lines.append(
+                f"  {entry['rule_id']:<24} {entry['time'] * 1000:>10.2f} "
+                f"{entry['elements']:>8} {entry['issues']:>6}"
+            )
+        return "\n".join(lines)
+
+
+class LatencyHistogram:
+    """
+    对数分桶的耗时直方图
+    
+    相邻桶的边界相差5%，内存占用与样本数无关，分位数的相对误差不超过5%。
+    """
+    
+    BASE = 1.05
+    MIN_SECONDS = 1e-6
+    
+    def __init__(self):
+        self.buckets = {}  # 桶序号 -> 样本数
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def add(self, seconds):
+        """添加一个样本"""
+        bucket = 0 if seconds <= self.MIN_SECONDS else \
+            int(math.log(seconds / self.MIN_SECONDS, self.BASE)) + 1
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+    
+    def percentile(self, p):
+        """
+        估算分位数
+        
+        参数:
+            p: 百分位（0-100）
+        
+        返回:
+            秒数（取所在桶的上界，不超过最大值）
+        """
+        if not self.count:
+            return 0.0
+        
+        rank = max(1, math.ceil(self.count * p / 100))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                upper = self.MIN_SECONDS * self.BASE ** bucket
+                return min(upper, self.max)
+        return self.max
+
+
+class ProfileAggregator:
+    """汇总多个页面的性能分析结果，统计每个规则和阶段耗时的分位数"""
+    
+    def __init__(self):
+        self.pages = 0
+        self.rules = {}  # 规则ID -> {"time": LatencyHistogram, "elements": 总数, "issues": 总数}
+        self.phases = {}  # 阶段 -> LatencyHistogram
+    
+    def add_profile(self, profile):
+        """
+        添加一个页面的性能分析结果
+        
+        参数:
+            profile: ValidationProfile对象
+        """
+        self.pages += 1
+        for name, seconds in profile.phases.items():
+            self.phases.setdefault(name, LatencyHistogram()).add(seconds)
+        
+        for entry in profile.rules:
+            stats = self.rules.get(entry["rule_id"])
+            if stats is None:
+                stats = self.rules[entry["rule_id"]] = {"time": LatencyHistogram(), "elements": 0, "issues": 0}
+            stats["time"].add(entry["time"])
+            stats["elements"] += entry["elements"]
+            stats["issues"] += entry["issues"]
+    
+    def to_dict(self):
+        """转换为字典（耗时单位为毫秒）"""
+        def summarize(histogram):
+            result = {f"p{p}": round(histogram.percentile(p) * 1000, 3) for p in PERCENTILES}
+            result["max"] = round(histogram.max * 1000, 3)
+            result["total"] = round(histogram.total * 1000, 3)
+            return result
+        
+        return {
+            "pages": self.pages,
+            "phases": {name: summarize(histogram) for name, histogram in self.phases.items()},
+            "rules": {
+                rule_id: dict(summarize(stats["time"]), runs=stats["time"].count,
+                              elements=stats["elements"], issues=stats["issues"])
+                for rule_id, stats in self.rules.items()
+            },
+        }
+    
+    def format_table(self):
+        """
+        生成文本表格，规则按总耗时排序
+        
+        返回:
+            字符串
+        """
+        header = "".join(f"{'p' + str(p) + '(ms)':>10}" for p in PERCENTILES)
+        lines = [f"性能分析: {self.pages} 个页面"]
+        
+        lines.append(f"  {'阶段':<24}{header}{'max(ms)':>10}{'总计(ms)':>12}")
+        for name in PHASES:
+            histogram = self.phases.get(name)
+            if histogram:
+                lines.append(f"  {name:<24}{self._format_row(histogram)}")
+        
+        lines.append(f"  {'规则':<24}{header}{'max(ms)':>10}{'总计(ms)':>12}{'元素':>10}{'问题':>8}")
+        for rule_id, stats in sorted(self.rules.items(), key=lambda item: -item[1]["time"].total):
+            lines.append(
+                f"  {rule_id:<24}{self._format_row(stats['time'])}"
+                f"{stats['elements']:>10}{stats['issues']:>8}"
+            )
+        return "\n".join(lines)
+    
+    @staticmethod
+    def _format_row(histogram):
+        cells = "".join(f"{histogram.percentile(p) * 1000:>10.2f}" for p in PERCENTILES)
+        return f"{cells}{histogram.max * 1000:>10.2f}{histogram.total * 1000:>12.2f}"
+
+
+@contextmanager
+def cprofile_to(path):
+    """
+    在cProfile下执行代码块，结束后将统计数据写入文件（可用pstats或snakeviz查看）
+    
+    参数:
+        path: pstats数据文件路径，为None时不做任何事
+    
+    用法:
+        with cprofile_to("validate.prof"):
+            validator.validate_file("index.html")
+    """
+    if not path:
+        yield None
+        return
+    
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
@@ -0,0 +1,136 @@
+"""
+页面结果记录模块，将验证报告转换为可存储的紧凑字典，并从字典恢复出可交给汇总器和写入器的报告
+"""
+
+
+def report_to_record(report, source=None):
+    """
+    将ValidationReport转换为结果记录
+    
+    记录只包含汇总器、导出器、数据库和流式写入器需要的字段，描述、修复建议和
+    代码示例按生成记录时的语言展开，元素以规范化签名代替。
+    
+    参数:
+        report: ValidationReport对象
+        source: 报告对应的来源（文件路径或URL），默认为报告的URL
+    
+    返回:
+        记录字典
+    """
+    record = {
+        "source": source if source is not None else report.url,
+        "url": report.url,
+        "summary": dict(report.summary),
+        "gate_failed": report.gate_failed,
+        "issues": [issue_to_record(issue) for issue in report.issues]
+    }
+    if report.partial_rules:
+        record["partial"] = report.partial_rules
+    return record
+
+
+def issue_to_record(issue):
+    """将Issue对象转换为记录中的问题字典"""
+    rule = issue.rule
+    return {
+        "rule_id": rule.id,
+        "rule_name": rule.name,
+        "wcag_criterion": rule.wcag_criterion,
+        "level": rule.level,
+        "description": issue.description,
+        "impact": issue.impact,
+        "line": issue.line,
+        "column": issue.column,
+        "path": issue.path,
+        "location": issue.location,
+        "element_html": issue.element_html,
+        "signature": issue.signature,
+        "fingerprint": issue.fingerprint,
+        "code": issue.code,
+        "params": issue.params,
+        "fix_suggestions": issue.fix_suggestions,
+        "code_examples": issue.code_examples
+    }
+
+
+class RecordRule:
+    """记录中问题所属规则的基本信息"""
+    
+    __slots__ = ('id', 'name', 'wcag_criterion', 'level')
+    
+    def __init__(self, rule_id, name=None, wcag_criterion=None, level=None):
+        self.id = rule_id
+        self.name = name
+        self.wcag_criterion = wcag_criterion
+        self.level = level
+
+
+class RecordIssue:
+    """从记录恢复的问题，字段与Issue相同，但不持有元素"""
+    
+    __slots__ = ('rule', 'element', 'description', 'impact', 'line', 'column', 'path', 'location',
+                 'element_html', 'signature', 'fingerprint', 'code', 'params', 'fix_suggestions', 'code_examples')
+    
+    def __init__(self, rule, data):
+        """
+        参数:
+            rule: RecordRule对象
+            data: 记录中的问题字典
+        """
+        self.rule = rule
+        self.element = None
+        self.description = data.get("description", "")
+        self.impact = data.get("impact", "")
+        self.line = data.get("line", 0)
+        self.column = data.get("column", 0)
+        self.path = data.get("path", "")
+        self.location = data.get("location", "")
+        self.element_html = data.get("element_html", "")
+        self.signature = data.get("signature", "")
+        self.fingerprint = data.get("fingerprint", "")
+        self.code = data.get("code")
+        self.params = data.get("params") or {}
+        self.fix_suggestions = data.get("fix_suggestions") or []
+        self.code_examples = data.get("code_examples") or []
+
+
+class RecordReport:
+    """
+    从记录恢复的报告
+    
+    提供批量处理时汇总器（SiteAggregator）、导出器、结果数据库和流式写入器读取的
+    字段，无需重新验证页面。
+    """
+    
+    def __init__(self, record, rules=None):
+        """
+        参数:
+            record: report_to_record生成的记录字典
+            rules: 可选的规则ID -> RecordRule字典，多个报告共享同一份规则信息
+        """
+        rules = rules if rules is not None else {}
+        self.source = record.get("source")
+        self.url = record.get("url") or self.source
+        self.summary = record.get("summary", {})
+        self.gate_failed = record.get("gate_failed")
+        self.partial_rules = record.get("partial", [])
+        self.baseline_suppressed = None
+        self.profile = None
+        self.issues = []
+        for data in record.get("issues", ()):
+            rule = rules.get(data["rule_id"])
+            if rule is None:
+                rule = rules[data["rule_id"]] = RecordRule(
+                    data["rule_id"], data.get("rule_name"), data.get("wcag_criterion"), data.get("level")
+                )
+            self.issues.append(RecordIssue(rule, data))
+    
+    @property
+    def partial(self):
+        """是否有规则因超出预算而未完成"""
+        return bool(self.partial_rules)
+    
+    def get_gate_dict(self):
+        """记录不保存门禁阈值，返回None"""
+        return None
+
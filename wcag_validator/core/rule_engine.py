@@ -0,0 +1,112 @@
+"""
+规则引擎模块，负责按配置筛选规则并编译执行计划
+"""
+import weakref
+
+from ..rules.base import RuleRegistry
+from ..rules.declarative import DeclarativeRule, MatcherTable
+
+class ExecutionPlan:
+    """执行计划，记录要执行的规则及其触发条件"""
+    
+    _cache = weakref.WeakKeyDictionary()  # 规则注册表 -> {配置: 已编译的执行计划}
+    
+    def __init__(self, rules):
+        """
+        初始化执行计划
+        
+        参数:
+            rules: 规则实例列表
+        """
+        self.rules = list(rules)
+        
+        # 每个规则需要的标签和属性，都为None表示总是执行
+        self.triggers = [
+            (rule, rule.required_tags, rule.required_attrs)
+            for rule in self.rules
+        ]
+        
+        # 声明式规则编译为一张匹配表，在一次遍历中共同执行
+        self.matcher = MatcherTable(rule for rule in self.rules if isinstance(rule, DeclarativeRule))
+    
+    @classmethod
+    def compile(cls, wcag_level='AA', rule_ids=None, skip_rules=None, criteria=None, registry=None):
+        """
+        编译执行计划，相同注册表上的相同配置只编译一次
+        
+        参数:
+            wcag_level: 验证级别 ('A', 'AA', 'AAA')
+            rule_ids: 只执行这些规则ID（在级别筛选结果内）
+            skip_rules: 跳过这些规则ID
+            criteria: 只执行这些WCAG标准的规则
+            registry: 规则注册表，默认为RuleRegistry的默认注册表
+        
+        返回:
+            ExecutionPlan对象
+        """
+        registry = registry or RuleRegistry.default()
+        # 先加载所选规则涉及的规则包，使缓存键中的版本号包含它们
+        registry.load_packs(wcag_level, criteria=criteria, rule_ids=rule_ids)
+        
+        key = (
+            wcag_level.upper(),
+            frozenset(rule_ids) if rule_ids else None,
+            frozenset(skip_rules) if skip_rules else None,
+            frozenset(criteria) if criteria else None,
+            registry.version
+        )
+        
+        plans = cls._cache.get(registry)
+        if plans is None:
+            plans = cls._cache[registry] = {}
+        plan = plans.get(key)
+        if plan is None:
+            for rule_id in list(rule_ids or []) + list(skip_rules or []):
+                if registry.get_rule(rule_id) is None:
+                    raise ValueError(f"未知的规则ID: {rule_id}")
+            
+            rules = registry.select(wcag_level, rule_ids=rule_ids, criteria=criteria)
+            if skip_rules:
+                rules = [rule for rule in rules if rule.id not in skip_rules]
+            
+            plan = cls(rules)
+            plans[key] = plan
+        
+        return plan
+    
+    def select(self, index):
+        """
+        按文档内容筛选规则
+        
+        参数:
+            index: DocumentIndex对象
+        
+        返回:
+            (需要执行的规则列表, 因触发条件不存在而跳过的规则列表)元组
+        """
+        selected = []
+        skipped = []
+        
+        for rule, tags, attrs in self.triggers:
+            if tags is None and attrs is None:
+                selected.append(rule)
+            elif (tags and any(index.has_tag(tag) for tag in tags)) or \
+                 (attrs and any(index.has_attr(attr) for attr in attrs)):
+                selected.append(rule)
+            else:
+                skipped.append(rule)
+        
+        return selected, skipped
+    
+    def prepare(self, document, index, rules, visits=None):
+        """
+        一次性计算本次要执行的声明式规则的匹配结果，供各规则的iter_issues读取
+        
+        参数:
+            document: BeautifulSoup文档对象
+            index: 文档的DocumentIndex对象
+            rules: 本次要执行的规则列表
+            visits: 可选的字典，记录每个声明式规则比较过的元素数
+        """
+        if self.matcher:
+            document._wcag_matches = self.matcher.run(document, index, rules, visits=visits)
@@ -0,0 +1,155 @@
+"""
+SARIF输出模块，以流式方式生成SARIF 2.1.0文档，供代码扫描平台使用
+"""
+from ..rules.base import RuleRegistry
+from .baseline import SARIF_FINGERPRINT_KEY
+from .serializer import dumps
+from .writers import BufferedTextWriter, DEFAULT_BUFFER_SIZE
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+# WCAG级别对应的SARIF结果级别
+SARIF_LEVELS = {
+    'A': 'error',
+    'AA': 'warning',
+    'AAA': 'note',
+}
+
+
+class SarifWriter:
+    """
+    SARIF流式写入器
+    
+    规则描述在begin()时根据RuleRegistry生成一次，之后每个问题都单独序列化后
+    写入，不会在内存中构建完整的SARIF文档。
+    """
+    
+    def __init__(self, fp, rules=None, buffer_size=DEFAULT_BUFFER_SIZE):
+        """
+        初始化写入器
+        
+        参数:
+            fp: 支持write方法的文本文件对象
+            rules: 要描述的规则列表，默认为所有已注册规则
+            buffer_size: 缓冲区大小（字符数）
+        """
+        self.out = BufferedTextWriter(fp, buffer_size)
+        self.rules = rules
+        self.result_count = 0
+        self._rule_index = {}
+    
+    def write_report(self, report):
+        """
+        写入单个页面的完整SARIF文档
+        
+        参数:
+            report: ValidationReport对象
+        """
+        self.begin()
+        self.add_report(report)
+        self.finish()
+    
+    def begin(self):
+        """写入文档头部和规则描述"""
+        from .. import __version__
+        
+        rules = self.rules if self.rules is not None else RuleRegistry.get_all_rules()
+        descriptors = []
+        for rule in rules:
+            self._rule_index[rule.id] = len(descriptors)
+            descriptors.append(self._rule_descriptor(rule))
+        
+        driver = {
+            "name": "wcag-validator",
+            "version": __version__,
+            "informationUri": "https://www.w3.org/WAI/WCAG22/quickref/",
+            "rules": descriptors
+        }
+        
+        self.out.write('{"$schema": ')
+        self.out.write(dumps(SARIF_SCHEMA))
+        self.out.write(', "version": "2.1.0", "runs": [{"tool": {"driver": ')
+        self.out.write(dumps(driver))
+        self.out.write('}, "results": [')
+    
+    def add_report(self, report):
+        """
+        写入一个页面的全部问题
+        
+        参数:
+            report: ValidationReport对象
+        """
+        for issue in report.issues:
+            self.add_issue(issue, report.url)
+    
+    def add_issue(self, issue, url=None):
+        """
+        写入单个问题
+        
+        参数:
+            issue: Issue对象
+            url: 问题所在页面的URL
+        """
+        rule = issue.rule
+        region = {}
+        if issue.line:
+            region["startLine"] = issue.line
+            region["startColumn"] = issue.column
+        if issue.element_html:
+            region["snippet"] = {"text": issue.element_html}
+        
+        physical_location = {"artifactLocation": {"uri": url or ""}}
+        if region:
+            physical_location["region"] = region
+        
+        location = {"physicalLocation": physical_location}
+        if issue.path:
+            location["logicalLocations"] = [{"fullyQualifiedName": issue.path, "kind": "element"}]
+        
+        result = {
+            "ruleId": rule.id,
+            "level": SARIF_LEVELS.get(rule.level, 'warning'),
+            "message": {"text": issue.description},
+            "locations": [location],
+            "properties": {
+                "wcagCriterion": rule.wcag_criterion,
+                "wcagLevel": rule.level,
+                "impact": issue.impact
+            }
+        }
+        if rule.id in self._rule_index:
+            result["ruleIndex"] = self._rule_index[rule.id]
+        if issue.fingerprint:
+            result["partialFingerprints"] = {SARIF_FINGERPRINT_KEY: issue.fingerprint}
+        
+        if self.result_count:
+            self.out.write(', ')
+        self.out.write(dumps(result))
+        self.result_count += 1
+    
+    def finish(self):
+        """写入文档尾部并刷新缓冲区"""
+        self.out.write(']}]}')
+        self.out.flush()
+    
+    def _rule_descriptor(self, rule):
+        """生成SARIF规则描述"""
+        descriptor = {
+            "id": rule.id,
+            "name": type(rule).__name__,
+            "shortDescription": {"text": rule.name},
+            "fullDescription": {"text": rule.description or rule.name},
+            "defaultConfiguration": {"level": SARIF_LEVELS.get(rule.level, 'warning')},
+            "properties": {
+                "tags": ["accessibility", f"wcag{(rule.wcag_criterion or '').replace('.', '')}",
+                         f"wcag-level-{rule.level}"],
+                "wcagCriterion": rule.wcag_criterion,
+                "wcagLevel": rule.level
+            }
+        }
+        
+        help_uri = rule.get_wcag_reference()
+        if help_uri:
+            descriptor["helpUri"] = help_uri
+        
+        return descriptor
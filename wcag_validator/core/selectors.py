@@ -0,0 +1,204 @@
+"""
+CSS选择器模块，预编译CSS选择器并基于文档索引求值
+"""
+import soupsieve
+
+
+class CompiledSelector:
+    """
+    预编译的CSS选择器
+    
+    选择器由soupsieve编译一次。求值时先根据每个候选分支最右侧复合选择器中的标签名
+    （或必需的属性、id、class）从DocumentIndex取得候选元素，只对候选元素执行完整
+    匹配，而不是扫描整个文档。
+    """
+    
+    def __init__(self, css):
+        """
+        编译选择器
+        
+        参数:
+            css: CSS选择器字符串
+        """
+        self.css = css
+        self._compiled = soupsieve.compile(css)
+        self.keys = _candidate_keys(self._compiled)
+        self.buckets = _bucket_keys(self._compiled)
+        self.ancestors = _ancestor_keys(self._compiled)
+        self.simple = _simple_branches(self._compiled)
+        # 所有分支都有标签名时，选择器只可能匹配这些标签
+        self.tags = {value for kind, value in self.keys if kind == 'tag'} \
+            if all(key is not None and key[0] == 'tag' for key in self.keys) else None
+    
+    def __repr__(self):
+        return f"CompiledSelector({self.css!r})"
+    
+    def match(self, element):
+        """判断元素是否匹配选择器"""
+        return self._compiled.match(element)
+    
+    def candidates(self, index):
+        """
+        从文档索引获取可能匹配的元素
+        
+        参数:
+            index: DocumentIndex对象
+        
+        返回:
+            按文档顺序排列的元素列表
+        """
+        if any(key is None for key in self.keys):
+            return index.elements
+        if self.tags is not None:
+            return index.elements_by_tag(*self.tags)
+        if len(self.keys) == 1:
+            return index.elements_with_attr(self.keys[0][1])
+        
+        # 多个分支使用不同的键时合并候选集合，再按文档顺序输出
+        wanted = set()
+        for kind, value in self.keys:
+            elements = index.by_tag.get(value, ()) if kind == 'tag' else index.by_attr.get(value, ())
+            wanted.update(id(element) for element in elements)
+        return [element for element in index.elements if id(element) in wanted]
+    
+    def select(self, index):
+        """
+        获取文档中匹配选择器的所有元素
+        
+        参数:
+            index: DocumentIndex对象
+        
+        返回:
+            按文档顺序排列的元素列表
+        """
+        match = self._compiled.match
+        return [element for element in self.candidates(index) if match(element)]
+
+
+_cache = {}  # CSS选择器字符串 -> CompiledSelector
+
+
+def compile_selector(css):
+    """
+    编译CSS选择器，相同的选择器只编译一次
+    
+    参数:
+        css: CSS选择器字符串或CompiledSelector对象
+    
+    返回:
+        CompiledSelector对象
+    """
+    if isinstance(css, CompiledSelector):
+        return css
+    
+    selector = _cache.get(css)
+    if selector is None:
+        selector = CompiledSelector(css)
+        _cache[css] = selector
+    return selector
+
+
+def _candidate_keys(compiled):
+    """
+    计算每个分支的候选键
+    
+    返回:
+        列表，每项为('tag', 标签名)、('attr', 属性名)或None（需要扫描所有元素）
+    """
+    keys = []
+    for selector in getattr(compiled.selectors, 'selectors', None) or [None]:
+        keys.append(_branch_key(selector))
+    return keys
+
+
+def _bucket_keys(compiled):
+    """
+    计算每个分支最右侧复合选择器中最具区分度的键，用于按元素的id、class和标签分桶
+    
+    返回:
+        列表，每项为('id', 值)、('class', 值)、('tag', 标签名)或None（可能匹配任何元素）
+    """
+    return [_compound_key(selector) for selector in getattr(compiled.selectors, 'selectors', None) or [None]]
+
+
+def _ancestor_keys(compiled):
+    """
+    计算每个分支要求祖先元素具有的键（后代和子元素组合器左侧的复合选择器）
+    
+    返回:
+        列表，每项为键的元组，键的形式与_bucket_keys相同
+    """
+    result = []
+    for selector in getattr(compiled.selectors, 'selectors', None) or [None]:
+        keys = []
+        node = _left_compound(selector)
+        while node is not None:
+            # 兄弟组合器左侧的元素不是祖先，但它的祖先仍是右侧元素的祖先
+            if node.rel_type in (' ', '>'):
+                key = _compound_key(node)
+                if key is not None:
+                    keys.append(key)
+            node = _left_compound(node)
+        result.append(tuple(keys))
+    return result
+
+
+def _simple_branches(compiled):
+    """
+    判断每个分支是否只由单个标签、id或class构成，这类分支命中分桶即可确定匹配
+    
+    返回:
+        布尔值列表
+    """
+    result = []
+    for selector in getattr(compiled.selectors, 'selectors', None) or [None]:
+        if selector is None or _left_compound(selector) is not None:
+            result.append(False)
+            continue
+        tag = getattr(getattr(selector, 'tag', None), 'name', None)
+        parts = (1 if tag and tag != '*' else 0) + len(selector.ids) + len(selector.classes)
+        result.append(
+            parts == 1 and getattr(selector.tag, 'prefix', None) is None and not selector.attributes
+            and not selector.nth and not selector.selectors and not selector.contains
+            and not selector.lang and not selector.flags
+        )
+    return result
+
+
+def _left_compound(selector):
+    """获取组合器左侧的复合选择器"""
+    relation = getattr(selector, 'relation', None)
+    selectors = getattr(relation, 'selectors', None)
+    return selectors[0] if selectors else None
+
+
+def _compound_key(selector):
+    """复合选择器中最具区分度的键：id、class或标签名"""
+    if selector is None:
+        return None
+    if getattr(selector, 'ids', None):
+        return ('id', selector.ids[0])
+    if getattr(selector, 'classes', None):
+        return ('class', selector.classes[0])
+    key = _branch_key(selector)
+    return key if key is not None and key[0] == 'tag' else None
+
+
+def _branch_key(selector):
+    """根据最右侧复合选择器的标签、id、class和属性条件确定候选键"""
+    if selector is None:
+        return None
+    
+    tag = getattr(selector, 'tag', None)
+    name = getattr(tag, 'name', None)
+    if name and name != '*':
+        return ('tag', name.lower())
+    if getattr(selector, 'ids', None):
+        return ('attr', 'id')
+    if getattr(selector, 'classes', None):
+        return ('attr', 'class')
+    for attribute in getattr(selector, 'attributes', None) or ():
+        # 取反的属性条件（如[type!=x]）不要求属性存在
+        if not getattr(attribute, 'inverse', False) and getattr(attribute, 'prefix', '') in ('', None):
+            return ('attr', attribute.attribute.lower())
+    return None
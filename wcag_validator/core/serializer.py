@@ -0,0 +1,222 @@
+"""
+JSON序列化模块，安装了orjson时使用orjson，否则使用标准库json
+"""
+import io
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson是可选依赖
+    orjson = None
+
+from .writers import BufferedTextWriter, DEFAULT_BUFFER_SIZE
+
+
+def dumps(obj, indent=None):
+    """
+    将对象序列化为JSON字符串，非ASCII字符原样输出
+    
+    参数:
+        obj: 要序列化的对象
+        indent: 缩进，为None时输出无空白的紧凑格式
+    
+    返回:
+        JSON字符串
+    """
+    if orjson is not None and indent in (None, 2):
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option).decode('utf-8')
+    
+    if indent is None:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+    return json.dumps(obj, indent=indent, ensure_ascii=False)
+
+
+def issue_to_dict(issue):
+    """
+    将Issue对象转换为报告中的问题字典
+    
+    参数:
+        issue: Issue对象
+    
+    返回:
+        字典
+    """
+    return {
+        "rule_id": issue.rule.id,
+        "rule_name": issue.rule.name,
+        "wcag_criterion": issue.rule.wcag_criterion,
+        "level": issue.rule.level,
+        "description": issue.description,
+        "impact": issue.impact,
+        "location": issue.location,
+        "element_html": issue.element_html,
+        "fingerprint": issue.fingerprint,
+        "code": issue.code,
+        "params": issue.params,
+        "fix_suggestions": issue.fix_suggestions,
+        "code_examples": issue.code_examples
+    }
+
+
+def report_to_dict(report, timestamp=None):
+    """
+    将ValidationReport转换为报告字典
+    
+    参数:
+        report: ValidationReport对象
+        timestamp: 可选的生成时间（ISO格式字符串）
+    
+    返回:
+        字典
+    """
+    result = {"url": report.url}
+    if timestamp is not None:
+        result["timestamp"] = timestamp
+    result["summary"] = report.summary
+    result["issues"] = [issue_to_dict(issue) for issue in report.issues]
+    
+    gate = report.get_gate_dict()
+    if gate:
+        result["gate"] = gate
+    if report.baseline_suppressed is not None:
+        result["baseline"] = {"suppressed_issues": report.baseline_suppressed}
+    if report.partial_rules:
+        result["partial"] = report.partial_rules
+    if report.profile is not None:
+        result["profile"] = report.profile.to_dict()
+    
+    return result
+
+
+def report_to_json(report, indent=2, timestamp=None):
+    """
+    将ValidationReport序列化为JSON字符串
+    
+    参数:
+        report: ValidationReport对象
+        indent: 缩进，为None时使用流式写入器输出紧凑格式
+        timestamp: 可选的生成时间（ISO格式字符串）
+    
+    返回:
+        JSON字符串
+    """
+    if indent is not None:
+        return dumps(report_to_dict(report, timestamp), indent=indent)
+    
+    buffer = io.StringIO()
+    JSONReportWriter(buffer).write_report(report, timestamp)
+    return buffer.getvalue()
+
+
+class JSONReportWriter:
+    """
+    紧凑JSON流式写入器
+    
+    不构建整个报告的字典，而是逐个问题序列化后写入。规则相关的字段
+    （ID、名称、WCAG标准、级别）对每条规则只序列化一次。lines=True时输出
+    JSON Lines，每行一个问题，并附带所在页面的URL。
+    """
+    
+    def __init__(self, fp, lines=False, buffer_size=DEFAULT_BUFFER_SIZE):
+        """
+        初始化写入器
+        
+        参数:
+            fp: 支持write方法的文本文件对象
+            lines: 是否输出JSON Lines格式
+            buffer_size: 缓冲区大小（字符数）
+        """
+        self.out = BufferedTextWriter(fp, buffer_size)
+        self.lines = lines
+        self._rule_prefixes = {}
+    
+    def write_report(self, report, timestamp=None):
+        """
+        写入一个页面的报告
+        
+        参数:
+            report: ValidationReport对象
+            timestamp: 可选的生成时间（ISO格式字符串），JSON Lines格式下忽略
+        """
+        if self.lines:
+            self.add_report(report)
+            self.out.flush()
+            return
+        
+        out = self.out
+        out.write('{"url":')
+        out.write(dumps(report.url))
+        if timestamp is not None:
+            out.write(',"timestamp":')
+            out.write(dumps(timestamp))
+        out.write(',"summary":')
+        out.write(dumps(report.summary))
+        out.write(',"issues":[')
+        for i, issue in enumerate(report.issues):
+            if i:
+                out.write(',')
+            out.write(self._issue_json(issue))
+        out.write(']')
+        
+        gate = report.get_gate_dict()
+        if gate:
+            out.write(',"gate":')
+            out.write(dumps(gate))
+        if report.baseline_suppressed is not None:
+            out.write(',"baseline":')
+            out.write(dumps({"suppressed_issues": report.baseline_suppressed}))
+        if report.partial_rules:
+            out.write(',"partial":')
+            out.write(dumps(report.partial_rules))
+        if report.profile is not None:
+            out.write(',"profile":')
+            out.write(dumps(report.profile.to_dict()))
+        out.write('}')
+        out.flush()
+    
+    def add_report(self, report):
+        """
+        以JSON Lines格式追加一个页面的全部问题
+        
+        参数:
+            report: ValidationReport对象
+        """
+        for issue in report.issues:
+            self.out.write(self._issue_json(issue, report.url))
+            self.out.write('\n')
+    
+    def flush(self):
+        """刷新缓冲区"""
+        self.out.flush()
+    
+    def _issue_json(self, issue, url=None):
+        """序列化单个问题，规则字段使用缓存的前缀"""
+        rule = issue.rule
+        prefix = self._rule_prefixes.get(rule.id)
+        if prefix is None:
+            prefix = dumps({
+                "rule_id": rule.id,
+                "rule_name": rule.name,
+                "wcag_criterion": rule.wcag_criterion,
+                "level": rule.level
+            })[:-1]
+            self._rule_prefixes[rule.id] = prefix
+        
+        fields = {
+            "description": issue.description,
+            "impact": issue.impact,
+            "location": issue.location,
+            "element_html": issue.element_html,
+            "fingerprint": issue.fingerprint,
+            "code": issue.code,
+            "params": issue.params,
+            "fix_suggestions": issue.fix_suggestions,
+            "code_examples": issue.code_examples
+        }
+        if self.lines:
+            fields["url"] = url
+        
+        return prefix + ',' + dumps(fields)[1:]
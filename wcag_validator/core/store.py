@@ -0,0 +1,301 @@
+"""
+结果存储模块，将验证报告写入本地SQLite数据库，支持历史和趋势查询
+"""
+import hashlib
+import sqlite3
+from datetime import datetime
+
+from .baseline import issue_fingerprint
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    wcag_level TEXT,
+    label TEXT
+);
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    url TEXT,
+    total_issues INTEGER,
+    level_A_issues INTEGER,
+    level_AA_issues INTEGER,
+    level_AAA_issues INTEGER,
+    passed_rules INTEGER,
+    failed_rules INTEGER
+);
+CREATE TABLE IF NOT EXISTS rules (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    wcag_criterion TEXT,
+    level TEXT
+);
+CREATE TABLE IF NOT EXISTS issues (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    page_id INTEGER NOT NULL REFERENCES pages(id),
+    url TEXT,
+    rule_id TEXT NOT NULL REFERENCES rules(id),
+    wcag_criterion TEXT,
+    level TEXT,
+    issue_key TEXT NOT NULL,
+    description TEXT,
+    line INTEGER,
+    "column" INTEGER,
+    path TEXT,
+    element_html TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_pages_run ON pages(run_id);
+CREATE INDEX IF NOT EXISTS idx_pages_url ON pages(url);
+CREATE INDEX IF NOT EXISTS idx_issues_run_key ON issues(run_id, issue_key);
+CREATE INDEX IF NOT EXISTS idx_issues_url ON issues(url);
+CREATE INDEX IF NOT EXISTS idx_issues_rule ON issues(rule_id, run_id);
+CREATE INDEX IF NOT EXISTS idx_issues_criterion ON issues(wcag_criterion, run_id);
+"""
+
+
+def issue_key(url, issue):
+    """
+    生成跨运行识别同一问题的键，由页面URL和问题指纹组成，不依赖行号
+    
+    参数:
+        url: 页面URL
+        issue: Issue对象
+    
+    返回:
+        十六进制字符串
+    """
+    raw = "\x1f".join([url or "", issue.fingerprint or issue_fingerprint(issue)])
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+class ResultStore:
+    """
+    SQLite结果存储
+    
+    每次运行对应runs表中的一行，页面、规则和问题分别写入pages、rules和issues表。
+    问题行先在内存中缓冲，每满batch_size行在一个事务中批量写入。
+    """
+    
+    def __init__(self, path, batch_size=5000):
+        """
+        初始化结果存储
+        
+        参数:
+            path: 数据库文件路径
+            batch_size: 每个事务批量写入的问题行数
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._known_rules = {row[0] for row in self.conn.execute("SELECT id FROM rules")}
+        self._pending = []
+    
+    def begin_run(self, wcag_level=None, label=None):
+        """
+        开始一次运行
+        
+        参数:
+            wcag_level: 验证级别
+            label: 可选的运行标签（如提交号）
+        
+        返回:
+            运行ID
+        """
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (started_at, wcag_level, label) VALUES (?, ?, ?)",
+                (datetime.now().isoformat(), wcag_level, label)
+            )
+        return cursor.lastrowid
+    
+    def add_report(self, run_id, report):
+        """
+        添加一个页面的验证报告
+        
+        参数:
+            run_id: 运行ID
+            report: ValidationReport对象
+        """
+        summary = report.summary
+        cursor = self.conn.execute(
+            "INSERT INTO pages (run_id, url, total_issues, level_A_issues, level_AA_issues, "
+            "level_AAA_issues, passed_rules, failed_rules) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (run_id, report.url, summary["total_issues"], summary["level_A_issues"],
+             summary["level_AA_issues"], summary["level_AAA_issues"],
+             summary["passed_rules"], summary["failed_rules"])
+        )
+        page_id = cursor.lastrowid
+        
+        for issue in report.issues:
+            rule = issue.rule
+            if rule.id not in self._known_rules:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO rules (id, name, wcag_criterion, level) VALUES (?, ?, ?, ?)",
+                    (rule.id, rule.name, rule.wcag_criterion, rule.level)
+                )
+                self._known_rules.add(rule.id)
+            
+            self._pending.append((
+                run_id, page_id, report.url, rule.id, rule.wcag_criterion, rule.level,
+                issue_key(report.url, issue), issue.description,
+                issue.line, issue.column, issue.path, issue.element_html
+            ))
+        
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+    
+    def flush(self):
+        """在一个事务中写入缓冲的问题行"""
+        with self.conn:
+            if self._pending:
+                self.conn.executemany(
+                    "INSERT INTO issues (run_id, page_id, url, rule_id, wcag_criterion, level, "
+                    "issue_key, description, line, \"column\", path, element_html) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    self._pending
+                )
+                self._pending = []
+    
+    def finish_run(self, run_id):
+        """结束一次运行"""
+        self.flush()
+        with self.conn:
+            self.conn.execute(
+                "UPDATE runs SET finished_at = ? WHERE id = ?",
+                (datetime.now().isoformat(), run_id)
+            )
+    
+    def close(self):
+        """写入剩余数据并关闭数据库"""
+        self.flush()
+        self.conn.close()
+    
+    def latest_run_id(self):
+        """返回最近一次运行的ID，没有运行时返回None"""
+        row = self.conn.execute("SELECT MAX(id) FROM runs").fetchone()
+        return row[0]
+    
+    def list_runs(self, limit=20):
+        """
+        列出最近的运行
+        
+        返回:
+            运行字典列表，包含页面数和问题数
+        """
+        rows = self.conn.execute(
+            "SELECT r.id, r.started_at, r.finished_at, r.wcag_level, r.label, "
+            "COUNT(p.id), COALESCE(SUM(p.total_issues), 0) "
+            "FROM runs r LEFT JOIN pages p ON p.run_id = r.id "
+            "GROUP BY r.id ORDER BY r.id DESC LIMIT ?",
+            (limit,)
+        )
+        return [
+            {
+                "id": run_id, "started_at": started_at, "finished_at": finished_at,
+                "wcag_level": wcag_level, "label": label, "pages": pages, "issues": issues
+            }
+            for run_id, started_at, finished_at, wcag_level, label, pages, issues in rows
+        ]
+    
+    def new_issues_since(self, base_run_id, run_id=None, limit=None):
+        """
+        返回在run_id中出现、但在base_run_id中不存在的问题
+        
+        参数:
+            base_run_id: 作为基准的运行ID
+            run_id: 要比较的运行ID，默认为最近一次运行
+            limit: 最多返回的问题数
+        
+        返回:
+            问题字典列表
+        """
+        return self._diff_issues(run_id or self.latest_run_id(), base_run_id, limit)
+    
+    def fixed_issues_since(self, base_run_id, run_id=None, limit=None):
+        """
+        返回在base_run_id中存在、但在run_id中已消失的问题
+        
+        参数:
+            base_run_id: 作为基准的运行ID
+            run_id: 要比较的运行ID，默认为最近一次运行
+            limit: 最多返回的问题数
+        
+        返回:
+            问题字典列表
+        """
+        return self._diff_issues(base_run_id, run_id or self.latest_run_id(), limit)
+    
+    def top_failing_rules(self, run_id=None, limit=10):
+        """
+        返回问题最多的规则
+        
+        参数:
+            run_id: 运行ID，默认为最近一次运行
+            limit: 返回的规则数
+        
+        返回:
+            规则字典列表，包含问题数和涉及的页面数
+        """
+        rows = self.conn.execute(
+            "SELECT i.rule_id, r.name, r.wcag_criterion, r.level, COUNT(*), COUNT(DISTINCT i.page_id) "
+            "FROM issues i JOIN rules r ON r.id = i.rule_id "
+            "WHERE i.run_id = ? GROUP BY i.rule_id ORDER BY COUNT(*) DESC LIMIT ?",
+            (run_id or self.latest_run_id(), limit)
+        )
+        return [
+            {
+                "rule_id": rule_id, "name": name, "wcag_criterion": criterion,
+                "level": level, "issues": issues, "pages": pages
+            }
+            for rule_id, name, criterion, level, issues, pages in rows
+        ]
+    
+    def issue_trend(self, rule_id=None, limit=20):
+        """
+        返回最近几次运行的问题数，可按规则过滤
+        
+        参数:
+            rule_id: 可选的规则ID
+            limit: 返回的运行数
+        
+        返回:
+            (运行ID, 开始时间, 问题数)列表，按运行先后排序
+        """
+        if rule_id is None:
+            rows = self.conn.execute(
+                "SELECT r.id, r.started_at, COALESCE(SUM(p.total_issues), 0) "
+                "FROM runs r LEFT JOIN pages p ON p.run_id = r.id "
+                "GROUP BY r.id ORDER BY r.id DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        else:
+            rows = self.conn.execute(
+                "SELECT r.id, r.started_at, "
+                "(SELECT COUNT(*) FROM issues i WHERE i.rule_id = ? AND i.run_id = r.id) "
+                "FROM runs r ORDER BY r.id DESC LIMIT ?",
+                (rule_id, limit)
+            ).fetchall()
+        
+        return list(reversed(rows))
+    
+    def _diff_issues(self, run_id, other_run_id, limit):
+        """返回在run_id中存在、在other_run_id中不存在的问题"""
+        sql = (
+            "SELECT i.url, i.rule_id, i.wcag_criterion, i.level, i.issue_key, i.description, "
+            "i.line, i.\"column\", i.path FROM issues i WHERE i.run_id = ? AND NOT EXISTS ("
+            "SELECT 1 FROM issues o WHERE o.run_id = ? AND o.issue_key = i.issue_key)"
+        )
+        params = [run_id, other_run_id]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        
+        columns = ["url", "rule_id", "wcag_criterion", "level", "issue_key", "description",
+                   "line", "column", "path"]
+        return [dict(zip(columns, row)) for row in self.conn.execute(sql, params)]
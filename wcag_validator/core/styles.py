@@ -0,0 +1,763 @@
+"""
+样式引擎模块，解析<style>、style属性和本地链接的样式表，按需计算元素的层叠和计算样式
+"""
+import hashlib
+import os
+import re
+from collections import OrderedDict
+from functools import lru_cache
+from urllib.parse import unquote, urljoin, urlparse
+
+import soupsieve
+
+from .selectors import compile_selector
+
+# 会被子元素继承的属性
+INHERITED_PROPERTIES = frozenset({
+    'color', 'cursor', 'direction', 'font', 'font-family', 'font-size', 'font-style',
+    'font-variant', 'font-weight', 'letter-spacing', 'line-height', 'list-style',
+    'list-style-type', 'quotes', 'text-align', 'text-indent', 'text-transform',
+    'visibility', 'white-space', 'word-spacing', 'word-break', 'overflow-wrap',
+})
+
+# 简写属性覆盖的子属性，后出现的简写会清除先前的子属性声明
+SHORTHANDS = {
+    'background': ('background-color', 'background-image'),
+    'font': ('font-size', 'font-weight', 'font-style', 'font-family', 'line-height'),
+}
+
+# 浏览器默认样式中与可见性、字号和字重相关的部分
+USER_AGENT_CSS = """
+head, script, style, template, noscript, title, meta, link, base, datalist, [hidden] { display: none }
+h1 { font-size: 2em; font-weight: bold }
+h2 { font-size: 1.5em; font-weight: bold }
+h3 { font-size: 1.17em; font-weight: bold }
+h4 { font-size: 1em; font-weight: bold }
+h5 { font-size: 0.83em; font-weight: bold }
+h6 { font-size: 0.67em; font-weight: bold }
+b, strong, th { font-weight: bold }
+small { font-size: smaller }
+big { font-size: larger }
+sub, sup { font-size: smaller }
+"""
+
+# 字号关键字（像素）
+FONT_SIZE_KEYWORDS = {
+    'xx-small': 9.0, 'x-small': 10.0, 'small': 13.0, 'medium': 16.0,
+    'large': 18.0, 'x-large': 24.0, 'xx-large': 32.0, 'xxx-large': 48.0,
+}
+
+DEFAULT_FONT_SIZE = 16.0
+
+# 只在交互状态下生效的伪类，静态检查时按默认状态处理，忽略这些选择器
+_DYNAMIC_PSEUDO_RE = re.compile(r':(?:hover|active|focus|focus-visible|focus-within|visited|target)\b', re.I)
+# 伪元素的样式不作用于元素本身
+_PSEUDO_ELEMENT_RE = re.compile(r'::?(?:before|after|first-line|first-letter|placeholder|selection|marker|backdrop)\b|::', re.I)
+_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+_LENGTH_RE = re.compile(r'^(-?[\d.]+)(px|pt|em|rem|%)?$')
+_IMPORT_RE = re.compile(r'''^@import\s+(?:url\(\s*)?['"]?([^'")\s]+)['"]?\s*\)?\s*(.*)$''', re.I | re.S)
+
+# 特异性计算
+_WHERE_RE = re.compile(r':where\([^()]*\)', re.I)
+_ID_RE = re.compile(r'#[\w-]+')
+_CLASS_LIKE_RE = re.compile(r'\.[\w-]+|\[[^\]]*\]|(?<!:):(?!not\(|is\(|where\()[\w-]+')
+_TYPE_RE = re.compile(r'(?:^|[\s>+~(,])([a-zA-Z][\w-]*)')
+
+
+@lru_cache(maxsize=4096)
+def parse_declarations(text):
+    """
+    解析声明块（style属性值或规则的花括号内容）
+    
+    相同的声明块只解析一次，返回的字典在多个元素间共享，调用方不得修改。
+    
+    参数:
+        text: 声明文本
+    
+    返回:
+        属性名(小写) -> (值, 是否!important)的字典，后出现的声明覆盖先出现的
+    """
+    declarations = {}
+    for declaration in _split_top_level(text, ';'):
+        name, sep, value = declaration.partition(':')
+        if not sep:
+            continue
+        name = name.strip().lower()
+        value = value.strip()
+        important = False
+        if value.lower().endswith('!important'):
+            value = value[:-len('!important')].strip()
+            important = True
+        if name and value:
+            declarations[name] = (value, important)
+    return declarations
+
+
+def _split_top_level(text, separator):
+    """按分隔符拆分文本，忽略括号和引号内的分隔符（如url(data:...;base64,...)）"""
+    if '(' not in text and '"' not in text and "'" not in text:
+        return text.split(separator)
+    
+    parts = []
+    depth = 0
+    quote = None
+    start = 0
+    for i, ch in enumerate(text):
+        if quote:
+            if ch == quote and text[i - 1] != '\\':
+                quote = None
+        elif ch in '"\'':
+            quote = ch
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth = max(depth - 1, 0)
+        elif ch == separator and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def specificity(selector):
+    """
+    计算单个选择器（不含逗号）的特异性
+    
+    参数:
+        selector: 选择器字符串
+    
+    返回:
+        (id数, class/属性/伪类数, 类型/伪元素数)元组
+    """
+    text = _WHERE_RE.sub('', selector)
+    ids = len(_ID_RE.findall(text))
+    text = _ID_RE.sub('', text)
+    classes = len(_CLASS_LIKE_RE.findall(text))
+    text = _CLASS_LIKE_RE.sub('', text)
+    types = len(_TYPE_RE.findall(text)) + text.count('::')
+    return (ids, classes, types)
+
+
+def _bloom(keys):
+    """将键集合映射为位掩码（布隆过滤器），用于快速排除祖先不满足要求的规则"""
+    mask = 0
+    for key in keys:
+        mask |= 1 << (hash(key) & 255)
+    return mask
+
+
+def _element_keys(element):
+    """元素自身的键：标签名、id和class"""
+    keys = [('tag', element.name)]
+    element_id = element.get('id')
+    if element_id is not None:
+        keys.append(('id', element_id))
+    classes = element.get('class')
+    if classes:
+        if isinstance(classes, str):
+            classes = classes.split()
+        keys.extend(('class', name) for name in classes)
+    return keys
+
+
+class StyleRule:
+    """样式表中的一条规则（每个逗号分隔的选择器单独成为一条规则）"""
+    
+    __slots__ = ('selector', 'specificity', 'order', 'declarations', 'ancestor_mask', 'simple')
+    
+    def __init__(self, selector, specificity, order, declarations):
+        self.selector = selector  # CompiledSelector对象
+        self.specificity = specificity  # 特异性元组
+        self.order = order  # 在样式表中的顺序
+        self.declarations = declarations  # 属性名 -> (值, 是否!important)
+        self.ancestor_mask = _bloom(selector.ancestors[0])  # 祖先必须具有的键的位掩码
+        self.simple = selector.simple[0]  # 只由单个标签、id或class构成，命中分桶即匹配
+
+
+class Stylesheet:
+    """
+    解析后的样式表
+    
+    规则按选择器最右侧复合选择器中的id、class和标签名分桶，查找元素适用的规则时
+    只需检查与元素id、class和标签对应的桶以及通用桶，而不必逐条匹配全部规则。
+    """
+    
+    def __init__(self, text):
+        """
+        解析样式表
+        
+        参数:
+            text: CSS文本
+        """
+        self.rules = []
+        self.imports = []  # @import引用的样式表地址，按出现顺序
+        self.by_id = {}
+        self.by_class = {}
+        self.by_tag = {}
+        self.universal = []
+        self._parse_block(_COMMENT_RE.sub('', text))
+    
+    def __len__(self):
+        return len(self.rules)
+    
+    def candidates(self, element):
+        """
+        获取可能适用于元素的规则（未按选择器完整匹配）
+        
+        参数:
+            element: 元素
+        
+        返回:
+            StyleRule列表
+        """
+        candidates = list(self.universal)
+        rules = self.by_tag.get(element.name)
+        if rules:
+            candidates.extend(rules)
+        element_id = element.get('id')
+        if element_id is not None and self.by_id:
+            rules = self.by_id.get(element_id)
+            if rules:
+                candidates.extend(rules)
+        classes = element.get('class')
+        if classes and self.by_class:
+            if isinstance(classes, str):
+                classes = classes.split()
+            for name in classes:
+                rules = self.by_class.get(name)
+                if rules:
+                    candidates.extend(rules)
+        return candidates
+    
+    def _parse_block(self, text):
+        """解析规则列表，@media和@supports块递归解析"""
+        position = 0
+        length = len(text)
+        while position < length:
+            end = _find_any(text, '{;', position)
+            if end == -1:
+                break
+            prelude = text[position:end].strip()
+            
+            if text[end] == ';':
+                # 语句形式的@规则，只处理@import
+                match = _IMPORT_RE.match(prelude)
+                if match and _media_applies(match.group(2)):
+                    self.imports.append(match.group(1))
+                position = end + 1
+                continue
+            
+            close = _find_block_end(text, end)
+            body = text[end + 1:close]
+            position = close + 1
+            
+            if prelude.startswith('@'):
+                keyword, _, condition = prelude[1:].partition(' ')
+                keyword = keyword.lower()
+                if keyword == 'media' and _media_applies(condition):
+                    self._parse_block(body)
+                elif keyword in ('supports', 'layer', 'container', 'document'):
+                    self._parse_block(body)
+                # @font-face、@keyframes、@page等不影响元素样式
+                continue
+            
+            declarations = parse_declarations(body)
+            if declarations:
+                self._add_rule(prelude, declarations)
+    
+    def _add_rule(self, prelude, declarations):
+        for selector in _split_top_level(prelude, ','):
+            selector = selector.strip()
+            if not selector or _DYNAMIC_PSEUDO_RE.search(selector) or _PSEUDO_ELEMENT_RE.search(selector):
+                continue
+            try:
+                compiled = compile_selector(selector)
+            except (soupsieve.SelectorSyntaxError, NotImplementedError, ValueError):
+                continue  # 不支持的选择器（如浏览器私有伪类）
+            
+            rule = StyleRule(compiled, specificity(selector), len(self.rules), declarations)
+            self.rules.append(rule)
+            key = compiled.buckets[0] if compiled.buckets else None
+            if key is None:
+                self.universal.append(rule)
+            elif key[0] == 'id':
+                self.by_id.setdefault(key[1], []).append(rule)
+            elif key[0] == 'class':
+                self.by_class.setdefault(key[1], []).append(rule)
+            else:
+                self.by_tag.setdefault(key[1], []).append(rule)
+
+
+def _find_any(text, chars, start):
+    """查找下一个不在引号内的指定字符"""
+    quote = None
+    for i in range(start, len(text)):
+        ch = text[i]
+        if quote:
+            if ch == quote and text[i - 1] != '\\':
+                quote = None
+        elif ch in '"\'':
+            quote = ch
+        elif ch in chars:
+            return i
+    return -1
+
+
+def _find_block_end(text, start):
+    """查找与start处的左花括号配对的右花括号，不存在时返回文本末尾"""
+    depth = 0
+    quote = None
+    for i in range(start, len(text)):
+        ch = text[i]
+        if quote:
+            if ch == quote and text[i - 1] != '\\':
+                quote = None
+        elif ch in '"\'':
+            quote = ch
+        elif ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return i
+    return len(text)
+
+
+def _media_applies(media):
+    """媒体查询是否适用于屏幕显示（只排除明确针对打印、语音或否定形式的查询）"""
+    media = (media or '').strip().lower()
+    if not media:
+        return True
+    for query in media.split(','):
+        query = query.strip()
+        if not query.startswith(('print', 'speech', 'not ', 'only print', 'only speech')):
+            return True
+    return False
+
+
+class StylesheetCache:
+    """
+    解析后样式表的缓存
+    
+    样式表按内容的哈希缓存，多个页面共享同一个样式表时整个运行期间只解析一次；本地
+    样式表文件另按(路径, 修改时间, 大小)缓存其内容哈希，文件未变化时无需重新读取。
+    """
+    
+    def __init__(self, max_entries=256):
+        """
+        参数:
+            max_entries: 最多缓存的样式表数量，超出时淘汰最久未使用的
+        """
+        self.max_entries = max_entries
+        self._sheets = OrderedDict()  # 内容哈希 -> Stylesheet
+        self._files = {}  # (路径, 修改时间, 大小) -> 内容哈希
+        self.hits = 0
+        self.misses = 0
+    
+    def parse(self, text):
+        """
+        解析CSS文本，相同内容只解析一次
+        
+        参数:
+            text: CSS文本
+        
+        返回:
+            Stylesheet对象
+        """
+        digest = hashlib.sha1(text.encode('utf-8', 'surrogatepass')).hexdigest()
+        sheet = self._sheets.get(digest)
+        if sheet is not None:
+            self.hits += 1
+            self._sheets.move_to_end(digest)
+            return sheet
+        
+        self.misses += 1
+        sheet = Stylesheet(text)
+        self._sheets[digest] = sheet
+        if len(self._sheets) > self.max_entries:
+            self._sheets.popitem(last=False)
+        return sheet
+    
+    def load(self, path):
+        """
+        读取并解析本地样式表文件
+        
+        参数:
+            path: 文件路径
+        
+        返回:
+            Stylesheet对象，文件不存在或无法读取时返回None
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        digest = self._files.get(key)
+        if digest is not None:
+            sheet = self._sheets.get(digest)
+            if sheet is not None:
+                self.hits += 1
+                self._sheets.move_to_end(digest)
+                return sheet
+        
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                text = f.read()
+        except OSError:
+            return None
+        
+        sheet = self.parse(text)
+        self._files[key] = hashlib.sha1(text.encode('utf-8', 'surrogatepass')).hexdigest()
+        return sheet
+    
+    def clear(self):
+        """清空缓存"""
+        self._sheets.clear()
+        self._files.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# 进程内共享的样式表缓存
+stylesheet_cache = StylesheetCache()
+
+
+class ComputedStyle:
+    """元素的计算样式"""
+    
+    __slots__ = ('values', 'font_size', '_inherited')
+    
+    def __init__(self, values, font_size):
+        self.values = values  # 属性名 -> 值（包括继承的属性），在元素间共享，不得修改
+        self.font_size = font_size  # 字号（像素）
+        self._inherited = None
+    
+    def get(self, name, default=None):
+        """获取属性值"""
+        return self.values.get(name, default)
+    
+    def __getitem__(self, name):
+        return self.values[name]
+    
+    def __contains__(self, name):
+        return name in self.values
+    
+    @property
+    def inherited(self):
+        """子元素继承的属性"""
+        if self._inherited is None:
+            values = self.values
+            if all(name in INHERITED_PROPERTIES for name in values):
+                self._inherited = values
+            else:
+                self._inherited = {name: value for name, value in values.items() if name in INHERITED_PROPERTIES}
+        return self._inherited
+
+
+ROOT_STYLE = ComputedStyle({}, DEFAULT_FONT_SIZE)
+
+_NO_DECLARATIONS = {}
+
+
+class StyleEngine:
+    """
+    文档的样式引擎
+    
+    样式表在首次使用时收集（浏览器默认样式、<style>元素和本地<link rel="stylesheet">，
+    按文档顺序），解析结果通过stylesheet_cache在文档间共享。元素的层叠声明和计算样式
+    在被查询时才计算并缓存，计算样式由父元素的计算样式继承得到，祖先链上已计算的
+    结果会被复用。
+    """
+    
+    def __init__(self, document, index, base_url=None, cache=None):
+        """
+        参数:
+            document: BeautifulSoup文档对象
+            index: 文档的DocumentIndex对象
+            base_url: 文档地址，用于解析链接样式表的相对路径（只加载file://或本地路径）
+            cache: StylesheetCache对象，默认使用进程内共享的缓存
+        """
+        self.document = document
+        self.index = index
+        self.base_url = base_url
+        self.cache = cache or stylesheet_cache
+        self._sheets = None  # [(来源, Stylesheet)]，来源0为浏览器默认样式，1为作者样式
+        self._declared = {}  # 元素id -> 层叠后的声明
+        self._ancestor_masks = {}  # 元素id -> 祖先键的位掩码
+        self._computed = {}  # 元素id -> ComputedStyle
+    
+    @classmethod
+    def for_document(cls, document):
+        """
+        获取文档的样式引擎，每个文档只创建一次
+        
+        参数:
+            document: BeautifulSoup文档对象
+        
+        返回:
+            StyleEngine对象
+        """
+        from .index import DocumentIndex
+        
+        engine = document.__dict__.get('_wcag_styles')
+        if engine is None:
+            engine = cls(document, DocumentIndex.for_document(document),
+                         base_url=document.__dict__.get('_wcag_url'))
+            document._wcag_styles = engine
+        return engine
+    
+    @property
+    def stylesheets(self):
+        """按层叠顺序排列的(来源, Stylesheet)列表"""
+        if self._sheets is None:
+            self._sheets = self._collect()
+        return self._sheets
+    
+    def _collect(self):
+        sheets = [(0, self.cache.parse(USER_AGENT_CSS))]
+        seen = set()
+        for element in self.index.elements_by_tag('style', 'link'):
+            if element.name == 'style':
+                if _media_applies(element.get('media')):
+                    self._add_sheet(sheets, self.cache.parse(element.string or ""), self.base_url, seen)
+                continue
+            
+            rel = element.get('rel') or []
+            if isinstance(rel, str):
+                rel = rel.split()
+            rel = [value.lower() for value in rel]
+            if 'stylesheet' not in rel or 'alternate' in rel or not _media_applies(element.get('media')):
+                continue
+            path = self._local_path(element.get('href'), self.base_url)
+            if path is not None:
+                self._add_file(sheets, path, seen)
+        return sheets
+    
+    def _add_file(self, sheets, path, seen):
+        if path in seen:
+            return
+        seen.add(path)
+        sheet = self.cache.load(path)
+        if sheet is not None:
+            self._add_sheet(sheets, sheet, 'file://' + path, seen)
+    
+    def _add_sheet(self, sheets, sheet, base_url, seen):
+        # @import的样式表在引用它的样式表之前生效
+        for href in sheet.imports:
+            path = self._local_path(href, base_url)
+            if path is not None:
+                self._add_file(sheets, path, seen)
+        if sheet.rules:
+            sheets.append((1, sheet))
+    
+    @staticmethod
+    def _local_path(href, base_url):
+        """将样式表地址解析为本地文件路径，远程地址返回None"""
+        if not href:
+            return None
+        href = href.strip()
+        if base_url:
+            href = urljoin(base_url, href)
+        parsed = urlparse(href)
+        if parsed.scheme == 'file':
+            return os.path.abspath(unquote(parsed.path))
+        if parsed.scheme:
+            return None  # 验证时不下载远程样式表
+        return os.path.abspath(unquote(parsed.path))
+    
+    def declarations(self, element):
+        """
+        获取元素层叠后的声明（不含继承）
+        
+        按来源、!important、特异性和出现顺序确定每个属性的最终值，style属性的声明
+        优先于样式表中的普通声明。
+        
+        参数:
+            element: 元素
+        
+        返回:
+            属性名 -> 值的字典，在多次调用间共享，不得修改
+        """
+        key = id(element)
+        declared = self._declared.get(key)
+        if declared is not None:
+            return declared
+        
+        matched = []
+        ancestors = None
+        for position, (origin, sheet) in enumerate(self.stylesheets):
+            for rule in sheet.candidates(element):
+                if not rule.simple:
+                    required = rule.ancestor_mask
+                    if required:
+                        # 祖先中不可能具有选择器要求的id、class或标签时无需完整匹配
+                        if ancestors is None:
+                            ancestors = self._ancestor_mask(element)
+                        if required & ancestors != required:
+                            continue
+                    if not rule.selector.match(element):
+                        continue
+                matched.append((origin, rule.specificity, position, rule.order, rule.declarations))
+        
+        inline = element.get('style')
+        inline = parse_declarations(inline) if inline else None
+        
+        if not matched and not inline:
+            declared = _NO_DECLARATIONS
+        else:
+            matched.sort(key=lambda item: item[:4])
+            declared = {}
+            layers = [item[4] for item in matched]
+            if inline:
+                layers.append(inline)
+            for important in (False, True):
+                for declarations in layers:
+                    for name, (value, flag) in declarations.items():
+                        if flag is important:
+                            for longhand in SHORTHANDS.get(name, ()):
+                                declared.pop(longhand, None)
+                            declared[name] = value
+        
+        self._declared[key] = declared
+        return declared
+    
+    def _ancestor_mask(self, element):
+        """元素所有祖先的键的位掩码，由父元素的掩码递推并缓存"""
+        masks = self._ancestor_masks
+        chain = []
+        node = element.parent
+        mask = 0
+        while node is not None and getattr(node, 'name', '[document]') != '[document]':
+            cached = masks.get(id(node))
+            if cached is not None:
+                mask = cached
+                break
+            chain.append(node)
+            node = node.parent
+        
+        # masks保存的是包含元素自身键的掩码，供其子元素使用
+        for node in reversed(chain):
+            mask = masks[id(node)] = mask | _bloom(_element_keys(node))
+        return mask
+    
+    def computed(self, element):
+        """
+        获取元素的计算样式
+        
+        参数:
+            element: 元素
+        
+        返回:
+            ComputedStyle对象
+        """
+        computed = self._computed
+        style = computed.get(id(element))
+        if style is not None:
+            return style
+        
+        # 向上找到最近的已计算祖先，再自顶向下计算链上的元素
+        chain = []
+        node = element
+        while node is not None and getattr(node, 'name', '[document]') != '[document]':
+            style = computed.get(id(node))
+            if style is not None:
+                break
+            chain.append(node)
+            node = node.parent
+        parent = style or ROOT_STYLE
+        
+        for node in reversed(chain):
+            parent = computed[id(node)] = self._derive(parent, self.declarations(node))
+        return parent
+    
+    @staticmethod
+    def _derive(parent, declared):
+        """由父元素的计算样式和元素的层叠声明计算元素的计算样式"""
+        inherited = parent.inherited
+        if not declared:
+            # 没有声明的元素与父元素的计算样式相同时直接共享
+            return parent if inherited is parent.values else ComputedStyle(inherited, parent.font_size)
+        
+        values = dict(inherited)
+        font_size = parent.font_size
+        for name, value in declared.items():
+            keyword = value.lower()
+            if keyword == 'inherit' or (keyword == 'unset' and name in INHERITED_PROPERTIES):
+                if name in parent.values:
+                    values[name] = parent.values[name]
+                else:
+                    values.pop(name, None)
+            elif keyword in ('initial', 'unset', 'revert'):
+                values.pop(name, None)
+                if name == 'font-size':
+                    font_size = DEFAULT_FONT_SIZE
+            else:
+                values[name] = value
+                if name == 'font-size':
+                    font_size = parse_font_size(value, parent.font_size)
+                elif name == 'font':
+                    # 简写中的字号和字重同时设置对应的子属性
+                    size, weight = _expand_font(value)
+                    values['font-weight'] = weight
+                    if size is not None:
+                        values['font-size'] = size
+                        font_size = parse_font_size(size, parent.font_size)
+        return ComputedStyle(values, font_size)
+
+
+def parse_font_size(value, parent_size, default=None):
+    """
+    解析font-size声明
+    
+    参数:
+        value: 声明值
+        parent_size: 父元素字号（像素）
+        default: 无法解析时使用的字号，默认为父元素字号
+    
+    返回:
+        字号（像素）
+    """
+    value = value.strip().lower()
+    if value in FONT_SIZE_KEYWORDS:
+        return FONT_SIZE_KEYWORDS[value]
+    if value == 'larger':
+        return parent_size * 1.2
+    if value == 'smaller':
+        return parent_size / 1.2
+    
+    match = _LENGTH_RE.match(value)
+    if not match:
+        return parent_size if default is None else default
+    number = float(match.group(1))
+    unit = match.group(2) or 'px'
+    if unit == 'px':
+        return number
+    if unit == 'pt':
+        return number * 4 / 3
+    if unit == 'em':
+        return number * parent_size
+    if unit == 'rem':
+        return number * DEFAULT_FONT_SIZE
+    return number * parent_size / 100
+
+
+def _expand_font(value):
+    """
+    从font简写中取出字号和字重
+    
+    返回:
+        (字号, 字重)元组，字号为字体族之前的第一个长度或字号关键字（可带/行高），没有时为None
+    """
+    size = None
+    weight = 'normal'
+    for token in value.split():
+        token = token.split('/', 1)[0].lower()
+        if token in ('bold', 'bolder', 'lighter') or (token.isdigit() and len(token) == 3):
+            weight = token
+        elif token in FONT_SIZE_KEYWORDS or token in ('larger', 'smaller') or \
+                (_LENGTH_RE.match(token) and not token.replace('.', '', 1).isdigit()):
+            size = token
+            break
+    return size, weight
@@ -1,17 +1,47 @@
 """
 验证器主类，负责协调验证流程和生成报告
 """
+import time
+
 from .parser import HTMLParser
-from ..rules.base import RuleRegistry
+from .baseline import Baseline, issue_fingerprint
+from .index import DocumentIndex
+from .messages import DEFAULT_LOCALE, catalogue
+from .budget import Budget, BudgetExceeded, BudgetMeter
+from .profiler import ElementMeter, ValidationProfile
+from .rule_engine import ExecutionPlan
+from ..utils.html_utils import element_signature
+
+LEVEL_ORDER = {'A': 1, 'AA': 2, 'AAA': 3}
 
 class ValidationReport:
-    """验证报告类"""
+    """
+    验证报告类
+    
+    添加问题时同步维护按规则、WCAG标准、级别和影响程度的索引，
+    按这些维度查询和计数不需要扫描全部问题。
+    """
+    
+    # 可用于查询的维度及其取值方式
+    FACETS = {
+        "rule_id": lambda issue: issue.rule.id,
+        "wcag_criterion": lambda issue: issue.rule.wcag_criterion,
+        "level": lambda issue: issue.rule.level,
+        "impact": lambda issue: issue.impact,
+    }
     
-    def __init__(self, url=None):
+    def __init__(self, url=None, locale=DEFAULT_LOCALE):
         self.url = url
+        self.locale = locale  # 问题描述、修复建议和代码示例的语言
         self.issues = []  # 问题列表
         self.passed_rules = []  # 通过的规则
         self.failed_rules = []  # 失败的规则
+        self.fail_on = None  # 门禁阈值 (FailThreshold)
+        self.gate_failed = None  # 门禁结论，未设置阈值时为None
+        self.short_circuited = False  # 是否因结论已确定而提前停止
+        self.baseline_suppressed = None  # 与基线对比时被忽略的已知问题数
+        self.profile = None  # 性能分析结果 (ValidationProfile)，未启用时为None
+        self.partial_rules = []  # 因超出预算而未完成的规则 [{"rule_id", "reason"}]
         self.summary = {
             "total_issues": 0,
             "level_A_issues": 0,
@@ -20,6 +50,9 @@ class ValidationReport:
             "passed_rules": 0,
             "failed_rules": 0
         }
+        self._indexes = {facet: {} for facet in self.FACETS}  # 维度 -> 取值 -> 问题列表
+        self._failed_rule_set = set()
+        self._passed_rule_set = set()
     
     def add_issue(self, issue):
         """添加问题"""
@@ -27,44 +60,176 @@ class ValidationReport:
         self.summary["total_issues"] += 1
         
         # 更新按级别统计
-        if issue.rule.level == "A":
-            self.summary["level_A_issues"] += 1
-        elif issue.rule.level == "AA":
-            self.summary["level_AA_issues"] += 1
-        elif issue.rule.level == "AAA":
-            self.summary["level_AAA_issues"] += 1
+        level_key = f"level_{issue.rule.level}_issues"
+        if level_key in self.summary:
+            self.summary[level_key] += 1
+        
+        # 更新索引
+        for facet, key in self.FACETS.items():
+            self._indexes[facet].setdefault(key(issue), []).append(issue)
         
         # 更新失败规则列表
-        if issue.rule not in self.failed_rules:
+        if issue.rule not in self._failed_rule_set:
+            self._failed_rule_set.add(issue.rule)
             self.failed_rules.append(issue.rule)
             self.summary["failed_rules"] = len(self.failed_rules)
     
     def add_passed_rule(self, rule):
         """添加通过的规则"""
-        if rule not in self.passed_rules:
+        if rule not in self._passed_rule_set:
+            self._passed_rule_set.add(rule)
             self.passed_rules.append(rule)
             self.summary["passed_rules"] = len(self.passed_rules)
     
+    def add_partial_rule(self, rule, reason):
+        """
+        添加因超出预算而未完成的规则，其已发现的问题仍保留在报告中
+        
+        参数:
+            rule: 规则实例
+            reason: 未完成的原因
+        """
+        self.partial_rules.append({"rule_id": rule.id, "reason": reason})
+    
+    @property
+    def partial(self):
+        """是否有规则因超出预算而未完成"""
+        return bool(self.partial_rules)
+    
+    def has_failed(self, rule):
+        """判断规则是否产生了问题"""
+        return rule in self._failed_rule_set
+    
+    def get_issues_by_rule(self, rule_id):
+        """按规则ID获取问题"""
+        return list(self._indexes["rule_id"].get(rule_id, ()))
+    
     def get_issues_by_criterion(self, criterion):
         """按WCAG标准获取问题"""
-        return [issue for issue in self.issues if issue.rule.wcag_criterion == criterion]
+        return list(self._indexes["wcag_criterion"].get(criterion, ()))
     
     def get_issues_by_level(self, level):
         """按级别获取问题"""
-        return [issue for issue in self.issues if issue.rule.level == level]
+        return list(self._indexes["level"].get(level, ()))
+    
+    def get_issues_by_impact(self, impact):
+        """按影响程度获取问题"""
+        return list(self._indexes["impact"].get(impact, ()))
+    
+    def query(self, **facets):
+        """
+        按多个维度组合查询问题，如query(level='A', impact='高')
+        
+        从候选最少的索引出发，再用其余条件过滤。
+        
+        参数:
+            facets: 维度名（rule_id、wcag_criterion、level、impact）到取值的映射，
+                    取值也可以是取值的列表或集合
+        
+        返回:
+            按添加顺序排列的问题列表
+        """
+        if not facets:
+            return list(self.issues)
+        
+        conditions = []
+        for facet, value in facets.items():
+            if facet not in self.FACETS:
+                raise ValueError(f"不支持的查询维度: {facet}")
+            values = set(value) if isinstance(value, (list, tuple, set, frozenset)) else {value}
+            candidates = [self._indexes[facet].get(v, ()) for v in values]
+            conditions.append((sum(len(c) for c in candidates), facet, values, candidates))
+        
+        conditions.sort(key=lambda condition: condition[0])
+        _, _, _, candidates = conditions[0]
+        if len(candidates) == 1:
+            issues = candidates[0]
+        else:
+            # 多个取值的并集需要恢复添加顺序
+            positions = {id(issue): i for i, issue in enumerate(self.issues)}
+            issues = sorted((issue for c in candidates for issue in c), key=lambda issue: positions[id(issue)])
+        
+        filters = [(self.FACETS[facet], values) for _, facet, values, _ in conditions[1:]]
+        return [issue for issue in issues if all(key(issue) in values for key, values in filters)]
+    
+    def count(self, **facets):
+        """
+        按维度组合计数，单一维度单一取值时直接读取索引
+        
+        参数:
+            facets: 同query
+        
+        返回:
+            问题数
+        """
+        if not facets:
+            return len(self.issues)
+        if len(facets) == 1:
+            (facet, value), = facets.items()
+            if facet in self.FACETS and not isinstance(value, (list, tuple, set, frozenset)):
+                return len(self._indexes[facet].get(value, ()))
+        
+        return len(self.query(**facets))
+    
+    def facet_counts(self, facet, **filters):
+        """
+        统计某个维度各取值的问题数，可附加其他维度的过滤条件
+        
+        参数:
+            facet: 维度名
+            filters: 过滤条件，同query
+        
+        返回:
+            取值到问题数的字典
+        """
+        if facet not in self.FACETS:
+            raise ValueError(f"不支持的查询维度: {facet}")
+        
+        if not filters:
+            return {value: len(issues) for value, issues in self._indexes[facet].items()}
+        
+        counts = {}
+        key = self.FACETS[facet]
+        for issue in self.query(**filters):
+            value = key(issue)
+            counts[value] = counts.get(value, 0) + 1
+        return counts
+    
+    def get_gate_dict(self):
+        """返回门禁结论字典，未设置阈值时返回None"""
+        if self.fail_on is None:
+            return None
+        
+        return {
+            "fail_on": str(self.fail_on),
+            "failed": self.gate_failed,
+            "short_circuited": self.short_circuited
+        }
     
     def to_dict(self):
         """转换为字典"""
-        return {
+        result = {
             "url": self.url,
             "summary": self.summary,
             "issues": [issue.to_dict() for issue in self.issues]
         }
+        
+        gate = self.get_gate_dict()
+        if gate:
+            result["gate"] = gate
+        if self.baseline_suppressed is not None:
+            result["baseline"] = {"suppressed_issues": self.baseline_suppressed}
+        if self.partial_rules:
+            result["partial"] = self.partial_rules
+        if self.profile is not None:
+            result["profile"] = self.profile.to_dict()
+        
+        return result
     
-    def to_json(self):
-        """转换为JSON"""
-        import json
-        return json.dumps(self.to_dict(), indent=2)
+    def to_json(self, indent=2):
+        """转换为JSON，indent为None时输出紧凑格式"""
+        from .serializer import report_to_json
+        return report_to_json(self, indent=indent)
     
     def to_html(self):
         """转换为HTML报告"""
@@ -253,26 +418,78 @@ class ValidationReport:
 
 
 class Issue:
-    """问题类"""
+    """
+    问题类
+    
+    规则产生的问题携带代码(code)和参数(params)，描述、修复建议和代码示例在输出时
+    按问题的语言(locale，由验证器设置)从消息目录生成；没有代码的问题（如自定义规则）
+    使用显式给出的描述。
+    """
     
-    def __init__(self, rule, element=None, description=""):
+    __slots__ = ('rule', 'element', 'code', 'params', 'locale', 'impact', 'element_html', 'location',
+                 'line', 'column', 'path', 'fingerprint', '_description', '_fix_suggestions', '_code_examples')
+    
+    def __init__(self, rule, element=None, description="", code=None, params=None):
         self.rule = rule  # 触发问题的规则
         self.element = element  # 问题元素
-        self.description = description  # 问题描述
+        self.code = code  # 消息目录中的问题代码
+        self.params = params if params is not None else {}  # 生成描述、建议和示例的模板参数
+        self.locale = None  # 生成描述、建议和示例的语言，None时使用默认语言
         self.impact = "高"  # 影响程度
-        self.fix_suggestions = []  # 修复建议
-        self.code_examples = []  # 代码示例
         self.element_html = ""  # 元素HTML
         self.location = ""  # 元素位置
+        self.line = 0  # 元素所在行号
+        self.column = 0  # 元素所在列号
+        self.path = ""  # 元素XPath路径
+        self.fingerprint = ""  # 不依赖行号的稳定指纹
+        self._description = description  # 显式给出的问题描述
+        self._fix_suggestions = None  # 显式添加的修复建议
+        self._code_examples = None  # 显式添加的代码示例
+    
+    @property
+    def description(self):
+        """问题描述"""
+        if self._description or not self.code:
+            return self._description
+        return catalogue.render(self.code, self.params, self.element, self.locale)
+    
+    @description.setter
+    def description(self, value):
+        self._description = value
+    
+    @property
+    def fix_suggestions(self):
+        """修复建议：消息目录中的建议加上显式添加的建议"""
+        suggestions = catalogue.fix_suggestions(self.code, self.params, self.element, self.locale) if self.code else []
+        if self._fix_suggestions:
+            suggestions.extend(self._fix_suggestions)
+        return suggestions
+    
+    @property
+    def code_examples(self):
+        """代码示例：消息目录中的示例加上显式添加的示例"""
+        examples = catalogue.code_examples(self.code, self.params, self.element, self.locale) if self.code else []
+        if self._code_examples:
+            examples.extend(self._code_examples)
+        return examples
+    
+    @property
+    def signature(self):
+        """问题元素的规范化签名，用于跨页面识别相同的元素"""
+        return element_signature(self.element)
     
     def add_fix_suggestion(self, suggestion):
         """添加修复建议"""
-        self.fix_suggestions.append(suggestion)
+        if self._fix_suggestions is None:
+            self._fix_suggestions = []
+        self._fix_suggestions.append(suggestion)
         return self
     
     def add_code_example(self, code, description=""):
         """添加代码示例"""
-        self.code_examples.append({
+        if self._code_examples is None:
+            self._code_examples = []
+        self._code_examples.append({
             "code": code,
             "description": description
         })
@@ -288,6 +505,13 @@ class Issue:
         self.location = location
         return self
     
+    def set_position(self, line, column, path):
+        """设置元素的行号、列号和路径，并生成位置描述"""
+        self.line = line
+        self.column = column
+        self.path = path
+        return self.set_location(f"行 {line}, 列 {column}, 路径 {path}")
+    
     def set_impact(self, impact):
         """设置影响程度"""
         self.impact = impact
@@ -303,30 +527,130 @@ class Issue:
             "impact": self.impact,
             "element_html": self.element_html,
             "location": self.location,
+            "fingerprint": self.fingerprint,
+            "code": self.code,
+            "params": self.params,
             "fix_suggestions": self.fix_suggestions,
             "code_examples": self.code_examples
         }
 
 
+class FailThreshold:
+    """门禁阈值，结论一旦确定即可停止验证"""
+    
+    def __init__(self, level=None, max_issues=None):
+        """
+        初始化门禁阈值
+        
+        参数:
+            level: 出现该级别（含更低级别）的任意问题即判定失败 ('A', 'AA', 'AAA')
+            max_issues: 问题总数超过该值即判定失败
+        """
+        if (level is None) == (max_issues is None):
+            raise ValueError("必须且只能指定level或max_issues之一")
+        if level is not None and level.upper() not in LEVEL_ORDER:
+            raise ValueError(f"不支持的门禁级别: {level}")
+        if max_issues is not None and max_issues < 0:
+            raise ValueError(f"问题数阈值不能为负数: {max_issues}")
+        
+        self.level = level.upper() if level is not None else None
+        self.max_issues = max_issues
+    
+    @classmethod
+    def parse(cls, spec):
+        """
+        解析门禁阈值字符串
+        
+        参数:
+            spec: 'A'、'AA'、'AAA'或'count=N'，也可以直接传入FailThreshold对象
+            
+        返回:
+            FailThreshold对象
+        """
+        if isinstance(spec, cls):
+            return spec
+        
+        spec = spec.strip()
+        if spec.lower().startswith('count='):
+            try:
+                max_issues = int(spec.split('=', 1)[1])
+            except ValueError:
+                raise ValueError(f"无效的门禁阈值: {spec}")
+            return cls(max_issues=max_issues)
+        
+        return cls(level=spec)
+    
+    def is_relevant(self, rule):
+        """判断规则产生的问题能否影响门禁结论"""
+        if self.level is None:
+            return True
+        
+        return LEVEL_ORDER.get(rule.level, 0) <= LEVEL_ORDER[self.level]
+    
+    def is_exceeded(self, report):
+        """判断报告是否已达到失败条件"""
+        if self.level is None:
+            return report.summary["total_issues"] > self.max_issues
+        
+        return any(
+            report.summary[f"level_{level}_issues"] > 0
+            for level, order in LEVEL_ORDER.items()
+            if order <= LEVEL_ORDER[self.level]
+        )
+    
+    def __str__(self):
+        if self.level is None:
+            return f"count={self.max_issues}"
+        return self.level
+
+
 class WCAGValidator:
     """WCAG验证器主类"""
     
-    def __init__(self, wcag_level='AA', rules=None):
+    def __init__(self, wcag_level='AA', rules=None, fail_on=None,
+                 rule_ids=None, skip_rules=None, criteria=None, baseline=None, profile=False,
+                 budget=None, registry=None, locale=None):
         """
         初始化验证器
         
         参数:
             wcag_level: 验证级别 ('A', 'AA', 'AAA')
             rules: 要使用的规则列表，如果为None则使用默认规则
+            fail_on: 可选的门禁阈值 ('A', 'AA', 'AAA', 'count=N' 或FailThreshold)，
+                     设置后一旦判定失败即停止验证
+            rule_ids: 只执行这些规则ID
+            skip_rules: 跳过这些规则ID
+            criteria: 只执行这些WCAG标准（如'1.1.1'）的规则
+            baseline: 可选的基线（文件路径或Baseline对象），基线中已有的问题不再报告
+            profile: 是否记录每个规则的耗时、访问的元素数和问题数以及各阶段耗时
+            budget: 可选的执行预算（Budget对象或其参数字典），超出预算的规则被中止并标记为部分完成
+            registry: 可选的规则注册表（RuleRegistry对象），默认使用共享的默认注册表；
+                      在独立注册表中注册的规则只对使用它的验证器可见
+            locale: 问题描述、修复建议和代码示例的语言（如'zh-CN'、'en'），默认为zh-CN；
+                    语言属于验证器和报告，不同语言的验证器可以在同一进程中同时使用
         """
         self.parser = HTMLParser()
         self.wcag_level = wcag_level
+        self.fail_on = FailThreshold.parse(fail_on) if fail_on is not None else None
+        self.baseline = Baseline(baseline) if isinstance(baseline, str) else baseline
+        self.profile = profile
+        self.locale = locale or DEFAULT_LOCALE
+        self.budget = Budget(**budget) if isinstance(budget, dict) else budget
+        if not self.budget:
+            self.budget = None
         
-        # 获取规则
+        # 获取规则执行计划，相同配置的计划会被缓存复用
         if rules is None:
-            self.rules = RuleRegistry.get_rules_by_level(wcag_level)
+            self.plan = ExecutionPlan.compile(
+                wcag_level,
+                rule_ids=rule_ids,
+                skip_rules=skip_rules,
+                criteria=criteria,
+                registry=registry
+            )
         else:
-            self.rules = rules
+            self.plan = ExecutionPlan(rules)
+        self.rules = self.plan.rules
     
     def validate_html(self, html_content, url=None):
         """
@@ -339,44 +663,161 @@ class WCAGValidator:
         返回:
             ValidationReport对象
         """
+        profile = ValidationProfile() if self.profile else None
+        clock = time.perf_counter
+        started = clock()
+        
         # 解析HTML
         document = self.parser.parse_html(html_content, url)
+        document._wcag_url = url  # 样式引擎据此解析本地链接样式表的相对路径
+        parsed = clock()
         
         # 创建报告
-        report = ValidationReport(url)
+        report = ValidationReport(url, self.locale)
+        report.fail_on = self.fail_on
+        if self.baseline is not None:
+            self.baseline.begin_page(url)
+            report.baseline_suppressed = 0
+        
+        # 触发条件（标签或属性）在文档中不存在的规则不可能发现问题，直接视为通过
+        index = DocumentIndex.for_document(document)
+        indexed = clock()
+        rules, skipped = self.plan.select(index)
+        for rule in skipped:
+            report.add_passed_rule(rule)
+        
+        visits = {} if profile else None
+        self.plan.prepare(document, index, rules, visits=visits)
+        
+        if profile:
+            profile.add_phase("parse", parsed - started)
+            profile.add_phase("index", indexed - parsed)
+            profile.add_phase("declarative", clock() - indexed)
+            report.profile = profile
+            enrich_total = 0.0
+            loop_started = clock()
+        
+        # 设置了预算时由计数器在规则遍历元素的过程中检查预算，否则只在性能分析时计数
+        budget = self.budget
+        meter = None
+        if budget:
+            meter = index.meter = BudgetMeter(budget)
+        elif profile:
+            meter = index.meter = ElementMeter()
+        
+        if self.fail_on:
+            # 能影响门禁结论的规则优先执行，以便尽早得出结论
+            rules = sorted(rules, key=lambda rule: not self.fail_on.is_relevant(rule))
         
         # 应用规则
-        for rule in self.rules:
-            issues = rule.validate(document)
+        for rule in rules:
+            if budget:
+                # 文档预算已用尽时不再执行剩余规则
+                exhausted = meter.document_exhausted()
+                if exhausted is not None:
+                    report.add_partial_rule(rule, exhausted.reason)
+                    continue
             
-            if issues:
-                # 处理每个问题
+            issues = rule.iter_issues(document)
+            has_issues = False
+            exceeded = None
+            
+            if meter is not None:
+                meter.start_rule(rule)
+            if profile or budget:
+                rule_started = clock()
+                enrich_time = 0.0
+                emitted = 0
+            
+            try:
                 for issue in issues:
-                    # 如果元素存在，添加位置和HTML信息
-                    if issue.element:
-                        # 获取元素位置
-                        line, column = self.parser.get_element_position(issue.element)
-                        path = self.parser.get_element_path(issue.element)
-                        issue.set_location(f"行 {line}, 列 {column}, 路径 {path}")
-                        
-                        # 获取元素HTML
-                        html = self.parser.get_element_html(issue.element)
-                        issue.set_element_html(html)
+                    if profile or budget:
+                        emitted += 1
+                        enrich_started = clock()
+                        self._enrich_issue(rule, issue)
+                        elapsed = clock() - enrich_started
+                        enrich_time += elapsed
+                        if budget:
+                            meter.exclude(elapsed)
+                    else:
+                        self._enrich_issue(rule, issue)
                     
-                    # 添加修复建议
-                    if not issue.fix_suggestions:
-                        suggestions = rule.get_fix_suggestions(issue)
-                        for suggestion in suggestions:
-                            issue.add_fix_suggestion(suggestion)
+                    # 基线中已有的问题不再报告，也不影响门禁结论
+                    if self.baseline is not None and self.baseline.match(url, issue):
+                        report.baseline_suppressed += 1
+                        continue
                     
+                    has_issues = True
                     # 添加到报告
                     report.add_issue(issue)
-            else:
+                    
+                    if self.fail_on and self.fail_on.is_exceeded(report):
+                        report.short_circuited = True
+                        break
+                    
+                    if budget:
+                        meter.check_time()
+                
+                # 规则结束时再检查一次，遍历期间没有触发检查的超时同样标记为部分完成
+                if budget and not report.short_circuited:
+                    meter.check_time()
+            except BudgetExceeded as e:
+                # 超出预算：保留已发现的问题，规则标记为部分完成，继续执行其余规则
+                exceeded = e
+                report.add_partial_rule(rule, e.reason)
+            
+            if profile:
+                # 规则耗时不含问题的位置、路径和HTML计算；声明式规则的元素数来自匹配表
+                profile.add_rule(rule, clock() - rule_started - enrich_time,
+                                 meter.visited + visits.get(id(rule), 0), emitted)
+                enrich_total += enrich_time
+            
+            if not has_issues and exceeded is None:
                 # 规则通过
                 report.add_passed_rule(rule)
+            
+            if report.short_circuited or exceeded is not None:
+                # 结论已确定或超出预算，取消当前规则剩余的工作
+                close = getattr(issues, 'close', None)
+                if close:
+                    close()
+            if report.short_circuited:
+                # 跳过其余规则
+                break
+        
+        index.meter = None
+        if profile:
+            profile.add_phase("rules", clock() - loop_started - enrich_total)
+            profile.add_phase("enrich", enrich_total)
+        
+        if self.fail_on:
+            report.gate_failed = report.short_circuited or self.fail_on.is_exceeded(report)
         
         return report
     
+    def _enrich_issue(self, rule, issue):
+        """为问题补充语言、位置、HTML代码和修复建议"""
+        issue.locale = self.locale
+        
+        # 如果元素存在，添加位置和HTML信息
+        if issue.element:
+            # 获取元素位置
+            line, column = self.parser.get_element_position(issue.element)
+            path = self.parser.get_element_path(issue.element)
+            issue.set_position(line, column, path)
+            
+            # 获取元素HTML
+            html = self.parser.get_element_html(issue.element)
+            issue.set_element_html(html)
+        
+        issue.fingerprint = issue_fingerprint(issue)
+        
+        # 有代码的问题在输出时从消息目录生成修复建议，其余问题使用规则给出的建议
+        if not issue.code and not issue.fix_suggestions:
+            suggestions = rule.get_fix_suggestions(issue)
+            for suggestion in suggestions:
+                issue.add_fix_suggestion(suggestion)
+    
     def validate_file(self, file_path):
         """
         验证HTML文件
@@ -0,0 +1,636 @@
+"""
+流式报告写入模块，将报告分段写入文件对象，内存占用不随问题数量增长
+"""
+import html
+from datetime import datetime
+
+DEFAULT_BUFFER_SIZE = 64 * 1024  # 默认缓冲区大小（字符数）
+
+# HTML报告的<head>部分（含样式表）
+HTML_HEAD = [
+    "<!DOCTYPE html>",
+    "<html lang='zh-CN'>",
+    "<head>",
+    "    <meta charset='utf-8'>",
+    "    <meta name='viewport' content='width=device-width, initial-scale=1'>",
+    "    <title>WCAG 2.2 验证报告</title>",
+    "    <style>",
+    "        :root {",
+    "            --primary-color: #2c3e50;",
+    "            --secondary-color: #3498db;",
+    "            --success-color: #2ecc71;",
+    "            --warning-color: #f39c12;",
+    "            --danger-color: #e74c3c;",
+    "            --light-color: #f8f9fa;",
+    "            --dark-color: #343a40;",
+    "        }",
+    "        body {",
+    "            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;",
+    "            line-height: 1.6;",
+    "            color: var(--dark-color);",
+    "            margin: 0;",
+    "            padding: 0;",
+    "            background-color: #f5f5f5;",
+    "        }",
+    "        .container {",
+    "            max-width: 1200px;",
+    "            margin: 0 auto;",
+    "            padding: 20px;",
+    "        }",
+    "        header {",
+    "            background-color: var(--primary-color);",
+    "            color: white;",
+    "            padding: 20px;",
+    "            margin-bottom: 20px;",
+    "            border-radius: 5px;",
+    "        }",
+    "        h1, h2, h3, h4 {",
+    "            margin-top: 0;",
+    "        }",
+    "        .summary {",
+    "            background-color: white;",
+    "            padding: 20px;",
+    "            border-radius: 5px;",
+    "            box-shadow: 0 2px 5px rgba(0,0,0,0.1);",
+    "            margin-bottom: 20px;",
+    "        }",
+    "        .summary-grid {",
+    "            display: grid;",
+    "            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));",
+    "            gap: 15px;",
+    "            margin-top: 15px;",
+    "        }",
+    "        .summary-item {",
+    "            padding: 15px;",
+    "            border-radius: 5px;",
+    "            text-align: center;",
+    "        }",
+    "        .summary-item.total {",
+    "            background-color: var(--primary-color);",
+    "            color: white;",
+    "        }",
+    "        .summary-item.level-a {",
+    "            background-color: var(--danger-color);",
+    "            color: white;",
+    "        }",
+    "        .summary-item.level-aa {",
+    "            background-color: var(--warning-color);",
+    "            color: white;",
+    "        }",
+    "        .summary-item.level-aaa {",
+    "            background-color: var(--secondary-color);",
+    "            color: white;",
+    "        }",
+    "        .summary-item.passed {",
+    "            background-color: var(--success-color);",
+    "            color: white;",
+    "        }",
+    "        .summary-item.failed {",
+    "            background-color: var(--danger-color);",
+    "            color: white;",
+    "        }",
+    "        .issue {",
+    "            background-color: white;",
+    "            padding: 20px;",
+    "            border-radius: 5px;",
+    "            box-shadow: 0 2px 5px rgba(0,0,0,0.1);",
+    "            margin-bottom: 20px;",
+    "        }",
+    "        .issue-header {",
+    "            display: flex;",
+    "            justify-content: space-between;",
+    "            align-items: center;",
+    "            margin-bottom: 15px;",
+    "            padding-bottom: 10px;",
+    "            border-bottom: 1px solid #eee;",
+    "        }",
+    "        .issue-title {",
+    "            margin: 0;",
+    "            font-size: 1.2rem;",
+    "        }",
+    "        .issue-badge {",
+    "            padding: 5px 10px;",
+    "            border-radius: 3px;",
+    "            font-weight: bold;",
+    "            font-size: 0.8rem;",
+    "        }",
+    "        .issue-badge.level-A {",
+    "            background-color: var(--danger-color);",
+    "            color: white;",
+    "        }",
+    "        .issue-badge.level-AA {",
+    "            background-color: var(--warning-color);",
+    "            color: white;",
+    "        }",
+    "        .issue-badge.level-AAA {",
+    "            background-color: var(--secondary-color);",
+    "            color: white;",
+    "        }",
+    "        .issue-description {",
+    "            margin-bottom: 15px;",
+    "        }",
+    "        .issue-location {",
+    "            font-family: monospace;",
+    "            background-color: #f8f9fa;",
+    "            padding: 5px 10px;",
+    "            border-radius: 3px;",
+    "            margin-bottom: 15px;",
+    "        }",
+    "        .code-block {",
+    "            background-color: #f8f9fa;",
+    "            padding: 15px;",
+    "            border-radius: 5px;",
+    "            overflow-x: auto;",
+    "            font-family: monospace;",
+    "            margin-bottom: 15px;",
+    "            white-space: pre-wrap;",
+    "            border-left: 4px solid var(--danger-color);",
+    "        }",
+    "        .fix-suggestions {",
+    "            background-color: #e8f4f8;",
+    "            padding: 15px;",
+    "            border-radius: 5px;",
+    "            margin-bottom: 15px;",
+    "            border-left: 4px solid var(--secondary-color);",
+    "        }",
+    "        .fix-suggestions h4 {",
+    "            margin-top: 0;",
+    "            color: var(--secondary-color);",
+    "        }",
+    "        .fix-suggestions ul {",
+    "            margin-bottom: 0;",
+    "        }",
+    "        .code-examples {",
+    "            background-color: #f0f7f0;",
+    "            padding: 15px;",
+    "            border-radius: 5px;",
+    "            margin-bottom: 15px;",
+    "            border-left: 4px solid var(--success-color);",
+    "        }",
+    "        .code-examples h4 {",
+    "            margin-top: 0;",
+    "            color: var(--success-color);",
+    "        }",
+    "        .code-example {",
+    "            background-color: white;",
+    "            padding: 15px;",
+    "            border-radius: 5px;",
+    "            margin-bottom: 10px;",
+    "            font-family: monospace;",
+    "            white-space: pre-wrap;",
+    "        }",
+    "        .code-example:last-child {",
+    "            margin-bottom: 0;",
+    "        }",
+    "        .code-example-description {",
+    "            font-style: italic;",
+    "            margin-top: 5px;",
+    "            color: #666;",
+    "        }",
+    "        .wcag-reference {",
+    "            margin-top: 15px;",
+    "            font-size: 0.9rem;",
+    "        }",
+    "        .wcag-reference a {",
+    "            color: var(--secondary-color);",
+    "            text-decoration: none;",
+    "        }",
+    "        .wcag-reference a:hover {",
+    "            text-decoration: underline;",
+    "        }",
+    "        footer {",
+    "            text-align: center;",
+    "            margin-top: 30px;",
+    "            padding: 20px;",
+    "            color: #666;",
+    "            font-size: 0.9rem;",
+    "        }",
+    "        @media (max-width: 768px) {",
+    "            .summary-grid {",
+    "                grid-template-columns: repeat(2, 1fr);",
+    "            }",
+    "        }",
+    "        @media (max-width: 480px) {",
+    "            .summary-grid {",
+    "                grid-template-columns: 1fr;",
+    "            }",
+    "            .issue-header {",
+    "                flex-direction: column;",
+    "                align-items: flex-start;",
+    "            }",
+    "            .issue-badge {",
+    "                margin-top: 10px;",
+    "            }",
+    "        }",
+    "    </style>",
+    "</head>"
+]
+
+
+def wcag_reference_url(criterion):
+    """
+    获取WCAG参考链接
+    
+    参数:
+        criterion: WCAG标准编号
+        
+    返回:
+        参考链接
+    """
+    # 提取主要部分，如1.1.1
+    parts = criterion.split('.')
+    if len(parts) >= 3:
+        principle, guideline, criterion = parts[:3]
+        return f"https://www.w3.org/WAI/WCAG22/Understanding/{principle}-{guideline}-{criterion}.html"
+    
+    return ""
+
+
+class BufferedTextWriter:
+    """固定大小的文本缓冲区，写满后整块写入底层文件对象"""
+    
+    def __init__(self, fp, buffer_size=DEFAULT_BUFFER_SIZE):
+        """
+        初始化缓冲区
+        
+        参数:
+            fp: 支持write方法的文本文件对象
+            buffer_size: 缓冲区大小（字符数）
+        """
+        self.fp = fp
+        self.buffer_size = buffer_size
+        self._parts = []
+        self._size = 0
+    
+    def write(self, text):
+        """写入文本，缓冲区满时自动刷新"""
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.buffer_size:
+            self.flush()
+    
+    def flush(self):
+        """将缓冲区内容写入底层文件对象"""
+        if self._parts:
+            self.fp.write("".join(self._parts))
+            self._parts = []
+            self._size = 0
+
+
+class ReportWriter:
+    """
+    流式报告写入器基类
+    
+    可以一次写入完整报告（write_report），也可以在问题产生时逐个写入：
+    begin() -> write_issue()... -> finish(summary)。逐个写入时摘要在问题之后输出。
+    """
+    
+    def __init__(self, fp, buffer_size=DEFAULT_BUFFER_SIZE):
+        """
+        初始化写入器
+        
+        参数:
+            fp: 支持write方法的文本文件对象
+            buffer_size: 缓冲区大小（字符数）
+        """
+        self.out = BufferedTextWriter(fp, buffer_size)
+        self.issue_count = 0
+        self._started = False
+        self._summary_written = False
+    
+    def write_report(self, report):
+        """
+        写入完整报告
+        
+        参数:
+            report: ValidationReport对象
+        """
+        self.begin(report.url)
+        self._write_summary(report.summary)
+        if report.partial_rules:
+            self._write_partial(report.partial_rules)
+        self._summary_written = True
+        for issue in report.issues:
+            self.write_issue(issue)
+        self.finish(report.summary)
+    
+    def begin(self, url=None):
+        """写入报告头部"""
+        self.timestamp = datetime.now()
+        self._write_header(url)
+    
+    def write_issue(self, issue):
+        """写入单个问题"""
+        if self.issue_count == 0:
+            self._write_issues_heading()
+        self.issue_count += 1
+        self._write_issue(self.issue_count, issue)
+    
+    def finish(self, summary):
+        """
+        写入报告尾部并刷新缓冲区
+        
+        参数:
+            summary: 报告摘要字典，逐个写入问题时在此处输出
+        """
+        if self.issue_count == 0:
+            self._write_no_issues()
+        if not self._summary_written:
+            self._write_summary(summary)
+        self._write_footer()
+        self.out.flush()
+    
+    def _line(self, text):
+        """写入一行，行之间以换行符分隔"""
+        if self._started:
+            self.out.write("\n")
+        self._started = True
+        self.out.write(text)
+    
+    def _write_header(self, url):
+        raise NotImplementedError("子类必须实现_write_header方法")
+    
+    def _write_summary(self, summary):
+        raise NotImplementedError("子类必须实现_write_summary方法")
+    
+    def _write_partial(self, partial_rules):
+        """写入因超出预算而未完成的规则"""
+        pass
+    
+    def _write_issues_heading(self):
+        raise NotImplementedError("子类必须实现_write_issues_heading方法")
+    
+    def _write_issue(self, number, issue):
+        raise NotImplementedError("子类必须实现_write_issue方法")
+    
+    def _write_no_issues(self):
+        raise NotImplementedError("子类必须实现_write_no_issues方法")
+    
+    def _write_footer(self):
+        raise NotImplementedError("子类必须实现_write_footer方法")
+
+
+class HTMLReportWriter(ReportWriter):
+    """HTML格式的流式报告写入器"""
+    
+    def _write_header(self, url):
+        for line in HTML_HEAD:
+            self._line(line)
+        
+        self._line("<body>")
+        self._line("    <div class='container'>")
+        self._line("        <header>")
+        self._line("            <h1>WCAG 2.2 验证报告</h1>")
+        self._line(f"            <p>生成时间: {self.timestamp.strftime('%Y-%m-%d %H:%M:%S')}</p>")
+        
+        if url:
+            self._line(f"            <p>URL: {html.escape(url)}</p>")
+        
+        self._line("        </header>")
+    
+    def _write_summary(self, summary):
+        self._line("")
+        self._line("        <div class='summary'>")
+        self._line("            <h2>摘要</h2>")
+        self._line("            <div class='summary-grid'>")
+        self._line(f"                <div class='summary-item total'><h3>{summary['total_issues']}</h3><p>总问题数</p></div>")
+        self._line(f"                <div class='summary-item level-a'><h3>{summary['level_A_issues']}</h3><p>A级问题</p></div>")
+        self._line(f"                <div class='summary-item level-aa'><h3>{summary['level_AA_issues']}</h3><p>AA级问题</p></div>")
+        self._line(f"                <div class='summary-item level-aaa'><h3>{summary['level_AAA_issues']}</h3><p>AAA级问题</p></div>")
+        self._line(f"                <div class='summary-item passed'><h3>{summary['passed_rules']}</h3><p>通过规则</p></div>")
+        self._line(f"                <div class='summary-item failed'><h3>{summary['failed_rules']}</h3><p>失败规则</p></div>")
+        self._line("            </div>")
+        self._line("        </div>")
+    
+    def _write_partial(self, partial_rules):
+        self._line("        <div class='partial'>")
+        self._line("            <h2>未完成的规则</h2>")
+        self._line("            <ul>")
+        for entry in partial_rules:
+            self._line(f"                <li>{html.escape(entry['rule_id'])}: {html.escape(entry['reason'])}</li>")
+        self._line("            </ul>")
+        self._line("        </div>")
+    
+    def _write_issues_heading(self):
+        self._line("        <h2>问题详情</h2>")
+    
+    def _write_issue(self, number, issue):
+        self._line("        <div class='issue'>")
+        self._line("            <div class='issue-header'>")
+        self._line(f"                <h3 class='issue-title'>{number}. {html.escape(issue.rule.name)}</h3>")
+        self._line(f"                <span class='issue-badge level-{issue.rule.level}'>WCAG {issue.rule.wcag_criterion} (级别 {issue.rule.level})</span>")
+        self._line("            </div>")
+        self._line(f"            <div class='issue-description'>{html.escape(issue.description)}</div>")
+        
+        if issue.location:
+            self._line(f"            <div class='issue-location'>{html.escape(issue.location)}</div>")
+        
+        if issue.element_html:
+            self._line(f"            <div class='code-block'>{html.escape(issue.element_html)}</div>")
+        
+        if issue.fix_suggestions:
+            self._line("            <div class='fix-suggestions'>")
+            self._line("                <h4>修复建议:</h4>")
+            self._line("                <ul>")
+            for suggestion in issue.fix_suggestions:
+                self._line(f"                    <li>{html.escape(suggestion)}</li>")
+            self._line("                </ul>")
+            self._line("            </div>")
+        
+        if issue.code_examples:
+            self._line("            <div class='code-examples'>")
+            self._line("                <h4>代码示例:</h4>")
+            for example in issue.code_examples:
+                self._line(f"                <div class='code-example'>{html.escape(example['code'])}</div>")
+                if example.get('description'):
+                    self._line(f"                <div class='code-example-description'>{html.escape(example['description'])}</div>")
+            self._line("            </div>")
+        
+        # 添加WCAG参考链接
+        wcag_ref = wcag_reference_url(issue.rule.wcag_criterion)
+        if wcag_ref:
+            self._line(f"            <div class='wcag-reference'><a href='{wcag_ref}' target='_blank'>了解更多关于 WCAG {issue.rule.wcag_criterion} 的信息</a></div>")
+        
+        self._line("        </div>")
+    
+    def _write_no_issues(self):
+        self._line("        <div class='issue'>")
+        self._line("            <h3>恭喜！</h3>")
+        self._line("            <p>未发现无障碍问题。</p>")
+        self._line("        </div>")
+    
+    def _write_footer(self):
+        self._line("        <footer>")
+        self._line("            <p>由 WCAG 2.2 验证器生成</p>")
+        self._line("        </footer>")
+        self._line("    </div>")
+        self._line("</body>")
+        self._line("</html>")
+
+
+class MarkdownReportWriter(ReportWriter):
+    """Markdown格式的流式报告写入器"""
+    
+    def _write_header(self, url):
+        self._line("# WCAG 2.2 验证报告")
+        self._line("")
+        self._line(f"生成时间: {self.timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
+        
+        if url:
+            self._line(f"URL: {url}")
+    
+    def _write_summary(self, summary):
+        self._line("")
+        self._line("## 摘要")
+        self._line("")
+        self._line(f"- **总问题数:** {summary['total_issues']}")
+        self._line(f"- **A级问题:** {summary['level_A_issues']}")
+        self._line(f"- **AA级问题:** {summary['level_AA_issues']}")
+        self._line(f"- **AAA级问题:** {summary['level_AAA_issues']}")
+        self._line(f"- **通过规则:** {summary['passed_rules']}")
+        self._line(f"- **失败规则:** {summary['failed_rules']}")
+        self._line("")
+    
+    def _write_partial(self, partial_rules):
+        self._line("## 未完成的规则")
+        self._line("")
+        for entry in partial_rules:
+            self._line(f"- **{entry['rule_id']}:** {entry['reason']}")
+        self._line("")
+    
+    def _write_issues_heading(self):
+        self._line("## 问题详情")
+        self._line("")
+    
+    def _write_issue(self, number, issue):
+        self._line(f"### {number}. {issue.rule.name}")
+        self._line("")
+        self._line(f"**WCAG标准:** {issue.rule.wcag_criterion} (级别 {issue.rule.level})")
+        self._line("")
+        self._line(f"**问题描述:** {issue.description}")
+        self._line("")
+        
+        if issue.location:
+            self._line(f"**位置:** `{issue.location}`")
+            self._line("")
+        
+        if issue.element_html:
+            self._line("**问题代码:**")
+            self._line("```html")
+            self._line(issue.element_html)
+            self._line("```")
+            self._line("")
+        
+        if issue.fix_suggestions:
+            self._line("**修复建议:**")
+            self._line("")
+            for suggestion in issue.fix_suggestions:
+                self._line(f"- {suggestion}")
+            self._line("")
+        
+        if issue.code_examples:
+            self._line("**代码示例:**")
+            self._line("")
+            for example in issue.code_examples:
+                self._line("```html")
+                self._line(example['code'])
+                self._line("```")
+                if example.get('description'):
+                    self._line(f"*{example['description']}*")
+                self._line("")
+        
+        # 添加WCAG参考链接
+        wcag_ref = wcag_reference_url(issue.rule.wcag_criterion)
+        if wcag_ref:
+            self._line(f"[了解更多关于 WCAG {issue.rule.wcag_criterion} 的信息]({wcag_ref})")
+            self._line("")
+        
+        self._line("---")
+        self._line("")
+    
+    def _write_no_issues(self):
+        self._line("## 结果")
+        self._line("")
+        self._line("恭喜！未发现无障碍问题。")
+        self._line("")
+    
+    def _write_footer(self):
+        self._line("*由 WCAG 2.2 验证器生成*")
+
+
+class ConsoleReportWriter(ReportWriter):
+    """控制台格式的流式报告写入器"""
+    
+    def _write_header(self, url):
+        self._line("=" * 80)
+        self._line("WCAG 2.2 验证报告")
+        self._line("=" * 80)
+        self._line("")
+        self._line(f"生成时间: {self.timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
+        
+        if url:
+            self._line(f"URL: {url}")
+    
+    def _write_summary(self, summary):
+        self._line("")
+        self._line("摘要:")
+        self._line(f"- 总问题数: {summary['total_issues']}")
+        self._line(f"- A级问题: {summary['level_A_issues']}")
+        self._line(f"- AA级问题: {summary['level_AA_issues']}")
+        self._line(f"- AAA级问题: {summary['level_AAA_issues']}")
+        self._line(f"- 通过规则: {summary['passed_rules']}")
+        self._line(f"- 失败规则: {summary['failed_rules']}")
+        self._line("")
+    
+    def _write_partial(self, partial_rules):
+        self._line("未完成的规则（结果不完整）:")
+        for entry in partial_rules:
+            self._line(f"- {entry['rule_id']}: {entry['reason']}")
+        self._line("")
+    
+    def _write_issues_heading(self):
+        self._line("问题详情:")
+        self._line("-" * 80)
+    
+    def _write_issue(self, number, issue):
+        self._line(f"{number}. {issue.rule.name}")
+        self._line(f"   WCAG标准: {issue.rule.wcag_criterion} (级别 {issue.rule.level})")
+        self._line(f"   问题描述: {issue.description}")
+        
+        if issue.location:
+            self._line(f"   位置: {issue.location}")
+        
+        if issue.element_html:
+            self._line("   问题代码:")
+            for line in issue.element_html.split("\n"):
+                self._line(f"      {line}")
+        
+        if issue.fix_suggestions:
+            self._line("   修复建议:")
+            for suggestion in issue.fix_suggestions:
+                self._line(f"   - {suggestion}")
+        
+        if issue.code_examples:
+            self._line("   代码示例:")
+            for example in issue.code_examples:
+                for line in example['code'].split("\n"):
+                    self._line(f"      {line}")
+                if example.get('description'):
+                    self._line(f"      ({example['description']})")
+        
+        self._line("")
+    
+    def _write_no_issues(self):
+        self._line("结果:")
+        self._line("恭喜！未发现无障碍问题。")
+        self._line("")
+    
+    def _write_footer(self):
+        self._line("由 WCAG 2.2 验证器生成")
+
+
+WRITERS = {
+    'html': HTMLReportWriter,
+    'markdown': MarkdownReportWriter,
+    'console': ConsoleReportWriter,
+}
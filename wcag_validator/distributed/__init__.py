@@ -0,0 +1,26 @@
+"""
+分布式验证模块，协调器将来源分片放入工作队列，多台机器上的工作进程租用、验证并确认工作单元
+"""
+from .backends import (
+    DEFAULT_LEASE_TTL, DEFAULT_MAX_ATTEMPTS, Lease, QueueBackend, RedisQueue, SQLiteQueue, open_queue
+)
+from .resp import RespClient, RespError
+from .worker import DEFAULT_SHARD_SIZE, Coordinator, Worker, shard_sources, start_workers, validator_from_config
+
+__all__ = [
+    'DEFAULT_LEASE_TTL',
+    'DEFAULT_MAX_ATTEMPTS',
+    'DEFAULT_SHARD_SIZE',
+    'Lease',
+    'QueueBackend',
+    'RedisQueue',
+    'SQLiteQueue',
+    'open_queue',
+    'RespClient',
+    'RespError',
+    'Coordinator',
+    'Worker',
+    'shard_sources',
+    'start_workers',
+    'validator_from_config'
+]
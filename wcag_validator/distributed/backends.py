@@ -0,0 +1,553 @@
+"""
+工作队列后端模块，提供SQLite（默认）和Redis协议两种后端，支持租约、确认、重试和幂等的结果写入
+"""
+import json
+import sqlite3
+import time
+import uuid
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from ..core.serializer import dumps
+from .resp import RespClient
+
+# 默认租约时长（秒），工作进程在租约内未确认的工作单元会重新排队
+DEFAULT_LEASE_TTL = 300
+
+# 默认最大尝试次数，超过后工作单元标记为失败
+DEFAULT_MAX_ATTEMPTS = 3
+
+# 租约过期且尝试次数用尽时记录的错误
+LEASE_EXPIRED = "租约过期（工作进程可能已崩溃）"
+
+
+class Lease:
+    """工作进程对一个工作单元的租约"""
+    
+    __slots__ = ('unit_id', 'sources', 'token', 'attempts')
+    
+    def __init__(self, unit_id, sources, token, attempts):
+        """
+        参数:
+            unit_id: 工作单元ID
+            sources: 工作单元中的来源列表
+            token: 租约令牌，重新租出后旧令牌失效
+            attempts: 包括本次在内的尝试次数
+        """
+        self.unit_id = unit_id
+        self.sources = sources
+        self.token = token
+        self.attempts = attempts
+    
+    def __repr__(self):
+        return f"Lease({self.unit_id!r}, attempts={self.attempts})"
+
+
+class QueueBackend:
+    """
+    工作队列后端接口
+    
+    工作单元由ID和来源列表组成，ID相同的单元只入队一次。工作进程租用单元，在租约
+    过期前确认（附带结果）或报告失败；过期的租约由reap重新排队。结果按单元ID只写入
+    一次，重复确认（如租约过期后原工作进程迟到的确认）不会覆盖已有结果。
+    """
+    
+    def set_config(self, config):
+        """保存任务配置（验证级别、语言、规则选择等），工作进程据此创建验证器"""
+        raise NotImplementedError("子类必须实现set_config方法")
+    
+    def get_config(self):
+        """读取任务配置，未设置时返回None"""
+        raise NotImplementedError("子类必须实现get_config方法")
+    
+    def enqueue(self, units):
+        """
+        将工作单元加入队列，已存在的单元被忽略，之前失败的单元重新排队
+        
+        参数:
+            units: (单元ID, 来源列表)元组的列表
+        
+        返回:
+            新入队的单元数
+        """
+        raise NotImplementedError("子类必须实现enqueue方法")
+    
+    def lease(self, worker, count=1, ttl=DEFAULT_LEASE_TTL, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        """
+        租用最多count个工作单元
+        
+        参数:
+            worker: 工作进程标识
+            count: 最多租用的单元数
+            ttl: 租约时长（秒）
+            max_attempts: 最大尝试次数，租约过期且次数用尽的单元标记为失败
+        
+        返回:
+            Lease列表，队列中没有可用单元时为空列表
+        """
+        raise NotImplementedError("子类必须实现lease方法")
+    
+    def renew(self, lease, ttl=DEFAULT_LEASE_TTL):
+        """
+        延长租约
+        
+        返回:
+            租约是否仍然有效
+        """
+        raise NotImplementedError("子类必须实现renew方法")
+    
+    def ack(self, lease, results):
+        """
+        确认工作单元已完成并写入结果
+        
+        参数:
+            lease: Lease对象
+            results: 单元中每个来源的结果记录列表
+        
+        返回:
+            结果是否为首次写入
+        """
+        raise NotImplementedError("子类必须实现ack方法")
+    
+    def fail(self, lease, error, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        """
+        报告工作单元处理失败，尝试次数未用尽时重新排队，否则标记为失败
+        
+        返回:
+            是否重新排队
+        """
+        raise NotImplementedError("子类必须实现fail方法")
+    
+    def reap(self, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        """
+        将租约已过期的单元重新排队（尝试次数用尽的标记为失败）
+        
+        返回:
+            重新排队的单元数
+        """
+        raise NotImplementedError("子类必须实现reap方法")
+    
+    def counts(self):
+        """返回各状态的单元数：{"pending", "leased", "done", "failed"}"""
+        raise NotImplementedError("子类必须实现counts方法")
+    
+    def results(self, unit_ids):
+        """
+        按给定顺序读取工作单元的结果
+        
+        参数:
+            unit_ids: 单元ID列表
+        
+        返回:
+            (单元ID, 结果记录列表)迭代器，未完成的单元结果为None
+        """
+        raise NotImplementedError("子类必须实现results方法")
+    
+    def failures(self):
+        """返回失败的单元：单元ID -> 错误信息"""
+        raise NotImplementedError("子类必须实现failures方法")
+    
+    def close(self):
+        """关闭连接"""
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS units (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    sources TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    token TEXT,
+    worker TEXT,
+    expires REAL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_units_state ON units(state, seq);
+CREATE INDEX IF NOT EXISTS idx_units_expires ON units(state, expires);
+"""
+
+
+class SQLiteQueue(QueueBackend):
+    """
+    SQLite工作队列
+    
+    队列是一个本地（或共享文件系统上的）SQLite文件，使用WAL模式，多个进程可以同时
+    租用和确认单元。租用在BEGIN IMMEDIATE事务中完成，同一单元不会同时租给两个进程；
+    结果单独存放在results表中，INSERT OR IGNORE保证只写入一次。
+    """
+    
+    def __init__(self, path, timeout=60):
+        """
+        参数:
+            path: 数据库文件路径
+            timeout: 等待其他进程释放写锁的最长时间（秒）
+        """
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SQLITE_SCHEMA)
+    
+    def set_config(self, config):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('config', ?)", (dumps(config),)
+        )
+    
+    def get_config(self):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'config'").fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def enqueue(self, units):
+        units = list(units)
+        with self._transaction():
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO units (id, sources) VALUES (?, ?)",
+                ((unit_id, dumps(sources)) for unit_id, sources in units)
+            )
+            added = self.conn.total_changes - before
+            for chunk in _chunks([unit_id for unit_id, _ in units], 500):
+                cursor = self.conn.execute(
+                    "UPDATE units SET state = 'pending', attempts = 0, error = NULL "
+                    f"WHERE state = 'failed' AND id IN ({','.join('?' * len(chunk))})",
+                    chunk
+                )
+                added += cursor.rowcount
+        return added
+    
+    def lease(self, worker, count=1, ttl=DEFAULT_LEASE_TTL, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        with self._transaction():
+            rows = self._pending(count)
+            if len(rows) < count and self._reap(max_attempts):
+                rows = self._pending(count)
+            
+            now = time.time()
+            leases = []
+            for unit_id, sources, attempts in rows:
+                token = uuid.uuid4().hex
+                self.conn.execute(
+                    "UPDATE units SET state = 'leased', token = ?, worker = ?, expires = ?, "
+                    "attempts = attempts + 1 WHERE id = ?",
+                    (token, worker, now + ttl, unit_id)
+                )
+                leases.append(Lease(unit_id, json.loads(sources), token, attempts + 1))
+        return leases
+    
+    def renew(self, lease, ttl=DEFAULT_LEASE_TTL):
+        cursor = self.conn.execute(
+            "UPDATE units SET expires = ? WHERE id = ? AND token = ? AND state = 'leased'",
+            (time.time() + ttl, lease.unit_id, lease.token)
+        )
+        return cursor.rowcount > 0
+    
+    def ack(self, lease, results):
+        with self._transaction():
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO results (id, data) VALUES (?, ?)", (lease.unit_id, dumps(results))
+            )
+            self.conn.execute(
+                "UPDATE units SET state = 'done', token = NULL, expires = NULL, error = NULL WHERE id = ?",
+                (lease.unit_id,)
+            )
+        return cursor.rowcount > 0
+    
+    def fail(self, lease, error, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        state = 'failed' if lease.attempts >= max_attempts else 'pending'
+        cursor = self.conn.execute(
+            "UPDATE units SET state = ?, error = ?, token = NULL, expires = NULL "
+            "WHERE id = ? AND token = ? AND state = 'leased'",
+            (state, error, lease.unit_id, lease.token)
+        )
+        return cursor.rowcount > 0 and state == 'pending'
+    
+    def reap(self, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        with self._transaction():
+            return self._reap(max_attempts)
+    
+    def counts(self):
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        for state, count in self.conn.execute("SELECT state, COUNT(*) FROM units GROUP BY state"):
+            counts[state] = count
+        return counts
+    
+    def results(self, unit_ids):
+        for chunk in _chunks(unit_ids, 500):
+            rows = dict(self.conn.execute(
+                f"SELECT id, data FROM results WHERE id IN ({','.join('?' * len(chunk))})", chunk
+            ))
+            for unit_id in chunk:
+                data = rows.get(unit_id)
+                yield unit_id, json.loads(data) if data is not None else None
+    
+    def failures(self):
+        return dict(self.conn.execute("SELECT id, error FROM units WHERE state = 'failed' ORDER BY seq"))
+    
+    def close(self):
+        self.conn.close()
+    
+    def _pending(self, count):
+        return self.conn.execute(
+            "SELECT id, sources, attempts FROM units WHERE state = 'pending' ORDER BY seq LIMIT ?", (count,)
+        ).fetchall()
+    
+    def _reap(self, max_attempts):
+        """在当前事务中处理过期的租约，返回重新排队的单元数"""
+        now = time.time()
+        self.conn.execute(
+            "UPDATE units SET state = 'failed', error = ?, token = NULL, expires = NULL "
+            "WHERE state = 'leased' AND expires < ? AND attempts >= ?",
+            (LEASE_EXPIRED, now, max_attempts)
+        )
+        cursor = self.conn.execute(
+            "UPDATE units SET state = 'pending', token = NULL, expires = NULL "
+            "WHERE state = 'leased' AND expires < ?",
+            (now,)
+        )
+        return cursor.rowcount
+    
+    def _transaction(self):
+        return _ImmediateTransaction(self.conn)
+
+
+class _ImmediateTransaction:
+    """BEGIN IMMEDIATE事务，立即获取写锁，避免并发租用时的锁升级冲突"""
+    
+    def __init__(self, conn):
+        self.conn = conn
+    
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("COMMIT" if exc_type is None else "ROLLBACK")
+        return False
+
+
+class RedisQueue(QueueBackend):
+    """
+    Redis协议工作队列
+    
+    使用标准命令实现，不依赖Lua脚本，兼容实现了Redis协议的服务。键均以
+    "wcag:<队列名>:"为前缀：
+        units       哈希，单元ID -> 来源列表（HSETNX保证只入队一次）
+        pending     列表，等待处理的单元ID（LPUSH入队、RPOPLPUSH出队，先进先出）
+        processing  列表，已租出的单元ID（由RPOPLPUSH从pending原子地移入）
+        lease:<ID>  字符串，租约令牌，带过期时间
+        attempts    哈希，单元ID -> 尝试次数
+        results     哈希，单元ID -> 结果（HSETNX保证只写入一次）
+        failed      哈希，单元ID -> 错误信息
+    
+    租出和设置租约令牌之间存在短暂间隔，此时回收可能把单元重新排队，导致同一单元被
+    处理两次；由于结果只写入一次，这不会影响最终结果。
+    """
+    
+    def __init__(self, client, name='default'):
+        """
+        参数:
+            client: RespClient对象
+            name: 队列名称，同一服务器上的不同任务使用不同名称
+        """
+        self.client = client
+        self.name = name
+        self.prefix = f"wcag:{name}:"
+    
+    def set_config(self, config):
+        self.client.execute("SET", self._key("config"), dumps(config))
+    
+    def get_config(self):
+        value = self.client.execute("GET", self._key("config"))
+        return json.loads(value) if value is not None else None
+    
+    def enqueue(self, units):
+        units = list(units)
+        if not units:
+            return 0
+        units_key, failed_key = self._key("units"), self._key("failed")
+        created = self.client.pipeline([
+            ("HSETNX", units_key, unit_id, dumps(sources)) for unit_id, sources in units
+        ])
+        queued = [unit_id for (unit_id, _), new in zip(units, created) if new]
+        existing = [unit_id for (unit_id, _), new in zip(units, created) if not new]
+        
+        # 之前失败的单元重新排队
+        if existing:
+            removed = self.client.pipeline([("HDEL", failed_key, unit_id) for unit_id in existing])
+            retried = [unit_id for unit_id, count in zip(existing, removed) if count]
+            if retried:
+                self.client.execute("HDEL", self._key("attempts"), *retried)
+                queued.extend(retried)
+        
+        for chunk in _chunks(queued, 1000):
+            self.client.execute("LPUSH", self._key("pending"), *chunk)
+        return len(queued)
+    
+    def lease(self, worker, count=1, ttl=DEFAULT_LEASE_TTL, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        unit_ids = self._pop(count)
+        # 刚移入processing的单元还没有租约令牌，回收时跳过，否则会被当作过期单元重新排队
+        if len(unit_ids) < count and self._reap(max_attempts, skip=unit_ids):
+            unit_ids.extend(self._pop(count - len(unit_ids)))
+        if not unit_ids:
+            return []
+        
+        tokens = [f"{uuid.uuid4().hex}:{worker}" for _ in unit_ids]
+        commands = []
+        for unit_id, token in zip(unit_ids, tokens):
+            commands.append(("SET", self._lease_key(unit_id), token, "PX", int(ttl * 1000)))
+            commands.append(("HINCRBY", self._key("attempts"), unit_id, 1))
+            commands.append(("HGET", self._key("units"), unit_id))
+        replies = self.client.pipeline(commands)
+        
+        return [
+            Lease(unit_id, json.loads(replies[i * 3 + 2] or "[]"), token, replies[i * 3 + 1])
+            for i, (unit_id, token) in enumerate(zip(unit_ids, tokens))
+        ]
+    
+    def renew(self, lease, ttl=DEFAULT_LEASE_TTL):
+        key = self._lease_key(lease.unit_id)
+        if self.client.execute("GET", key) != lease.token:
+            return False
+        self.client.execute("PEXPIRE", key, int(ttl * 1000))
+        return True
+    
+    def ack(self, lease, results):
+        written, _, _, _ = self.client.pipeline([
+            ("HSETNX", self._key("results"), lease.unit_id, dumps(results)),
+            ("HDEL", self._key("failed"), lease.unit_id),
+            ("LREM", self._key("processing"), 0, lease.unit_id),
+            ("DEL", self._lease_key(lease.unit_id)),
+        ])
+        return bool(written)
+    
+    def fail(self, lease, error, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        if self.client.execute("GET", self._lease_key(lease.unit_id)) != lease.token:
+            return False  # 租约已过期，单元已由回收处理
+        if lease.attempts >= max_attempts:
+            self.client.pipeline([
+                ("HSET", self._key("failed"), lease.unit_id, error),
+                ("LREM", self._key("processing"), 0, lease.unit_id),
+                ("DEL", self._lease_key(lease.unit_id)),
+            ])
+            return False
+        return self._requeue(lease.unit_id, delete_lease=True)
+    
+    def reap(self, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        return self._reap(max_attempts)
+    
+    def counts(self):
+        pending, leased, done, failed = self.client.pipeline([
+            ("LLEN", self._key("pending")),
+            ("LLEN", self._key("processing")),
+            ("HLEN", self._key("results")),
+            ("HLEN", self._key("failed")),
+        ])
+        return {"pending": pending, "leased": leased, "done": done, "failed": failed}
+    
+    def results(self, unit_ids):
+        for chunk in _chunks(unit_ids, 500):
+            values = self.client.execute("HMGET", self._key("results"), *chunk)
+            for unit_id, data in zip(chunk, values):
+                yield unit_id, json.loads(data) if data is not None else None
+    
+    def failures(self):
+        values = self.client.execute("HGETALL", self._key("failed")) or []
+        return dict(zip(values[::2], values[1::2]))
+    
+    def close(self):
+        self.client.close()
+    
+    def _key(self, name):
+        return self.prefix + name
+    
+    def _lease_key(self, unit_id):
+        return f"{self.prefix}lease:{unit_id}"
+    
+    def _reap(self, max_attempts, skip=()):
+        """处理过期的租约，skip中的单元不处理，返回重新排队的单元数"""
+        skip = set(skip)
+        unit_ids = [
+            unit_id for unit_id in self.client.execute("LRANGE", self._key("processing"), 0, -1)
+            if unit_id not in skip
+        ]
+        if not unit_ids:
+            return 0
+        
+        commands = []
+        for unit_id in unit_ids:
+            commands.append(("EXISTS", self._lease_key(unit_id)))
+            commands.append(("HEXISTS", self._key("results"), unit_id))
+            commands.append(("HGET", self._key("attempts"), unit_id))
+        replies = self.client.pipeline(commands)
+        
+        requeued = 0
+        for i, unit_id in enumerate(unit_ids):
+            leased, done, attempts = replies[i * 3:i * 3 + 3]
+            if leased:
+                continue
+            if done:
+                self.client.execute("LREM", self._key("processing"), 0, unit_id)
+            elif int(attempts or 0) >= max_attempts:
+                self.client.pipeline([
+                    ("HSET", self._key("failed"), unit_id, LEASE_EXPIRED),
+                    ("LREM", self._key("processing"), 0, unit_id),
+                ])
+            elif self._requeue(unit_id):
+                requeued += 1
+        return requeued
+    
+    def _pop(self, count):
+        """从pending原子地移动最多count个单元到processing"""
+        replies = self.client.pipeline(
+            [("RPOPLPUSH", self._key("pending"), self._key("processing"))] * count
+        )
+        return [unit_id for unit_id in replies if unit_id is not None]
+    
+    def _requeue(self, unit_id, delete_lease=False):
+        """将单元从processing移回pending，只有成功移出的进程会重新排队"""
+        commands = [("LREM", self._key("processing"), 1, unit_id)]
+        if delete_lease:
+            commands.append(("DEL", self._lease_key(unit_id)))
+        if not self.client.pipeline(commands)[0]:
+            return False
+        self.client.execute("LPUSH", self._key("pending"), unit_id)
+        return True
+
+
+def open_queue(url):
+    """
+    根据地址打开工作队列
+    
+    参数:
+        url: SQLite文件路径（或sqlite:///路径），或redis://[:密码@]主机[:端口][/库][?name=队列名]
+    
+    返回:
+        QueueBackend对象
+    """
+    if url.startswith('redis://'):
+        parts = urlsplit(url)
+        db = parts.path.strip('/')
+        name = parse_qs(parts.query).get('name', ['default'])[0]
+        client = RespClient(
+            host=parts.hostname or 'localhost',
+            port=parts.port or 6379,
+            db=int(db) if db else 0,
+            password=unquote(parts.password) if parts.password else None
+        )
+        return RedisQueue(client, name=name)
+    if url.startswith('sqlite://'):
+        url = url[len('sqlite://'):]
+    return SQLiteQueue(url)
+
+
+def _chunks(items, size):
+    """将列表按size切分"""
+    items = list(items)
+    return [items[i:i + size] for i in range(0, len(items), size)]
@@ -0,0 +1,124 @@
+"""
+Redis协议（RESP）客户端，只实现工作队列需要的命令收发和流水线，不依赖redis包
+"""
+import socket
+
+
+class RespError(Exception):
+    """服务器返回的错误回复"""
+
+
+class RespClient:
+    """
+    最小的RESP2客户端
+    
+    兼容Redis及实现Redis协议的服务（如Valkey、KeyDB）。流水线将多条命令一次发送
+    并依次读取回复，减少网络往返。字符串回复按UTF-8解码。
+    """
+    
+    def __init__(self, host='localhost', port=6379, db=0, password=None, timeout=30):
+        """
+        参数:
+            host: 服务器地址
+            port: 端口
+            db: 数据库编号
+            password: 可选的密码
+            timeout: 套接字超时（秒）
+        """
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self._sock = None
+        self._file = None
+    
+    def execute(self, *args):
+        """
+        执行一条命令
+        
+        返回:
+            命令的回复
+        """
+        return self.pipeline([args])[0]
+    
+    def pipeline(self, commands):
+        """
+        依次执行多条命令，只有一次网络往返
+        
+        参数:
+            commands: 命令参数元组的列表
+        
+        返回:
+            回复列表；任一命令返回错误时在读完所有回复后抛出RespError
+        """
+        if not commands:
+            return []
+        if self._sock is None:
+            self._connect()
+        try:
+            self._sock.sendall(b"".join(_encode(command) for command in commands))
+            replies = [self._read_reply() for _ in commands]
+        except (OSError, ConnectionError):
+            self.close()
+            raise
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+    
+    def close(self):
+        """关闭连接"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+    
+    def _connect(self):
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._file = self._sock.makefile('rb')
+        setup = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            self.pipeline(setup)
+    
+    def _read_reply(self):
+        line = self._file.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Redis连接已断开")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode('utf-8')
+        if kind == b"-":
+            return RespError(body.decode('utf-8'))
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = self._file.read(length + 2)
+            return data[:-2].decode('utf-8')
+        if kind == b"*":
+            count = int(body)
+            if count < 0:
+                return None
+            return [self._read_reply() for _ in range(count)]
+        raise ConnectionError(f"无法解析的Redis回复: {line!r}")
+
+
+def _encode(args):
+    """将命令编码为RESP数组"""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if not isinstance(arg, bytes):
+            arg = str(arg).encode('utf-8')
+        parts.append(b"$%d\r\n" % len(arg))
+        parts.append(arg)
+        parts.append(b"\r\n")
+    return b"".join(parts)
@@ -0,0 +1,295 @@
+"""
+分布式验证模块：协调器将来源分片为工作单元放入队列，工作进程租用单元、验证并确认结果
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import time
+
+from ..core.budget import Budget
+from ..core.records import RecordReport, report_to_record
+from ..core.validator import FailThreshold, WCAGValidator
+from ..rules.base import RuleRegistry
+from .backends import DEFAULT_LEASE_TTL, DEFAULT_MAX_ATTEMPTS, open_queue
+
+# 默认每个工作单元包含的来源数
+DEFAULT_SHARD_SIZE = 50
+
+# 每次入队的工作单元数
+ENQUEUE_BATCH = 1000
+
+# 只影响调度、不影响结果的配置项，不参与单元ID的计算
+RUNTIME_KEYS = ("max_attempts",)
+
+
+def shard_sources(sources, size=DEFAULT_SHARD_SIZE, salt=""):
+    """
+    将来源分片为工作单元，单元ID由其来源列表的哈希生成，同一批来源重复提交时ID相同
+    
+    参数:
+        sources: 来源迭代器
+        size: 每个单元的来源数
+        salt: 参与哈希的附加字符串（如任务配置），配置不同的任务不会复用彼此的结果
+    
+    返回:
+        (单元ID, 来源列表)元组迭代器
+    """
+    chunk = []
+    for source in sources:
+        chunk.append(source)
+        if len(chunk) >= size:
+            yield _unit_id(chunk, salt), chunk
+            chunk = []
+    if chunk:
+        yield _unit_id(chunk, salt), chunk
+
+
+def _unit_id(sources, salt):
+    return hashlib.sha1("\n".join([salt] + sources).encode('utf-8')).hexdigest()
+
+
+def validator_from_config(config):
+    """
+    根据任务配置创建验证器，验证器使用协调器的输出语言生成问题描述
+    
+    参数:
+        config: 任务配置字典（level、locale、rules、skip_rules、criteria、fail_on、budget、no_plugins）
+    
+    返回:
+        WCAGValidator对象
+    """
+    fail_on = config.get("fail_on")
+    return WCAGValidator(
+        wcag_level=config.get("level", "AA"),
+        fail_on=FailThreshold.parse(fail_on) if fail_on else None,
+        rule_ids=config.get("rules"),
+        skip_rules=config.get("skip_rules"),
+        criteria=config.get("criteria"),
+        budget=Budget(**config.get("budget", {})),
+        registry=RuleRegistry(plugins=False) if config.get("no_plugins") else None,
+        locale=config.get("locale")
+    )
+
+
+def validate_source(validator, source):
+    """
+    验证一个来源（URL或文件路径）
+    
+    返回:
+        ValidationReport对象，URL为空时使用来源
+    """
+    if source.startswith(('http://', 'https://')):
+        report = validator.validate_url(source)
+    else:
+        report = validator.validate_file(source)
+    if report.url is None:
+        report.url = source
+    return report
+
+
+class Worker:
+    """
+    工作进程
+    
+    从队列租用工作单元，逐个验证其中的来源，全部完成后以结果记录确认单元。处理
+    每个来源后延长租约；出错时报告失败，由队列重新排队。最后一次尝试时，无法验证
+    的来源记录为错误，单元中其他来源的结果仍然确认。
+    """
+    
+    def __init__(self, queue, worker_id=None, batch_size=1, lease_ttl=DEFAULT_LEASE_TTL, poll_interval=1.0):
+        """
+        参数:
+            queue: QueueBackend对象
+            worker_id: 工作进程标识，默认为主机名和进程号
+            batch_size: 每次租用的单元数
+            lease_ttl: 租约时长（秒），需大于处理一个来源的时间
+            poll_interval: 队列中没有可用单元但仍有单元未完成时的等待间隔（秒）
+        """
+        self.queue = queue
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.batch_size = batch_size
+        self.lease_ttl = lease_ttl
+        self.poll_interval = poll_interval
+        self.processed = 0  # 已确认的单元数
+        self.failed = 0  # 报告失败的单元数
+    
+    def run(self, max_units=None):
+        """
+        处理单元直到队列中所有单元都已完成或失败
+        
+        参数:
+            max_units: 最多处理的单元数
+        
+        返回:
+            已确认的单元数
+        """
+        config = self.queue.get_config()
+        if config is None:
+            raise ValueError("队列中没有任务配置，请先运行协调器提交来源")
+        validator = validator_from_config(config)
+        max_attempts = config.get("max_attempts", DEFAULT_MAX_ATTEMPTS)
+        
+        while max_units is None or self.processed + self.failed < max_units:
+            count = self.batch_size
+            if max_units is not None:
+                count = min(count, max_units - self.processed - self.failed)
+            leases = self.queue.lease(self.worker_id, count, self.lease_ttl, max_attempts)
+            if not leases:
+                counts = self.queue.counts()
+                if not counts["pending"] and not counts["leased"]:
+                    break
+                # 其他工作进程持有的租约可能过期，稍后重试
+                time.sleep(self.poll_interval)
+                continue
+            for lease in leases:
+                self.process(validator, lease, max_attempts)
+        return self.processed
+    
+    def process(self, validator, lease, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        """
+        处理一个工作单元
+        
+        返回:
+            是否已确认
+        """
+        final = lease.attempts >= max_attempts
+        records = []
+        try:
+            self.queue.renew(lease, self.lease_ttl)
+            for source in lease.sources:
+                try:
+                    records.append(report_to_record(validate_source(validator, source), source))
+                except Exception as e:
+                    if not final:
+                        raise
+                    records.append({"source": source, "error": f"{type(e).__name__}: {e}"})
+                self.queue.renew(lease, self.lease_ttl)
+        except Exception as e:
+            self.queue.fail(lease, f"{type(e).__name__}: {e}", max_attempts)
+            self.failed += 1
+            return False
+        
+        self.queue.ack(lease, records)
+        self.processed += 1
+        return True
+
+
+def _worker_main(url, options):
+    """本地工作进程的入口"""
+    queue = open_queue(url)
+    try:
+        Worker(queue, **options).run()
+    finally:
+        queue.close()
+
+
+def start_workers(url, count, **options):
+    """
+    在本机启动多个工作进程（每个进程使用自己的队列连接）
+    
+    参数:
+        url: 队列地址
+        count: 进程数
+        options: 传给Worker的参数
+    
+    返回:
+        已启动的Process列表
+    """
+    processes = []
+    for _ in range(count):
+        process = multiprocessing.Process(target=_worker_main, args=(url, options), daemon=True)
+        process.start()
+        processes.append(process)
+    return processes
+
+
+class Coordinator:
+    """
+    协调器
+    
+    将来源分片提交到队列，等待工作进程处理完毕后按提交顺序读取结果。单元ID由来源
+    和任务配置（不含RUNTIME_KEYS中的调度参数）生成，中断后用相同来源和配置重新运行时，
+    已完成的单元直接复用结果，只处理剩余单元。
+    """
+    
+    def __init__(self, queue, shard_size=DEFAULT_SHARD_SIZE):
+        """
+        参数:
+            queue: QueueBackend对象
+            shard_size: 每个工作单元的来源数
+        """
+        self.queue = queue
+        self.shard_size = shard_size
+        self.unit_ids = []  # 已提交的单元ID，按提交顺序
+        self.errors = []  # (来源, 错误信息)，读取结果时收集
+    
+    def submit(self, sources, config):
+        """
+        保存任务配置并提交来源
+        
+        参数:
+            sources: 来源迭代器
+            config: 任务配置字典，见validator_from_config
+        
+        返回:
+            新入队的单元数（已完成的单元不会重新入队）
+        """
+        self.queue.set_config(config)
+        # 修改重试次数等调度参数后重新提交同一任务时，单元ID不变，已完成的结果仍然复用
+        salt = json.dumps(
+            {key: value for key, value in config.items() if key not in RUNTIME_KEYS}, sort_keys=True
+        )
+        queued = 0
+        batch = []
+        for unit in shard_sources(sources, self.shard_size, salt):
+            self.unit_ids.append(unit[0])
+            batch.append(unit)
+            if len(batch) >= ENQUEUE_BATCH:
+                queued += self.queue.enqueue(batch)
+                batch = []
+        if batch:
+            queued += self.queue.enqueue(batch)
+        return queued
+    
+    def wait(self, processes=(), poll_interval=1.0, max_attempts=DEFAULT_MAX_ATTEMPTS, progress=None):
+        """
+        等待队列中所有单元完成或失败，期间回收过期的租约
+        
+        参数:
+            processes: 本机启动的工作进程，全部退出后不再等待
+            poll_interval: 检查间隔（秒）
+            max_attempts: 最大尝试次数
+            progress: 可选的回调函数，参数为各状态的单元数
+        
+        返回:
+            最后一次检查时各状态的单元数
+        """
+        while True:
+            counts = self.queue.counts()
+            if progress:
+                progress(counts)
+            if not counts["pending"] and not counts["leased"]:
+                return counts
+            if processes and not any(process.is_alive() for process in processes):
+                print("警告: 本机工作进程已全部退出，队列中仍有未完成的单元", file=sys.stderr)
+                return counts
+            self.queue.reap(max_attempts)
+            time.sleep(poll_interval)
+    
+    def iter_reports(self):
+        """
+        按提交顺序产生已完成来源的报告
+        
+        返回:
+            RecordReport迭代器；无法验证的来源记录在errors中
+        """
+        rules = {}
+        for _, records in self.queue.results(self.unit_ids):
+            for record in records or ():
+                if record.get("error"):
+                    self.errors.append((record.get("source"), record["error"]))
+                    continue
+                yield RecordReport(record, rules)
@@ -0,0 +1,17 @@
+"""
+自动修复模块，将可机械修复的问题以编辑的形式写回原始源代码
+"""
+from .edits import Edit, apply_edits, set_attributes
+from .engine import AutoFixer, FixResult
+from .fixers import FIXERS, FixContext, fixer
+
+__all__ = [
+    'Edit',
+    'apply_edits',
+    'set_attributes',
+    'AutoFixer',
+    'FixResult',
+    'FIXERS',
+    'FixContext',
+    'fixer'
+]
@@ -0,0 +1,187 @@
+"""
+源代码编辑模块，按元素在源代码中的位置生成编辑并一次性拼接，不经过BeautifulSoup重新序列化
+"""
+import re
+from html import escape
+
+# 开始标签：标签名后跟任意数量的属性，属性值可以带引号（引号内允许出现>）
+_START_TAG_RE = re.compile(r'''
+    <[a-zA-Z][^\s/>]*
+    (?:
+        \s*
+        (?:[^\s"'>/=]+ (?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s>]*))? | /(?!>) )
+    )*
+    \s*/?>
+''', re.X)
+
+# 开始标签中的属性
+_ATTRIBUTE_RE = re.compile(r'''
+    (?P<name>[^\s"'>/=]+)
+    (?:\s*=\s*(?P<value>"[^"]*"|'[^']*'|[^\s>]*))?
+''', re.X)
+
+
+class Edit:
+    """对源代码的一处编辑：将[start, end)替换为text，start等于end时为插入"""
+    
+    __slots__ = ('start', 'end', 'text', 'rule_id', 'description', 'line')
+    
+    def __init__(self, start, end, text, rule_id=None, description="", line=0):
+        """
+        参数:
+            start: 起始偏移量（字符）
+            end: 结束偏移量（不含）
+            text: 替换文本
+            rule_id: 产生编辑的规则ID
+            description: 编辑说明
+            line: 所在行号
+        """
+        self.start = start
+        self.end = end
+        self.text = text
+        self.rule_id = rule_id
+        self.description = description
+        self.line = line
+    
+    def __repr__(self):
+        return f"Edit({self.start}, {self.end}, {self.text!r})"
+    
+    def to_dict(self):
+        """转换为字典"""
+        return {
+            "rule_id": self.rule_id,
+            "line": self.line,
+            "description": self.description,
+        }
+
+
+def apply_edits(source, edits):
+    """
+    将编辑一次性拼接到源代码中
+    
+    编辑按起始位置排序后顺序拼接，源代码中未修改的部分原样保留，整个过程是一次线性
+    遍历。同一位置的多个插入按给出的顺序保留；与先前编辑重叠的编辑被跳过。
+    
+    参数:
+        source: 源代码
+        edits: Edit列表
+    
+    返回:
+        (修改后的源代码, 已应用的Edit列表, 因重叠而跳过的Edit列表)元组
+    """
+    parts = []
+    applied = []
+    skipped = []
+    position = 0
+    
+    for edit in sorted(edits, key=lambda edit: (edit.start, edit.end)):
+        if edit.start < position:
+            skipped.append(edit)
+            continue
+        parts.append(source[position:edit.start])
+        parts.append(edit.text)
+        position = edit.end
+        applied.append(edit)
+    
+    parts.append(source[position:])
+    return "".join(parts), applied, skipped
+
+
+def start_tag_span(source, offset):
+    """
+    获取从offset开始的开始标签的范围
+    
+    参数:
+        source: 源代码
+        offset: 开始标签"<"的偏移量
+    
+    返回:
+        (起始偏移量, 结束偏移量)元组，offset处不是开始标签时返回None
+    """
+    match = _START_TAG_RE.match(source, offset)
+    if match is None:
+        return None
+    return match.span()
+
+
+def attribute_spans(source, start, end):
+    """
+    解析开始标签中的属性位置
+    
+    参数:
+        source: 源代码
+        start: 开始标签的起始偏移量
+        end: 开始标签的结束偏移量
+    
+    返回:
+        属性名(小写) -> (属性起始, 属性结束, 值起始, 值结束)的字典，没有值的属性值范围为None；
+        重复的属性只保留第一个（与HTML解析规则一致）
+    """
+    tag = source[start:end]
+    # 跳过标签名
+    name_end = 1
+    while name_end < len(tag) and not tag[name_end].isspace() and tag[name_end] not in '/>':
+        name_end += 1
+    
+    spans = {}
+    for match in _ATTRIBUTE_RE.finditer(tag, name_end, len(tag) - 1):
+        name = match.group('name').lower()
+        if name in spans:
+            continue
+        value_start = value_end = None
+        if match.group('value') is not None:
+            value_start, value_end = match.span('value')
+            if match.group('value')[:1] in ('"', "'"):
+                value_start += 1
+                value_end -= 1
+            value_start += start
+            value_end += start
+        spans[name] = (start + match.start(), start + match.end(), value_start, value_end)
+    return spans
+
+
+def set_attributes(source, offset, attributes, rule_id=None, description="", line=0):
+    """
+    生成设置开始标签属性的编辑：已有的属性替换其值，不存在的属性插入到标签末尾
+    
+    参数:
+        source: 源代码
+        offset: 开始标签"<"的偏移量
+        attributes: 属性名 -> 值的有序字典
+        rule_id: 产生编辑的规则ID
+        description: 编辑说明
+        line: 所在行号
+    
+    返回:
+        Edit列表，offset处不是开始标签时返回空列表
+    """
+    span = start_tag_span(source, offset)
+    if span is None:
+        return []
+    start, end = span
+    existing = attribute_spans(source, start, end)
+    
+    edits = []
+    inserted = []
+    for name, value in attributes.items():
+        quoted = escape(value, quote=True)
+        current = existing.get(name.lower())
+        if current is not None and current[2] is not None and source[current[2]:current[3]] == quoted:
+            continue  # 已是目标值
+        if current is None:
+            inserted.append(f' {name}="{quoted}"')
+        elif current[2] is None:
+            # 没有值的属性（如<html lang>）补上值
+            edits.append(Edit(current[1], current[1], f'="{quoted}"', rule_id, description, line))
+        elif source[current[2] - 1:current[2]] in ('"', "'"):
+            edits.append(Edit(current[2], current[3], quoted, rule_id, description, line))
+        else:
+            edits.append(Edit(current[2], current[3], f'"{quoted}"', rule_id, description, line))
+    
+    if inserted:
+        # 插入到"/>"或">"之前，并跳过其前的空白，保持原有的空白风格
+        position = end - 2 if source[end - 2:end] == '/>' else end - 1
+        while position > start and source[position - 1].isspace():
+            position -= 1
+        edits.append(Edit(position, position, "".join(inserted), rule_id, description, line))
+    return edits
@@ -0,0 +1,181 @@
+"""
+自动修复引擎，将可机械修复的问题以编辑的形式拼接回原始源代码
+"""
+import os
+import tempfile
+
+from ..core.index import DocumentIndex
+from .edits import apply_edits, set_attributes
+from .fixers import FIXERS, FixContext
+
+
+class FixResult:
+    """一个来源的修复结果"""
+    
+    def __init__(self, source, text, applied, skipped, path=None):
+        self.source = source  # 原始源代码
+        self.text = text  # 修复后的源代码
+        self.applied = applied  # 已应用的Edit列表
+        self.skipped = skipped  # 与其他编辑冲突而未应用的Edit列表
+        self.path = path  # 写入的文件路径
+    
+    @property
+    def changed(self):
+        """源代码是否被修改"""
+        return bool(self.applied)
+    
+    @property
+    def fixed_issues(self):
+        """被修复的问题数（同一问题的多处编辑只计一次）"""
+        return len({(edit.rule_id, edit.line, edit.description) for edit in self.applied})
+
+
+class AutoFixer:
+    """
+    自动修复引擎
+    
+    根据验证报告中的问题生成编辑：每个编辑的位置由元素在源代码中的行号和列号
+    （html.parser记录的sourceline和sourcepos）换算为偏移量，所有编辑在一次线性
+    拼接中写回原始源代码，未修改的部分（包括空白、引号风格和换行符）原样保留。
+    """
+    
+    def __init__(self, lang='zh-CN', rule_ids=None):
+        """
+        参数:
+            lang: 页面缺少语言时添加的语言代码
+            rule_ids: 只应用这些规则的修复，默认应用所有修复
+        """
+        self.lang = lang
+        self.fixers = {
+            rule_id: func for rule_id, func in FIXERS.items()
+            if rule_ids is None or rule_id in rule_ids
+        }
+    
+    @property
+    def rule_ids(self):
+        """可以自动修复的规则ID"""
+        return set(self.fixers)
+    
+    def plan(self, report, source, document, line_positions=None):
+        """
+        为报告中可修复的问题生成编辑
+        
+        参数:
+            report: 验证source得到的ValidationReport对象
+            source: 被验证的源代码
+            document: 验证时解析得到的BeautifulSoup文档对象（问题中的元素属于该文档）
+            line_positions: 可选的每行起始偏移量列表，默认从source计算
+        
+        返回:
+            Edit列表
+        """
+        if line_positions is None:
+            line_positions = _line_positions(source)
+        
+        context = FixContext(document, DocumentIndex.for_document(document), lang=self.lang)
+        edits = []
+        changes = {}  # 元素id -> (元素, 属性字典, 规则ID, 描述, 行号)，同一元素的修改合并为一次编辑
+        
+        for issue in report.issues:
+            fix = self.fixers.get(issue.rule.id)
+            if fix is None:
+                continue
+            for element, attributes in fix(issue, context):
+                entry = changes.get(id(element))
+                if entry is None:
+                    changes[id(element)] = (element, dict(attributes), issue.rule.id, issue.description, issue.line)
+                else:
+                    entry[1].update(attributes)
+        
+        for element, attributes, rule_id, description, line in changes.values():
+            offset = element_offset(element, line_positions)
+            if offset is None:
+                continue
+            edits.extend(set_attributes(source, offset, attributes, rule_id=rule_id,
+                                        description=description, line=line))
+        return edits
+    
+    def fix(self, report, source, document, line_positions=None):
+        """
+        修复源代码
+        
+        参数:
+            report: 验证source得到的ValidationReport对象
+            source: 被验证的源代码
+            document: 验证时解析得到的BeautifulSoup文档对象
+            line_positions: 可选的每行起始偏移量列表
+        
+        返回:
+            FixResult对象
+        """
+        edits = self.plan(report, source, document, line_positions)
+        text, applied, skipped = apply_edits(source, edits)
+        return FixResult(source, text, applied, skipped)
+    
+    def fix_file(self, validator, path, output=None):
+        """
+        验证并修复HTML文件
+        
+        参数:
+            validator: WCAGValidator对象
+            path: HTML文件路径
+            output: 输出文件路径，默认覆盖原文件
+        
+        返回:
+            (ValidationReport对象, FixResult对象)元组
+        """
+        report = validator.validate_file(path)
+        parser = validator.parser
+        result = self.fix(report, parser.source_code, parser.document, parser.line_positions)
+        if result.changed or output:
+            result.path = write_text(output or path, result.text)
+        return report, result
+
+
+def element_offset(element, line_positions):
+    """
+    计算元素开始标签在源代码中的偏移量
+    
+    参数:
+        element: html.parser解析得到的元素
+        line_positions: 每行起始偏移量列表
+    
+    返回:
+        偏移量，元素没有位置信息时返回None
+    """
+    line = getattr(element, 'sourceline', None)
+    if line is None or line < 1 or line > len(line_positions):
+        return None
+    return line_positions[line - 1] + element.sourcepos
+
+
+def _line_positions(source):
+    """计算每行的起始偏移量（按\\n划分，与html.parser的行号一致）"""
+    positions = [0]
+    position = source.find('\n')
+    while position != -1:
+        positions.append(position + 1)
+        position = source.find('\n', position + 1)
+    return positions
+
+
+def write_text(path, text):
+    """
+    原子地写入文本文件（先写入同目录的临时文件再替换），保留原有换行符
+    
+    返回:
+        写入的文件路径
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix='.wcag-fix-', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        if os.path.exists(path):
+            os.chmod(temp_path, os.stat(path).st_mode & 0o7777)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return path
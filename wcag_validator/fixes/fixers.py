@@ -0,0 +1,121 @@
+"""
+自动修复规则模块，为可以机械修复的问题给出要设置的属性
+"""
+from ..core.accname import LABELABLE_TAGS
+
+# 规则ID -> 修复函数
+FIXERS = {}
+
+
+def fixer(rule_id):
+    """
+    注册修复函数的装饰器
+    
+    修复函数接收(问题, FixContext)，返回[(元素, {属性名: 值}), ...]，无法安全修复时返回空列表。
+    """
+    def decorator(func):
+        FIXERS[rule_id] = func
+        return func
+    return decorator
+
+
+class FixContext:
+    """修复过程中共享的文档信息"""
+    
+    def __init__(self, document, index, lang='zh-CN'):
+        """
+        参数:
+            document: BeautifulSoup文档对象
+            index: 文档的DocumentIndex对象
+            lang: 页面缺少语言时添加的语言代码
+        """
+        self.document = document
+        self.index = index
+        self.lang = lang
+        self.used_ids = set()  # 本次修复中新增的id
+        self.used_labels = set()  # 本次修复中已关联到控件的label的id()
+    
+    def id_available(self, value):
+        """id在文档中和本次修复中都未被使用"""
+        return value not in self.used_ids and self.index.element_by_id(value) is None
+    
+    def unique_id(self, base):
+        """生成未被使用的id"""
+        base = "".join(ch if ch.isalnum() or ch in '-_' else '-' for ch in base).strip('-') or 'field'
+        candidate = base
+        number = 2
+        while not self.id_available(candidate):
+            candidate = f"{base}-{number}"
+            number += 1
+        self.used_ids.add(candidate)
+        return candidate
+
+
+@fixer("img-alt")
+def fix_image_alt(issue, context):
+    """缺少alt或alt为空的图像标记为装饰性图像（alt="" role="presentation"）"""
+    image = issue.element
+    if image is None or image.has_attr('role'):
+        return []
+    if not image.has_attr('alt') or not image['alt'].strip():
+        return [(image, {"alt": "", "role": "presentation"})]
+    return []  # alt过长需要人工改写
+
+
+@fixer("page-language")
+def fix_page_language(issue, context):
+    """为html元素添加lang属性"""
+    html = issue.element
+    if html is None or html.name != 'html':
+        return []
+    return [(html, {"lang": context.lang})]
+
+
+@fixer("form-label")
+def fix_form_label(issue, context):
+    """
+    将控件与紧邻的、尚未关联任何控件的label关联
+    
+    label位于控件之前（复选框和单选按钮也可以在之后）、没有for属性或for指向不存在的
+    元素、不包含其他控件且有文本时，设置label的for属性，控件没有id时同时添加id。
+    """
+    control = issue.element
+    if control is None or control.name not in ('input', 'select', 'textarea'):
+        return []
+    
+    label = _adjacent_label(control, context)
+    if label is None:
+        return []
+    context.used_labels.add(id(label))
+    
+    control_id = (control.get('id') or "").strip()
+    if control_id:
+        return [(label, {"for": control_id})]
+    
+    # 优先使用label的for值或控件的name作为新id
+    target = (label.get('for') or "").strip()
+    if not target or not context.id_available(target):
+        target = context.unique_id(control.get('name') or f"{control.name}-field")
+    else:
+        context.used_ids.add(target)
+    return [(control, {"id": target}), (label, {"for": target})]
+
+
+def _adjacent_label(control, context):
+    """查找可以关联到控件的相邻label"""
+    candidates = [control.find_previous_sibling(True)]
+    if control.name == 'input' and control.get('type', '').lower() in ('checkbox', 'radio'):
+        candidates.append(control.find_next_sibling(True))
+    
+    for label in candidates:
+        if label is None or label.name != 'label' or id(label) in context.used_labels:
+            continue
+        target = label.get('for')
+        if target is not None and target.strip() and context.index.element_by_id(target.strip()) is not None:
+            continue  # 已关联到其他元素
+        if not label.get_text().strip():
+            continue
+        if label.find(list(LABELABLE_TAGS)) is not None:
+            continue
+        return label
+    return None
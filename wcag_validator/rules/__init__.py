@@ -4,10 +4,14 @@
 
 # 导入规则基类
 from .base import Rule, RuleRegistry
+from .declarative import DeclarativeRule, define_rule, load_rules
+from .plugins import RulePack, ENTRY_POINT_GROUP, discover_packs
 
 # 导入所有规则模块
 from .perceivable.images import ImageAltRule, ImageInputAltRule, SVGAccessibilityRule
 from .perceivable.forms import FormLabelRule, FormFieldsetRule, FormAutocompleteRule
+from .perceivable.contrast import ColorContrastRule, ColorContrastEnhancedRule
+from .operable.keyboard import FocusOrderRule, FocusableHiddenRule, ClickHandlerKeyboardRule, NestedInteractiveRule
 from .understandable.structure import HeadingStructureRule, PageTitleRule, LanguageRule
 from .robust.structure import HTMLParsingRule, ARIARule, LinkPurposeRule
 
@@ -15,12 +19,24 @@ from .robust.structure import HTMLParsingRule, ARIARule, LinkPurposeRule
 __all__ = [
     'Rule',
     'RuleRegistry',
+    'DeclarativeRule',
+    'define_rule',
+    'load_rules',
+    'RulePack',
+    'ENTRY_POINT_GROUP',
+    'discover_packs',
     'ImageAltRule',
     'ImageInputAltRule',
     'SVGAccessibilityRule',
     'FormLabelRule',
     'FormFieldsetRule',
     'FormAutocompleteRule',
+    'ColorContrastRule',
+    'ColorContrastEnhancedRule',
+    'FocusOrderRule',
+    'FocusableHiddenRule',
+    'ClickHandlerKeyboardRule',
+    'NestedInteractiveRule',
     'HeadingStructureRule',
     'PageTitleRule',
     'LanguageRule',
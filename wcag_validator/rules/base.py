@@ -11,6 +11,9 @@ class Rule:
         self.wcag_criterion = None  # WCAG标准编号
         self.level = None  # 级别 (A, AA, AAA)
         self.description = None  # 规则描述
+        self.required_tags = None  # 触发规则所需的标签集合，None表示不限
+        self.required_attrs = None  # 触发规则所需的属性集合，None表示不限
+        self.selectors = {}  # 名称 -> CSS选择器，注册时预编译
         
     def validate(self, document):
         """
@@ -18,11 +21,49 @@ class Rule:
         
         参数:
             document: 解析后的文档对象
-            
+        
+        返回:
+            Issue对象列表
+        """
+        return list(self.iter_issues(document))
+    
+    def iter_issues(self, document):
+        """
+        逐个产生问题，供验证器在结论确定后提前停止
+        
+        只实现了validate方法的旧规则会回退为一次性返回全部问题。
+        
+        参数:
+            document: 解析后的文档对象
+        
         返回:
-            RuleResult对象列表
+            Issue对象迭代器
         """
-        raise NotImplementedError("子类必须实现validate方法")
+        if type(self).validate is Rule.validate:
+            raise NotImplementedError("子类必须实现iter_issues或validate方法")
+        return iter(self.validate(document) or [])
+    
+    def compile_selectors(self):
+        """预编译规则声明的CSS选择器，选择器语法错误在注册时即可发现"""
+        from ..core.selectors import compile_selector
+        
+        self.selectors = {name: compile_selector(css) for name, css in (self.selectors or {}).items()}
+    
+    def select(self, document, selector):
+        """
+        基于文档索引获取匹配CSS选择器的元素
+        
+        参数:
+            document: 解析后的文档对象
+            selector: self.selectors中的名称，或CSS选择器字符串
+        
+        返回:
+            按文档顺序排列的元素列表
+        """
+        from ..core.index import DocumentIndex
+        
+        selector = (self.selectors or {}).get(selector, selector)
+        return DocumentIndex.for_document(document).select(selector)
     
     def get_help_text(self):
         """返回规则的帮助文本"""
@@ -36,9 +77,13 @@ class Rule:
             issue: 问题对象
             
         返回:
-            修复建议列表
+            修复建议列表，默认按问题代码从消息目录生成
         """
-        return []
+        from ..core.messages import catalogue
+        
+        if not issue.code:
+            return []
+        return catalogue.suggestions(issue.code, issue.params, issue.element, issue.locale)
     
     def get_wcag_reference(self):
         """返回WCAG参考链接"""
@@ -54,13 +99,72 @@ class Rule:
         return ""
 
 
+# WCAG级别的顺序
+_LEVEL_ORDER = {'A': 1, 'AA': 2, 'AAA': 3}
+
+
+class _RegistryMethod:
+    """在RuleRegistry类上调用时作用于默认注册表，在实例上调用时作用于该实例"""
+    
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+    
+    def __get__(self, instance, owner):
+        if instance is None:
+            instance = owner.default()
+        return self.func.__get__(instance, owner)
+
+
 class RuleRegistry:
-    """规则注册表"""
+    """
+    规则注册表
+    
+    注册时只记录规则类，规则在第一次被查询时才实例化。第三方规则包通过入口点
+    （见plugins模块）发现，只有所选级别、标准或规则ID涉及的规则包才会被导入。
+    
+    在类上调用的方法（如@RuleRegistry.register）作用于进程内共享的默认注册表；
+    RuleRegistry()创建的注册表继承默认注册表中的规则，在其中注册的规则只对使用
+    该注册表的验证器可见：
+        
+        registry = RuleRegistry()
+        registry.register(MyRule)
+        validator = WCAGValidator('AA', registry=registry)
+    """
+    
+    _default = None  # 默认注册表
+    _capture = None  # 导入规则包时收集在默认注册表上注册的规则类
     
-    _rules = {}
+    def __init__(self, inherit=True, plugins=True):
+        """
+        参数:
+            inherit: 是否继承默认注册表中的规则（内置规则和全局注册的规则）
+            plugins: 是否按需加载通过入口点发现的规则包，为False时继承的注册表中
+                     已加载的规则包中的规则同样不可见
+        """
+        self.parent = type(self).default() if inherit else None
+        self.plugins = plugins
+        self._version = 0
+        self._pending = []  # 已注册但尚未实例化的规则类
+        self._rules = {}  # 规则ID -> 规则实例
+        self._loaded_packs = set()  # 已加载的规则包名称
+        self._pack_classes = set()  # 从规则包加载的规则类
+        self._pack_rule_ids = set()  # 从规则包加载的规则ID
     
     @classmethod
-    def register(cls, rule_class):
+    def default(cls):
+        """返回默认注册表"""
+        if cls._default is None:
+            cls._default = cls(inherit=False)
+        return cls._default
+    
+    @property
+    def version(self):
+        """每次注册或加载规则包时递增（含继承的注册表），用于使已编译的执行计划失效"""
+        return self._version + (self.parent.version if self.parent is not None else 0)
+    
+    @_RegistryMethod
+    def register(self, rule_class):
         """
         注册规则
         
@@ -70,14 +174,18 @@ class RuleRegistry:
         返回:
             规则类（用于装饰器模式）
         """
-        instance = rule_class()
-        cls._rules[instance.id] = instance
+        if self is RuleRegistry._default and RuleRegistry._capture is not None:
+            # 正在导入规则包：规则属于规则包，由加载它的注册表实例化
+            RuleRegistry._capture.append(rule_class)
+            return rule_class
+        self._pending.append(rule_class)
+        self._version += 1
         return rule_class
     
-    @classmethod
-    def get_rule(cls, rule_id):
+    @_RegistryMethod
+    def get_rule(self, rule_id):
         """
-        获取规则
+        获取规则，规则不存在时加载可能包含它的规则包
         
         参数:
             rule_id: 规则ID
@@ -85,20 +193,24 @@ class RuleRegistry:
         返回:
             规则实例
         """
-        return cls._rules.get(rule_id)
+        rules = self._all_rules()
+        if rule_id not in rules and self.load_packs(rule_ids=[rule_id]):
+            rules = self._all_rules()
+        return rules.get(rule_id)
     
-    @classmethod
-    def get_all_rules(cls):
+    @_RegistryMethod
+    def get_all_rules(self):
         """
-        获取所有规则
+        获取所有规则（加载所有规则包）
         
         返回:
             规则实例列表
         """
-        return list(cls._rules.values())
+        self.load_packs()
+        return list(self._all_rules().values())
     
-    @classmethod
-    def get_rules_by_level(cls, level):
+    @_RegistryMethod
+    def get_rules_by_level(self, level):
         """
         按级别获取规则
         
@@ -108,16 +220,10 @@ class RuleRegistry:
         返回:
             规则实例列表
         """
-        level_map = {'A': 1, 'AA': 2, 'AAA': 3}
-        target_level = level_map.get(level.upper(), 3)
-        
-        return [
-            rule for rule in cls._rules.values() 
-            if level_map.get(rule.level, 0) <= target_level
-        ]
+        return self.select(level)
     
-    @classmethod
-    def get_rules_by_criterion(cls, criterion):
+    @_RegistryMethod
+    def get_rules_by_criterion(self, criterion):
         """
         按标准获取规则
         
@@ -127,7 +233,89 @@ class RuleRegistry:
         返回:
             规则实例列表
         """
+        return self.select('AAA', criteria=[criterion])
+    
+    @_RegistryMethod
+    def select(self, level, rule_ids=None, criteria=None):
+        """
+        获取所选级别内的规则，只加载涉及所选级别、标准和规则ID的规则包
+        
+        参数:
+            level: WCAG级别 ('A', 'AA', 'AAA')
+            rule_ids: 可选，只返回这些规则ID
+            criteria: 可选，只返回这些WCAG标准的规则
+        
+        返回:
+            按注册顺序排列的规则实例列表
+        """
+        target_level = _LEVEL_ORDER.get(level.upper(), 3)
+        self.load_packs(level, criteria=criteria, rule_ids=rule_ids)
+        
         return [
-            rule for rule in cls._rules.values() 
-            if rule.wcag_criterion == criterion
+            rule for rule in self._all_rules().values()
+            if _LEVEL_ORDER.get(rule.level, 0) <= target_level
+            and (not rule_ids or rule.id in rule_ids)
+            and (not criteria or rule.wcag_criterion in criteria)
         ]
+    
+    @_RegistryMethod
+    def load_packs(self, level=None, criteria=None, rule_ids=None):
+        """
+        加载可能包含所选规则的规则包
+        
+        参数:
+            level: 可选的WCAG级别，只加载包含该级别（含更低级别）规则的规则包
+            criteria: 可选，只加载包含这些WCAG标准的规则包
+            rule_ids: 可选，只加载包含这些规则ID的规则包
+        
+        返回:
+            本次加载的规则包数量
+        """
+        from .plugins import discover_packs
+        
+        if not self.plugins or RuleRegistry._capture is not None:
+            return 0  # 导入规则包的过程中不再加载其他规则包
+        
+        loaded = 0
+        for pack in discover_packs():
+            if self._pack_loaded(pack.name) or not pack.matches(level, criteria, rule_ids):
+                continue
+            rules = pack.load()
+            self._pending.extend(rules)
+            self._pack_classes.update(rules)
+            self._loaded_packs.add(pack.name)
+            self._version += 1
+            loaded += 1
+        return loaded
+    
+    def _pack_loaded(self, name):
+        if name in self._loaded_packs:
+            return True
+        return self.parent is not None and self.parent._pack_loaded(name)
+    
+    def _all_rules(self, packs=True):
+        """
+        规则ID -> 规则实例（继承的规则在前，同ID的规则被本注册表中的规则替换）
+        
+        参数:
+            packs: 是否包含从规则包加载的规则，不加载规则包的注册表也看不到
+                   继承的注册表中已加载的规则包
+        """
+        if self._pending:
+            pending, self._pending = self._pending, []
+            for rule_class in pending:
+                instance = rule_class()
+                instance.compile_selectors()
+                self._rules[instance.id] = instance
+                if rule_class in self._pack_classes:
+                    self._pack_rule_ids.add(instance.id)
+        
+        packs = packs and self.plugins
+        own = self._rules
+        if not packs and self._pack_rule_ids:
+            own = {rule_id: rule for rule_id, rule in own.items() if rule_id not in self._pack_rule_ids}
+        if self.parent is None:
+            return own
+        rules = dict(self.parent._all_rules(packs))
+        rules.update(own)
+        return rules
@@ -0,0 +1,385 @@
+"""
+声明式规则模块，用字典（或YAML/JSON文件）描述规则，编译为按标签和属性分派的匹配表，
+所有声明式规则在一次遍历中共同执行
+"""
+import json
+import re
+
+from .base import Rule, RuleRegistry
+from ..core.messages import catalogue
+from ..core.selectors import compile_selector
+from ..utils.html_utils import attribute_value
+
+try:
+    import yaml
+except ImportError:  # PyYAML是可选依赖
+    yaml = None
+
+
+class DeclarativeRule(Rule):
+    """
+    声明式规则基类
+    
+    子类只需提供spec字典：
+        
+        spec = {
+            "id": "img-input-alt",
+            "name": "图像按钮必须有alt属性",
+            "wcag_criterion": "1.1.1",
+            "level": "A",
+            "description": "...",
+            "selector": {
+                "tag": "input",                    # 标签名或标签名列表，省略时按属性分派
+                "css": "input:not([alt])",         # 可选的CSS选择器，省略tag时由其推导分派键
+                "first": False,                    # 只检查第一个匹配标签的元素
+                "attrs": {"type": "image"},        # 属性谓词
+                "accessible_name": "blank",        # 无障碍名称为空（或"present"）
+            },
+            "let": {"value": {"lookup": ["id", "name"], "table": {...}}},  # 命名捕获
+            "message": "图像按钮缺少alt属性",
+            "fix": ["添加描述按钮功能的alt属性"],
+            "examples": [{"code": '<input src="{attrs[src]}">', "description": "..."}],
+            "suggestions": [...],                  # get_fix_suggestions的返回值，默认同fix
+            "impact": "高",
+            "code": "img-input-alt",               # 消息目录中的问题代码，默认同id
+            "translations": {"en": {"message": "...", "fix": [...], ...}},  # 其他语言的消息
+        }
+    
+    属性谓词可以是True（存在）、False（不存在）、字符串（等于），或包含equals、
+    in、blank、matches、ignore_case的字典。模板使用str.format语法，可引用
+    {attrs[名称]}、{attributes}（全部属性，example中可用omit排除）、{tag}和let捕获。
+    message、fix、examples和suggestions注册到消息目录，问题只携带代码和let捕获的参数。
+    """
+    
+    spec = None
+    
+    def __init__(self, spec=None):
+        super().__init__()
+        spec = spec if spec is not None else self.spec
+        if not spec:
+            raise ValueError(f"{type(self).__name__}缺少规则定义spec")
+        
+        self.spec = spec
+        self.id = spec["id"]
+        self.name = spec.get("name", self.id)
+        self.wcag_criterion = spec.get("wcag_criterion")
+        self.level = spec.get("level", "A")
+        self.description = spec.get("description", self.name)
+        self.message = spec["message"]
+        self.fix = list(spec.get("fix", []))
+        self.examples = list(spec.get("examples", []))
+        self.suggestions = list(spec.get("suggestions", self.fix))
+        self.impact = spec.get("impact")
+        self.code = spec.get("code", self.id)
+        
+        catalogue.define(self.code, spec)
+        for locale, entry in spec.get("translations", {}).items():
+            catalogue.define(self.code, entry, locale)
+        
+        selector = spec.get("selector", {})
+        css = selector.get("css")
+        self._css = compile_selector(css) if css else None
+        tags = selector.get("tag")
+        if tags is None and self._css is not None and self._css.tags:
+            tags = sorted(self._css.tags)
+        self.tags = [tags] if isinstance(tags, str) else list(tags or [])
+        self.first = bool(selector.get("first"))
+        if self.first and len(self.tags) != 1:
+            raise ValueError(f"规则{self.id}: first只能与单个标签一起使用")
+        
+        self._predicates = [
+            (name, _compile_predicate(self.id, name, predicate))
+            for name, predicate in selector.get("attrs", {}).items()
+        ]
+        self._captures = [
+            (name, _compile_capture(self.id, name, capture))
+            for name, capture in spec.get("let", {}).items()
+        ]
+        
+        accessible_name = selector.get("accessible_name")
+        if accessible_name not in (None, "blank", "present"):
+            raise ValueError(f"规则{self.id}: 不支持的accessible_name条件: {accessible_name}")
+        self._accessible_name = accessible_name
+        
+        # 第一个要求属性存在的谓词作为分派键：没有指定标签时按该属性分派，
+        # 指定了标签时只与带有该属性的元素比较
+        self.key_attr = None
+        for name, predicate in selector.get("attrs", {}).items():
+            if _requires_presence(predicate):
+                self.key_attr = name
+                break
+        if self.key_attr is None and self._css is not None and len(self._css.keys) == 1 \
+                and self._css.keys[0] is not None and self._css.keys[0][0] == 'attr':
+            self.key_attr = self._css.keys[0][1]
+        
+        self.required_tags = set(self.tags) or None
+        self.required_attrs = {self.key_attr} if self.key_attr and not self.tags else None
+    
+    def match(self, element, index):
+        """
+        判断元素是否匹配规则
+        
+        参数:
+            element: 候选元素
+            index: 文档的DocumentIndex对象
+        
+        返回:
+            匹配时返回捕获的参数字典，否则返回None
+        """
+        for name, predicate in self._predicates:
+            if not predicate(attribute_value(element, name)):
+                return None
+        
+        if self._css is not None and not self._css.match(element):
+            return None
+        
+        if self._accessible_name is not None:
+            has_name = bool(index.names.name(element))
+            if has_name != (self._accessible_name == "present"):
+                return None
+        
+        params = {}
+        for name, capture in self._captures:
+            value = capture(element)
+            if value is None:
+                return None
+            params[name] = value
+        return params
+    
+    def iter_issues(self, document):
+        from ..core.index import DocumentIndex
+        
+        # 验证器已经通过执行计划的匹配表一次性计算了所有声明式规则的匹配结果；
+        # 单独调用规则时退化为只包含本规则的匹配表
+        matches = document.__dict__.get('_wcag_matches', {}).get(id(self))
+        if matches is None:
+            index = DocumentIndex.for_document(document)
+            matches = MatcherTable([self]).run(document, index)[id(self)]
+        
+        for element, params in matches:
+            yield self.build_issue(element, params)
+    
+    def build_issue(self, element, params):
+        """
+        生成携带问题代码和捕获参数的问题，描述和建议在输出时由消息目录生成
+        
+        参数:
+            element: 匹配的元素
+            params: 捕获的参数
+        
+        返回:
+            Issue对象
+        """
+        from ..core.validator import Issue
+        
+        issue = Issue(rule=self, element=element, code=self.code, params=params)
+        if self.impact:
+            issue.set_impact(self.impact)
+        return issue
+
+
+class MatcherTable:
+    """
+    声明式规则的匹配表
+    
+    规则先按标签（没有标签时按属性）分派，同一标签下要求某个属性存在的规则再按该
+    属性分派：候选元素直接取自DocumentIndex，每个元素只与其标签和自身属性对应的
+    规则比较，因此增加规则的开销只与该规则关心的元素数量有关，而与规则总数无关。
+    """
+    
+    def __init__(self, rules):
+        """
+        编译匹配表
+        
+        参数:
+            rules: DeclarativeRule实例列表
+        """
+        self.rules = list(rules)
+        self.by_tag = {}  # 标签名 -> (不需要属性的规则列表, 属性名 -> 规则列表)
+        self.by_attr = {}  # 属性名 -> 没有指定标签的规则列表
+        self.universal = []  # 对所有元素检查的规则
+        self._multi_key = set()  # 分派到多个标签、结果需要按文档顺序重排的规则
+        
+        for rule in self.rules:
+            if rule.tags:
+                for tag in rule.tags:
+                    plain, keyed = self.by_tag.setdefault(tag, ([], {}))
+                    if rule.key_attr:
+                        keyed.setdefault(rule.key_attr, []).append(rule)
+                    else:
+                        plain.append(rule)
+                if len(rule.tags) > 1:
+                    self._multi_key.add(id(rule))
+            elif rule.key_attr:
+                self.by_attr.setdefault(rule.key_attr, []).append(rule)
+            else:
+                self.universal.append(rule)
+    
+    def __bool__(self):
+        return bool(self.rules)
+    
+    def run(self, document, index, rules=None, visits=None):
+        """
+        在一次遍历中执行所有（或指定的）声明式规则
+        
+        参数:
+            document: BeautifulSoup文档对象
+            index: 文档的DocumentIndex对象
+            rules: 只执行这些规则，默认为匹配表中的全部规则
+            visits: 可选的字典，记录每个规则（以id()为键）比较过的元素数
+        
+        返回:
+            规则id() -> [(元素, 捕获参数), ...]的字典
+        """
+        active = None if rules is None else {id(rule) for rule in rules}
+        results = {id(rule): [] for rule in self.rules if active is None or id(rule) in active}
+        
+        groups = [(plain, keyed, index.by_tag.get(tag)) for tag, (plain, keyed) in self.by_tag.items()]
+        groups.extend(([], {attr: rules}, index.by_attr.get(attr)) for attr, rules in self.by_attr.items())
+        if self.universal:
+            groups.append((self.universal, {}, index.elements))
+        
+        for plain, keyed, elements in groups:
+            if not elements:
+                continue
+            plain = [rule for rule in plain if id(rule) in results]
+            keyed = {attr: [rule for rule in rules if id(rule) in results] for attr, rules in keyed.items()}
+            keyed = {attr: rules for attr, rules in keyed.items() if rules}
+            if not plain and not keyed:
+                continue
+            
+            for position, element in enumerate(elements):
+                candidates = plain
+                if keyed:
+                    candidates = plain + [rule for attr in element.attrs for rule in keyed.get(attr, ())]
+                
+                for rule in candidates:
+                    if rule.first and position:
+                        continue
+                    if visits is not None:
+                        visits[id(rule)] = visits.get(id(rule), 0) + 1
+                    params = rule.match(element, index)
+                    if params is not None:
+                        results[id(rule)].append((element, params))
+        
+        multi_key = [key for key in self._multi_key if results.get(key)]
+        if multi_key:
+            positions = {id(element): i for i, element in enumerate(index.elements)}
+            for key in multi_key:
+                results[key].sort(key=lambda match: positions[id(match[0])])
+        
+        return results
+
+
+def define_rule(spec, register=True, registry=None):
+    """
+    根据规则定义创建声明式规则
+    
+    参数:
+        spec: 规则定义字典
+        register: 是否注册到规则注册表
+        registry: 注册到的RuleRegistry对象，默认为默认注册表
+    
+    返回:
+        DeclarativeRule实例
+    """
+    class_name = "".join(part.capitalize() for part in re.split(r'[^0-9A-Za-z]+', spec["id"]) if part) + "Rule"
+    rule_class = type(class_name, (DeclarativeRule,), {"spec": spec, "__doc__": spec.get("name")})
+    if register:
+        registry = registry or RuleRegistry.default()
+        registry.register(rule_class)
+        rule = registry.get_rule(spec["id"])
+        if isinstance(rule, rule_class):
+            return rule
+    # 未注册，或在导入规则包时被规则包收集
+    return rule_class()
+
+
+def load_rules(path, register=True, registry=None):
+    """
+    从YAML或JSON文件加载声明式规则
+    
+    文件内容为规则定义列表，或包含rules列表的对象。
+    
+    参数:
+        path: 文件路径（.yaml/.yml需要安装PyYAML）
+        register: 是否注册到规则注册表
+        registry: 注册到的RuleRegistry对象，默认为默认注册表
+    
+    返回:
+        DeclarativeRule实例列表
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith(('.yaml', '.yml')):
+            if yaml is None:
+                raise ImportError("加载YAML规则需要安装PyYAML: pip install pyyaml")
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    
+    specs = data.get("rules", []) if isinstance(data, dict) else data
+    return [define_rule(spec, register=register, registry=registry) for spec in specs or []]
+
+
+def _requires_presence(predicate):
+    """谓词是否要求属性存在"""
+    if predicate is True or isinstance(predicate, str):
+        return True
+    if isinstance(predicate, dict):
+        return any(key in predicate for key in ("equals", "in", "matches")) or predicate.get("blank") is False
+    return False
+
+
+def _compile_predicate(rule_id, name, predicate):
+    """将属性谓词编译为接收属性值（字符串，多值属性以空格连接；不存在时为None）的函数"""
+    if predicate is True:
+        return lambda value: value is not None
+    if predicate is False:
+        return lambda value: value is None
+    if isinstance(predicate, str):
+        return lambda value: value == predicate
+    if not isinstance(predicate, dict):
+        raise ValueError(f"规则{rule_id}: 属性{name}的谓词无效: {predicate!r}")
+    
+    unknown = set(predicate) - {"equals", "in", "blank", "matches", "ignore_case"}
+    if unknown:
+        raise ValueError(f"规则{rule_id}: 属性{name}的谓词包含未知条件: {', '.join(sorted(unknown))}")
+    
+    ignore_case = predicate.get("ignore_case", False)
+    normalize = (lambda value: value.lower()) if ignore_case else (lambda value: value)
+    checks = []
+    
+    if "equals" in predicate:
+        expected = normalize(predicate["equals"])
+        checks.append(lambda value: value is not None and normalize(value) == expected)
+    if "in" in predicate:
+        allowed = {normalize(item) for item in predicate["in"]}
+        checks.append(lambda value: value is not None and normalize(value) in allowed)
+    if "matches" in predicate:
+        pattern = re.compile(predicate["matches"], re.IGNORECASE if ignore_case else 0)
+        checks.append(lambda value: value is not None and pattern.search(value) is not None)
+    if "blank" in predicate:
+        blank = bool(predicate["blank"])
+        checks.append(lambda value: (value is None or not value.strip()) == blank)
+    
+    return lambda value: all(check(value) for check in checks)
+
+
+def _compile_capture(rule_id, name, capture):
+    """将命名捕获编译为接收元素、返回捕获值（不匹配时为None）的函数"""
+    if not isinstance(capture, dict) or "lookup" not in capture or "table" not in capture:
+        raise ValueError(f"规则{rule_id}: 捕获{name}必须包含lookup和table")
+    
+    attrs = list(capture["lookup"])
+    # 按表中顺序依次尝试，属性值（小写）包含任一模式即返回对应的值
+    table = [(value, [pattern.lower() for pattern in patterns]) for value, patterns in capture["table"].items()]
+    
+    def lookup(element):
+        fields = [attribute_value(element, attr, "").lower() for attr in attrs]
+        for value, patterns in table:
+            for pattern in patterns:
+                if any(pattern in field for field in fields):
+                    return value
+        return None
+    
+    return lookup
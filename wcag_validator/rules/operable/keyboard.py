@@ -0,0 +1,236 @@
+"""
+键盘可访问规则模块，实现与键盘操作和焦点顺序相关的WCAG验证规则
+
+所有规则共享文档索引中的焦点顺序索引（DocumentIndex.focus），每个文档只计算一次。
+"""
+from ...core.messages import catalogue
+from ...rules.base import Rule, RuleRegistry
+
+# 问题代码 -> 消息（格式与声明式规则的spec相同）
+MESSAGES = {
+    "zh-CN": {
+        "focus-order.positive-tabindex": {
+            "message": "元素使用了正数tabindex=\"{tabindex}\"，会先于页面中的其他元素获得焦点，打乱焦点顺序",
+            "fix": ["将tabindex改为0，通过调整元素在源代码中的位置控制焦点顺序"],
+            "examples": [{"code": "{html}", "set": {"tabindex": "0"}}],
+            "suggestions": [
+                "将tabindex改为0，通过调整元素在源代码中的位置控制焦点顺序",
+                "确保焦点顺序与视觉和阅读顺序一致",
+            ],
+        },
+        "focusable-hidden.aria-hidden": {
+            "message": "可聚焦的元素位于aria-hidden=\"true\"的内容中，键盘用户可以聚焦但辅助技术无法识别",
+            "fix": ["为元素添加tabindex=\"-1\"使其不可通过Tab键聚焦", "或移除aria-hidden=\"true\""],
+            "examples": [
+                {
+                    "code": "{html}",
+                    "description": "将元素移出Tab顺序",
+                    "set": {"tabindex": "-1"},
+                },
+            ],
+        },
+        "keyboard-click.not-focusable": {
+            "message": "<{tag}>元素有点击事件处理，但无法通过键盘聚焦和操作",
+            "fix": ["使用<button>元素代替", "或添加tabindex=\"0\"、合适的role，并处理Enter和空格键"],
+            "examples": [
+                {"code": '<button type="button" onclick="{attrs[onclick]}">{inner}</button>', "description": "使用<button>元素"},
+                {
+                    "code": "{html}",
+                    "description": "添加role和tabindex",
+                    "set": {"role": "button", "tabindex": "0"},
+                },
+            ],
+        },
+        "keyboard-click.no-role": {
+            "message": "<{tag}>元素有点击事件处理，但没有控件角色，辅助技术无法识别其用途",
+            "fix": ["使用<button>元素代替", "或添加合适的role属性（如role=\"button\"）"],
+            "examples": [{"code": "{html}", "set": {"role": "button"}}],
+        },
+        "nested-interactive.focusable-descendant": {
+            "message": "交互控件<{tag}>中嵌套了可聚焦或交互的<{inner}>元素，辅助技术可能无法识别或操作内部的控件",
+            "fix": ["将内部的控件移到<{tag}>元素之外", "或移除内部元素的交互角色和tabindex"],
+            "suggestions": [
+                "将内部的控件移到<{tag}>元素之外",
+                "或移除内部元素的交互角色和tabindex",
+                "每个交互控件只应包含文本和图像等非交互内容",
+            ],
+        },
+    },
+    "en": {
+        "focus-order.positive-tabindex": {
+            "message": "Element uses a positive tabindex=\"{tabindex}\" and receives focus before the rest of the page, breaking the focus order",
+            "fix": ["Change tabindex to 0 and control the focus order through the element's position in the source"],
+            "examples": [{"code": "{html}", "set": {"tabindex": "0"}}],
+            "suggestions": [
+                "Change tabindex to 0 and control the focus order through the element's position in the source",
+                "Make sure the focus order matches the visual and reading order",
+            ],
+        },
+        "focusable-hidden.aria-hidden": {
+            "message": "Focusable element is inside aria-hidden=\"true\" content: keyboard users can reach it but assistive technology cannot identify it",
+            "fix": ["Add tabindex=\"-1\" to take the element out of the tab order", "Or remove aria-hidden=\"true\""],
+            "examples": [
+                {
+                    "code": "{html}",
+                    "description": "Take the element out of the tab order",
+                    "set": {"tabindex": "-1"},
+                },
+            ],
+        },
+        "keyboard-click.not-focusable": {
+            "message": "<{tag}> element has a click handler but cannot be focused or operated with the keyboard",
+            "fix": ["Use a <button> element instead", "Or add tabindex=\"0\", a suitable role, and handle the Enter and Space keys"],
+            "examples": [
+                {"code": '<button type="button" onclick="{attrs[onclick]}">{inner}</button>', "description": "Use a <button> element"},
+                {
+                    "code": "{html}",
+                    "description": "Add role and tabindex",
+                    "set": {"role": "button", "tabindex": "0"},
+                },
+            ],
+        },
+        "keyboard-click.no-role": {
+            "message": "<{tag}> element has a click handler but no widget role, so assistive technology cannot tell what it does",
+            "fix": ["Use a <button> element instead", "Or add a suitable role attribute (such as role=\"button\")"],
+            "examples": [{"code": "{html}", "set": {"role": "button"}}],
+        },
+        "nested-interactive.focusable-descendant": {
+            "message": "Interactive control <{tag}> contains a focusable or interactive <{inner}> element that assistive technology may not announce or operate",
+            "fix": ["Move the inner control out of the <{tag}> element", "Or remove the inner element's widget role and tabindex"],
+            "suggestions": [
+                "Move the inner control out of the <{tag}> element",
+                "Or remove the inner element's widget role and tabindex",
+                "Interactive controls should contain only non-interactive content such as text and images",
+            ],
+        },
+    },
+}
+
+catalogue.update(MESSAGES)
+
+# 检查点击事件处理的非语义元素
+CLICKABLE_TAGS = {'div', 'span'}
+
+
+@RuleRegistry.register
+class FocusOrderRule(Rule):
+    """焦点顺序必须保持意义和可操作性"""
+    
+    def __init__(self):
+        super().__init__()
+        self.id = "focus-order"
+        self.name = "焦点顺序必须保持意义和可操作性"
+        self.wcag_criterion = "2.4.3"
+        self.level = "A"
+        self.description = "不应使用正数tabindex，焦点顺序应与内容的意义和阅读顺序一致"
+        self.required_attrs = {"tabindex"}
+    
+    def iter_issues(self, document):
+        from ...core.validator import Issue
+        from ...core.index import DocumentIndex
+        
+        focus = DocumentIndex.for_document(document).focus
+        
+        # 正数tabindex的元素已按其实际获得焦点的顺序排列
+        for element in focus.positive:
+            yield Issue(
+                rule=self,
+                element=element,
+                code="focus-order.positive-tabindex",
+                params={"tabindex": focus.tabindex(element)}
+            )
+
+
+@RuleRegistry.register
+class FocusableHiddenRule(Rule):
+    """对辅助技术隐藏的内容不能获得焦点"""
+    
+    def __init__(self):
+        super().__init__()
+        self.id = "focusable-hidden"
+        self.name = "对辅助技术隐藏的内容不能获得焦点"
+        self.wcag_criterion = "4.1.2"
+        self.level = "A"
+        self.description = "aria-hidden=\"true\"的内容中不能有Tab键可以到达的元素，否则焦点会落在辅助技术无法识别的元素上"
+        self.required_attrs = {"aria-hidden"}
+    
+    def iter_issues(self, document):
+        from ...core.validator import Issue
+        from ...core.index import DocumentIndex
+        
+        index = DocumentIndex.for_document(document)
+        focus = index.focus
+        
+        # aria-usage规则已报告包含交互控件的aria-hidden="true"容器，这里只报告其他仍在Tab顺序中
+        # 的元素，如自身带有aria-hidden="true"的链接、不含交互控件的隐藏容器中tabindex="0"的div
+        for element in focus.focusable:
+            if not focus.is_tabbable(element):
+                continue
+            # 最外层的隐藏容器（包括元素自身）；内层容器包含交互控件时外层容器也包含
+            outermost = element if element.get('aria-hidden') == 'true' else None
+            hidden_root = index.context(element).hidden_root
+            while hidden_root is not None:
+                outermost = hidden_root
+                hidden_root = index.context(hidden_root).hidden_root
+            if outermost is not None and not index.hides_interactive(outermost):
+                yield Issue(rule=self, element=element, code="focusable-hidden.aria-hidden")
+
+
+@RuleRegistry.register
+class ClickHandlerKeyboardRule(Rule):
+    """通过点击操作的功能必须可以通过键盘操作"""
+    
+    def __init__(self):
+        super().__init__()
+        self.id = "keyboard-click"
+        self.name = "通过点击操作的功能必须可以通过键盘操作"
+        self.wcag_criterion = "2.1.1"
+        self.level = "A"
+        self.description = "带有点击事件处理的div和span元素必须可以通过键盘聚焦，并具有控件角色"
+        self.required_attrs = {"onclick"}
+    
+    def iter_issues(self, document):
+        from ...core.validator import Issue
+        from ...core.focus import WIDGET_ROLES
+        from ...core.index import DocumentIndex
+        
+        index = DocumentIndex.for_document(document)
+        focus = index.focus
+        
+        for element in index.elements_with_attr('onclick'):
+            if element.name not in CLICKABLE_TAGS:
+                continue
+            if not focus.is_focusable(element):
+                yield Issue(rule=self, element=element, code="keyboard-click.not-focusable")
+            elif element.get('role', '').strip().lower() not in WIDGET_ROLES:
+                yield Issue(rule=self, element=element, code="keyboard-click.no-role")
+
+
+@RuleRegistry.register
+class NestedInteractiveRule(Rule):
+    """交互控件中不能嵌套其他可聚焦的控件"""
+    
+    def __init__(self):
+        super().__init__()
+        self.id = "nested-interactive"
+        self.name = "交互控件中不能嵌套其他可聚焦的控件"
+        self.wcag_criterion = "4.1.2"
+        self.level = "A"
+        self.description = "链接、按钮等交互控件中不能包含其他可聚焦或交互的元素，否则辅助技术无法正确识别控件的名称和角色"
+        self.required_tags = {"a", "button"}
+        self.required_attrs = {"role"}
+    
+    def iter_issues(self, document):
+        from ...core.validator import Issue
+        from ...core.index import DocumentIndex
+        
+        focus = DocumentIndex.for_document(document).focus
+        
+        # 每个交互控件只报告一次，指出其中第一个嵌套的元素
+        for control, inner in focus.nested:
+            yield Issue(
+                rule=self,
+                element=control,
+                code="nested-interactive.focusable-descendant",
+                params={"inner": inner.name}
+            )
@@ -0,0 +1,330 @@
+"""
+颜色对比度规则模块，实现WCAG 1.4.3和1.4.6文本对比度检查
+"""
+import re
+
+from bs4 import NavigableString
+from bs4.element import PreformattedString
+
+from ...core.messages import catalogue
+from ...rules.base import Rule, RuleRegistry
+from ...utils.color import (
+    BLACK, WHITE, blend, contrast_ratios, pack, parse_color, suggest_color, to_hex, unpack
+)
+
+# 不显示文本或文本颜色不由CSS决定的元素
+NON_TEXT_TAGS = {
+    'head', 'title', 'meta', 'link', 'script', 'style', 'noscript', 'template',
+    'svg', 'math', 'canvas', 'iframe', 'object', 'video', 'audio', 'select', 'option',
+}
+
+_BACKGROUND_IMAGE_RE = re.compile(r'url\(|gradient\(')
+
+# 问题代码 -> 消息（格式与声明式规则的spec相同）
+MESSAGES = {
+    "zh-CN": {
+        "color-contrast.insufficient": {
+            "message": "文本对比度不足: {ratio:.2f}:1（要求至少{required:g}:1）",
+            "fix": [
+                "将文本颜色{foreground}调整为{suggested}或对比度更高的颜色",
+                "或调整背景色{background}，使对比度至少达到{required:g}:1",
+            ],
+            "examples": [
+                {
+                    "code": '<{tag} style="color: {suggested}; background-color: {background}">...</{tag}>',
+                    "description": "满足对比度要求的颜色示例",
+                },
+            ],
+            "suggestions": [
+                "加深文本颜色或减淡背景色（浅色文本则相反），提高两者的对比度",
+                "该文本的对比度至少需要达到{required:g}:1",
+            ],
+        },
+    },
+    "en": {
+        "color-contrast.insufficient": {
+            "message": "Insufficient text contrast: {ratio:.2f}:1 (at least {required:g}:1 required)",
+            "fix": [
+                "Change the text color {foreground} to {suggested} or a color with higher contrast",
+                "Or change the background color {background} so the contrast reaches at least {required:g}:1",
+            ],
+            "examples": [
+                {
+                    "code": '<{tag} style="color: {suggested}; background-color: {background}">...</{tag}>',
+                    "description": "Colors that meet the contrast requirement",
+                },
+            ],
+            "suggestions": [
+                "Darken the text or lighten the background (or the reverse for light text) to increase contrast",
+                "This text needs a contrast ratio of at least {required:g}:1",
+            ],
+        },
+    },
+}
+
+catalogue.update(MESSAGES)
+
+
+class TextStyle:
+    """元素的文本样式（对比度检查需要的部分）"""
+    
+    __slots__ = ('color', 'backdrop', 'font_size', 'bold', 'displayed', 'visible')
+    
+    def __init__(self, color=BLACK, backdrop=WHITE, font_size=16.0, bold=False, displayed=True, visible=True):
+        self.color = color  # 前景色，可能半透明
+        self.backdrop = backdrop  # 元素背后的不透明背景色，为None表示背景无法确定（如背景图片）
+        self.font_size = font_size  # 字号（像素）
+        self.bold = bold  # 是否加粗
+        self.displayed = displayed  # 元素及其祖先都没有display: none
+        self.visible = visible  # 是否显示（还考虑继承的visibility）
+    
+    @property
+    def large(self):
+        """是否为大号文本：至少18pt（24px），或至少14pt（约18.66px）且加粗"""
+        return self.font_size >= 24 or (self.bold and self.font_size >= 18.66)
+
+
+ROOT_STYLE = TextStyle()
+
+
+class TextStyleResolver:
+    """
+    基于样式引擎计算元素的文本样式
+    
+    颜色、字号、字重和visibility取自计算样式；背景色不继承，由祖先链上的背景逐层合成。
+    与计算样式一样按需计算，祖先链上已计算的结果会被复用。
+    """
+    
+    def __init__(self, engine):
+        """
+        参数:
+            engine: 文档的StyleEngine对象
+        """
+        self.engine = engine
+        self._styles = {}  # 元素id -> TextStyle
+    
+    def style(self, element):
+        """获取元素的文本样式"""
+        styles = self._styles
+        style = styles.get(id(element))
+        if style is not None:
+            return style
+        
+        chain = []
+        node = element
+        while node is not None and getattr(node, 'name', '[document]') != '[document]':
+            style = styles.get(id(node))
+            if style is not None:
+                break
+            chain.append(node)
+            node = node.parent
+        parent = style or ROOT_STYLE
+        
+        for node in reversed(chain):
+            parent = styles[id(node)] = self._derive(parent, node)
+        return parent
+    
+    def _derive(self, parent, element):
+        engine = self.engine
+        declared = engine.declarations(element)
+        computed = engine.computed(element)
+        
+        displayed = parent.displayed and declared.get('display', '').lower() != 'none'
+        visible = displayed and computed.get('visibility', 'visible').lower() not in ('hidden', 'collapse')
+        
+        color = parent.color
+        value = computed.get('color')
+        if value:
+            color = parse_color(value) or color
+        
+        backdrop = _derive_backdrop(parent.backdrop, declared) if declared else parent.backdrop
+        bold = _is_bold(computed.get('font-weight', 'normal'))
+        return TextStyle(color, backdrop, computed.font_size, bold, displayed, visible)
+
+
+def _derive_backdrop(backdrop, declarations):
+    """根据background和background-color声明计算元素背后的背景色"""
+    background = declarations.get('background')
+    if background is not None and _BACKGROUND_IMAGE_RE.search(background.lower()):
+        return None
+    if declarations.get('background-image', 'none').lower() not in ('none', ''):
+        return None
+    
+    value = declarations.get('background-color')
+    if value is None and background is not None:
+        # background简写中取第一个可识别的颜色
+        for token in re.split(r'\s+(?![^(]*\))', background):
+            if parse_color(token) is not None:
+                value = token
+                break
+    if value is None:
+        return backdrop
+    
+    parsed = parse_color(value)
+    if parsed is None:
+        return backdrop
+    if parsed[3] >= 1:
+        return parsed
+    if backdrop is None:
+        return None
+    return blend(parsed, backdrop)
+
+
+def _is_bold(weight):
+    weight = weight.strip().lower()
+    if weight in ('bold', 'bolder'):
+        return True
+    try:
+        return int(weight) >= 700
+    except ValueError:
+        return False
+
+
+def _has_text(element):
+    """元素是否直接包含非空白文本"""
+    for child in element.contents:
+        if isinstance(child, NavigableString) and not isinstance(child, PreformattedString) and child.strip():
+            return True
+    return False
+
+
+class ContrastSamples:
+    """
+    文档中所有可见文本元素的前景色、背景色和对比度
+    
+    所有颜色对的相对亮度和对比度在一次批量运算中计算（安装了NumPy时向量化），
+    AA和AAA两个对比度规则共享同一份结果。
+    """
+    
+    def __init__(self, index, resolver):
+        """
+        参数:
+            index: 文档的DocumentIndex对象
+            resolver: 提供style(element)方法的样式解析器
+        """
+        self.elements = []
+        self.foregrounds = []  # pack()打包的不透明前景色
+        self.backgrounds = []  # pack()打包的不透明背景色
+        self.large = []
+        pairs = {}  # (前景色, 背景色) -> 打包后的不透明颜色对，页面中的颜色组合通常很少
+        
+        for element in index.elements:
+            if element.name in NON_TEXT_TAGS or element.has_attr('disabled') or not _has_text(element):
+                continue
+            style = resolver.style(element)
+            if not style.visible or style.backdrop is None:
+                continue
+            key = (style.color, style.backdrop)
+            pair = pairs.get(key)
+            if pair is None:
+                pair = pairs[key] = (pack(blend(style.color, style.backdrop)), pack(style.backdrop))
+            self.elements.append(element)
+            self.foregrounds.append(pair[0])
+            self.backgrounds.append(pair[1])
+            self.large.append(style.large)
+        
+        self.ratios = contrast_ratios(self.foregrounds, self.backgrounds)
+    
+    @classmethod
+    def for_document(cls, document):
+        """
+        获取文档的对比度数据，每个文档只计算一次
+        
+        参数:
+            document: BeautifulSoup文档对象
+        
+        返回:
+            ContrastSamples对象
+        """
+        from ...core.index import DocumentIndex
+        from ...core.styles import StyleEngine
+        
+        samples = document.__dict__.get('_wcag_contrast')
+        if samples is None:
+            index = DocumentIndex.for_document(document)
+            if index.meter is not None:
+                # 样式计算遍历文档中的每个元素
+                index.meter.add(len(index.elements))
+            samples = cls(index, TextStyleResolver(StyleEngine.for_document(document)))
+            document._wcag_contrast = samples
+        return samples
+    
+    def failures(self, normal, large):
+        """
+        产生对比度低于要求的文本元素
+        
+        参数:
+            normal: 普通文本要求的最低对比度
+            large: 大号文本要求的最低对比度
+        
+        返回:
+            (元素, 前景色, 背景色, 对比度, 要求的对比度)迭代器
+        """
+        for i, ratio in enumerate(self.ratios):
+            required = large if self.large[i] else normal
+            if ratio < required:
+                yield self.elements[i], unpack(self.foregrounds[i]), unpack(self.backgrounds[i]), ratio, required
+
+
+class _ContrastRule(Rule):
+    """文本对比度规则的公共实现"""
+    
+    normal_ratio = 4.5  # 普通文本要求的最低对比度
+    large_ratio = 3.0  # 大号文本要求的最低对比度
+    
+    def __init__(self):
+        super().__init__()
+        # 文档中没有任何样式时所有文本都是默认的白底黑字
+        self.required_tags = {"style", "link"}
+        self.required_attrs = {"style"}
+    
+    def iter_issues(self, document):
+        from ...core.validator import Issue
+        
+        samples = ContrastSamples.for_document(document)
+        for element, foreground, background, ratio, required in samples.failures(self.normal_ratio, self.large_ratio):
+            yield Issue(
+                rule=self,
+                element=element,
+                code="color-contrast.insufficient",
+                params={
+                    # 向下取整，避免显示的对比度看起来已达到要求
+                    "ratio": int(ratio * 100) / 100,
+                    "required": required,
+                    "foreground": to_hex(foreground),
+                    "background": to_hex(background),
+                    "suggested": to_hex(suggest_color(foreground, background, required)),
+                }
+            )
+
+
+@RuleRegistry.register
+class ColorContrastRule(_ContrastRule):
+    """文本对比度必须达到最低要求"""
+    
+    normal_ratio = 4.5
+    large_ratio = 3.0
+    
+    def __init__(self):
+        super().__init__()
+        self.id = "color-contrast"
+        self.name = "文本对比度必须达到最低要求"
+        self.wcag_criterion = "1.4.3"
+        self.level = "AA"
+        self.description = "普通文本与背景的对比度至少为4.5:1，大号文本至少为3:1"
+
+
+@RuleRegistry.register
+class ColorContrastEnhancedRule(_ContrastRule):
+    """文本对比度应达到增强要求"""
+    
+    normal_ratio = 7.0
+    large_ratio = 4.5
+    
+    def __init__(self):
+        super().__init__()
+        self.id = "color-contrast-enhanced"
+        self.name = "文本对比度应达到增强要求"
+        self.wcag_criterion = "1.4.6"
+        self.level = "AAA"
+        self.description = "普通文本与背景的对比度至少为7:1，大号文本至少为4.5:1"
@@ -1,9 +1,129 @@
 """
 图像无障碍规则模块，实现与图像相关的WCAG验证规则
 """
+from ...core.messages import catalogue
 from ...rules.base import Rule, RuleRegistry
+from ...rules.declarative import DeclarativeRule
 from bs4 import BeautifulSoup
 
+# 问题代码 -> 消息（格式与声明式规则的spec相同）
+MESSAGES = {
+    "zh-CN": {
+        "img-alt.missing": {
+            "message": "图像缺少alt属性",
+            "fix": ["添加描述性的alt属性，说明图像内容和目的"],
+            "examples": [
+                {"code": '<img src="{attrs[src]}" alt="[图像描述]">', "description": "添加描述性alt属性的示例"},
+            ],
+            "suggestions": [
+                "添加描述性的alt属性，说明图像内容和目的",
+                "如果图像是装饰性的，添加alt=\"\"和role=\"presentation\"属性",
+            ],
+        },
+        "img-alt.empty": {
+            "message": "图像的alt属性为空",
+            "fix": [
+                "如果图像是装饰性的，请添加role=\"presentation\"属性",
+                "如果图像包含信息，请添加描述性的alt属性",
+            ],
+            "examples": [
+                {"code": '<img src="{attrs[src]}" alt="[图像描述]">', "description": "信息性图像示例"},
+                {"code": '<img src="{attrs[src]}" alt="" role="presentation">', "description": "装饰性图像示例"},
+            ],
+        },
+        "img-alt.too-long": {
+            "message": "图像的alt属性过长（超过100个字符）",
+            "fix": [
+                "缩短alt属性，保持简洁但描述准确",
+                "如果需要更详细的描述，考虑使用longdesc属性或在图像附近提供描述",
+            ],
+            "examples": [
+                {"code": '<img src="{attrs[src]}" alt="[简短描述]">', "description": "简短alt属性示例"},
+            ],
+        },
+        "svg-accessibility.missing-name": {
+            "message": "SVG图像缺少无障碍名称",
+            "fix": [
+                "添加<title>元素描述SVG内容",
+                "添加aria-label属性描述SVG内容",
+            ],
+            "examples": [
+                {
+                    "code": '<svg width="{width}" height="{height}">\n  <title>SVG图像描述</title>\n  <!-- SVG内容 -->\n</svg>',
+                    "description": "使用title元素的示例",
+                },
+                {
+                    "code": '<svg width="{width}" height="{height}" aria-label="SVG图像描述">\n  <!-- SVG内容 -->\n</svg>',
+                    "description": "使用aria-label的示例",
+                },
+            ],
+            "suggestions": [
+                "添加<title>元素描述SVG内容",
+                "添加aria-label属性描述SVG内容",
+                "如果SVG是装饰性的，添加role=\"presentation\"和aria-hidden=\"true\"属性",
+            ],
+        },
+    },
+    "en": {
+        "img-alt.missing": {
+            "message": "Image is missing an alt attribute",
+            "fix": ["Add a descriptive alt attribute that conveys the image's content and purpose"],
+            "examples": [
+                {"code": '<img src="{attrs[src]}" alt="[image description]">', "description": "Descriptive alt attribute"},
+            ],
+            "suggestions": [
+                "Add a descriptive alt attribute that conveys the image's content and purpose",
+                "If the image is decorative, add alt=\"\" and role=\"presentation\"",
+            ],
+        },
+        "img-alt.empty": {
+            "message": "Image has an empty alt attribute",
+            "fix": [
+                "If the image is decorative, add role=\"presentation\"",
+                "If the image conveys information, add a descriptive alt attribute",
+            ],
+            "examples": [
+                {"code": '<img src="{attrs[src]}" alt="[image description]">', "description": "Informative image"},
+                {"code": '<img src="{attrs[src]}" alt="" role="presentation">', "description": "Decorative image"},
+            ],
+        },
+        "img-alt.too-long": {
+            "message": "Image alt attribute is too long (more than 100 characters)",
+            "fix": [
+                "Shorten the alt attribute while keeping it accurate",
+                "For a longer description, use longdesc or describe the image in nearby text",
+            ],
+            "examples": [
+                {"code": '<img src="{attrs[src]}" alt="[short description]">', "description": "Short alt attribute"},
+            ],
+        },
+        "svg-accessibility.missing-name": {
+            "message": "SVG image has no accessible name",
+            "fix": [
+                "Add a <title> element describing the SVG",
+                "Add an aria-label attribute describing the SVG",
+            ],
+            "examples": [
+                {
+                    "code": '<svg width="{width}" height="{height}">\n  <title>SVG description</title>\n  <!-- SVG content -->\n</svg>',
+                    "description": "Using a title element",
+                },
+                {
+                    "code": '<svg width="{width}" height="{height}" aria-label="SVG description">\n  <!-- SVG content -->\n</svg>',
+                    "description": "Using aria-label",
+                },
+            ],
+            "suggestions": [
+                "Add a <title> element describing the SVG",
+                "Add an aria-label attribute describing the SVG",
+                "If the SVG is decorative, add role=\"presentation\" and aria-hidden=\"true\"",
+            ],
+        },
+    },
+}
+
+catalogue.update(MESSAGES)
+
 @RuleRegistry.register
 class ImageAltRule(Rule):
     """图像必须有alt属性"""
@@ -15,12 +135,15 @@ class ImageAltRule(Rule):
         self.wcag_criterion = "1.1.1"
         self.level = "A"
         self.description = "所有非装饰性图像必须有描述性的alt属性"
+        self.required_tags = {"img"}
     
-    def validate(self, document):
+    def iter_issues(self, document):
         from ...core.validator import Issue
+        from ...core.index import DocumentIndex
+        
+        index = DocumentIndex.for_document(document)
         
-        issues = []
-        for img in document.find_all("img"):
+        for img in index.elements_by_tag("img"):
             # 检查是否为装饰性图像
             is_decorative = (
                 (img.has_attr("role") and img["role"] == "presentation") or
@@ -30,126 +153,64 @@ class ImageAltRule(Rule):
             # 检查alt属性
             if not is_decorative:
                 if not img.has_attr("alt"):
+                    if index.names.name(img):
+                        continue  # 已通过aria-labelledby、aria-label或title获得无障碍名称
+                    
                     # 缺少alt属性
-                    issue = Issue(
-                        rule=self,
-                        element=img,
-                        description="图像缺少alt属性"
-                    )
-                    issue.add_fix_suggestion(
-                        "添加描述性的alt属性，说明图像内容和目的"
-                    )
-                    issue.add_code_example(
-                        f'<img src="{img.get("src", "")}" alt="[图像描述]">',
-                        "添加描述性alt属性的示例"
-                    )
-                    issues.append(issue)
+                    yield Issue(rule=self, element=img, code="img-alt.missing")
                 elif img["alt"].strip() == "":
                     # alt属性为空
-                    issue = Issue(
-                        rule=self,
-                        element=img,
-                        description="图像的alt属性为空"
-                    )
-                    issue.add_fix_suggestion(
-                        "如果图像是装饰性的，请添加role=\"presentation\"属性"
-                    )
-                    issue.add_fix_suggestion(
-                        "如果图像包含信息，请添加描述性的alt属性"
-                    )
-                    issue.add_code_example(
-                        f'<img src="{img.get("src", "")}" alt="[图像描述]">',
-                        "信息性图像示例"
-                    )
-                    issue.add_code_example(
-                        f'<img src="{img.get("src", "")}" alt="" role="presentation">',
-                        "装饰性图像示例"
-                    )
-                    issues.append(issue)
+                    yield Issue(rule=self, element=img, code="img-alt.empty")
                 elif len(img["alt"]) > 100:
                     # alt属性过长
-                    issue = Issue(
-                        rule=self,
-                        element=img,
-                        description="图像的alt属性过长（超过100个字符）"
-                    )
-                    issue.add_fix_suggestion(
-                        "缩短alt属性，保持简洁但描述准确"
-                    )
-                    issue.add_fix_suggestion(
-                        "如果需要更详细的描述，考虑使用longdesc属性或在图像附近提供描述"
-                    )
-                    issue.add_code_example(
-                        f'<img src="{img.get("src", "")}" alt="[简短描述]">',
-                        "简短alt属性示例"
-                    )
-                    issues.append(issue)
-        
-        return issues
-    
-    def get_fix_suggestions(self, issue):
-        """获取修复建议"""
-        if "缺少alt属性" in issue.description:
-            return [
-                "添加描述性的alt属性，说明图像内容和目的",
-                "如果图像是装饰性的，添加alt=\"\"和role=\"presentation\"属性"
-            ]
-        elif "alt属性为空" in issue.description:
-            return [
-                "如果图像是装饰性的，请添加role=\"presentation\"属性",
-                "如果图像包含信息，请添加描述性的alt属性"
-            ]
-        elif "alt属性过长" in issue.description:
-            return [
-                "缩短alt属性，保持简洁但描述准确",
-                "如果需要更详细的描述，考虑使用longdesc属性或在图像附近提供描述"
-            ]
-        
-        return []
+                    yield Issue(rule=self, element=img, code="img-alt.too-long")
 
 
 @RuleRegistry.register
-class ImageInputAltRule(Rule):
+class ImageInputAltRule(DeclarativeRule):
     """图像按钮必须有alt属性"""
     
-    def __init__(self):
-        super().__init__()
-        self.id = "img-input-alt"
-        self.name = "图像按钮必须有alt属性"
-        self.wcag_criterion = "1.1.1"
-        self.level = "A"
-        self.description = "所有图像按钮必须有描述其功能的alt属性"
-    
-    def validate(self, document):
-        from ...core.validator import Issue
-        
-        issues = []
-        for input_elem in document.find_all("input"):
-            if input_elem.has_attr("type") and input_elem["type"] == "image":
-                if not input_elem.has_attr("alt") or input_elem["alt"].strip() == "":
-                    issue = Issue(
-                        rule=self,
-                        element=input_elem,
-                        description="图像按钮缺少alt属性"
-                    )
-                    issue.add_fix_suggestion(
-                        "添加描述按钮功能的alt属性"
-                    )
-                    issue.add_code_example(
-                        f'<input type="image" src="{input_elem.get("src", "")}" alt="[按钮功能描述]">',
-                        "添加描述性alt属性的示例"
-                    )
-                    issues.append(issue)
-        
-        return issues
-    
-    def get_fix_suggestions(self, issue):
-        """获取修复建议"""
-        return [
+    # 无障碍名称依次来自aria-labelledby、aria-label、alt和title
+    spec = {
+        "id": "img-input-alt",
+        "name": "图像按钮必须有alt属性",
+        "wcag_criterion": "1.1.1",
+        "level": "A",
+        "description": "所有图像按钮必须有描述其功能的alt属性",
+        "selector": {
+            "tag": "input",
+            "attrs": {"type": "image"},
+            "accessible_name": "blank",
+        },
+        "message": "图像按钮缺少alt属性",
+        "fix": ["添加描述按钮功能的alt属性"],
+        "examples": [
+            {
+                "code": '<input type="image" src="{attrs[src]}" alt="[按钮功能描述]">',
+                "description": "添加描述性alt属性的示例",
+            },
+        ],
+        "suggestions": [
             "添加描述按钮功能的alt属性",
-            "确保alt属性描述的是按钮的功能，而不仅仅是图像内容"
-        ]
-
+            "确保alt属性描述的是按钮的功能，而不仅仅是图像内容",
+        ],
+        "translations": {
+            "en": {
+                "message": "Image button is missing an alt attribute",
+                "fix": ["Add an alt attribute describing what the button does"],
+                "examples": [
+                    {
+                        "code": '<input type="image" src="{attrs[src]}" alt="[button action]">',
+                        "description": "Descriptive alt attribute",
+                    },
+                ],
+                "suggestions": [
+                    "Add an alt attribute describing what the button does",
+                    "Make sure the alt text describes the button's action, not just the image",
+                ],
+            },
+        },
+    }
 
 @RuleRegistry.register
 class SVGAccessibilityRule(Rule):
@@ -162,12 +223,15 @@ class SVGAccessibilityRule(Rule):
         self.wcag_criterion = "1.1.1"
         self.level = "A"
         self.description = "SVG图像必须包含title元素或aria-label属性"
+        self.required_tags = {"svg"}
     
-    def validate(self, document):
+    def iter_issues(self, document):
         from ...core.validator import Issue
+        from ...core.index import DocumentIndex
+        
+        index = DocumentIndex.for_document(document)
         
-        issues = []
-        for svg in document.find_all("svg"):
+        for svg in index.elements_by_tag("svg"):
             # 检查是否为装饰性SVG
             is_decorative = (
                 (svg.has_attr("role") and svg["role"] == "presentation") or
@@ -175,38 +239,11 @@ class SVGAccessibilityRule(Rule):
             )
             
             if not is_decorative:
-                has_title = svg.find("title") is not None
-                has_aria_label = svg.has_attr("aria-label") and svg["aria-label"].strip() != ""
-                has_aria_labelledby = svg.has_attr("aria-labelledby") and svg["aria-labelledby"].strip() != ""
-                
-                if not (has_title or has_aria_label or has_aria_labelledby):
-                    issue = Issue(
+                # 无障碍名称依次来自aria-labelledby、aria-label、title子元素和title属性
+                if not index.names.name(svg):
+                    yield Issue(
                         rule=self,
                         element=svg,
-                        description="SVG图像缺少无障碍名称"
+                        code="svg-accessibility.missing-name",
+                        params={"width": svg.get("width", "100"), "height": svg.get("height", "100")}
                     )
-                    issue.add_fix_suggestion(
-                        "添加<title>元素描述SVG内容"
-                    )
-                    issue.add_fix_suggestion(
-                        "添加aria-label属性描述SVG内容"
-                    )
-                    issue.add_code_example(
-                        f'<svg width="{svg.get("width", "100")}" height="{svg.get("height", "100")}">\n  <title>SVG图像描述</title>\n  <!-- SVG内容 -->\n</svg>',
-                        "使用title元素的示例"
-                    )
-                    issue.add_code_example(
-                        f'<svg width="{svg.get("width", "100")}" height="{svg.get("height", "100")}" aria-label="SVG图像描述">\n  <!-- SVG内容 -->\n</svg>',
-                        "使用aria-label的示例"
-                    )
-                    issues.append(issue)
-        
-        return issues
-    
-    def get_fix_suggestions(self, issue):
-        """获取修复建议"""
-        return [
-            "添加<title>元素描述SVG内容",
-            "添加aria-label属性描述SVG内容",
-            "如果SVG是装饰性的，添加role=\"presentation\"和aria-hidden=\"true\"属性"
-        ]
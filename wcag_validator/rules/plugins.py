@@ -0,0 +1,167 @@
+"""
+规则包插件模块，通过入口点发现第三方规则包，规则包在其级别、标准或规则ID被选中时才导入
+"""
+import importlib
+import inspect
+import logging
+
+from .base import Rule, RuleRegistry, _LEVEL_ORDER
+
+try:
+    from importlib.metadata import entry_points
+except ImportError:  # Python 3.8以下没有importlib.metadata，需要安装importlib_metadata
+    try:
+        from importlib_metadata import entry_points
+    except ImportError:
+        entry_points = None
+
+# 规则包的入口点组
+ENTRY_POINT_GROUP = "wcag_validator.rules"
+
+logger = logging.getLogger(__name__)
+
+_packs = None  # 已发现的规则包
+
+
+class RulePack:
+    """
+    规则包
+    
+    规则包声明其包含的WCAG级别、标准和规则ID，规则模块只在被选中时导入。第三方包在
+    入口点组wcag_validator.rules中指向一个RulePack对象（所在模块应只包含这一声明）：
+        
+        # pyproject.toml
+        [project.entry-points."wcag_validator.rules"]
+        acme = "acme_wcag:PACK"
+        
+        # acme_wcag/__init__.py
+        PACK = RulePack("acme", modules=["acme_wcag.rules"], levels=["AA"], criteria=["2.4.6"])
+    
+    规则模块中用@RuleRegistry.register注册的规则不会进入默认注册表，而是由加载该
+    规则包的注册表实例化。入口点也可以直接指向规则模块或规则类，此时规则包在发现时
+    即被导入，并在任何级别下都被加载。
+    """
+    
+    def __init__(self, name, modules=(), levels=None, criteria=None, rule_ids=None, rules=()):
+        """
+        参数:
+            name: 规则包名称
+            modules: 规则模块路径列表，加载时依次导入
+            levels: 规则包包含的WCAG级别，None表示未声明（任何级别下都加载）
+            criteria: 规则包包含的WCAG标准，None表示未声明
+            rule_ids: 规则包包含的规则ID，None表示未声明
+            rules: 直接提供的规则类列表
+        """
+        self.name = name
+        self.modules = [modules] if isinstance(modules, str) else list(modules)
+        self.levels = {level.upper() for level in levels} if levels else None
+        self.criteria = set(criteria) if criteria else None
+        self.rule_ids = set(rule_ids) if rule_ids else None
+        self._rules = list(rules)
+        self._loaded = not self.modules
+    
+    def __repr__(self):
+        return f"RulePack({self.name!r})"
+    
+    def matches(self, level=None, criteria=None, rule_ids=None):
+        """
+        判断规则包是否可能包含所选的规则，未声明的条件视为匹配
+        
+        参数:
+            level: 验证级别，规则包包含该级别或更低级别的规则时匹配
+            criteria: 所选的WCAG标准
+            rule_ids: 所选的规则ID
+        
+        返回:
+            布尔值
+        """
+        if level is not None and self.levels is not None:
+            target = _LEVEL_ORDER.get(level.upper(), 3)
+            if not any(_LEVEL_ORDER.get(item, 0) <= target for item in self.levels):
+                return False
+        if criteria and self.criteria is not None and not self.criteria.intersection(criteria):
+            return False
+        if rule_ids and self.rule_ids is not None and not self.rule_ids.intersection(rule_ids):
+            return False
+        return True
+    
+    def load(self):
+        """
+        导入规则模块（每个进程只导入一次）
+        
+        返回:
+            规则类列表，规则模块无法导入时记录警告并返回空列表
+        """
+        if not self._loaded:
+            try:
+                rules, _ = _capture(lambda: [importlib.import_module(module) for module in self.modules])
+            except Exception as e:
+                logger.warning("无法导入规则包%s的规则模块，已跳过: %s", self.name, e)
+                rules = []
+            self._rules.extend(rules)
+            self._loaded = True
+        return list(self._rules)
+
+
+def discover_packs(refresh=False):
+    """
+    发现通过入口点安装的规则包，结果在进程内缓存
+    
+    参数:
+        refresh: 是否重新扫描入口点
+    
+    返回:
+        RulePack列表，无法加载的入口点记录警告后跳过
+    """
+    global _packs
+    if _packs is None or refresh:
+        packs = (_to_pack(entry_point) for entry_point in _iter_entry_points())
+        _packs = [pack for pack in packs if pack is not None]
+    return _packs
+
+
+def _iter_entry_points():
+    if entry_points is None:
+        return []
+    eps = entry_points()
+    if hasattr(eps, 'select'):
+        return list(eps.select(group=ENTRY_POINT_GROUP))
+    return list(eps.get(ENTRY_POINT_GROUP, []))  # Python 3.8/3.9的字典接口
+
+
+def _to_pack(entry_point):
+    """将入口点转换为RulePack，入口点无法加载时返回None"""
+    try:
+        rules, target = _capture(entry_point.load)
+    except Exception as e:
+        # 一个损坏的第三方规则包不应导致所有验证失败
+        logger.warning("无法加载规则包%s，已跳过: %s", entry_point.name, e)
+        return None
+    
+    if isinstance(target, RulePack):
+        if rules:
+            target._rules.extend(rules)
+        return target
+    
+    # 入口点直接指向规则模块、规则类或规则类列表
+    targets = target if isinstance(target, (list, tuple)) else [target]
+    for item in targets:
+        if inspect.isclass(item) and issubclass(item, Rule) and item not in rules:
+            rules.append(item)
+    return RulePack(entry_point.name, rules=rules)
+
+
+def _capture(load):
+    """
+    执行load，收集期间在默认注册表上注册的规则类
+    
+    返回:
+        (规则类列表, load的返回值)元组
+    """
+    previous = RuleRegistry._capture
+    RuleRegistry._capture = captured = []
+    try:
+        result = load()
+    finally:
+        RuleRegistry._capture = previous
+    return captured, result
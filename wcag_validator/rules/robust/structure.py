@@ -1,9 +1,105 @@
 """
 HTML结构和ARIA规则模块，实现与HTML结构和ARIA相关的WCAG验证规则
 """
+from ...core.messages import catalogue
 from ...rules.base import Rule, RuleRegistry
 from bs4 import BeautifulSoup
 
+# 问题代码 -> 消息（格式与声明式规则的spec相同）
+MESSAGES = {
+    "zh-CN": {
+        "html-parsing.duplicate-id": {
+            "message": "重复的id属性: '{id}'已在其他元素中使用",
+            "fix": ["修改id属性为唯一值"],
+            "examples": [{"code": '<{tag} id="unique-{id}" {attributes}>{end_tag}', "omit": ["id"]}],
+            "suggestions": ["修改id属性为唯一值", "确保页面中每个id都是唯一的"],
+        },
+        "aria-usage.hidden-interactive": {
+            "message": "aria-hidden=\"true\"的元素包含交互元素，这会使交互元素对辅助技术不可见",
+            "fix": ["移除aria-hidden=\"true\"属性", "或将交互元素移出aria-hidden=\"true\"的容器"],
+            "examples": [
+                {
+                    "code": "{html}",
+                    "description": "移除aria-hidden=\"true\"属性",
+                    "strip": ["aria-hidden"],
+                },
+            ],
+        },
+        "aria-usage.empty-label": {
+            "message": "元素的aria-label属性为空",
+            "fix": ["为aria-label添加描述性文本", "或移除空的aria-label属性"],
+            "examples": [{"code": '<{tag} {attributes} aria-label="描述性文本">{end_tag}', "omit": ["aria-label"]}],
+        },
+        "aria-usage.missing-labelledby-target": {
+            "message": "aria-labelledby引用的id '{id}'不存在",
+            "fix": ["确保id为'{id}'的元素存在", "或修改aria-labelledby属性引用正确的id"],
+            "examples": [{"code": '<div id="{id}">标签文本</div>', "description": "添加id为'{id}'的元素"}],
+        },
+        "link-purpose.no-text": {
+            "message": "链接没有描述性文本",
+            "fix": ["添加描述链接目的的文本", "或为链接添加aria-label属性"],
+            "examples": [
+                {"code": '<a href="{href}">描述性链接文本</a>', "description": "添加描述性链接文本"},
+                {"code": '<a href="{href}" aria-label="描述性链接文本">{inner}</a>', "description": "添加aria-label属性"},
+            ],
+        },
+        "link-purpose.generic-text": {
+            "message": "链接文本 '{name}' 不足以描述链接目的",
+            "fix": ["使用描述链接目的的文本替换通用文本"],
+            "examples": [{"code": '<a href="{href}">描述性链接文本</a>', "description": "使用描述性链接文本"}],
+            "suggestions": ["使用描述链接目的的文本替换通用文本", "确保链接文本能够独立理解，不依赖上下文"],
+        },
+    },
+    "en": {
+        "html-parsing.duplicate-id": {
+            "message": "Duplicate id attribute: '{id}' is already used by another element",
+            "fix": ["Change the id attribute to a unique value"],
+            "examples": [{"code": '<{tag} id="unique-{id}" {attributes}>{end_tag}', "omit": ["id"]}],
+            "suggestions": ["Change the id attribute to a unique value", "Make sure every id on the page is unique"],
+        },
+        "aria-usage.hidden-interactive": {
+            "message": "Element with aria-hidden=\"true\" contains interactive elements, hiding them from assistive technology",
+            "fix": ["Remove aria-hidden=\"true\"", "Or move the interactive elements out of the aria-hidden=\"true\" container"],
+            "examples": [
+                {
+                    "code": "{html}",
+                    "description": "Remove aria-hidden=\"true\"",
+                    "strip": ["aria-hidden"],
+                },
+            ],
+        },
+        "aria-usage.empty-label": {
+            "message": "Element has an empty aria-label attribute",
+            "fix": ["Add descriptive text to aria-label", "Or remove the empty aria-label attribute"],
+            "examples": [{"code": '<{tag} {attributes} aria-label="descriptive text">{end_tag}', "omit": ["aria-label"]}],
+        },
+        "aria-usage.missing-labelledby-target": {
+            "message": "id '{id}' referenced by aria-labelledby does not exist",
+            "fix": ["Make sure an element with id '{id}' exists", "Or point aria-labelledby at the correct id"],
+            "examples": [{"code": '<div id="{id}">Label text</div>', "description": "Add the element with id '{id}'"}],
+        },
+        "link-purpose.no-text": {
+            "message": "Link has no descriptive text",
+            "fix": ["Add text describing the link's purpose", "Or add an aria-label attribute to the link"],
+            "examples": [
+                {"code": '<a href="{href}">Descriptive link text</a>', "description": "Descriptive link text"},
+                {"code": '<a href="{href}" aria-label="Descriptive link text">{inner}</a>', "description": "Add aria-label"},
+            ],
+        },
+        "link-purpose.generic-text": {
+            "message": "Link text '{name}' does not describe the link's purpose",
+            "fix": ["Replace the generic text with text describing the link's purpose"],
+            "examples": [{"code": '<a href="{href}">Descriptive link text</a>', "description": "Descriptive link text"}],
+            "suggestions": [
+                "Replace the generic text with text describing the link's purpose",
+                "Make sure the link text makes sense on its own, without surrounding context",
+            ],
+        },
+    },
+}
+
+catalogue.update(MESSAGES)
+
 @RuleRegistry.register
 class HTMLParsingRule(Rule):
     """HTML必须可以正确解析"""
@@ -15,48 +111,22 @@ class HTMLParsingRule(Rule):
         self.wcag_criterion = "4.1.1"
         self.level = "A"
         self.description = "HTML必须有良好的格式，元素必须有完整的开始和结束标签，元素必须嵌套正确"
+        self.required_attrs = {"id"}
+        self.selectors = {"with_id": "[id]"}
     
-    def validate(self, document):
+    def iter_issues(self, document):
         from ...core.validator import Issue
         
-        issues = []
         # 由于BeautifulSoup会自动修复HTML，所以这里主要检查一些常见的问题
         
         # 检查是否有重复的id
         ids = {}
-        for element in document.find_all(attrs={"id": True}):
+        for element in self.select(document, "with_id"):
             element_id = element["id"]
             if element_id in ids:
-                issue = Issue(
-                    rule=self,
-                    element=element,
-                    description=f"重复的id属性: '{element_id}'已在其他元素中使用"
-                )
-                issue.add_fix_suggestion(f"修改id属性为唯一值")
-                
-                # 修复f-string语法
-                attrs_str = " ".join([f"{k}=\"{v}\"" for k, v in element.attrs.items() if k != "id"])
-                if element.name not in ['img', 'input', 'br', 'hr']:
-                    code_example = f'<{element.name} id="unique-{element_id}" {attrs_str}></{element.name}>'
-                else:
-                    code_example = f'<{element.name} id="unique-{element_id}" {attrs_str}>'
-                
-                issue.add_code_example(code_example)
-                issues.append(issue)
+                yield Issue(rule=self, element=element, code="html-parsing.duplicate-id", params={"id": element_id})
             else:
                 ids[element_id] = element
-        
-        return issues
-    
-    def get_fix_suggestions(self, issue):
-        """获取修复建议"""
-        if "重复的id属性" in issue.description:
-            return [
-                "修改id属性为唯一值",
-                "确保页面中每个id都是唯一的"
-            ]
-        
-        return []
 
 
 @RuleRegistry.register
@@ -70,96 +140,36 @@ class ARIARule(Rule):
         self.wcag_criterion = "4.1.2"
         self.level = "A"
         self.description = "ARIA属性必须正确使用，确保无障碍名称、角色和值可以被辅助技术识别"
+        self.required_attrs = {"aria-hidden", "aria-label", "aria-labelledby"}
+        self.selectors = {"aria_label": "[aria-label]"}
     
-    def validate(self, document):
+    def iter_issues(self, document):
         from ...core.validator import Issue
+        from ...core.index import DocumentIndex
         
-        issues = []
+        index = DocumentIndex.for_document(document)
         
         # 检查aria-hidden="true"的元素是否包含交互元素
-        for element in document.find_all(attrs={"aria-hidden": "true"}):
-            interactive_elements = element.find_all(['a', 'button', 'input', 'select', 'textarea'])
-            if interactive_elements:
-                issue = Issue(
-                    rule=self,
-                    element=element,
-                    description="aria-hidden=\"true\"的元素包含交互元素，这会使交互元素对辅助技术不可见"
-                )
-                issue.add_fix_suggestion("移除aria-hidden=\"true\"属性")
-                issue.add_fix_suggestion("或将交互元素移出aria-hidden=\"true\"的容器")
-                
-                # 生成修复示例
-                element_html = str(element)
-                fixed_html = element_html.replace('aria-hidden="true"', '')
-                issue.add_code_example(
-                    fixed_html,
-                    "移除aria-hidden=\"true\"属性"
-                )
-                issues.append(issue)
+        for element in index.elements_with_attr('aria-hidden'):
+            if element.get('aria-hidden') == 'true' and index.hides_interactive(element):
+                yield Issue(rule=self, element=element, code="aria-usage.hidden-interactive")
         
         # 检查aria-label为空的元素
-        for element in document.find_all(attrs={"aria-label": True}):
+        for element in self.select(document, "aria_label"):
             if not element["aria-label"].strip():
-                issue = Issue(
-                    rule=self,
-                    element=element,
-                    description="元素的aria-label属性为空"
-                )
-                issue.add_fix_suggestion("为aria-label添加描述性文本")
-                issue.add_fix_suggestion("或移除空的aria-label属性")
-                
-                # 生成修复示例 - 修复f-string语法
-                attrs_str = " ".join([f"{k}=\"{v}\"" for k, v in element.attrs.items() if k != "aria-label"])
-                if element.name not in ['img', 'input', 'br', 'hr']:
-                    code_example = f'<{element.name} {attrs_str} aria-label="描述性文本"></{element.name}>'
-                else:
-                    code_example = f'<{element.name} {attrs_str} aria-label="描述性文本">'
-                
-                issue.add_code_example(code_example)
-                issues.append(issue)
+                yield Issue(rule=self, element=element, code="aria-usage.empty-label")
         
         # 检查aria-labelledby引用的元素是否存在
-        for element in document.find_all(attrs={"aria-labelledby": True}):
+        for element in index.elements_with_attr('aria-labelledby'):
             referenced_ids = element["aria-labelledby"].split()
             for ref_id in referenced_ids:
-                if not document.find(id=ref_id):
-                    issue = Issue(
+                if index.element_by_id(ref_id) is None:
+                    yield Issue(
                         rule=self,
                         element=element,
-                        description=f"aria-labelledby引用的id '{ref_id}'不存在"
-                    )
-                    issue.add_fix_suggestion(f"确保id为'{ref_id}'的元素存在")
-                    issue.add_fix_suggestion("或修改aria-labelledby属性引用正确的id")
-                    
-                    # 生成修复示例
-                    issue.add_code_example(
-                        f'<div id="{ref_id}">标签文本</div>',
-                        f"添加id为'{ref_id}'的元素"
+                        code="aria-usage.missing-labelledby-target",
+                        params={"id": ref_id}
                     )
-                    issues.append(issue)
-        
-        return issues
-    
-    def get_fix_suggestions(self, issue):
-        """获取修复建议"""
-        if "aria-hidden=\"true\"的元素包含交互元素" in issue.description:
-            return [
-                "移除aria-hidden=\"true\"属性",
-                "或将交互元素移出aria-hidden=\"true\"的容器"
-            ]
-        elif "元素的aria-label属性为空" in issue.description:
-            return [
-                "为aria-label添加描述性文本",
-                "或移除空的aria-label属性"
-            ]
-        elif "aria-labelledby引用的id" in issue.description and "不存在" in issue.description:
-            ref_id = issue.description.split("'")[1]
-            return [
-                f"确保id为'{ref_id}'的元素存在",
-                "或修改aria-labelledby属性引用正确的id"
-            ]
-        
-        return []
 
 
 @RuleRegistry.register
@@ -173,81 +183,27 @@ class LinkPurposeRule(Rule):
         self.wcag_criterion = "2.4.4"
         self.level = "A"
         self.description = "链接文本必须描述其目的，使用户能够确定是否要跟随链接"
+        self.required_tags = {'a'}
     
-    def validate(self, document):
+    def iter_issues(self, document):
         from ...core.validator import Issue
+        from ...core.index import DocumentIndex
         
-        issues = []
+        index = DocumentIndex.for_document(document)
         
         # 检查所有链接
-        for link in document.find_all('a'):
-            # 获取链接文本
-            link_text = link.get_text().strip()
+        for link in index.elements_by_tag('a'):
+            # 获取链接的无障碍名称（aria-labelledby、aria-label、内容（含图像alt）、title）
+            link_text = index.names.name(link)
             
-            # 检查是否有文本内容
+            # 检查是否有描述
             if not link_text:
-                # 检查是否有图像并且图像有alt属性
-                img = link.find('img')
-                if img and img.has_attr('alt') and img['alt'].strip():
-                    continue  # 图像有alt属性，链接有描述
-                
-                # 检查是否有aria-label或title属性
-                if (link.has_attr('aria-label') and link['aria-label'].strip()) or \
-                   (link.has_attr('title') and link['title'].strip()):
-                    continue  # 有aria-label或title属性，链接有描述
-                
-                issue = Issue(
-                    rule=self,
-                    element=link,
-                    description="链接没有描述性文本"
-                )
-                issue.add_fix_suggestion("添加描述链接目的的文本")
-                issue.add_fix_suggestion("或为链接添加aria-label属性")
-                
-                # 生成修复示例
-                href = link.get('href', '#')
-                issue.add_code_example(
-                    f'<a href="{href}">描述性链接文本</a>',
-                    "添加描述性链接文本"
-                )
-                
-                # 修复f-string语法
-                link_content = str(link.contents[0]) if link.contents else ""
-                issue.add_code_example(
-                    f'<a href="{href}" aria-label="描述性链接文本">{link_content}</a>',
-                    "添加aria-label属性"
-                )
-                issues.append(issue)
+                yield Issue(rule=self, element=link, code="link-purpose.no-text", params={"href": link.get('href', '#')})
             elif link_text.lower() in ['点击这里', '点击', '这里', 'click here', 'click', 'here', 'more', '更多']:
                 # 链接文本不描述目的
-                issue = Issue(
+                yield Issue(
                     rule=self,
                     element=link,
-                    description=f"链接文本 '{link_text}' 不足以描述链接目的"
-                )
-                issue.add_fix_suggestion("使用描述链接目的的文本替换通用文本")
-                
-                # 生成修复示例
-                href = link.get('href', '#')
-                issue.add_code_example(
-                    f'<a href="{href}">描述性链接文本</a>',
-                    "使用描述性链接文本"
+                    code="link-purpose.generic-text",
+                    params={"name": link_text, "href": link.get('href', '#')}
                 )
-                issues.append(issue)
-        
-        return issues
-    
-    def get_fix_suggestions(self, issue):
-        """获取修复建议"""
-        if "链接没有描述性文本" in issue.description:
-            return [
-                "添加描述链接目的的文本",
-                "或为链接添加aria-label属性"
-            ]
-        elif "不足以描述链接目的" in issue.description:
-            return [
-                "使用描述链接目的的文本替换通用文本",
-                "确保链接文本能够独立理解，不依赖上下文"
-            ]
-        
-        return []
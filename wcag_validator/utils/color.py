@@ -0,0 +1,300 @@
+"""
+颜色对比度计算，解析CSS颜色并按WCAG定义批量计算相对亮度和对比度
+"""
+import colorsys
+import re
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # NumPy是可选依赖，未安装时使用纯Python实现
+    np = None
+
+# WCAG相对亮度的通道权重
+LUMINANCE_WEIGHTS = (0.2126, 0.7152, 0.0722)
+
+BLACK = (0, 0, 0, 1.0)
+WHITE = (255, 255, 255, 1.0)
+TRANSPARENT = (0, 0, 0, 0.0)
+
+# CSS命名颜色
+NAMED_COLORS = {
+    'aliceblue': 'f0f8ff', 'antiquewhite': 'faebd7', 'aqua': '00ffff', 'aquamarine': '7fffd4',
+    'azure': 'f0ffff', 'beige': 'f5f5dc', 'bisque': 'ffe4c4', 'black': '000000',
+    'blanchedalmond': 'ffebcd', 'blue': '0000ff', 'blueviolet': '8a2be2', 'brown': 'a52a2a',
+    'burlywood': 'deb887', 'cadetblue': '5f9ea0', 'chartreuse': '7fff00', 'chocolate': 'd2691e',
+    'coral': 'ff7f50', 'cornflowerblue': '6495ed', 'cornsilk': 'fff8dc', 'crimson': 'dc143c',
+    'cyan': '00ffff', 'darkblue': '00008b', 'darkcyan': '008b8b', 'darkgoldenrod': 'b8860b',
+    'darkgray': 'a9a9a9', 'darkgreen': '006400', 'darkgrey': 'a9a9a9', 'darkkhaki': 'bdb76b',
+    'darkmagenta': '8b008b', 'darkolivegreen': '556b2f', 'darkorange': 'ff8c00', 'darkorchid': '9932cc',
+    'darkred': '8b0000', 'darksalmon': 'e9967a', 'darkseagreen': '8fbc8f', 'darkslateblue': '483d8b',
+    'darkslategray': '2f4f4f', 'darkslategrey': '2f4f4f', 'darkturquoise': '00ced1', 'darkviolet': '9400d3',
+    'deeppink': 'ff1493', 'deepskyblue': '00bfff', 'dimgray': '696969', 'dimgrey': '696969',
+    'dodgerblue': '1e90ff', 'firebrick': 'b22222', 'floralwhite': 'fffaf0', 'forestgreen': '228b22',
+    'fuchsia': 'ff00ff', 'gainsboro': 'dcdcdc', 'ghostwhite': 'f8f8ff', 'gold': 'ffd700',
+    'goldenrod': 'daa520', 'gray': '808080', 'green': '008000', 'greenyellow': 'adff2f',
+    'grey': '808080', 'honeydew': 'f0fff0', 'hotpink': 'ff69b4', 'indianred': 'cd5c5c',
+    'indigo': '4b0082', 'ivory': 'fffff0', 'khaki': 'f0e68c', 'lavender': 'e6e6fa',
+    'lavenderblush': 'fff0f5', 'lawngreen': '7cfc00', 'lemonchiffon': 'fffacd', 'lightblue': 'add8e6',
+    'lightcoral': 'f08080', 'lightcyan': 'e0ffff', 'lightgoldenrodyellow': 'fafad2', 'lightgray': 'd3d3d3',
+    'lightgreen': '90ee90', 'lightgrey': 'd3d3d3', 'lightpink': 'ffb6c1', 'lightsalmon': 'ffa07a',
+    'lightseagreen': '20b2aa', 'lightskyblue': '87cefa', 'lightslategray': '778899', 'lightslategrey': '778899',
+    'lightsteelblue': 'b0c4de', 'lightyellow': 'ffffe0', 'lime': '00ff00', 'limegreen': '32cd32',
+    'linen': 'faf0e6', 'magenta': 'ff00ff', 'maroon': '800000', 'mediumaquamarine': '66cdaa',
+    'mediumblue': '0000cd', 'mediumorchid': 'ba55d3', 'mediumpurple': '9370db', 'mediumseagreen': '3cb371',
+    'mediumslateblue': '7b68ee', 'mediumspringgreen': '00fa9a', 'mediumturquoise': '48d1cc',
+    'mediumvioletred': 'c71585', 'midnightblue': '191970', 'mintcream': 'f5fffa', 'mistyrose': 'ffe4e1',
+    'moccasin': 'ffe4b5', 'navajowhite': 'ffdead', 'navy': '000080', 'oldlace': 'fdf5e6',
+    'olive': '808000', 'olivedrab': '6b8e23', 'orange': 'ffa500', 'orangered': 'ff4500',
+    'orchid': 'da70d6', 'palegoldenrod': 'eee8aa', 'palegreen': '98fb98', 'paleturquoise': 'afeeee',
+    'palevioletred': 'db7093', 'papayawhip': 'ffefd5', 'peachpuff': 'ffdab9', 'peru': 'cd853f',
+    'pink': 'ffc0cb', 'plum': 'dda0dd', 'powderblue': 'b0e0e6', 'purple': '800080',
+    'rebeccapurple': '663399', 'red': 'ff0000', 'rosybrown': 'bc8f8f', 'royalblue': '4169e1',
+    'saddlebrown': '8b4513', 'salmon': 'fa8072', 'sandybrown': 'f4a460', 'seagreen': '2e8b57',
+    'seashell': 'fff5ee', 'sienna': 'a0522d', 'silver': 'c0c0c0', 'skyblue': '87ceeb',
+    'slateblue': '6a5acd', 'slategray': '708090', 'slategrey': '708090', 'snow': 'fffafa',
+    'springgreen': '00ff7f', 'steelblue': '4682b4', 'tan': 'd2b48c', 'teal': '008080',
+    'thistle': 'd8bfd8', 'tomato': 'ff6347', 'turquoise': '40e0d0', 'violet': 'ee82ee',
+    'wheat': 'f5deb3', 'white': 'ffffff', 'whitesmoke': 'f5f5f5', 'yellow': 'ffff00',
+    'yellowgreen': '9acd32',
+}
+
+_FUNCTION_RE = re.compile(r'^(rgba?|hsla?)\(\s*(.*?)\s*\)$')
+_SEPARATOR_RE = re.compile(r'\s*,\s*|\s*/\s*|\s+')
+
+# sRGB通道值(0-255)到线性值的查找表
+_LINEAR = [
+    (value / 255) / 12.92 if value / 255 <= 0.04045 else ((value / 255 + 0.055) / 1.055) ** 2.4
+    for value in range(256)
+]
+_LINEAR_ARRAY = np.array(_LINEAR) if np is not None else None
+
+
+@lru_cache(maxsize=4096)
+def parse_color(value):
+    """
+    解析CSS颜色值
+    
+    支持#rgb、#rgba、#rrggbb、#rrggbbaa、rgb()/rgba()、hsl()/hsla()、命名颜色和transparent。
+    
+    参数:
+        value: CSS颜色字符串
+    
+    返回:
+        (r, g, b, a)元组，r/g/b为0-255，a为0-1；无法解析（包括currentcolor等关键字）时返回None
+    """
+    if not value:
+        return None
+    value = value.strip().lower()
+    if value.endswith('!important'):
+        value = value[:-len('!important')].strip()
+    
+    if value == 'transparent':
+        return TRANSPARENT
+    if value in NAMED_COLORS:
+        value = '#' + NAMED_COLORS[value]
+    
+    if value.startswith('#'):
+        digits = value[1:]
+        if len(digits) in (3, 4):
+            digits = "".join(ch * 2 for ch in digits)
+        if len(digits) not in (6, 8):
+            return None
+        try:
+            channels = [int(digits[i:i + 2], 16) for i in range(0, len(digits), 2)]
+        except ValueError:
+            return None
+        alpha = channels[3] / 255 if len(channels) == 4 else 1.0
+        return (channels[0], channels[1], channels[2], alpha)
+    
+    match = _FUNCTION_RE.match(value)
+    if not match:
+        return None
+    
+    parts = [part for part in _SEPARATOR_RE.split(match.group(2)) if part]
+    if len(parts) not in (3, 4):
+        return None
+    try:
+        alpha = _parse_alpha(parts[3]) if len(parts) == 4 else 1.0
+        if match.group(1).startswith('rgb'):
+            channels = [_parse_channel(part) for part in parts[:3]]
+        else:
+            hue = float(parts[0].replace('deg', '')) % 360 / 360
+            saturation = _parse_percentage(parts[1])
+            lightness = _parse_percentage(parts[2])
+            channels = [value * 255 for value in colorsys.hls_to_rgb(hue, lightness, saturation)]
+    except ValueError:
+        return None
+    
+    return (*(int(round(min(max(channel, 0), 255))) for channel in channels), min(max(alpha, 0.0), 1.0))
+
+
+def _parse_channel(part):
+    """解析rgb()的通道值（数字或百分比）"""
+    if part.endswith('%'):
+        return float(part[:-1]) * 255 / 100
+    return float(part)
+
+
+def _parse_alpha(part):
+    """解析透明度（数字或百分比）"""
+    if part.endswith('%'):
+        return float(part[:-1]) / 100
+    return float(part)
+
+
+def _parse_percentage(part):
+    """解析hsl()的百分比值，返回0-1"""
+    return min(max(float(part.rstrip('%')) / 100, 0.0), 1.0)
+
+
+def blend(foreground, background):
+    """
+    将半透明颜色合成到不透明背景上
+    
+    参数:
+        foreground: (r, g, b, a)元组
+        background: 不透明的(r, g, b, a)元组
+    
+    返回:
+        不透明的(r, g, b, 1.0)元组
+    """
+    alpha = foreground[3]
+    if alpha >= 1:
+        return foreground
+    return (
+        *(int(round(f * alpha + b * (1 - alpha))) for f, b in zip(foreground[:3], background[:3])),
+        1.0
+    )
+
+
+def to_hex(color):
+    """将颜色转换为#rrggbb格式"""
+    return "#{:02x}{:02x}{:02x}".format(*(int(round(channel)) for channel in color[:3]))
+
+
+def relative_luminance(color):
+    """
+    计算颜色的WCAG相对亮度
+    
+    参数:
+        color: (r, g, b[, a])元组，通道值为0-255
+    
+    返回:
+        0-1之间的亮度
+    """
+    r, g, b = (int(round(channel)) for channel in color[:3])
+    wr, wg, wb = LUMINANCE_WEIGHTS
+    return wr * _LINEAR[r] + wg * _LINEAR[g] + wb * _LINEAR[b]
+
+
+def contrast_ratio(foreground, background):
+    """
+    计算两个不透明颜色的对比度
+    
+    返回:
+        1-21之间的对比度
+    """
+    return _ratio(relative_luminance(foreground), relative_luminance(background))
+
+
+def _ratio(first, second):
+    lighter, darker = (first, second) if first >= second else (second, first)
+    return (lighter + 0.05) / (darker + 0.05)
+
+
+def pack(color):
+    """
+    将不透明颜色打包为0xRRGGBB整数，用于批量计算
+    
+    参数:
+        color: (r, g, b[, a])元组
+    
+    返回:
+        整数
+    """
+    r, g, b = (int(round(channel)) for channel in color[:3])
+    return (r << 16) | (g << 8) | b
+
+
+def unpack(value):
+    """将0xRRGGBB整数还原为(r, g, b, 1.0)元组"""
+    return ((value >> 16) & 255, (value >> 8) & 255, value & 255, 1.0)
+
+
+def contrast_ratios(foregrounds, backgrounds):
+    """
+    批量计算对比度
+    
+    安装了NumPy时在一次向量化运算中完成所有颜色对的计算，否则逐对计算并按颜色缓存亮度。
+    
+    参数:
+        foregrounds: 前景色列表，每项为pack()打包的整数
+        backgrounds: 与foregrounds等长的背景色列表，每项为pack()打包的整数
+    
+    返回:
+        对比度列表
+    """
+    if not foregrounds:
+        return []
+    
+    if np is not None:
+        fg_luminance = _luminance_array(np.asarray(foregrounds, dtype=np.int64))
+        bg_luminance = _luminance_array(np.asarray(backgrounds, dtype=np.int64))
+        lighter = np.maximum(fg_luminance, bg_luminance)
+        darker = np.minimum(fg_luminance, bg_luminance)
+        return ((lighter + 0.05) / (darker + 0.05)).tolist()
+    
+    # 相同的颜色在页面中大量重复，按颜色缓存亮度
+    luminance = {}
+    ratios = []
+    for foreground, background in zip(foregrounds, backgrounds):
+        fg_luminance = luminance.get(foreground)
+        if fg_luminance is None:
+            fg_luminance = luminance[foreground] = relative_luminance(unpack(foreground))
+        bg_luminance = luminance.get(background)
+        if bg_luminance is None:
+            bg_luminance = luminance[background] = relative_luminance(unpack(background))
+        ratios.append(_ratio(fg_luminance, bg_luminance))
+    return ratios
+
+
+def _luminance_array(packed):
+    """计算打包颜色数组的相对亮度"""
+    wr, wg, wb = LUMINANCE_WEIGHTS
+    return (wr * _LINEAR_ARRAY[packed >> 16]
+            + wg * _LINEAR_ARRAY[(packed >> 8) & 255]
+            + wb * _LINEAR_ARRAY[packed & 255])
+
+
+def suggest_color(foreground, background, target):
+    """
+    在保持色相的前提下调整前景色，使其与背景的对比度达到目标值
+    
+    前景色按背景的明暗向黑色或白色混合，二分查找满足目标对比度的最小调整量。
+    
+    参数:
+        foreground: 不透明前景色
+        background: 不透明背景色
+        target: 目标对比度
+    
+    返回:
+        调整后的颜色，无法达到目标时返回黑色或白色中对比度较高者
+    """
+    extreme = BLACK if relative_luminance(background) > 0.18 else WHITE
+    if contrast_ratio(extreme, background) < target:
+        extreme = WHITE if extreme is BLACK else BLACK
+        if contrast_ratio(extreme, background) < target:
+            return extreme
+    
+    def mix(amount):
+        return tuple(int(round(f + (e - f) * amount)) for f, e in zip(foreground[:3], extreme[:3])) + (1.0,)
+    
+    low, high = 0.0, 1.0
+    for _ in range(16):
+        middle = (low + high) / 2
+        if contrast_ratio(mix(middle), background) >= target:
+            high = middle
+        else:
+            low = middle
+    return mix(high)
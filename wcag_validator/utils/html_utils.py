@@ -0,0 +1,97 @@
+"""
+HTML辅助函数
+"""
+import re
+
+# 每次渲染都可能变化、不应参与元素比较的属性
+VOLATILE_ATTRS = {'style', 'nonce', 'integrity'}
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_space(text):
+    """合并连续空白并去除首尾空白"""
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+def attribute_value(element, name, default=None):
+    """
+    获取属性值的字符串形式
+    
+    BeautifulSoup将class、rel等多值属性解析为列表，这里按原顺序用空格连接。
+    
+    参数:
+        element: BeautifulSoup元素
+        name: 属性名
+        default: 属性不存在时的返回值
+    
+    返回:
+        属性值字符串，属性不存在时返回default
+    """
+    value = element.get(name)
+    if value is None:
+        return default
+    if isinstance(value, list):
+        return " ".join(value)
+    return value
+
+
+def element_signature(element, max_length=200):
+    """
+    生成元素的规范化签名，用于跨页面识别相同的元素
+    
+    签名由标签名和排序后的属性组成，忽略易变属性（style、nonce、data-*等）
+    和空白差异，因此不同页面中的同一个组件会得到相同的签名。
+    
+    参数:
+        element: BeautifulSoup元素
+        max_length: 签名最大长度
+    
+    返回:
+        签名字符串
+    """
+    if element is None or not getattr(element, 'name', None):
+        return ""
+    
+    parts = [element.name]
+    for name in sorted(element.attrs):
+        if name in VOLATILE_ATTRS or name.startswith('data-'):
+            continue
+        
+        value = element.attrs[name]
+        if isinstance(value, list):
+            # class等多值属性与顺序无关
+            value = " ".join(sorted(value))
+        parts.append(f'{name}="{normalize_space(value)}"')
+    
+    signature = " ".join(parts)
+    if len(signature) > max_length:
+        signature = signature[:max_length]
+    
+    return signature
+
+
+def normalized_path(element):
+    """
+    生成元素的规范化DOM路径，不含兄弟节点序号
+    
+    路径从最近的带id的祖先（含元素本身）开始，例如"form#signup > div > input"，
+    因此在页面其他位置插入或删除元素不会改变路径。
+    
+    参数:
+        element: BeautifulSoup元素
+    
+    返回:
+        路径字符串
+    """
+    parts = []
+    node = element
+    while node is not None and getattr(node, 'name', None) and node.name != '[document]':
+        element_id = node.get('id')
+        if element_id:
+            parts.append(f"{node.name}#{normalize_space(element_id)}")
+            break
+        parts.append(node.name)
+        node = node.parent
+    
+    return " > ".join(reversed(parts))